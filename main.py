@@ -55,9 +55,33 @@ def build_parser() -> argparse.ArgumentParser:
 
     process_parser = subparsers.add_parser("process", help="Build processed features from raw data.")
     process_parser.add_argument("--raw-file", help="Specific raw JSON file to process.")
+    process_parser.add_argument("--from", dest="from_date", help="First raw file date to reprocess (YYYY-MM-DD).")
+    process_parser.add_argument("--to", dest="to_date", help="Last raw file date to reprocess (YYYY-MM-DD).")
+    process_parser.add_argument(
+        "--verify-context",
+        action="store_true",
+        help="Check the rolling context state against a full history recomputation.",
+    )
+    process_parser.add_argument(
+        "--no-context-cache",
+        action="store_false",
+        dest="use_cache",
+        help="Recompute historical contexts instead of reusing cached results.",
+    )
+    process_parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail instead of falling back when BTC history is missing or stale.",
+    )
 
     paper_parser = subparsers.add_parser("paper", help="Run the paper trading routine.")
     paper_parser.add_argument("--processed-file", help="Specific processed JSON file to use.")
+    paper_parser.add_argument(
+        "--calibrator",
+        choices=["historical", "sketch"],
+        default="historical",
+        help="Feature calibrator for the quant scorer; 'sketch' extends persisted quantile sketches.",
+    )
 
     full_parser = subparsers.add_parser("full", help="Run download, processing and paper trading.")
     full_parser.add_argument("--date", help="Override output date (YYYY-MM-DD).")
@@ -66,6 +90,43 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Fail the pipeline if any data source cannot be fetched.",
     )
+    full_parser.add_argument(
+        "--calibrator",
+        choices=["historical", "sketch"],
+        default="historical",
+        help="Feature calibrator for the quant scorer; 'sketch' extends persisted quantile sketches.",
+    )
+
+    compact_parser = subparsers.add_parser(
+        "compact-reports",
+        help="Roll old daily reports into monthly tables.",
+    )
+    compact_parser.add_argument(
+        "--keep-days",
+        default=90,
+        type=int,
+        help="Number of most recent daily reports kept as markdown files.",
+    )
+    compact_parser.add_argument("--date", help="Reference date for the retention window (YYYY-MM-DD).")
+    compact_parser.add_argument("--dry-run", action="store_true")
+
+    features_parser = subparsers.add_parser(
+        "features",
+        help="Recompute stale processed feature columns across history.",
+    )
+    features_parser.add_argument("--only", nargs="+", help="Force these columns (e.g. metrics.mvrv_zscore) and their dependents.")
+    features_parser.add_argument("--adopt", action="store_true", help="Record the stored columns as up to date.")
+    features_parser.add_argument("--dry-run", action="store_true", help="Only list the stale columns.")
+    features_parser.add_argument("--workers", default=8, type=int)
+
+    stream_parser = subparsers.add_parser(
+        "stream",
+        help="Ingest a live trade feed into intraday candles and rolling features.",
+    )
+    stream_parser.add_argument("--url", help="Websocket feed (default: Binance BTCUSDT trades).")
+    stream_parser.add_argument("--replay", dest="replay_file", help="Replay a JSONL/CSV feed through a local server.")
+    stream_parser.add_argument("--max-messages", type=int, help="Stop after this many feed messages.")
+    stream_parser.add_argument("--delay", default=0.0, type=float, help="Seconds between replayed messages.")
 
     dashboard_parser = subparsers.add_parser("dashboard", help="Serve the local dashboard.")
     dashboard_parser.add_argument("--host", default="0.0.0.0")
@@ -87,9 +148,25 @@ def command_download(args: argparse.Namespace) -> int:
 
 
 def command_process(args: argparse.Namespace) -> int:
-    from src.pipeline import run_processing
-
-    result = run_processing(raw_file=args.raw_file)
+    from src.pipeline import run_processing, run_processing_range
+
+    if args.from_date or args.to_date:
+        if args.raw_file:
+            raise SystemExit("--raw-file cannot be combined with --from/--to.")
+        if not args.from_date:
+            raise SystemExit("--to requires --from.")
+        if args.verify_context:
+            raise SystemExit("--verify-context cannot be combined with --from/--to.")
+        result = run_processing_range(args.from_date, args.to_date, use_cache=args.use_cache, strict=args.strict)
+        LOGGER.info("Reprocessed %s raw files", len(result["output_paths"]))
+        return 0
+
+    result = run_processing(
+        raw_file=args.raw_file,
+        verify_context=args.verify_context,
+        use_cache=args.use_cache,
+        strict=args.strict,
+    )
     LOGGER.info("Processed data written to %s", result["output_path"])
     return 0
 
@@ -97,7 +174,7 @@ def command_process(args: argparse.Namespace) -> int:
 def command_paper(args: argparse.Namespace) -> int:
     from src.pipeline import run_paper
 
-    result = run_paper(processed_file=args.processed_file)
+    result = run_paper(processed_file=args.processed_file, calibrator=args.calibrator)
     LOGGER.info("Paper trading report written to %s", result["report_path"])
     return 0
 
@@ -105,12 +182,65 @@ def command_paper(args: argparse.Namespace) -> int:
 def command_full(args: argparse.Namespace) -> int:
     from src.pipeline import run_full_pipeline
 
-    result = run_full_pipeline(target_date=args.date, strict=args.strict)
+    result = run_full_pipeline(target_date=args.date, strict=args.strict, calibrator=args.calibrator)
     LOGGER.info("Pipeline completed successfully.")
     LOGGER.info("Latest report: %s", result["paper"]["report_path"])
     return 0
 
 
+def command_compact_reports(args: argparse.Namespace) -> int:
+    from src.pipeline import run_report_compaction
+
+    result = run_report_compaction(keep_days=args.keep_days, today=args.date, dry_run=args.dry_run)
+    LOGGER.info(
+        "Compacted %s reports older than %s into %s monthly tables%s.",
+        result["compacted_reports"],
+        result["cutoff"],
+        len(result["months"]),
+        " (dry run)" if result["dry_run"] else "",
+    )
+    return 0
+
+
+def command_features(args: argparse.Namespace) -> int:
+    from src.pipeline import run_feature_refresh
+
+    if args.adopt and args.only:
+        raise SystemExit("--adopt cannot be combined with --only.")
+    result = run_feature_refresh(only=args.only, adopt=args.adopt, dry_run=args.dry_run, workers=args.workers)
+    for name, count in result["stale"].items():
+        LOGGER.info("%s: %s/%s dates stale", name, count, result["dates"])
+    LOGGER.info(
+        "%s stale columns, %s files rewritten%s.",
+        len(result["stale"]),
+        result["written"],
+        " (dry run)" if result["dry_run"] else "",
+    )
+    return 0
+
+
+def command_stream(args: argparse.Namespace) -> int:
+    from src.pipeline import run_stream
+
+    if args.url and args.replay_file:
+        raise SystemExit("--url cannot be combined with --replay.")
+    stats = run_stream(
+        url=args.url,
+        replay_file=args.replay_file,
+        max_messages=args.max_messages,
+        delay=args.delay,
+    )
+    LOGGER.info(
+        "Ingested %s updates (p50 %.1f us, p99 %.1f us, %s ring bytes).",
+        stats["count"],
+        stats["p50_us"] or 0.0,
+        stats["p99_us"] or 0.0,
+        stats["ring_bytes"],
+    )
+    print(json.dumps(stats["latest"], indent=2, sort_keys=True))
+    return 0
+
+
 def command_dashboard(args: argparse.Namespace) -> int:
     from webapp.app import app
 
@@ -153,6 +283,9 @@ def main(argv: list[str] | None = None) -> int:
         "process": command_process,
         "paper": command_paper,
         "full": command_full,
+        "compact-reports": command_compact_reports,
+        "features": command_features,
+        "stream": command_stream,
         "dashboard": command_dashboard,
         "status": command_status,
     }
@@ -1,43 +1,197 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
 import requests
 import pandas as pd
 
-def get_ema():
+from src.utils.project_paths import STATE_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+EMA_SPAN = 365
+EMA_STATE_PATH = STATE_DIR / "btc_price_ema_365.json"
+STATE_VERSION = 2
+
+CHANGE_LAGS = {"daily_change_pct": 1, "weekly_change_pct": 7, "monthly_change_pct": 30}
+
+# Closes kept on disk: the completed days of the 365-day chart, which the
+# full computation seeds its EMA over.
+BUFFER_DAYS = EMA_SPAN
+
+# Full re-download interval, to pick up revised closes.
+RESEED_DAYS = 30
+
+
+def _fetch_chart(days: int) -> list[tuple[str, float]]:
     url = "https://api.coingecko.com/api/v3/coins/bitcoin/market_chart"
-    
+
     params = {
         "vs_currency": "usd",
-        "days": "365",
+        "days": str(days),
         "interval": "daily"
     }
 
     response = requests.get(url, params=params)
+    response.raise_for_status()
     data = response.json()
-    
-    prices = [p[1] for p in data["prices"]]
-    
-    series = pd.Series(prices)
-
-    ema_365 = series.ewm(span=365, adjust=False).mean()
-    
-    current_price = prices[-1]
-    prev_price = prices[-2] if len(prices) > 1 else current_price
-    daily_change_pct = ((current_price - prev_price) / prev_price) * 100
-    
-    # Weekly Change (7 days ago)
-    price_7d = prices[-8] if len(prices) > 7 else prices[0]
-    weekly_change_pct = ((current_price - price_7d) / price_7d) * 100
-    
-    # Monthly Change (30 days ago)
-    price_30d = prices[-31] if len(prices) > 30 else prices[0]
-    monthly_change_pct = ((current_price - price_30d) / price_30d) * 100
-    
-    return {
-        "current_price": float(current_price),
-        "ema_365": float(ema_365.iloc[-1]),
-        "daily_change_pct": float(daily_change_pct),
-        "weekly_change_pct": float(weekly_change_pct),
-        "monthly_change_pct": float(monthly_change_pct)
-    }
+
+    prices = data.get("prices") if isinstance(data, dict) else None
+    if not prices:
+        raise ValueError(f"CoinGecko returned no BTC prices for the last {days} days")
+    return [
+        (datetime.fromtimestamp(point[0] / 1000, tz=timezone.utc).strftime("%Y-%m-%d"), float(point[1]))
+        for point in prices
+    ]
+
+
+def _snapshot(current_price: float, ema_365: float, closes: list[float]) -> dict:
+    snapshot = {"current_price": float(current_price), "ema_365": float(ema_365)}
+    for name, lag in CHANGE_LAGS.items():
+        # Fall back to the oldest close when the history is shorter than the lag.
+        reference = closes[-lag] if len(closes) >= lag else (closes[0] if closes else current_price)
+        snapshot[name] = float(((current_price - reference) / reference) * 100)
+    return snapshot
+
+
+def ema_from_prices(prices: list[float]) -> dict:
+    """Full recomputation over a price list whose last entry is the current price."""
+    ema_365 = pd.Series(prices).ewm(span=EMA_SPAN, adjust=False).mean()
+    return _snapshot(prices[-1], ema_365.iloc[-1], prices[:-1])
+
+
+class PriceEMAState:
+    """
+    The last `window` completed daily closes of the 365-day chart.
+
+    `snapshot(current_price)` runs the full computation over those closes plus
+    the live price, so it matches a fresh chart download exactly while only
+    the closes since the last run are fetched.
+    """
+
+    def __init__(self, window: int = BUFFER_DAYS):
+        self.window = int(window)
+        self.last_date: str | None = None
+        self.closes: list[float] = []
+        self.seeded_on: str | None = None
+        self.reseed_deviation_pct: float | None = None
+
+    def update(self, date_str: str, close: float) -> bool:
+        if self.last_date is not None and date_str <= self.last_date:
+            return False
+        self.closes = (self.closes + [float(close)])[-self.window :]
+        self.last_date = date_str
+        return True
+
+    def snapshot(self, current_price: float) -> dict:
+        return ema_from_prices([*self.closes, float(current_price)])
+
+    @classmethod
+    def from_closes(cls, closes: list[tuple[str, float]], seeded_on: str, window: int = BUFFER_DAYS) -> "PriceEMAState":
+        state = cls(window=window)
+        for date_str, close in closes:
+            state.update(date_str, close)
+        state.seeded_on = seeded_on
+        return state
+
+    def needs_reseed(self, today: str, reseed_days: int = RESEED_DAYS) -> bool:
+        if self.seeded_on is None or self.last_date is None:
+            return True
+        seeded = datetime.strptime(self.seeded_on, "%Y-%m-%d")
+        return (datetime.strptime(today, "%Y-%m-%d") - seeded).days >= reseed_days
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "window": self.window,
+            "last_date": self.last_date,
+            "closes": self.closes,
+            "seeded_on": self.seeded_on,
+            "reseed_deviation_pct": self.reseed_deviation_pct,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "PriceEMAState":
+        state = cls(window=payload.get("window", BUFFER_DAYS))
+        state.last_date = payload.get("last_date")
+        state.closes = [float(value) for value in payload.get("closes", [])][-state.window :]
+        state.seeded_on = payload.get("seeded_on")
+        state.reseed_deviation_pct = payload.get("reseed_deviation_pct")
+        return state
+
+    def save(self, path: Path = EMA_STATE_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = EMA_STATE_PATH) -> "PriceEMAState | None":
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable EMA state %s: %s", path, exc)
+            return None
+        if payload.get("version") != STATE_VERSION:
+            return None
+        return cls.from_dict(payload)
+
+
+def _reseed(previous: PriceEMAState | None, today: str) -> tuple[PriceEMAState, dict]:
+    points = _fetch_chart(EMA_SPAN)
+    closes, current_price = points[:-1], points[-1][1]
+    state = PriceEMAState.from_closes(closes, seeded_on=today, window=max(len(closes), 1))
+    expected = ema_from_prices([price for _, price in points])
+
+    if previous is not None and previous.closes:
+        # Deviation of the carried-forward state from the full recomputation
+        # (non-zero only when closes were revised since they were stored).
+        for date_str, close in closes:
+            previous.update(date_str, close)
+        carried = previous.snapshot(current_price)["ema_365"]
+        state.reseed_deviation_pct = ((carried - expected["ema_365"]) / expected["ema_365"]) * 100
+        LOGGER.info("EMA-365 re-seed: incremental state deviated %.4f%% from the full chart", state.reseed_deviation_pct)
+
+    return state, expected
+
+
+def get_ema(state_path: Path | None = EMA_STATE_PATH, reseed_days: int = RESEED_DAYS):
+    """
+    BTC price, EMA-365 and 1/7/30-day changes.
+
+    With a state file only the closes since the last run are downloaded; the
+    full 365-day chart is fetched when the state is missing or older than
+    `reseed_days`. A failed or empty download raises and leaves the state as is.
+    """
+    if state_path is None:
+        return ema_from_prices([price for _, price in _fetch_chart(EMA_SPAN)])
+
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    state = PriceEMAState.load(state_path)
+
+    gap_days = None
+    if state is not None and state.last_date is not None:
+        gap_days = (datetime.strptime(today, "%Y-%m-%d") - datetime.strptime(state.last_date, "%Y-%m-%d")).days
+
+    if state is None or state.needs_reseed(today, reseed_days) or gap_days is None or gap_days > reseed_days:
+        state, snapshot = _reseed(state, today)
+    else:
+        points = _fetch_chart(max(gap_days, 1))
+        for date_str, close in points[:-1]:
+            state.update(date_str, close)
+        snapshot = state.snapshot(points[-1][1])
+
+    state.save(state_path)
+    return snapshot
 
 if __name__ == "__main__":
     try:
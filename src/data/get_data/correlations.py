@@ -1,39 +1,190 @@
-import yfinance as yf
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Mapping
+
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+import yfinance as yf
+
+from src.features.rolling import RollingCovariance
+from src.utils.project_paths import STATE_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+CORRELATION_STATE_PATH = STATE_DIR / "macro_correlations.json"
+STATE_VERSION = 1
+CORRELATION_WINDOW = 90
+SEED_DAYS = 365
+
+TICKERS = {
+    "BTC": "BTC-USD",
+    "SPX": "^GSPC",
+    "GOLD": "GC=F",
+}
 
-def get_macro_correlations():
+# Output key -> (x, y) series. Returns are taken between consecutive dates
+# on which every ticker has a close.
+PAIRS = {
+    "corr_spx_90d": ("BTC", "SPX"),
+    "corr_gold_90d": ("BTC", "GOLD"),
+}
 
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=365) # Get 1 year of data
-    
-    tickers = {
-        "BTC": "BTC-USD",
-        "SPX": "^GSPC",
-        "GOLD": "GC=F"
+
+def _download_closes(start_date: str, end_date: str, tickers: Mapping[str, str] = TICKERS) -> pd.DataFrame:
+    data = yf.download(list(tickers.values()), start=start_date, end=end_date, progress=False)["Close"]
+    closes = data.rename(columns={symbol: name for name, symbol in tickers.items()})[list(tickers)]
+    closes.index = pd.DatetimeIndex(closes.index).tz_localize(None).normalize()
+    return closes.dropna()
+
+
+def correlations_from_closes(
+    closes: pd.DataFrame,
+    pairs: Mapping[str, tuple[str, str]] = PAIRS,
+    window: int = CORRELATION_WINDOW,
+) -> dict | None:
+    """Full recomputation: rolling correlation of joint-session returns."""
+    returns = closes.dropna().pct_change().iloc[1:]
+    if len(returns) < window:
+        return None
+    return {
+        name: float(returns[x].rolling(window=window).corr(returns[y]).iloc[-1])
+        for name, (x, y) in pairs.items()
     }
-    
-    try:
 
-        data = yf.download(list(tickers.values()), start=start_date, end=end_date, progress=False)["Close"]
-        
-        returns = data.pct_change().dropna()
 
-        if len(returns) < 90:
-            return None
+class CorrelationState:
+    """
+    Rolling covariance of each pair's returns over the last `window` joint
+    sessions, plus the last closes needed to form the next returns.
+    """
+
+    def __init__(self, pairs: Mapping[str, tuple[str, str]] = PAIRS, window: int = CORRELATION_WINDOW):
+        self.pairs = dict(pairs)
+        self.window = int(window)
+        self.series = sorted({name for pair in self.pairs.values() for name in pair})
+        self.last_date: str | None = None
+        self.last_closes: dict[str, float] = {}
+        self.windows = {name: RollingCovariance(self.window) for name in self.pairs}
+
+    def update(self, date_str: str, closes: Mapping[str, float]) -> bool:
+        if self.last_date is not None and date_str <= self.last_date:
+            return False
+        values = {name: float(closes[name]) for name in self.series}
+        if not all(np.isfinite(value) and value > 0.0 for value in values.values()):
+            return False
+
+        if self.last_closes:
+            returns = {name: (values[name] / self.last_closes[name]) - 1.0 for name in self.series}
+            for name, (x, y) in self.pairs.items():
+                self.windows[name].push(returns[x], returns[y])
+        self.last_closes = values
+        self.last_date = date_str
+        return True
 
-        corr_spx = returns[tickers["BTC"]].rolling(window=90).corr(returns[tickers["SPX"]]).iloc[-1]
+    def extend(self, closes: pd.DataFrame) -> int:
+        """Feeds the rows of a date-indexed close frame; returns how many were new."""
+        pushed = 0
+        for timestamp, row in closes.iterrows():
+            pushed += self.update(pd.Timestamp(timestamp).strftime("%Y-%m-%d"), row)
+        return pushed
 
-        corr_gold = returns[tickers["BTC"]].rolling(window=90).corr(returns[tickers["GOLD"]]).iloc[-1]
-        
+    def correlations(self) -> dict | None:
+        """None until every pair has a full window, like the full recomputation."""
+        values = {name: window.correlation(min_periods=self.window) for name, window in self.windows.items()}
+        if any(value is None for value in values.values()):
+            return None
+        return values
+
+    def to_dict(self) -> dict:
         return {
-            "corr_spx_90d": float(corr_spx),
-            "corr_gold_90d": float(corr_gold)
+            "version": STATE_VERSION,
+            "window": self.window,
+            "pairs": {name: list(pair) for name, pair in self.pairs.items()},
+            "last_date": self.last_date,
+            "last_closes": self.last_closes,
+            "returns": {name: window.values() for name, window in self.windows.items()},
         }
-        
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "CorrelationState":
+        state = cls({name: tuple(pair) for name, pair in payload["pairs"].items()}, window=payload["window"])
+        state.last_date = payload.get("last_date")
+        state.last_closes = {name: float(value) for name, value in payload.get("last_closes", {}).items()}
+        for name, pairs in payload.get("returns", {}).items():
+            if name in state.windows:
+                state.windows[name] = RollingCovariance(state.window, [tuple(pair) for pair in pairs])
+        return state
+
+    def save(self, path: Path = CORRELATION_STATE_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        path: Path = CORRELATION_STATE_PATH,
+        pairs: Mapping[str, tuple[str, str]] = PAIRS,
+        window: int = CORRELATION_WINDOW,
+    ) -> "CorrelationState | None":
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable correlation state %s: %s", path, exc)
+            return None
+        if payload.get("version") != STATE_VERSION or payload.get("window") != window:
+            return None
+        state = cls.from_dict(payload)
+        if state.pairs != dict(pairs):
+            return None
+        return state
+
+
+def get_macro_correlations(state_path: Path | None = CORRELATION_STATE_PATH):
+    """
+    90-day correlations of BTC daily returns with the S&P 500 and gold.
+
+    With a state file only the sessions since the last run are downloaded
+    and pushed through the rolling sums; the state is seeded from a year of
+    closes when missing. Only completed days are committed to the state.
+    """
+    now = datetime.now(timezone.utc)
+    today = now.strftime("%Y-%m-%d")
+
+    try:
+        if state_path is None:
+            return correlations_from_closes(
+                _download_closes((now - timedelta(days=SEED_DAYS)).strftime("%Y-%m-%d"), today)
+            )
+
+        state = CorrelationState.load(state_path)
+        if state is None or state.last_date is None:
+            state = CorrelationState()
+            start_date = (now - timedelta(days=SEED_DAYS)).strftime("%Y-%m-%d")
+        else:
+            start_date = (datetime.strptime(state.last_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+        if start_date < today:
+            closes = _download_closes(start_date, today)
+            if state.extend(closes[closes.index < pd.Timestamp(today)]):
+                state.save(state_path)
+        return state.correlations()
+
     except Exception as e:
-        print(f"Error fetching correlations: {e}")
+        LOGGER.warning("Error fetching correlations: %s", e)
         return None
 
+
 if __name__ == "__main__":
     print(get_macro_correlations())
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.utils.project_paths import MACRO_DATA_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+STORE_COLUMNS = ["series_id", "observation_date", "knowledge_date", "value"]
+
+# Knowledge dates are encoded in the low bits of a composite search key.
+_KEY_SHIFT = np.int64(1 << 32)
+
+
+@dataclass(frozen=True)
+class MacroColumn:
+    series_id: str
+    yoy_periods: int | None = None
+
+
+DEFAULT_MACRO_COLUMNS = {
+    "interest_rate": MacroColumn("DGS10"),
+    "m2_yoy": MacroColumn("M2SL", yoy_periods=12),
+}
+
+
+def _to_day_ordinals(values) -> np.ndarray:
+    days = pd.to_datetime(pd.Index(values)).tz_localize(None).normalize()
+    return days.to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+
+class _SeriesIndex:
+    """
+    Sorted arrays for one series, ready for vectorized as-of lookups.
+
+    Records are ordered by (observation, knowledge) so every observation owns a
+    contiguous block of vintages. `released_through` is the running max of the
+    first-release dates, which gives a monotone array to search knowledge dates
+    against without ever exposing an observation before it was published.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        ordered = frame.sort_values(["observation_date", "knowledge_date"])
+        obs_days = _to_day_ordinals(ordered["observation_date"])
+        knowledge_days = _to_day_ordinals(ordered["knowledge_date"])
+
+        self.obs_dates, obs_codes = np.unique(obs_days, return_inverse=True)
+        self.values = ordered["value"].to_numpy(dtype=float)
+        self.keys = (obs_codes.astype(np.int64) * _KEY_SHIFT) + knowledge_days
+
+        first_release = np.full(self.obs_dates.size, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first_release, obs_codes, knowledge_days)
+        self.released_through = np.maximum.accumulate(first_release)
+
+    def observation_index(self, query_days: np.ndarray, knowledge_days: np.ndarray) -> np.ndarray:
+        by_date = np.searchsorted(self.obs_dates, query_days, side="right") - 1
+        by_knowledge = np.searchsorted(self.released_through, knowledge_days, side="right") - 1
+        return np.minimum(by_date, by_knowledge)
+
+    def lookup(self, obs_index: np.ndarray, knowledge_days: np.ndarray) -> np.ndarray:
+        result = np.full(obs_index.shape, np.nan, dtype=float)
+        valid = obs_index >= 0
+        if not valid.any():
+            return result
+
+        targets = (obs_index[valid].astype(np.int64) * _KEY_SHIFT) + knowledge_days[valid]
+        positions = np.searchsorted(self.keys, targets, side="right") - 1
+        result[valid] = self.values[positions]
+        return result
+
+
+class MacroVintageStore:
+    """
+    Bitemporal store of revised macro series (FRED/ALFRED vintages).
+
+    Every record carries the observation date and the knowledge date on which
+    that value became public, so backtests can ask what was known at time t
+    instead of joining the latest vintage onto history.
+    """
+
+    def __init__(self, store_path: Path | None = None):
+        self.store_path = Path(store_path) if store_path else MACRO_DATA_DIR / "fred_vintages.csv"
+        self._frame = self._load()
+        self._indexes: dict[str, _SeriesIndex] = {}
+
+    def _load(self) -> pd.DataFrame:
+        if not self.store_path.exists():
+            return pd.DataFrame(columns=STORE_COLUMNS)
+
+        frame = pd.read_csv(self.store_path, parse_dates=["observation_date", "knowledge_date"])
+        return frame[STORE_COLUMNS]
+
+    def save(self) -> Path:
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        ordered = self._frame.sort_values(["series_id", "observation_date", "knowledge_date"])
+        ordered.to_csv(self.store_path, index=False, date_format="%Y-%m-%d")
+        return self.store_path
+
+    def series_ids(self) -> list[str]:
+        return sorted(self._frame["series_id"].unique().tolist())
+
+    def latest_knowledge_date(self, series_id: str) -> pd.Timestamp | None:
+        rows = self._frame.loc[self._frame["series_id"] == series_id, "knowledge_date"]
+        if rows.empty:
+            return None
+        return pd.Timestamp(rows.max())
+
+    def unseen_vintages(self, series_id: str, vintages: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drops incoming vintages that only repeat the latest stored value.
+
+        ALFRED re-reports every observation still valid at `realtime_start`, so
+        an incremental pull mostly echoes what the store already holds under a
+        later knowledge date.
+        """
+        stored = self._frame[self._frame["series_id"] == series_id]
+        if stored.empty or vintages.empty:
+            return vintages
+
+        latest = (
+            stored.sort_values("knowledge_date")
+            .groupby("observation_date")[["knowledge_date", "value"]]
+            .last()
+        )
+        observations = pd.to_datetime(vintages["observation_date"]).dt.normalize()
+        knowledge = pd.to_datetime(vintages["knowledge_date"]).dt.normalize()
+        values = pd.to_numeric(vintages["value"], errors="coerce")
+
+        stored_knowledge = observations.map(latest["knowledge_date"])
+        stored_value = observations.map(latest["value"])
+        repeated = (knowledge >= stored_knowledge) & (values == stored_value)
+        return vintages.loc[~repeated.to_numpy()]
+
+    def upsert(self, series_id: str, vintages: pd.DataFrame) -> int:
+        """
+        Merges vintages with columns observation_date, knowledge_date, value.
+
+        Returns the number of new (observation, knowledge) records.
+        """
+        incoming = vintages[["observation_date", "knowledge_date", "value"]].copy()
+        incoming["series_id"] = series_id
+        incoming["observation_date"] = pd.to_datetime(incoming["observation_date"]).dt.normalize()
+        incoming["knowledge_date"] = pd.to_datetime(incoming["knowledge_date"]).dt.normalize()
+        incoming["value"] = pd.to_numeric(incoming["value"], errors="coerce")
+        incoming = incoming.dropna(subset=["value"])[STORE_COLUMNS]
+
+        before = len(self._frame)
+        combined = pd.concat([self._frame, incoming], ignore_index=True) if before else incoming
+        combined = combined.drop_duplicates(
+            subset=["series_id", "observation_date", "knowledge_date"],
+            keep="last",
+        )
+        self._frame = combined.reset_index(drop=True)
+        self._indexes.pop(series_id, None)
+
+        added = len(self._frame) - before
+        LOGGER.info("Macro store %s: %s new vintage records.", series_id, added)
+        return added
+
+    def _index(self, series_id: str) -> _SeriesIndex | None:
+        if series_id not in self._indexes:
+            rows = self._frame[self._frame["series_id"] == series_id]
+            if rows.empty:
+                return None
+            self._indexes[series_id] = _SeriesIndex(rows)
+        return self._indexes[series_id]
+
+    def as_of_series(
+        self,
+        series_id: str,
+        dates,
+        knowledge_dates=None,
+        yoy_periods: int | None = None,
+    ) -> np.ndarray:
+        """
+        Latest observation on or before each date, using only vintages known at
+        the matching knowledge date. With `yoy_periods`, returns the percent
+        change against the observation that many periods earlier, measured
+        inside the same vintage.
+        """
+        query_days = _to_day_ordinals(dates)
+        knowledge_days = query_days if knowledge_dates is None else _to_day_ordinals(knowledge_dates)
+        if knowledge_days.shape != query_days.shape:
+            raise ValueError("dates and knowledge_dates must have the same length.")
+
+        index = self._index(series_id)
+        if index is None:
+            return np.full(query_days.shape, np.nan, dtype=float)
+
+        obs_index = index.observation_index(query_days, knowledge_days)
+        current = index.lookup(obs_index, knowledge_days)
+        if not yoy_periods:
+            return current
+
+        base_index = np.where(obs_index >= yoy_periods, obs_index - yoy_periods, -1)
+        base = index.lookup(base_index, knowledge_days)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ((current / base) - 1.0) * 100.0
+
+    def as_of(
+        self,
+        dates,
+        knowledge_dates=None,
+        columns: dict[str, MacroColumn] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Point-in-time macro columns for many days in one call.
+
+        `knowledge_dates` defaults to `dates`, i.e. what was public on each day.
+        """
+        columns = columns or DEFAULT_MACRO_COLUMNS
+        index = pd.DatetimeIndex(pd.to_datetime(pd.Index(dates))).tz_localize(None).normalize()
+
+        data = {
+            name: self.as_of_series(spec.series_id, index, knowledge_dates, spec.yoy_periods)
+            for name, spec in columns.items()
+        }
+        return pd.DataFrame(data, index=index)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from src.utils.project_paths import PROCESSED_DATA_DIR
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    FAST_JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depends on the environment
+    _loads = json.loads
+    FAST_JSON_BACKEND = "json"
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when the layout of processed_data_*.json changes.
+# Files written before the stamp existed are reported as version 1.
+PROCESSED_SCHEMA_VERSION = 2
+LEGACY_SCHEMA_VERSION = 1
+
+_MISSING = object()
+
+
+def _date_from_filename(file_path: Path) -> str | None:
+    name = file_path.stem  # processed_data_YYYY-MM-DD
+    if not name.startswith("processed_data_"):
+        return None
+    raw_date = name.replace("processed_data_", "", 1)
+    if len(raw_date) != 10:
+        return None
+    return raw_date
+
+
+def _split_field(field: str) -> tuple[str, ...]:
+    return tuple(part for part in field.split(".") if part)
+
+
+class ProcessedPayload:
+    """
+    Lazy view over one processed snapshot.
+
+    The file is read as bytes up front and only decoded the first time a field
+    or section (`metrics`, `market_data`, `flags`) is touched.
+    """
+
+    __slots__ = ("path", "_raw", "_decoded")
+
+    def __init__(self, path: Path, raw: bytes):
+        self.path = path
+        self._raw = raw
+        self._decoded: dict | None = None
+
+    @property
+    def payload(self) -> dict:
+        if self._decoded is None:
+            decoded = _loads(self._raw)
+            self._decoded = decoded if isinstance(decoded, dict) else {}
+            self._raw = b""
+        return self._decoded
+
+    def _section(self, name: str) -> dict:
+        section = self.payload.get(name)
+        return section if isinstance(section, dict) else {}
+
+    @property
+    def schema_version(self) -> int:
+        return int(self.payload.get("schema_version", LEGACY_SCHEMA_VERSION))
+
+    @property
+    def market_data(self) -> dict:
+        return self._section("market_data")
+
+    @property
+    def metrics(self) -> dict:
+        return self._section("metrics")
+
+    @property
+    def flags(self) -> dict:
+        return self._section("flags")
+
+    def get(self, field: str | tuple[str, ...], default=None):
+        node = self.payload
+        parts = _split_field(field) if isinstance(field, str) else field
+        for part in parts:
+            if not isinstance(node, dict):
+                return default
+            node = node.get(part, _MISSING)
+            if node is _MISSING:
+                return default
+        return default if node is None else node
+
+    def project(self, fields: Sequence[str]) -> dict:
+        """Nested dict holding only the requested dotted fields."""
+        projected: dict = {}
+        for field in fields:
+            parts = _split_field(field)
+            value = self.get(field)
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+        return projected
+
+
+class ProcessedPayloadReader:
+    """
+    Projected access to the processed history.
+
+    Consumers name the dotted fields they need (e.g. `metrics.mvrv_zscore`,
+    `market_data.current_price`) and get columns back. Column and projected
+    reads decode each file once (orjson, stdlib json if it is missing); only
+    `iter_payloads` defers decoding to first access.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_file_date: str | None = None,
+        lookback_files: int | None = None,
+        after_file_date: str | None = None,
+    ):
+        self.directory = Path(directory) if directory else PROCESSED_DATA_DIR
+        self.max_file_date = max_file_date
+        self.lookback_files = lookback_files
+        self.after_file_date = after_file_date
+
+    def files(self) -> list[Path]:
+        files = sorted(self.directory.glob("processed_data_*.json"), key=lambda file_path: file_path.name)
+        if self.max_file_date:
+            files = [
+                file_path
+                for file_path in files
+                if (file_date := _date_from_filename(file_path)) is not None and file_date <= self.max_file_date
+            ]
+        if self.after_file_date:
+            files = [
+                file_path
+                for file_path in files
+                if (file_date := _date_from_filename(file_path)) is not None and file_date > self.after_file_date
+            ]
+        if self.lookback_files is not None:
+            files = files[-self.lookback_files :]
+        return files
+
+    def iter_payloads(self) -> Iterator[ProcessedPayload]:
+        for file_path in self.files():
+            try:
+                raw = file_path.read_bytes()
+            except OSError as exc:
+                LOGGER.warning("Unable to read %s: %s", file_path, exc)
+                continue
+            yield ProcessedPayload(file_path, raw)
+
+    def _decoded(self) -> Iterator[ProcessedPayload]:
+        for payload in self.iter_payloads():
+            try:
+                payload.payload
+            except (json.JSONDecodeError, ValueError):
+                LOGGER.warning("Skipping undecodable processed file %s", payload.path)
+                continue
+            yield payload
+
+    def read_columns(self, fields: Sequence[str]) -> dict[str, list]:
+        """One list per field, aligned across files; missing values are None."""
+        paths = [(field, _split_field(field)) for field in fields]
+        columns: dict[str, list] = {field: [] for field in fields}
+        for payload in self._decoded():
+            for field, parts in paths:
+                columns[field].append(payload.get(parts))
+        return columns
+
+    def read_dated_columns(self, fields: Sequence[str]) -> tuple[list[str | None], dict[str, list]]:
+        """`read_columns` plus the file-name date of each row."""
+        paths = [(field, _split_field(field)) for field in fields]
+        dates: list[str | None] = []
+        columns: dict[str, list] = {field: [] for field in fields}
+        for payload in self._decoded():
+            dates.append(_date_from_filename(payload.path))
+            for field, parts in paths:
+                columns[field].append(payload.get(parts))
+        return dates, columns
+
+    def read_projected(self, fields: Sequence[str]) -> list[dict]:
+        """Row dicts shaped like the processed payload, restricted to `fields`."""
+        return [payload.project(fields) for payload in self._decoded()]
+
+    def schema_versions(self) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        for payload in self._decoded():
+            version = payload.schema_version
+            counts[version] = counts.get(version, 0) + 1
+        return counts
+
+
+if __name__ == "__main__":
+    import time
+
+    reader = ProcessedPayloadReader()
+    files = reader.files()
+    fields = ["timestamp", "market_data.current_price"]
+
+    def best_of(runner, repeats=5):
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            runner()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    baseline = best_of(lambda: [json.loads(path.read_text(encoding="utf-8")) for path in files])
+    projected = best_of(lambda: reader.read_columns(fields))
+
+    print(f"{len(files)} files | backend={FAST_JSON_BACKEND}")
+    print(f"json.loads: {baseline * 1000:.1f} ms | projected: {projected * 1000:.1f} ms")
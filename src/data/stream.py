@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from src.features.candles import LiveFeatureEngine
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - depends on the environment
+    websockets = None
+
+
+LOGGER = logging.getLogger(__name__)
+
+BINANCE_TRADE_STREAM = "wss://stream.binance.com:9443/ws/btcusdt@trade"
+REPLAY_HOST = "127.0.0.1"
+REPLAY_PORT = 8765
+
+
+def _require_websockets():
+    if websockets is None:
+        raise RuntimeError("Streaming needs the optional 'websockets' package (pip install websockets).")
+    return websockets
+
+
+def parse_message(message: str | bytes | dict) -> tuple[float, float, float, float, float, float, bool] | None:
+    """
+    `(timestamp_s, open, high, low, close, volume, cumulative)` from one feed message.
+
+    Accepts Binance trade (`e=trade`) and kline (`e=kline`) events and the
+    replay format (`{"ts", "price", "qty"}` or `{"ts", "open", ..., "volume"}`).
+    Binance resends the open kline with its running totals, so kline updates
+    are `cumulative`: each one revises the bar starting at `timestamp_s`.
+    """
+    payload = json.loads(message) if isinstance(message, (str, bytes)) else message
+    event = payload.get("e")
+    if event == "trade":
+        price = float(payload["p"])
+        return payload["T"] / 1000.0, price, price, price, price, float(payload["q"]), False
+    if event == "kline":
+        kline = payload["k"]
+        return (
+            kline["t"] / 1000.0,
+            float(kline["o"]),
+            float(kline["h"]),
+            float(kline["l"]),
+            float(kline["c"]),
+            float(kline["v"]),
+            True,
+        )
+    if "ts" in payload and "price" in payload:
+        price = float(payload["price"])
+        return float(payload["ts"]), price, price, price, price, float(payload.get("qty", 0.0)), False
+    if "ts" in payload and "close" in payload:
+        return (
+            float(payload["ts"]),
+            float(payload["open"]),
+            float(payload["high"]),
+            float(payload["low"]),
+            float(payload["close"]),
+            float(payload.get("volume", 0.0)),
+            False,
+        )
+    return None
+
+
+class LatencyTracker:
+    """Per-update processing time (ns) over the last `capacity` updates."""
+
+    def __init__(self, capacity: int = 10_000):
+        self._samples = np.zeros(int(capacity), dtype=np.int64)
+        self._head = 0
+        self.count = 0
+
+    def record(self, nanoseconds: int) -> None:
+        self._samples[self._head] = nanoseconds
+        self._head = (self._head + 1) % self._samples.size
+        self.count += 1
+
+    def summary(self) -> dict:
+        samples = self._samples[: min(self.count, self._samples.size)]
+        if samples.size == 0:
+            return {"count": 0, "p50_us": None, "p99_us": None, "max_us": None}
+        p50, p99 = np.percentile(samples, [50, 99]) / 1_000.0
+        return {
+            "count": self.count,
+            "p50_us": float(p50),
+            "p99_us": float(p99),
+            "max_us": float(samples.max() / 1_000.0),
+        }
+
+
+class StreamIngestor:
+    """Parses feed messages into a LiveFeatureEngine and times every update."""
+
+    def __init__(self, engine: LiveFeatureEngine | None = None, latency_capacity: int = 10_000):
+        self.engine = engine or LiveFeatureEngine()
+        self.latency = LatencyTracker(latency_capacity)
+        self.skipped = 0
+
+    def handle(self, message: str | bytes | dict) -> list[tuple[str, dict]]:
+        started = time.perf_counter_ns()
+        bar = parse_message(message)
+        if bar is None:
+            self.skipped += 1
+            return []
+        closed = self.engine.on_bar(*bar)
+        self.latency.record(time.perf_counter_ns() - started)
+        for timeframe, values in closed:
+            LOGGER.debug("%s bar closed: %s", timeframe, values)
+        return closed
+
+    def stats(self) -> dict:
+        return {
+            **self.latency.summary(),
+            "skipped": self.skipped,
+            "ring_bytes": self.engine.nbytes,
+            "bars": {name: len(ring) for name, ring in self.engine.rings.items()},
+            "latest": self.engine.latest,
+        }
+
+
+async def consume(url: str, ingestor: StreamIngestor, max_messages: int | None = None) -> StreamIngestor:
+    """Feeds every message of the websocket at `url` into `ingestor`."""
+    client = _require_websockets()
+    received = 0
+    async with client.connect(url) as connection:
+        async for message in connection:
+            ingestor.handle(message)
+            received += 1
+            if max_messages is not None and received >= max_messages:
+                break
+    return ingestor
+
+
+def load_replay_messages(path: Path) -> list[str]:
+    """Replay feed from a JSONL file (one message per line) or a CSV with a `ts` column."""
+    path = Path(path)
+    if path.suffix == ".csv":
+        with path.open("r", newline="", encoding="utf-8") as file:
+            return [json.dumps(row) for row in csv.DictReader(file)]
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+async def serve_replay(
+    messages: Iterable[str],
+    host: str = REPLAY_HOST,
+    port: int = REPLAY_PORT,
+    delay: float = 0.0,
+    ready: asyncio.Future | None = None,
+) -> None:
+    """
+    Local stand-in for the exchange feed: every client gets the full message
+    list, optionally paced by `delay` seconds, and is then disconnected.
+    """
+    server_module = _require_websockets()
+    messages = list(messages)
+
+    async def handler(connection, *_):
+        for message in messages:
+            await connection.send(message)
+            if delay:
+                await asyncio.sleep(delay)
+
+    async with server_module.serve(handler, host, port) as server:
+        if ready is not None:
+            ready.set_result(server.sockets[0].getsockname()[1])
+        LOGGER.info("Replaying %s messages on ws://%s:%s", len(messages), host, port)
+        await asyncio.Future()
+
+
+async def replay(
+    messages: Iterable[str],
+    ingestor: StreamIngestor,
+    delay: float = 0.0,
+    max_messages: int | None = None,
+) -> StreamIngestor:
+    """Runs a replay server on a free local port and consumes it to the end (or `max_messages`)."""
+    messages = list(messages)
+    limit = len(messages) if max_messages is None else min(max_messages, len(messages))
+    ready = asyncio.get_running_loop().create_future()
+    server = asyncio.create_task(serve_replay(messages, port=0, delay=delay, ready=ready))
+    try:
+        port = await ready
+        await consume(f"ws://{REPLAY_HOST}:{port}", ingestor, max_messages=limit)
+    finally:
+        server.cancel()
+        try:
+            await server
+        except asyncio.CancelledError:
+            pass
+    return ingestor
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
+from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
+from src.execution.portfolio_manager import PortfolioManager
+from src.utils.kernels import jit, kernel
+
+
+# Array versions of the portfolio managers' `calculate_order` and of the
+# backtest simulator loop, written to match the reference classes operation
+# for operation. An order is a signed notional: > 0 buys, < 0 sells, 0 holds.
+
+BASELINE_MANAGER = 0
+CONFIDENCE_MANAGER = 1
+ADVANCED_MANAGER = 2
+
+# `days_since` value when nothing has traded yet (the cooldown never applies).
+NO_TRADE_DAYS = 1 << 40
+
+
+def manager_kernel_spec(manager) -> tuple[int, np.ndarray] | None:
+    """
+    (manager kind, parameter array) for the kernel that reproduces
+    `manager.calculate_order`, or None when there is none. Subclasses may
+    override any rule, so only the exact classes qualify.
+    """
+    if type(manager) is PortfolioManager:
+        return BASELINE_MANAGER, np.array([manager.min_trade_usd, manager.cooldown_days], dtype=float)
+    if type(manager) is ConfidencePortfolioManager:
+        params = [manager.min_trade_usd, manager.cooldown_days, manager.max_leverage, manager.confidence_floor]
+        return CONFIDENCE_MANAGER, np.array(params, dtype=float)
+    if type(manager) is AdvancedPortfolioManager:
+        params = [
+            manager.min_trade_usd,
+            manager.cooldown_days,
+            manager.base_allocation,
+            manager.edge_gain,
+            manager.max_leverage,
+        ]
+        return ADVANCED_MANAGER, np.array(params, dtype=float)
+    return None
+
+
+@jit
+def _clip(value, low, high):
+    return max(low, min(high, value))
+
+
+@jit
+def _round_half_even(value):
+    # Python's round(): ties go to the even integer.
+    floor = math.floor(value)
+    fraction = value - floor
+    if fraction > 0.5 or (fraction == 0.5 and floor % 2 != 0):
+        floor += 1
+    return floor
+
+
+@jit
+def _baseline_target(lt, mt, current):
+    if lt > 75 and mt > 50:
+        return min(1.0 + ((lt - 75) / 25), 2.0)
+    if lt > 40 and mt > 0:
+        return 1.0
+    if lt < -60:
+        return 0.0
+    if lt < -40:
+        return 0.10
+    if lt > 20 and mt < -20:
+        return min(current + (abs(mt) / 200), 1.0)
+    if lt < 20 and mt > 20:
+        return max(current - (mt / 200), 0.10)
+    if mt > 50:
+        return min(current + 0.20, 0.30)
+    return max(current, 0.30)
+
+
+@jit
+def _sized_order(diff_usd, btc_value, threshold):
+    if diff_usd > 0:
+        return diff_usd
+    amount = min(abs(diff_usd), btc_value)
+    if amount < threshold:
+        return 0.0
+    return -amount
+
+
+@jit
+def _baseline_order(params, lt, mt, net_equity, btc_value, days_since):
+    current = btc_value / net_equity
+    diff_usd = (net_equity * _baseline_target(lt, mt, current)) - btc_value
+    threshold = max(params[0], net_equity * 0.02)
+    if abs(diff_usd) < threshold:
+        return 0.0
+    urgent = (lt > 75 and mt > 50) or (lt > 40 and mt > 0)
+    if not urgent and days_since < params[1]:
+        return 0.0
+    return _sized_order(diff_usd, btc_value, threshold)
+
+
+@jit
+def _confidence_order(params, lt, mt, net_equity, btc_value, days_since):
+    current = btc_value / net_equity
+    raw_target = _baseline_target(lt, mt, current)
+
+    agreement = 1.0 - _clip(abs(lt - mt) / 200.0, 0.0, 1.0)
+    same_direction = 1.0 if (lt * mt) >= 0 else 0.60
+    neutral_penalty = 0.20 if abs(lt) < 15 and abs(mt) < 15 else 0.0
+    confidence = (
+        (0.50 * _clip(abs(lt) / 100.0, 0.0, 1.0)) + (0.30 * _clip(abs(mt) / 100.0, 0.0, 1.0)) + (0.20 * agreement)
+    ) * same_direction
+    confidence = _clip(confidence - neutral_penalty, params[3], 1.0)
+
+    lt_norm = _clip(lt / 100.0, -1.0, 1.0)
+    mt_norm = _clip(mt / 100.0, -1.0, 1.0)
+    risk_on = (0.65 * max(0.0, lt_norm)) + (0.35 * max(0.0, mt_norm))
+    risk_off = (0.70 * max(0.0, -lt_norm)) + (0.30 * max(0.0, -mt_norm))
+    risk_budget = _clip(0.55 + (0.55 * risk_on) - (0.60 * risk_off), 0.15, 1.20)
+
+    dynamic_max_leverage = 1.0 + ((params[2] - 1.0) * confidence * risk_budget)
+    budgeted_target = raw_target * risk_budget
+    if lt < -60:
+        target = 0.0
+    elif lt > 75 and mt > 50:
+        target = _clip(max(budgeted_target, current), 0.0, dynamic_max_leverage)
+    else:
+        delta = budgeted_target - current
+        if delta >= 0:
+            aggressiveness = 0.45 + (0.80 * confidence)
+        else:
+            aggressiveness = 0.70 + (0.70 * confidence)
+            if lt < 0:
+                aggressiveness += 0.10
+        aggressiveness = _clip(aggressiveness, 0.25, 1.25)
+        target = _clip(current + (delta * aggressiveness), 0.0, dynamic_max_leverage)
+
+    diff_usd = (net_equity * target) - btc_value
+    threshold = max(params[0], net_equity * (0.022 - (0.010 * confidence)))
+    if abs(diff_usd) < threshold:
+        return 0.0
+
+    urgent = (lt > 75 and mt > 50) or (lt > 40 and mt > 0) or (lt < -60)
+    if not urgent:
+        cooldown_scale = (1.20 - confidence) * max(0.50, risk_budget)
+        if days_since < max(0, _round_half_even(params[1] * cooldown_scale)):
+            return 0.0
+    return _sized_order(diff_usd, btc_value, threshold)
+
+
+@jit
+def _advanced_order(params, lt_score, mt_score, net_equity, btc_value, days_since):
+    current = btc_value / net_equity
+    lt = _clip(lt_score / 100.0, -1.0, 1.0)
+    mt = _clip(mt_score / 100.0, -1.0, 1.0)
+
+    edge = (0.65 * lt) + (0.35 * mt)
+    confidence = _clip(1.0 - (0.5 * abs(lt - mt)), 0.20, 1.0)
+    target = params[2] + (edge * confidence * params[3])
+    if lt > 0.55 and mt > 0.35:
+        target += 0.20
+    if lt < -0.55:
+        target *= 0.35
+    if lt < -0.80:
+        target = 0.0
+    if mt < -0.70:
+        target = min(target, 0.20)
+    if target < current and lt > 0.25 and mt > 0.25:
+        target = max(target, current - 0.10)
+    target = _clip(target, 0.0, params[4])
+
+    diff_usd = (net_equity * target) - btc_value
+    threshold = max(params[0], net_equity * 0.01)
+    if abs(diff_usd) < threshold:
+        return 0.0
+
+    urgent = (abs(edge) > 0.70) or (lt_score < -80) or (lt_score > 80 and mt_score > 55)
+    if not urgent and days_since < params[1]:
+        return 0.0
+    return _sized_order(diff_usd, btc_value, threshold)
+
+
+@jit
+def manager_order(kind, params, lt, mt, cash, btc_value, debt, days_since):
+    """Signed order notional for one decision of the manager `kind`."""
+    net_equity = (cash + btc_value) - debt
+    if net_equity <= 0:
+        return 0.0
+    if kind == CONFIDENCE_MANAGER:
+        return _confidence_order(params, lt, mt, net_equity, btc_value, days_since)
+    if kind == ADVANCED_MANAGER:
+        return _advanced_order(params, lt, mt, net_equity, btc_value, days_since)
+    return _baseline_order(params, lt, mt, net_equity, btc_value, days_since)
+
+
+@kernel()
+def simulate_portfolio(
+    opens,
+    closes,
+    day_numbers,
+    long_term,
+    medium_term,
+    kind,
+    params,
+    fee_rate,
+    debt_growth,
+    initial_capital,
+    equities,
+    leverages,
+    daily_returns,
+):
+    """
+    The backtest state machine: debt accrues daily, the previous close's order
+    fills at the open, then the manager decides on the close for the next day.
+    Fills the per-day output arrays and returns (trades, turnover).
+    """
+    cash = initial_capital
+    btc = 0.0
+    debt = 0.0
+    last_trade_day = 0
+    has_traded = False
+    pending = 0.0
+    trades = 0
+    turnover = 0.0
+    prev_equity = initial_capital
+    days = closes.shape[0]
+
+    for idx in range(days):
+        close_price = closes[idx]
+        open_price = opens[idx]
+
+        if debt > 0:
+            debt *= debt_growth
+
+        if pending != 0.0:
+            traded_notional = 0.0
+            if pending > 0:
+                total_cost = pending + (pending * fee_rate)
+                if total_cost > cash:
+                    debt += total_cost - cash
+                    cash = 0.0
+                else:
+                    cash -= total_cost
+                btc += pending / open_price
+                traded_notional = pending
+            elif btc > 0:
+                btc_to_sell = min(btc, -pending / open_price)
+                gross = btc_to_sell * open_price
+                btc -= btc_to_sell
+                cash += gross - (gross * fee_rate)
+                traded_notional = gross
+                if debt > 0 and cash > 0:
+                    repayment = min(debt, cash)
+                    debt -= repayment
+                    cash -= repayment
+            if traded_notional > 0:
+                trades += 1
+                turnover += traded_notional
+                last_trade_day = day_numbers[idx]
+                has_traded = True
+
+        pending = 0.0
+        if idx < days - 1:
+            days_since = day_numbers[idx + 1] - last_trade_day if has_traded else NO_TRADE_DAYS
+            pending = manager_order(
+                kind,
+                params,
+                long_term[idx],
+                medium_term[idx],
+                cash,
+                btc * close_price,
+                debt,
+                days_since,
+            )
+
+        equity = max(cash + (btc * close_price) - debt, 1e-9)
+        daily_returns[idx] = (equity / prev_equity) - 1.0 if prev_equity > 0 else 0.0
+        prev_equity = equity
+        leverages[idx] = ((btc * close_price) + debt) / equity if equity > 0 else 0.0
+        equities[idx] = equity
+
+    return trades, turnover
@@ -10,6 +10,8 @@ from src.utils.project_paths import SIGNALS_DIR
 LOGGER = logging.getLogger(__name__)
 
 DEFAULT_MODEL = "production_legacy_cooldown1"
+DEFAULT_CALIBRATOR = "historical"
+CALIBRATORS = ("historical", "sketch")
 GATE_FILE_PATH = SIGNALS_DIR / "production_gate.json"
 
 SUPPORTED_MODELS = {
@@ -79,17 +81,27 @@ def resolve_live_model(gate_file: Path | None = None) -> dict:
 def build_live_components(
     min_trade_usd: float = 20.0,
     gate_file: Path | None = None,
+    calibrator: str = DEFAULT_CALIBRATOR,
 ) -> dict:
     from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
     from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
     from src.execution.portfolio_manager import PortfolioManager
     from src.strategy.score import QuantScorer
 
+    if calibrator not in CALIBRATORS:
+        raise ValueError(f"Unsupported calibrator: {calibrator}")
+
     resolved = resolve_live_model(gate_file)
     model = resolved["model"]
     config = resolved["config"]
 
-    scorer = QuantScorer(mode=config["scorer_mode"])
+    feature_calibrator = None
+    if calibrator == "sketch" and config["scorer_mode"] != "legacy":
+        from src.strategy.sketch_calibrator import SketchFeatureCalibrator
+
+        # Persisted sketches: only the processed days added since the last run are read.
+        feature_calibrator = SketchFeatureCalibrator()
+    scorer = QuantScorer(mode=config["scorer_mode"], calibrator=feature_calibrator)
 
     manager_name = config["manager"]
     cooldown_days = config["cooldown_days"]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import csv
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.utils.project_paths import REPORTS_DIR, normalize_date
+
+
+LOGGER = logging.getLogger(__name__)
+
+ROLLUP_DIRNAME = "rollups"
+ROLLUP_FIELDS = ["date", "equity", "roi", "alpha", "cash", "btc_value", "btc_amount", "debt"]
+
+_REPORT_NAME = re.compile(r"report_(\d{4}-\d{2}-\d{2})\.md")
+_ROLLUP_NAME = re.compile(r"reports_(\d{4}-\d{2})\.csv")
+
+_PATTERNS = {
+    "equity": re.compile(r"\*\*Total Equity\*\*.*?\$([0-9,]+\.\d{2})"),
+    "roi": re.compile(r"\*\*ROI \(Total\)\*\*.*?([+-]?\d+\.\d{2})%"),
+    "alpha": re.compile(r"\*\*Alpha.*?\*\*.*?([+-]?\d+\.\d{2})%"),
+    "cash": re.compile(r"💵 \*\*Cash\*\*.*?\$([0-9,]+\.\d{2})"),
+    "btc_value": re.compile(r"🟠 \*\*Bitcoin\*\*.*?\$([0-9,]+\.\d{2})"),
+    "btc_amount": re.compile(r"`([0-9.]+) BTC`"),
+    "debt": re.compile(r"🔴 \*\*Debt\*\*.*?\$([0-9,]+\.\d{2})"),
+}
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Keep the newest `keep_days` daily reports as loose markdown files and fold
+    anything older into one structured table per month.
+    """
+
+    keep_days: int = 90
+
+    def cutoff(self, today: date | None = None) -> date:
+        today = normalize_date(today)
+        return today - timedelta(days=max(int(self.keep_days), 1) - 1)
+
+
+def report_date(report_file: Path) -> str | None:
+    match = _REPORT_NAME.fullmatch(report_file.name)
+    return match.group(1) if match else None
+
+
+def parse_report_markdown(content: str, date_str: str) -> dict:
+    row = {"date": date_str}
+    for field, pattern in _PATTERNS.items():
+        match = pattern.search(content)
+        row[field] = float(match.group(1).replace(",", "")) if match else 0
+    return row
+
+
+def parse_report_file(report_file: Path) -> dict | None:
+    date_str = report_date(report_file)
+    if date_str is None:
+        return None
+    content = report_file.read_text(encoding="utf-8")
+    return parse_report_markdown(content, date_str)
+
+
+def rollup_path(month: str, reports_dir: Path = REPORTS_DIR) -> Path:
+    return reports_dir / ROLLUP_DIRNAME / f"reports_{month}.csv"
+
+
+def _read_rollup(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+
+    with path.open("r", newline="", encoding="utf-8") as file:
+        rows = {}
+        for row in csv.DictReader(file):
+            rows[row["date"]] = {
+                "date": row["date"],
+                **{field: float(row[field]) for field in ROLLUP_FIELDS if field != "date"},
+            }
+        return rows
+
+
+def _write_rollup(path: Path, rows: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=ROLLUP_FIELDS)
+        writer.writeheader()
+        for key in sorted(rows):
+            writer.writerow({field: rows[key][field] for field in ROLLUP_FIELDS})
+
+
+def compact_reports(
+    policy: RetentionPolicy | None = None,
+    today: date | str | None = None,
+    reports_dir: Path = REPORTS_DIR,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Rolls loose reports older than the retention window into monthly tables
+    and deletes the markdown files once their rows are written.
+    """
+    policy = policy or RetentionPolicy()
+    cutoff = policy.cutoff(today).isoformat()
+
+    by_month: dict[str, list[tuple[Path, dict]]] = {}
+    for report_file in sorted(reports_dir.glob("report_*.md")):
+        date_str = report_date(report_file)
+        if date_str is None or date_str >= cutoff:
+            continue
+        try:
+            row = parse_report_file(report_file)
+        except OSError as exc:
+            LOGGER.warning("Unable to read report %s: %s", report_file, exc)
+            continue
+        by_month.setdefault(date_str[:7], []).append((report_file, row))
+
+    compacted = 0
+    for month, entries in sorted(by_month.items()):
+        path = rollup_path(month, reports_dir)
+        if dry_run:
+            compacted += len(entries)
+            continue
+
+        rows = _read_rollup(path)
+        rows.update({row["date"]: row for _, row in entries})
+        _write_rollup(path, rows)
+
+        for report_file, _ in entries:
+            report_file.unlink()
+        compacted += len(entries)
+        LOGGER.info("Rolled %s reports into %s", len(entries), path)
+
+    return {
+        "cutoff": cutoff,
+        "compacted_reports": compacted,
+        "months": sorted(by_month),
+        "dry_run": dry_run,
+    }
+
+
+def load_report_history(reports_dir: Path = REPORTS_DIR) -> list[dict]:
+    """
+    Full report history: monthly rollups plus any loose markdown reports.
+    Loose files win when both contain the same date.
+    """
+    rows: dict[str, dict] = {}
+    for path in sorted((reports_dir / ROLLUP_DIRNAME).glob("reports_*.csv")):
+        if _ROLLUP_NAME.fullmatch(path.name):
+            rows.update(_read_rollup(path))
+
+    for report_file in sorted(reports_dir.glob("report_*.md")):
+        try:
+            row = parse_report_file(report_file)
+        except Exception as exc:
+            LOGGER.warning("Error parsing %s: %s", report_file, exc)
+            continue
+        if row is not None:
+            rows[row["date"]] = row
+
+    return [rows[key] for key in sorted(rows)]
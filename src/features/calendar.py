@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.features.cycle import BitcoinCycle
+from src.features.seasonality import BitcoinSeasonality
+
+
+CALENDAR_START = date(2010, 1, 1)
+CALENDAR_END = date(2040, 12, 31)
+
+
+def _calendar_frame(index: pd.DatetimeIndex) -> pd.DataFrame:
+    cycle = BitcoinCycle()
+    phases = cycle.get_phases(index.values)
+
+    statuses, positive = BitcoinSeasonality.month_table()
+    months = index.month.to_numpy()
+
+    table = pd.DataFrame(
+        {
+            "phase_code": phases["phase_code"],
+            "phase": cycle.phase_names(phases["phase_code"]),
+            "days_since_halving": phases["days_since_halving"],
+            "days_until_halving": phases["days_until_halving"],
+            "month": months,
+            "seasonality_status": np.array(statuses, dtype=object)[months],
+            "is_positive_seasonality": np.array(positive)[months],
+        },
+        index=index,
+    )
+    table.index.name = "date"
+    return table
+
+
+@lru_cache(maxsize=1)
+def calendar_table() -> pd.DataFrame:
+    """
+    One row per day from CALENDAR_START to CALENDAR_END with the halving-cycle
+    phase and the monthly seasonality status. Built once per process.
+    """
+    return _calendar_frame(pd.date_range(CALENDAR_START, CALENDAR_END, freq="D"))
+
+
+def calendar_rows(dates) -> pd.DataFrame:
+    """
+    Calendar rows for `dates` by day offset, without parsing each date.
+    Dates outside the cached table are computed directly instead.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    offsets = (days - np.datetime64(CALENDAR_START, "D")).astype(np.int64)
+    table = calendar_table()
+    if offsets.size and (offsets.min() < 0 or offsets.max() >= len(table)):
+        return _calendar_frame(pd.DatetimeIndex(days))
+    return table.iloc[offsets]
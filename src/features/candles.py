@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.features.rolling import RollingMax, RollingWindow
+
+
+LOGGER = logging.getLogger(__name__)
+
+CANDLE_FIELDS = ("start", "open", "high", "low", "close", "volume")
+
+# Bar length in seconds and ring capacity per timeframe.
+TIMEFRAMES = {
+    "1m": 60,
+    "1h": 3_600,
+    "1d": 86_400,
+}
+DEFAULT_CAPACITY = {
+    "1m": 1_440,
+    "1h": 24 * 90,
+    "1d": 1_460,
+}
+
+
+@dataclass(frozen=True)
+class FeatureWindows:
+    """Window lengths in bars for one timeframe."""
+
+    ema_span: int
+    vol_window: int
+    peak_window: int
+    momentum_lag: int
+    bars_per_year: float
+
+    @property
+    def min_vol_periods(self) -> int:
+        return max(2, self.vol_window // 3)
+
+    @property
+    def min_peak_periods(self) -> int:
+        return max(1, self.peak_window // 6)
+
+
+# The daily windows are the production historical-context definitions.
+DEFAULT_WINDOWS = {
+    "1m": FeatureWindows(ema_span=60, vol_window=60, peak_window=240, momentum_lag=60, bars_per_year=525_600.0),
+    "1h": FeatureWindows(ema_span=168, vol_window=24, peak_window=168, momentum_lag=24, bars_per_year=8_760.0),
+    "1d": FeatureWindows(ema_span=365, vol_window=30, peak_window=180, momentum_lag=63, bars_per_year=365.0),
+}
+
+
+class CandleRing:
+    """
+    Fixed-capacity OHLCV ring buffer backed by one float array.
+
+    Memory is `capacity * 6` floats whatever the stream length; the oldest
+    bar is overwritten once the ring is full.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = int(capacity)
+        self._data = np.full((self.capacity, len(CANDLE_FIELDS)), np.nan)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def append(self, candle) -> None:
+        self._data[self._head] = candle
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def last(self, ago: int = 0) -> np.ndarray | None:
+        """Row `ago` bars before the newest one (0 = newest)."""
+        if ago >= self._size:
+            return None
+        return self._data[(self._head - 1 - ago) % self.capacity]
+
+    def array(self) -> np.ndarray:
+        """Stored bars, oldest to newest (a copy)."""
+        if self._size < self.capacity:
+            return self._data[: self._size].copy()
+        return np.concatenate((self._data[self._head :], self._data[: self._head]))
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(self.array(), columns=list(CANDLE_FIELDS))
+        frame.index = pd.to_datetime(frame.pop("start"), unit="s")
+        return frame
+
+
+class CandleBuilder:
+    """Folds trades or finer bars into bars of `seconds` length."""
+
+    def __init__(self, seconds: int):
+        self.seconds = int(seconds)
+        self.current: list[float] | None = None
+        # (start, volume counted) of the last cumulative source bar.
+        self._revised: tuple[float, float] | None = None
+
+    def _bucket(self, timestamp: float) -> float:
+        return float(math.floor(timestamp / self.seconds) * self.seconds)
+
+    def add(
+        self,
+        timestamp: float,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        cumulative: bool = False,
+    ) -> list[float] | None:
+        """
+        Adds one trade/bar; returns the bar it closed, if any. A `cumulative`
+        update is a revision of the source bar starting at `timestamp` (an
+        open exchange kline): its volume replaces the volume that bar
+        contributed so far instead of adding to it.
+        """
+        start = self._bucket(timestamp)
+        current = self.current
+        if current is not None and start < current[0]:
+            LOGGER.debug("Dropping out-of-order update at %s", timestamp)
+            return None
+        counted = 0.0
+        if cumulative and self._revised is not None and self._revised[0] == timestamp:
+            counted = self._revised[1]
+        self._revised = (timestamp, volume) if cumulative else None
+
+        if current is not None and start == current[0]:
+            current[2] = max(current[2], high)
+            current[3] = min(current[3], low)
+            current[4] = close
+            current[5] += volume - counted
+            return None
+
+        self.current = [start, open_, high, low, close, volume]
+        return current
+
+
+class IncrementalFeatures:
+    """
+    Rolling features over closed bars, O(1) per bar: EMA, realized vol
+    (annualized), drawdown from the rolling peak and close-to-close momentum.
+    """
+
+    def __init__(self, windows: FeatureWindows):
+        self.windows = windows
+        self._alpha = 2.0 / (windows.ema_span + 1.0)
+        self.ema: float | None = None
+        self._closes = RollingWindow(windows.momentum_lag + 1)
+        self._returns = RollingWindow(windows.vol_window)
+        self._peak = RollingMax(windows.peak_window)
+
+    def update(self, close: float) -> dict:
+        close = float(close)
+        previous = self._closes.ago(0)
+        self.ema = close if self.ema is None else self.ema + (self._alpha * (close - self.ema))
+        self._closes.push(close)
+        if previous is not None:
+            self._returns.push((close / previous) - 1.0)
+        self._peak.push(close)
+        return self.values()
+
+    def values(self) -> dict:
+        windows = self.windows
+        close = self._closes.ago(0)
+        vol = self._returns.std(min_periods=windows.min_vol_periods)
+        lagged = self._closes.ago(windows.momentum_lag)
+        peak = self._peak.max(min_periods=windows.min_peak_periods)
+        return {
+            "close": close,
+            "ema": self.ema,
+            "realized_vol": None if vol is None else vol * math.sqrt(windows.bars_per_year),
+            "drawdown": None if peak is None or close is None else (close / peak) - 1.0,
+            "momentum": None if lagged is None else (close / lagged) - 1.0,
+        }
+
+
+class LiveFeatureEngine:
+    """
+    Multi-timeframe candle rings plus incremental features.
+
+    Every trade (or 1m bar) updates the open bar of each timeframe; when a
+    bar closes it is appended to its ring and the features for that
+    timeframe are advanced by one step.
+    """
+
+    def __init__(
+        self,
+        timeframes: tuple[str, ...] = tuple(TIMEFRAMES),
+        capacity: dict[str, int] | None = None,
+        windows: dict[str, FeatureWindows] | None = None,
+    ):
+        capacity = {**DEFAULT_CAPACITY, **(capacity or {})}
+        windows = {**DEFAULT_WINDOWS, **(windows or {})}
+        self.timeframes = tuple(timeframes)
+        self.builders = {name: CandleBuilder(TIMEFRAMES[name]) for name in self.timeframes}
+        self.rings = {name: CandleRing(capacity[name]) for name in self.timeframes}
+        self.features = {name: IncrementalFeatures(windows[name]) for name in self.timeframes}
+        self.latest: dict[str, dict] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ring.nbytes for ring in self.rings.values())
+
+    def on_bar(
+        self,
+        timestamp: float,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+        cumulative: bool = False,
+    ) -> list[tuple[str, dict]]:
+        """
+        Feeds one trade or bar; returns `(timeframe, features)` for every bar
+        it closed. See `CandleBuilder.add` for `cumulative` kline updates.
+        """
+        closed = []
+        for name in self.timeframes:
+            candle = self.builders[name].add(timestamp, open_, high, low, close, volume, cumulative)
+            if candle is not None:
+                closed.append((name, self._close(name, candle)))
+        return closed
+
+    def on_trade(self, timestamp: float, price: float, quantity: float = 0.0) -> list[tuple[str, dict]]:
+        return self.on_bar(timestamp, price, price, price, price, quantity)
+
+    def flush(self) -> list[tuple[str, dict]]:
+        """Closes every open bar (end of a replay)."""
+        closed = []
+        for name in self.timeframes:
+            candle = self.builders[name].current
+            if candle is None:
+                continue
+            self.builders[name].current = None
+            closed.append((name, self._close(name, candle)))
+        return closed
+
+    def _close(self, name: str, candle: list[float]) -> dict:
+        self.rings[name].append(candle)
+        values = self.features[name].update(candle[4])
+        values["start"] = candle[0]
+        self.latest[name] = values
+        return values
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.features.rolling_state import CONTEXT_VERSION, DEFAULT_CONTEXT
+from src.utils.project_paths import STATE_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+CONTEXT_CACHE_DIR = STATE_DIR / "context_cache"
+INDEX_VERSION = 1
+DEFAULT_MAX_ENTRIES = 4096
+
+# Closes remembered from the latest download; a later download that
+# disagrees on any of them revises the tail.
+TAIL_DAYS = 7
+REVISION_TOLERANCE = 1e-9
+
+
+def params_hash(window_days: int) -> str:
+    payload = json.dumps({"window_days": int(window_days), "version": CONTEXT_VERSION}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def series_fingerprint(prices: pd.Series, end_date_str: str, window_days: int) -> str:
+    """
+    Digest of the closes the context for `end_date_str` depends on: those
+    strictly before the date, within `window_days + 365` days.
+    """
+    end = pd.Timestamp(end_date_str)
+    index = pd.DatetimeIndex(prices.index)
+    mask = (index < end) & (index >= end - pd.Timedelta(days=window_days + 365))
+    digest = hashlib.sha1()
+    digest.update(index[mask].values.astype("datetime64[D]").astype(np.int64).tobytes())
+    digest.update(np.round(prices.to_numpy(dtype=float)[mask], 8).tobytes())
+    return digest.hexdigest()[:20]
+
+
+class ContextCache:
+    """
+    Bounded on-disk memo of historical contexts.
+
+    Each context is stored under a content address built from the date, the
+    window parameters, the feature version and a fingerprint of the input
+    closes. A small index maps (date, parameters) to the latest address and
+    tracks recency for LRU eviction.
+    """
+
+    def __init__(self, directory: Path = CONTEXT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.max_entries = max(int(max_entries), 1)
+        self.hits = 0
+        self.misses = 0
+        self._tick = 0
+        self._entries: dict[str, dict] = {}
+        self._tail: dict[str, float] = {}
+        self._load_index()
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / "index.json"
+
+    def _object_path(self, key: str) -> Path:
+        return self.directory / "objects" / f"{key}.json"
+
+    def _load_index(self) -> None:
+        if not self.index_path.exists():
+            return
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable context cache index %s: %s", self.index_path, exc)
+            return
+        if payload.get("version") != INDEX_VERSION:
+            return
+        self._tick = int(payload.get("tick", 0))
+        self._entries = dict(payload.get("entries", {}))
+        self._tail = {date_str: float(close) for date_str, close in payload.get("tail", {}).items()}
+
+    def save(self) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        payload = {"version": INDEX_VERSION, "tick": self._tick, "tail": self._tail, "entries": self._entries}
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        tmp_path.replace(self.index_path)
+        return self.index_path
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _slot(date_str: str, window_days: int) -> str:
+        return f"{date_str}|{params_hash(window_days)}"
+
+    @staticmethod
+    def address(date_str: str, window_days: int, fingerprint: str) -> str:
+        payload = f"{date_str}|{params_hash(window_days)}|{CONTEXT_VERSION}|{fingerprint}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, date_str: str, window_days: int, fingerprint: str) -> dict | None:
+        """
+        Cached context for `date_str`, only if it was built from the closes
+        with this `series_fingerprint`.
+        """
+        entry = self._entries.get(self._slot(date_str, window_days))
+        if entry is None or entry["fingerprint"] != fingerprint:
+            self.misses += 1
+            return None
+        try:
+            stored = json.loads(self._object_path(entry["key"]).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries.pop(self._slot(date_str, window_days), None)
+            self.misses += 1
+            return None
+
+        self._tick += 1
+        entry["used"] = self._tick
+        self.hits += 1
+        return {name: float(stored["context"][name]) for name in DEFAULT_CONTEXT}
+
+    def put(self, date_str: str, window_days: int, fingerprint: str, context: dict) -> str:
+        key = self.address(date_str, window_days, fingerprint)
+        path = self._object_path(key)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stored = {
+                "date": date_str,
+                "window_days": int(window_days),
+                "version": CONTEXT_VERSION,
+                "fingerprint": fingerprint,
+                "context": {name: float(context[name]) for name in DEFAULT_CONTEXT},
+            }
+            path.write_text(json.dumps(stored), encoding="utf-8")
+
+        slot = self._slot(date_str, window_days)
+        previous = self._entries.get(slot)
+        if previous is not None and previous["key"] != key:
+            self._object_path(previous["key"]).unlink(missing_ok=True)
+        self._tick += 1
+        self._entries[slot] = {"key": key, "date": date_str, "fingerprint": fingerprint, "used": self._tick}
+        self._evict()
+        return key
+
+    def _evict(self) -> None:
+        overflow = len(self._entries) - self.max_entries
+        if overflow <= 0:
+            return
+        for slot, entry in sorted(self._entries.items(), key=lambda item: item[1]["used"])[:overflow]:
+            self._object_path(entry["key"]).unlink(missing_ok=True)
+            del self._entries[slot]
+
+    def invalidate(self, since: str | None = None) -> int:
+        """Drops every entry dated on or after `since` (all entries when None)."""
+        dropped = [slot for slot, entry in self._entries.items() if since is None or entry["date"] >= since]
+        for slot in dropped:
+            self._object_path(self._entries.pop(slot)["key"]).unlink(missing_ok=True)
+        if dropped:
+            LOGGER.info("Invalidated %s cached contexts%s", len(dropped), f" from {since}" if since else "")
+        return len(dropped)
+
+    def observe(self, prices: pd.Series) -> str | None:
+        """
+        Compares freshly downloaded closes with the remembered tail. When an
+        overlapping close changed, every context that could have read it is
+        invalidated; returns the earliest revised date.
+        """
+        if prices is None or prices.empty:
+            return None
+        closes = {
+            pd.Timestamp(timestamp).strftime("%Y-%m-%d"): float(close)
+            for timestamp, close in prices.dropna().items()
+        }
+        revised = sorted(
+            date_str
+            for date_str, close in self._tail.items()
+            if date_str in closes and abs(closes[date_str] - close) > REVISION_TOLERANCE * max(1.0, abs(close))
+        )
+
+        merged = {**self._tail, **closes}
+        self._tail = {date_str: merged[date_str] for date_str in sorted(merged)[-TAIL_DAYS:]}
+        if not revised:
+            return None
+
+        LOGGER.warning("BTC closes revised from %s; invalidating cached contexts after it", revised[0])
+        next_day = (pd.Timestamp(revised[0]) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        self.invalidate(since=next_day)
+        return revised[0]
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
 class BitcoinCycle:
@@ -15,6 +16,16 @@ class BitcoinCycle:
         datetime(2028, 4, 1),  # Projected
     ]
 
+    # Phase codes returned by get_phases index into this tuple.
+    PHASES = (
+        "Post-Halving Expansion",
+        "Accumulation",
+        "Pre-Halving Rally",
+        "Bear Market / Distribution",
+    )
+    UNKNOWN_PHASE_CODE = len(PHASES)
+    NO_HALVING_DAYS = 9999
+
     def __init__(self):
         pass
 
@@ -78,6 +89,49 @@ class BitcoinCycle:
             "current_cycle_halving": past_h.strftime("%Y-%m-%d") if past_h else None
         }
 
+    def get_phases(self, dates) -> dict[str, np.ndarray]:
+        """
+        Vectorized get_phase over an array of dates (datetime64 or ISO strings).
+
+        Returns int arrays keyed like get_phase: `phase_code` (index into
+        PHASES), `days_since_halving` and `days_until_halving`, with 9999 where
+        there is no past or next halving.
+        """
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        halvings = np.array(sorted(self.HALVINGS), dtype="datetime64[D]").astype(np.int64)
+
+        next_idx = np.searchsorted(halvings, days, side="right")
+        has_past = next_idx > 0
+        has_next = next_idx < halvings.size
+        past_days = halvings[np.clip(next_idx - 1, 0, halvings.size - 1)]
+        next_days = halvings[np.clip(next_idx, 0, halvings.size - 1)]
+
+        days_since = np.where(has_past, days - past_days, self.NO_HALVING_DAYS)
+        days_until = np.where(has_next, next_days - days, self.NO_HALVING_DAYS)
+
+        phase_code = np.full(days.shape, 3, dtype=np.int8)
+        phase_code[has_next & (days_until > 270) & (days_until <= 540)] = 1
+        phase_code[has_next & (days_until <= 270)] = 2
+        phase_code[has_past & (days_since <= 540)] = 0
+
+        return {
+            "phase_code": phase_code,
+            "days_since_halving": days_since,
+            "days_until_halving": days_until,
+        }
+
+    def phase_names(self, phase_code: np.ndarray) -> np.ndarray:
+        return np.asarray(self.PHASES, dtype=object)[phase_code]
+
+    def phase_codes(self, names) -> np.ndarray:
+        """Inverse of phase_names; names outside PHASES get UNKNOWN_PHASE_CODE."""
+        names = np.asarray(names, dtype=object)
+        codes = np.full(names.shape, self.UNKNOWN_PHASE_CODE, dtype=np.int8)
+        for code, phase in enumerate(self.PHASES):
+            codes[names == phase] = code
+        return codes
+
+
 if __name__ == "__main__":
     cycle = BitcoinCycle()
     print(cycle.get_phase("2023-11-22")) 
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.features.seasonality import BitcoinSeasonality
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Flat inputs the flag rules read. Missing values are NaN.
+FLAG_INPUTS = (
+    "mvrv",
+    "rup",
+    "sopr",
+    "mayer_multiple",
+    "fear_and_greed",
+    "interest_rate",
+    "m2_yoy",
+    "inflation_yoy",
+    "inflation_trend",
+    "funding_rate",
+    "current_price",
+    "ema_365",
+    "daily_change_pct",
+    "corr_spx_90d",
+    "corr_gold_90d",
+    "month",
+)
+
+# Output order matches the processed payload.
+FLAG_NAMES = (
+    "is_accumulation",
+    "is_overheated",
+    "is_fear_extreme",
+    "is_greed_extreme",
+    "is_liquidity_good",
+    "is_inflation_high",
+    "is_inflation_falling",
+    "is_bull_trend",
+    "is_derivatives_risk",
+    "is_volatility_opportunity",
+    "is_positive_seasonality",
+    "is_high_corr_spx",
+    "is_high_corr_gold",
+)
+
+# FLAG_INPUTS each rule reads; keep in sync with `evaluate_flags`.
+FLAG_DEPENDENCIES = {
+    "is_accumulation": ("rup", "mvrv", "sopr"),
+    "is_overheated": ("rup", "mayer_multiple", "sopr"),
+    "is_fear_extreme": ("fear_and_greed",),
+    "is_greed_extreme": ("fear_and_greed",),
+    "is_liquidity_good": ("interest_rate", "m2_yoy"),
+    "is_inflation_high": ("inflation_yoy",),
+    "is_inflation_falling": ("inflation_yoy", "inflation_trend"),
+    "is_bull_trend": ("current_price", "ema_365"),
+    "is_derivatives_risk": ("funding_rate",),
+    "is_volatility_opportunity": ("current_price", "ema_365", "daily_change_pct"),
+    "is_positive_seasonality": ("month",),
+    "is_high_corr_spx": ("corr_spx_90d",),
+    "is_high_corr_gold": ("corr_gold_90d",),
+}
+
+# Flags that are None (not False) when their inputs are missing.
+NULLABLE_FLAGS = ("is_accumulation", "is_fear_extreme", "is_greed_extreme")
+
+_POSITIVE_SEASONALITY_BY_MONTH = np.array(BitcoinSeasonality.month_table()[1])
+
+
+def _known(*columns: np.ndarray) -> np.ndarray:
+    mask = np.ones(np.shape(columns[0]), dtype=bool)
+    for column in columns:
+        mask &= ~np.isnan(column)
+    return mask
+
+
+def evaluate_flags(inputs: Mapping[str, np.ndarray]) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """
+    Evaluates every flag rule over aligned float arrays.
+
+    Returns `(values, known)`: boolean arrays per flag, and for the nullable
+    flags a mask of rows whose inputs were all present.
+    """
+    length = len(next(iter(inputs.values()))) if inputs else 0
+    missing = np.full(length, np.nan)
+
+    def col(name: str) -> np.ndarray:
+        value = inputs.get(name)
+        return missing if value is None else np.asarray(value, dtype=float)
+
+    mvrv, rup, sopr = col("mvrv"), col("rup"), col("sopr")
+    mayer = col("mayer_multiple")
+    fng = col("fear_and_greed")
+    interest_rate, m2_yoy = col("interest_rate"), col("m2_yoy")
+    inflation_yoy, inflation_trend = col("inflation_yoy"), col("inflation_trend")
+    price, ema = col("current_price"), col("ema_365")
+    daily_change = col("daily_change_pct")
+
+    with np.errstate(invalid="ignore"):
+        # On-chain: RUP < 0.2 AND MVRV < 1.2 AND SOPR < 1 / (Mayer > 2.5 AND SOPR > 1) OR RUP > 2.5
+        is_accumulation = (rup < 0.2) & (mvrv < 1.2) & (sopr < 1.0)
+        is_overheated = (rup > 2.5) | ((mayer > 2.5) & (sopr > 1.0))
+
+        # Macro: M2 booming (> 5% YoY) or low rates (< 2%), only when both are known.
+        is_liquidity_good = _known(interest_rate, m2_yoy) & ((m2_yoy > 5.0) | (interest_rate < 2.0))
+        inflation_known = _known(inflation_yoy)
+        is_inflation_high = inflation_known & (inflation_yoy > 3.0)
+        is_inflation_falling = inflation_known & (np.where(np.isnan(inflation_trend), 0.0, inflation_trend) < 0.0)
+
+        # Market structure: long-term bull trend and buy-the-dip in a bull trend.
+        is_bull_trend = price > ema
+        is_volatility_opportunity = is_bull_trend & (daily_change < -5.0)
+
+        month = np.nan_to_num(col("month"), nan=0.0).astype(int).clip(0, 12)
+        values = {
+            "is_accumulation": is_accumulation,
+            "is_overheated": is_overheated,
+            "is_fear_extreme": fng < 20.0,
+            "is_greed_extreme": fng > 70.0,
+            "is_liquidity_good": is_liquidity_good,
+            "is_inflation_high": is_inflation_high,
+            "is_inflation_falling": is_inflation_falling,
+            "is_bull_trend": is_bull_trend,
+            "is_derivatives_risk": col("funding_rate") > 0.03,
+            "is_volatility_opportunity": is_volatility_opportunity,
+            "is_positive_seasonality": _POSITIVE_SEASONALITY_BY_MONTH[month],
+            "is_high_corr_spx": col("corr_spx_90d") > 0.5,
+            "is_high_corr_gold": col("corr_gold_90d") > 0.5,
+        }
+
+    known = {
+        "is_accumulation": _known(mvrv, rup, sopr),
+        "is_fear_extreme": _known(fng),
+        "is_greed_extreme": _known(fng),
+    }
+    return values, known
+
+
+def compute_flags(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    All flags for a frame of FLAG_INPUTS columns (missing columns count as NaN).
+
+    A `month` column is derived from a DatetimeIndex when absent. Nullable
+    flags come back as the pandas "boolean" dtype with NA for missing inputs.
+    """
+    inputs = {
+        name: frame[name].to_numpy(dtype=float, na_value=np.nan)
+        for name in FLAG_INPUTS
+        if name in frame.columns
+    }
+    if "month" not in inputs and isinstance(frame.index, pd.DatetimeIndex):
+        inputs["month"] = frame.index.month.to_numpy(dtype=float)
+    if not inputs:
+        inputs["month"] = np.full(len(frame), np.nan)
+
+    values, known = evaluate_flags(inputs)
+    result = pd.DataFrame(index=frame.index)
+    for name in FLAG_NAMES:
+        if name in known:
+            column = pd.array(values[name], dtype="boolean")
+            column[~known[name]] = pd.NA
+            result[name] = column
+        else:
+            result[name] = values[name]
+    return result
+
+
+def _number(value) -> float:
+    if value is None or isinstance(value, (dict, list, str)):
+        return np.nan
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value  # kept as int so processed payloads write it back unchanged
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def raw_flag_inputs(raw_data: Mapping) -> dict[str, float]:
+    """Flat FLAG_INPUTS for one raw snapshot (`daily_data_*.json`)."""
+    metrics = raw_data.get("metrics") or {}
+
+    def section(name: str) -> Mapping:
+        value = metrics.get(name)
+        return value if isinstance(value, Mapping) else {}
+
+    price_data = section("btc_price_ema_365")
+    inflation = section("inflation")
+    correlations = section("macro_correlations")
+    fear_and_greed = section("fear_and_greed")
+    timestamp = str(raw_data.get("timestamp") or "")
+
+    return {
+        "mvrv": _number(metrics.get("mvrv")),
+        "rup": _number(metrics.get("rup")),
+        "sopr": _number(metrics.get("sopr")),
+        "mayer_multiple": _number(metrics.get("mayer_multiple")),
+        "fear_and_greed": _number(fear_and_greed.get("value")),
+        "interest_rate": _number(section("interest_rate").get("current_rate")),
+        "m2_yoy": _number(section("m2_supply").get("m2_year_pct")),
+        "inflation_yoy": _number(inflation.get("yoy_inflation_pct")),
+        "inflation_trend": _number(inflation.get("inflation_trend", 0.0)) if inflation else np.nan,
+        "funding_rate": _number(section("derivatives").get("funding_rate")),
+        "current_price": _number(price_data.get("current_price")),
+        "ema_365": _number(price_data.get("ema_365")),
+        "daily_change_pct": _number(price_data.get("daily_change_pct")),
+        "corr_spx_90d": _number(correlations.get("corr_spx_90d")),
+        "corr_gold_90d": _number(correlations.get("corr_gold_90d")),
+        "month": float(timestamp[5:7]) if len(timestamp) >= 7 and timestamp[5:7].isdigit() else np.nan,
+    }
+
+
+def flags_for_row(inputs: Mapping[str, float]) -> dict[str, bool | None]:
+    """Single-row adapter: same rules as `compute_flags`, plain bools out."""
+    values, known = evaluate_flags({name: np.array([value], dtype=float) for name, value in inputs.items()})
+    flags: dict[str, bool | None] = {}
+    for name in FLAG_NAMES:
+        if name in known and not known[name][0]:
+            flags[name] = None
+        else:
+            flags[name] = bool(values[name][0])
+    return flags
+
+
+def flags_for_raw(raw_data: Mapping) -> dict[str, bool | None]:
+    return flags_for_row(raw_flag_inputs(raw_data))
+
+
+def flag_records(flags: pd.DataFrame) -> list[dict[str, bool | None]]:
+    """Rows of a `compute_flags` frame as plain dicts (NA -> None)."""
+    columns = {name: flags[name].astype(object).tolist() for name in flags.columns}
+    return [
+        {name: None if values[idx] is pd.NA else bool(values[idx]) for name, values in columns.items()}
+        for idx in range(len(flags))
+    ]
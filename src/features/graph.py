@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.features.calendar import calendar_rows
+from src.features.flags import FLAG_DEPENDENCIES, FLAG_NAMES, NULLABLE_FLAGS, evaluate_flags
+from src.features.pipeline import CONTEXT_FIELDS
+from src.utils.project_paths import STATE_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+FEATURE_MANIFEST_PATH = STATE_DIR / "feature_manifest.json"
+MANIFEST_VERSION = 1
+
+# Upstream series. Inputs are named "<source>.<column>".
+RAW_SOURCE = "raw"  # daily_data_*.json snapshots, tracked per date
+PRICE_SOURCE = "btc_close"  # BTC daily closes, tracked as one series
+CALENDAR_SOURCE = "calendar"  # static cycle/seasonality table
+SOURCES = (RAW_SOURCE, PRICE_SOURCE, CALENDAR_SOURCE)
+CALENDAR_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FeatureNode:
+    """
+    One stored column of the processed payload (`section.name`).
+
+    `inputs` are other nodes or source columns; bump `version` whenever the
+    definition in `compute` changes.
+    """
+
+    name: str
+    inputs: tuple[str, ...]
+    compute: Callable[[pd.DataFrame], np.ndarray] = field(compare=False, repr=False)
+    version: int = 1
+
+
+def _passthrough(column: str) -> Callable[[pd.DataFrame], np.ndarray]:
+    return lambda frame: frame[column].to_numpy(dtype=float)
+
+
+def _price_vs_ema(frame: pd.DataFrame) -> np.ndarray:
+    price = frame["market_data.current_price"].to_numpy(dtype=float)
+    ema = frame["market_data.ema_365"].to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return ((price - ema) / ema) * 100.0
+
+
+def _phase(frame: pd.DataFrame) -> np.ndarray:
+    return calendar_rows(frame.index.values)["phase"].to_numpy(dtype=object)
+
+
+# Flag rule inputs -> the column that holds them.
+_FLAG_INPUT_COLUMNS = {
+    "mvrv": "metrics.mvrv",
+    "rup": "metrics.rup",
+    "sopr": "metrics.sopr",
+    "mayer_multiple": "metrics.mayer_multiple",
+    "fear_and_greed": "metrics.fear_and_greed",
+    "interest_rate": "metrics.interest_rate",
+    "m2_yoy": "metrics.m2_yoy",
+    "inflation_yoy": "metrics.inflation_yoy",
+    "funding_rate": "metrics.funding_rate",
+    "current_price": "market_data.current_price",
+    "ema_365": "market_data.ema_365",
+    "daily_change_pct": "market_data.daily_change_pct",
+    "inflation_trend": f"{RAW_SOURCE}.inflation_trend",
+    "corr_spx_90d": f"{RAW_SOURCE}.corr_spx_90d",
+    "corr_gold_90d": f"{RAW_SOURCE}.corr_gold_90d",
+    "month": f"{CALENDAR_SOURCE}.month",
+}
+
+
+def _flag(name: str) -> Callable[[pd.DataFrame], np.ndarray]:
+    def compute(frame: pd.DataFrame) -> np.ndarray:
+        inputs = {
+            rule_input: frame[_FLAG_INPUT_COLUMNS[rule_input]].to_numpy(dtype=float)
+            for rule_input in FLAG_DEPENDENCIES[name]
+        }
+        values, known = evaluate_flags(inputs)
+        column = values[name].astype(object)
+        if name in NULLABLE_FLAGS:
+            column[~known[name]] = None
+        return column
+
+    return compute
+
+
+def default_nodes() -> list[FeatureNode]:
+    """The processed-payload columns and how each one is derived."""
+    nodes = []
+    for name in ("current_price", "daily_change_pct", "weekly_change_pct", "monthly_change_pct", "ema_365"):
+        nodes.append(FeatureNode(f"market_data.{name}", (f"{RAW_SOURCE}.{name}",), _passthrough(f"{RAW_SOURCE}.{name}")))
+    nodes.append(
+        FeatureNode(
+            "market_data.price_vs_ema_pct",
+            ("market_data.current_price", "market_data.ema_365"),
+            _price_vs_ema,
+        )
+    )
+
+    for name in (
+        "mvrv", "sopr", "rup", "mayer_multiple", "fear_and_greed",
+        "interest_rate", "m2_yoy", "inflation_yoy", "funding_rate",
+    ):
+        nodes.append(FeatureNode(f"metrics.{name}", (f"{RAW_SOURCE}.{name}",), _passthrough(f"{RAW_SOURCE}.{name}")))
+    for name in CONTEXT_FIELDS:
+        nodes.append(FeatureNode(f"metrics.{name}", (f"{PRICE_SOURCE}.{name}",), _passthrough(f"{PRICE_SOURCE}.{name}")))
+
+    nodes.append(FeatureNode("market_cycle_phase", (f"{CALENDAR_SOURCE}.phase",), _phase))
+    for name in FLAG_NAMES:
+        inputs = tuple(_FLAG_INPUT_COLUMNS[rule_input] for rule_input in FLAG_DEPENDENCIES[name])
+        nodes.append(FeatureNode(f"flags.{name}", inputs, _flag(name)))
+    return nodes
+
+
+def source_of(column: str) -> str | None:
+    prefix = column.split(".", 1)[0]
+    return prefix if prefix in SOURCES else None
+
+
+class FeatureGraph:
+    """Dependency graph over FeatureNodes with version-aware signatures."""
+
+    def __init__(self, nodes: Iterable[FeatureNode] | None = None):
+        self.nodes = {node.name: node for node in (default_nodes() if nodes is None else nodes)}
+        for node in self.nodes.values():
+            for column in node.inputs:
+                if column not in self.nodes and source_of(column) is None:
+                    raise ValueError(f"{node.name} depends on unknown column {column}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, int] = {}
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"dependency cycle through {name}")
+            state[name] = 1
+            for column in self.nodes[name].inputs:
+                if column in self.nodes:
+                    visit(column)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    def dependents(self, names: Iterable[str]) -> set[str]:
+        """`names` plus every node downstream of them."""
+        affected = set(names)
+        for name in self.order:
+            if any(column in affected for column in self.nodes[name].inputs):
+                affected.add(name)
+        return affected
+
+    def source_dependents(self, source: str) -> set[str]:
+        return self.dependents(
+            name for name, node in self.nodes.items() if any(source_of(column) == source for column in node.inputs)
+        )
+
+    def signatures(self) -> dict[str, str]:
+        """Definition hash per node, covering its version and all upstream definitions."""
+        signatures: dict[str, str] = {}
+        for name in self.order:
+            node = self.nodes[name]
+            parts = [node.name, str(node.version)]
+            parts += [signatures.get(column, column) for column in node.inputs]
+            signatures[name] = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+        return signatures
+
+
+@dataclass
+class FeatureManifest:
+    """What the stored columns were last computed from."""
+
+    definitions: dict[str, str] = field(default_factory=dict)
+    raw_digests: dict[str, str] = field(default_factory=dict)
+    price_digest: str | None = None
+    price_end: str | None = None
+    calendar_version: int | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "version": MANIFEST_VERSION,
+            "definitions": self.definitions,
+            "raw_digests": self.raw_digests,
+            "price_digest": self.price_digest,
+            "price_end": self.price_end,
+            "calendar_version": self.calendar_version,
+        }
+
+    def save(self, path: Path = FEATURE_MANIFEST_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = FEATURE_MANIFEST_PATH) -> "FeatureManifest | None":
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable feature manifest %s: %s", path, exc)
+            return None
+        if payload.get("version") != MANIFEST_VERSION:
+            return None
+        return cls(
+            definitions=dict(payload.get("definitions", {})),
+            raw_digests=dict(payload.get("raw_digests", {})),
+            price_digest=payload.get("price_digest"),
+            price_end=payload.get("price_end"),
+            calendar_version=payload.get("calendar_version"),
+        )
+
+
+def digest_bytes(payload: bytes) -> str:
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def digest_prices(prices: pd.Series, end_date: str | None = None) -> str:
+    """Digest of the closes up to `end_date`, so appended days do not change it."""
+    if end_date is not None:
+        prices = prices[pd.DatetimeIndex(prices.index) <= pd.Timestamp(end_date)]
+    frame = pd.DataFrame({"close": prices.astype(float).round(8)})
+    frame.index = pd.DatetimeIndex(frame.index).strftime("%Y-%m-%d")
+    return digest_bytes(frame.to_csv().encode("utf-8"))
+
+
+def plan_recompute(
+    graph: FeatureGraph,
+    manifest: FeatureManifest | None,
+    dates: list[str],
+    raw_digests: Mapping[str, str],
+    prices: pd.Series | None = None,
+) -> dict[str, set[str]]:
+    """
+    Stale (column -> dates) pairs.
+
+    A changed definition stales its column and everything downstream for
+    all dates; a changed raw snapshot stales the raw-derived columns for that
+    date only; a change in the overlapping part of `prices` (when given)
+    stales the price-derived columns for all dates. Without a manifest
+    everything is stale.
+    """
+    all_dates = set(dates)
+    if manifest is None:
+        return {name: set(all_dates) for name in graph.order}
+
+    plan: dict[str, set[str]] = {}
+
+    def mark(names: Iterable[str], marked_dates: set[str]) -> None:
+        for name in names:
+            if marked_dates:
+                plan.setdefault(name, set()).update(marked_dates)
+
+    signatures = graph.signatures()
+    mark((name for name in graph.order if manifest.definitions.get(name) != signatures[name]), all_dates)
+
+    changed_raw = {date_str for date_str in dates if manifest.raw_digests.get(date_str) != raw_digests.get(date_str)}
+    mark(graph.source_dependents(RAW_SOURCE), changed_raw)
+
+    if prices is not None and digest_prices(prices, manifest.price_end) != manifest.price_digest:
+        mark(graph.source_dependents(PRICE_SOURCE), all_dates)
+    if manifest.calendar_version != CALENDAR_VERSION:
+        mark(graph.source_dependents(CALENDAR_SOURCE), all_dates)
+    return plan
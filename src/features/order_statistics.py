@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+class RankFenwick:
+    """Fenwick tree of counts over ranks 0..size-1."""
+
+    def __init__(self, size: int):
+        self.size = int(size)
+        self._tree = [0] * (self.size + 1)
+        self._top = 1 << max(self.size.bit_length() - 1, 0) if self.size else 0
+
+    def add(self, rank: int, delta: int) -> None:
+        index = rank + 1
+        tree = self._tree
+        while index <= self.size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix(self, stop: int) -> int:
+        """Count of ranks < stop."""
+        total = 0
+        tree = self._tree
+        index = stop
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def kth(self, k: int) -> int:
+        """Rank of the k-th (0-based) present item."""
+        position = 0
+        remaining = k + 1
+        tree = self._tree
+        step = self._top
+        while step:
+            candidate = position + step
+            if candidate <= self.size and tree[candidate] < remaining:
+                position = candidate
+                remaining -= tree[candidate]
+            step >>= 1
+        return position
+
+
+class OrderStatisticWindow:
+    """
+    Multiset over a fixed sequence of observations with O(log n) insert,
+    remove and order-statistic queries.
+
+    Observations are ranked once up front (ties broken by position), so each
+    one maps to its own Fenwick slot and `kth` returns values by rank.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        order = np.argsort(values, kind="stable")
+        self._sorted = values[order].tolist()
+        self._sorted_array = values[order]
+        self._rank = np.empty(values.size, dtype=np.int64)
+        self._rank[order] = np.arange(values.size)
+        self._rank = self._rank.tolist()
+        self._tree = RankFenwick(values.size)
+        self.count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def insert(self, position: int) -> None:
+        self._tree.add(self._rank[position], 1)
+        value = self._sorted[self._rank[position]]
+        self.count += 1
+        self._sum += value
+        self._sumsq += value * value
+
+    def remove(self, position: int) -> None:
+        self._tree.add(self._rank[position], -1)
+        value = self._sorted[self._rank[position]]
+        self.count -= 1
+        self._sum -= value
+        self._sumsq -= value * value
+
+    def kth(self, k: int) -> float:
+        return self._sorted[self._tree.kth(k)]
+
+    def count_below(self, value: float) -> int:
+        return self._tree.prefix(int(np.searchsorted(self._sorted_array, value, side="left")))
+
+    def median(self) -> float:
+        n = self.count
+        if n % 2:
+            return self.kth(n // 2)
+        return 0.5 * (self.kth((n // 2) - 1) + self.kth(n // 2))
+
+    def percentile(self, q: float) -> float:
+        """Linear interpolation between order statistics (numpy's default)."""
+        position = (self.count - 1) * q
+        low = math.floor(position)
+        fraction = position - low
+        value = self.kth(low)
+        if fraction > 0.0:
+            value += fraction * (self.kth(low + 1) - value)
+        return value
+
+    def median_abs_deviation(self, center: float) -> float:
+        """
+        Median of |x - center|. Distances to the values at or above `center`
+        and to those below it form two sorted sequences; the needed order
+        statistics are selected from their union by binary search.
+        """
+        n = self.count
+        below = self.count_below(center)
+        above = n - below
+
+        def up(index: int) -> float:
+            return self.kth(below + index) - center
+
+        def down(index: int) -> float:
+            return center - self.kth(below - 1 - index)
+
+        def select(k: int) -> float:
+            low, high = max(0, k + 1 - above), min(k + 1, below)
+            while low < high:
+                taken = (low + high) // 2
+                if down(taken) < up(k - taken):
+                    low = taken + 1
+                else:
+                    high = taken
+            taken = k + 1 - low
+            return max(down(low - 1) if low > 0 else -math.inf, up(taken - 1) if taken > 0 else -math.inf)
+
+        if n % 2:
+            return select(n // 2)
+        return 0.5 * (select((n // 2) - 1) + select(n // 2))
+
+    def std(self, ddof: int = 1) -> float:
+        if self.count <= ddof:
+            return math.nan
+        mean = self._sum / self.count
+        return math.sqrt(max(self._sumsq - (self.count * mean * mean), 0.0) / (self.count - ddof))
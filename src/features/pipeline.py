@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.features.calendar import calendar_rows
+from src.features.flags import FLAG_NAMES, compute_flags, flag_records, raw_flag_inputs
+from src.features.rolling import rolling_max, rolling_mean, rolling_std, rolling_trend_tscore, rolling_zscore
+from src.features.rolling_state import DEFAULT_CONTEXT
+
+
+LOGGER = logging.getLogger(__name__)
+
+MARKET_FIELDS = (
+    "current_price",
+    "open_price",
+    "daily_change_pct",
+    "weekly_change_pct",
+    "monthly_change_pct",
+    "ema_365",
+    "price_vs_ema_pct",
+)
+
+METRIC_FIELDS = (
+    "mvrv",
+    "mvrv_zscore",
+    "sopr",
+    "rup",
+    "mayer_multiple",
+    "fear_and_greed",
+    "interest_rate",
+    "m2_yoy",
+    "inflation_yoy",
+    "funding_rate",
+    "realized_vol_30d",
+    "realized_vol_90d",
+    "momentum_63d",
+    "drawdown_180d",
+    "trend_tscore_90d",
+)
+
+CONTEXT_FIELDS = tuple(DEFAULT_CONTEXT)
+
+ANNUALIZATION = math.sqrt(365.0)
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    Window settings for the price-derived features.
+
+    The defaults are the production definitions. Short simulated paths relax
+    the warm-up (`sma_min_periods`, z-score window) and fill the warm-up rows
+    from the first defined value instead of the neutral defaults.
+    """
+
+    zscore_window: int = 1460
+    zscore_min_periods: int = 365
+    sma_min_periods: int | None = None
+    warmup_fill: bool = False
+
+
+PRODUCTION_SPEC = FeatureSpec()
+
+
+def _close_and_open(prices: pd.Series | pd.DataFrame) -> tuple[pd.Series, pd.Series | None]:
+    if isinstance(prices, pd.Series):
+        return prices.astype(float), None
+    for name in ("close", "price", "Close"):
+        if name in prices.columns:
+            close = prices[name].astype(float)
+            break
+    else:
+        raise KeyError("price frame needs a 'close' or 'price' column")
+    for name in ("open", "Open"):
+        if name in prices.columns:
+            return close, prices[name].astype(float)
+    return close, None
+
+
+def price_features(prices: pd.Series | pd.DataFrame, spec: FeatureSpec = PRODUCTION_SPEC) -> pd.DataFrame:
+    """
+    Every feature derived from daily closes, one row per close: market
+    columns, SMA-based valuation proxies and the historical-context metrics.
+    """
+    close, open_ = _close_and_open(prices)
+    values = close.to_numpy(dtype=float)
+    sma_min_periods = spec.sma_min_periods
+
+    frame = pd.DataFrame(index=close.index)
+    frame["current_price"] = values
+    if open_ is not None:
+        frame["open_price"] = open_.to_numpy(dtype=float)
+    frame["daily_change_pct"] = close.pct_change().to_numpy() * 100.0
+    frame["weekly_change_pct"] = close.pct_change(7).to_numpy() * 100.0
+    frame["monthly_change_pct"] = close.pct_change(30).to_numpy() * 100.0
+    frame["ema_365"] = close.ewm(span=365, adjust=False).mean().to_numpy()
+
+    frame["sma_200"] = rolling_mean(values, 200, sma_min_periods)
+    frame["sma_365"] = rolling_mean(values, 365, sma_min_periods)
+    if spec.warmup_fill:
+        frame[["sma_200", "sma_365"]] = frame[["sma_200", "sma_365"]].bfill()
+    frame["mvrv_proxy"] = values / frame["sma_365"].to_numpy()
+    frame["mayer_proxy"] = values / frame["sma_200"].to_numpy()
+
+    returns = close.pct_change().to_numpy()
+    frame["mvrv_zscore"] = rolling_zscore(frame["mvrv_proxy"].to_numpy(), spec.zscore_window, spec.zscore_min_periods)
+    frame["realized_vol_30d"] = rolling_std(returns, 30, 10) * ANNUALIZATION
+    frame["realized_vol_90d"] = rolling_std(returns, 90, 20) * ANNUALIZATION
+    frame["momentum_63d"] = (close / close.shift(63)).to_numpy() - 1.0
+    frame["drawdown_180d"] = (values / rolling_max(values, 180, 30)) - 1.0
+    frame["trend_tscore_90d"] = rolling_trend_tscore(np.log(values))
+
+    if spec.warmup_fill:
+        warmup = ["daily_change_pct", "weekly_change_pct", "monthly_change_pct"]
+        frame[warmup] = frame[warmup].fillna(0.0)
+        frame[list(CONTEXT_FIELDS)] = frame[list(CONTEXT_FIELDS)].bfill()
+
+    context = frame[list(CONTEXT_FIELDS)].replace([np.inf, -np.inf], np.nan)
+    frame[list(CONTEXT_FIELDS)] = context.fillna(value=DEFAULT_CONTEXT)
+    return frame
+
+
+def raw_inputs(raw_data: dict) -> dict[str, float]:
+    """Flat pipeline inputs for one raw snapshot (on-chain, macro and market)."""
+    inputs = raw_flag_inputs(raw_data)
+    price_data = (raw_data.get("metrics") or {}).get("btc_price_ema_365")
+    if isinstance(price_data, dict):
+        inputs["weekly_change_pct"] = price_data.get("weekly_change_pct", 0.0)
+        inputs["monthly_change_pct"] = price_data.get("monthly_change_pct", 0.0)
+    return inputs
+
+
+def raw_input_frame(rows: list[dict], index: pd.Index) -> pd.DataFrame:
+    """
+    `raw_inputs` rows as columns. A column whose present values are all ints
+    (e.g. the fear & greed index) gets the nullable Int64 dtype, so the
+    processed payload keeps the raw snapshot's ints.
+    """
+    frame = pd.DataFrame(rows, index=index)
+    for name in frame.columns:
+        values = [row.get(name) for row in rows]
+        present = [value for value in values if value is not None and value == value]
+        if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+            integers = [value if isinstance(value, int) else None for value in values]
+            frame[name] = pd.array(integers, dtype="Int64")
+    return frame
+
+
+def context_asof(price_frame: pd.DataFrame, dates) -> pd.DataFrame:
+    """
+    Historical-context rows for `dates`, each taken from the last close
+    strictly before the date (the live snapshot semantics).
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(dates))
+    positions = price_frame.index.searchsorted(index, side="left") - 1
+    context = price_frame[list(CONTEXT_FIELDS)].to_numpy(dtype=float)
+
+    rows = np.tile(np.array([DEFAULT_CONTEXT[name] for name in CONTEXT_FIELDS], dtype=float), (index.size, 1))
+    found = positions >= 0
+    rows[found] = context[positions[found]]
+    return pd.DataFrame(rows, index=index, columns=list(CONTEXT_FIELDS))
+
+
+def assemble_features(base: pd.DataFrame, inputs: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Full feature matrix: `base` columns, overridden by any column present in
+    `inputs` (aligned on the index), plus cycle phase, seasonality and flags.
+    """
+    frame = base.copy()
+    if inputs is not None:
+        for name in inputs.columns:
+            frame[name] = inputs[name].reindex(frame.index).array
+
+    for name in (*MARKET_FIELDS, *METRIC_FIELDS):
+        if name not in frame.columns and name not in ("open_price", "price_vs_ema_pct"):
+            frame[name] = np.nan
+    if "price_vs_ema_pct" not in frame.columns:
+        # Extension from the EMA (how stretched is the move?)
+        frame["price_vs_ema_pct"] = ((frame["current_price"] - frame["ema_365"]) / frame["ema_365"]) * 100.0
+
+    calendar = calendar_rows(frame.index.values)
+    frame["market_cycle_phase"] = calendar["phase"].to_numpy()
+    frame["month"] = calendar["month"].to_numpy()
+
+    flags = compute_flags(frame)
+    return pd.concat([frame, flags], axis=1)
+
+
+def build_feature_frame(
+    prices: pd.Series | pd.DataFrame,
+    inputs: pd.DataFrame | None = None,
+    spec: FeatureSpec = PRODUCTION_SPEC,
+) -> pd.DataFrame:
+    """Price features plus optional on-chain/macro input columns, fully assembled."""
+    return assemble_features(price_features(prices, spec), inputs)
+
+
+def _number(value) -> float:
+    if value is None or isinstance(value, (dict, list, str)):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _plain(column: pd.Series) -> list:
+    if pd.api.types.is_integer_dtype(column.dtype):
+        return [None if value is pd.NA else int(value) for value in column.astype(object).tolist()]
+    return [None if value is None or value != value else float(value) for value in column.tolist()]
+
+
+def feature_days(frame: pd.DataFrame) -> list[dict]:
+    """
+    Assembled frame as the nested day dicts the scorers consume
+    (`timestamp`, `market_cycle_phase`, `market_data`, `metrics`, `flags`).
+    """
+    market_fields = [name for name in MARKET_FIELDS if name in frame.columns]
+    market = {name: _plain(frame[name]) for name in market_fields}
+    metrics = {name: _plain(frame[name]) for name in METRIC_FIELDS}
+    flags = flag_records(frame[list(FLAG_NAMES)])
+    timestamps = pd.DatetimeIndex(frame.index).strftime("%Y-%m-%dT%H:%M:%S").tolist()
+    phases = frame["market_cycle_phase"].tolist()
+
+    return [
+        {
+            "timestamp": timestamps[idx],
+            "market_cycle_phase": phases[idx],
+            "market_data": {name: market[name][idx] for name in market_fields},
+            "metrics": {name: metrics[name][idx] for name in METRIC_FIELDS},
+            "flags": flags[idx],
+        }
+        for idx in range(len(frame))
+    ]
+
+
+def day_frame(days: list[dict]) -> pd.DataFrame:
+    """
+    Inverse of `feature_days`: nested day dicts as flat columns. Missing
+    numbers are NaN, missing flags None and a missing phase "Unknown".
+    """
+    columns: dict[str, list] = {}
+    for section, names in (("market_data", MARKET_FIELDS), ("metrics", METRIC_FIELDS)):
+        for name in names:
+            columns[name] = [_number((day.get(section) or {}).get(name)) for day in days]
+    for name in FLAG_NAMES:
+        columns[name] = [(day.get("flags") or {}).get(name) for day in days]
+    columns["market_cycle_phase"] = [day.get("market_cycle_phase", "Unknown") for day in days]
+
+    timestamps = [day.get("timestamp") for day in days]
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps, format="ISO8601")) if all(timestamps) else None
+    frame = pd.DataFrame(columns, index=index)
+    for name in FLAG_NAMES:
+        frame[name] = frame[name].astype(object)
+    return frame
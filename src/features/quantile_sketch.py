@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import Iterable
+
+import numpy as np
+
+
+DEFAULT_K = 200
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Level h holds items of weight 2**h. When the sketch outgrows its budget
+    the lowest over-full level is sorted and every other item (random offset)
+    is promoted to the next level, so an update costs O(log n) amortized and
+    memory stays O(k log(n / k)). The normalized rank error of a quantile is
+    about 1.7 / k at high probability (~1% for the default k = 200).
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: int | None = 0):
+        if k < 8:
+            raise ValueError("k must be >= 8")
+        self.k = int(k)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels: list[list[float]] = [[]]
+        self._size = 0
+        self._rng = random.Random(seed)
+        self._sorted: tuple[np.ndarray, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def rank_error(self) -> float:
+        """Approximate normalized rank error bound for this k."""
+        return 1.7 / self.k
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(int(math.ceil(self.k * (_CAPACITY_DECAY**depth))), 2)
+
+    def _budget(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        if not math.isfinite(value):
+            return
+        self._levels[0].append(value)
+        self._size += 1
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._sorted = None
+        if self._size > self._budget():
+            self._compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.update(value)
+
+    def _compress(self) -> None:
+        while self._size > self._budget():
+            for level, items in enumerate(self._levels):
+                if len(items) >= self._capacity(level):
+                    break
+            else:  # pragma: no cover - the budget is the sum of the capacities
+                return
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+
+            items.sort()
+            # An odd item out stays behind so that no weight is lost.
+            kept = [items.pop(self._rng.randrange(len(items)))] if len(items) % 2 else []
+            promoted = items[self._rng.randrange(2) :: 2]
+            self._levels[level + 1].extend(promoted)
+            self._levels[level] = kept
+            self._size = sum(len(level_items) for level_items in self._levels)
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Absorbs `other` in place (it is left untouched) and returns self."""
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self._size = sum(len(items) for items in self._levels)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._sorted = None
+        self._compress()
+        return self
+
+    def weighted_items(self) -> tuple[np.ndarray, np.ndarray]:
+        """Stored values (sorted) and their weights."""
+        if self._sorted is None:
+            values = np.array([value for items in self._levels for value in items], dtype=float)
+            weights = np.array(
+                [float(2**level) for level, items in enumerate(self._levels) for _ in items],
+                dtype=float,
+            )
+            order = np.argsort(values, kind="stable")
+            self._sorted = (values[order], weights[order])
+        return self._sorted
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return math.nan
+        if q <= 0.0:
+            return self.min
+        if q >= 1.0:
+            return self.max
+        values, weights = self.weighted_items()
+        cumulative = np.cumsum(weights)
+        position = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+        return float(values[min(position, values.size - 1)])
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of absorbed values <= `value`."""
+        if self.count == 0:
+            return math.nan
+        values, weights = self.weighted_items()
+        return float(weights[: np.searchsorted(values, value, side="right")].sum() / weights.sum())
+
+    def median_abs_deviation(self, center: float | None = None) -> float:
+        """Median of |x - center| over the sketch's weighted items."""
+        if self.count == 0:
+            return math.nan
+        center = self.quantile(0.5) if center is None else center
+        values, weights = self.weighted_items()
+        deviations = np.abs(values - center)
+        order = np.argsort(deviations, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = int(np.searchsorted(cumulative, 0.5 * cumulative[-1], side="left"))
+        return float(deviations[order][min(position, deviations.size - 1)])
+
+    def to_dict(self) -> dict:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "levels": self._levels,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict, seed: int | None = 0) -> "KLLSketch":
+        sketch = cls(k=int(payload["k"]), seed=seed)
+        sketch._levels = [[float(value) for value in items] for items in payload.get("levels", [[]])] or [[]]
+        sketch._size = sum(len(items) for items in sketch._levels)
+        sketch.count = int(payload.get("count", 0))
+        if sketch.count:
+            sketch.min = float(payload["min"])
+            sketch.max = float(payload["max"])
+        return sketch
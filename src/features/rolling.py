@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+import logging
+import math
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Batch functions take a 1-D array and return an array of the same length.
+# NaN inputs are skipped: they occupy a slot in the window but do not count
+# towards `min_periods` (pandas semantics). `min_periods=None` means `window`.
+# They are vectorized NumPy; the classes further down are the streaming
+# (one value per push) forms used by the incremental state.
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=float).reshape(-1)
+
+
+def _resolve_min_periods(window: int, min_periods: int | None) -> int:
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    return window if min_periods is None else max(int(min_periods), 1)
+
+
+def rolling_count(values, window: int) -> np.ndarray:
+    """Number of non-NaN values in each trailing window."""
+    valid = ~np.isnan(_as_float_array(values))
+    prefix = np.cumsum(valid)
+    counts = prefix.copy()
+    counts[window:] -= prefix[:-window]
+    return counts
+
+
+def rolling_mean(values, window: int, min_periods: int | None = None) -> np.ndarray:
+    x = _as_float_array(values)
+    min_periods = _resolve_min_periods(window, min_periods)
+
+    filled = np.where(np.isnan(x), 0.0, x)
+    prefix = np.concatenate(([0.0], np.cumsum(filled)))
+    ends = np.arange(1, x.size + 1)
+    sums = prefix[ends] - prefix[np.maximum(ends - window, 0)]
+    counts = rolling_count(x, window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts
+    return np.where(counts >= min_periods, mean, np.nan)
+
+
+def _blocks(values: np.ndarray, window: int, fill: float) -> np.ndarray:
+    """`values` padded with `fill` and reshaped to rows of `window`."""
+    blocks = -(-values.size // window)
+    padded = np.full(blocks * window, fill)
+    padded[: values.size] = values
+    return padded.reshape(blocks, window)
+
+
+def _window_sums(x: np.ndarray, window: int, positions: bool = False) -> tuple[np.ndarray, ...]:
+    """
+    Per row, over the valid points of its trailing window: n, Σc, Σc² and,
+    with `positions`, Σt, Σt², Σt·c.
+
+    Rows are cut into blocks of `window`; c is the value minus the first valid
+    value of the row's block and t the position from the block start. A
+    window is a prefix of its own block plus a suffix of the previous one,
+    shifted to the row's anchors, so the sums stay of the order of the
+    window's own spread and length instead of growing along the series.
+    """
+    values = _blocks(x, window, np.nan)
+    valid = ~np.isnan(values)
+    anchors = values[np.arange(values.shape[0]), np.argmax(valid, axis=1)]
+    filled = np.where(valid.any(axis=1), np.arange(anchors.size), 0)
+    anchors = anchors[np.maximum.accumulate(filled)]
+    anchors = np.where(np.isnan(anchors), 0.0, anchors)
+
+    v = valid.astype(float)
+    c = np.where(valid, values - anchors[:, None], 0.0)
+    terms = [v, c, c * c]
+    if positions:
+        t = np.arange(window, dtype=float) * v
+        terms += [t, t * t, t * c]
+    terms = np.stack(terms)
+
+    sums = np.cumsum(terms, axis=2)
+    # The window of (block k, offset o) also holds block k - 1 after offset
+    # o: that block's total minus its prefix at o, re-anchored to block k.
+    prev = sums[:, :-1, -1:] - sums[:, :-1]
+    current = sums[:, 1:]
+    e = (anchors[:-1] - anchors[1:])[:, None]
+
+    # Shifting by e (and d): Σ(c+e) = Σc + e·n, Σ(c+e)² = Σc² + e·(Σc + Σ(c+e)).
+    pv, pc, pcc = prev[:3]
+    shifted_c = pc + (e * pv)
+    current[0] += pv
+    current[1] += shifted_c
+    current[2] += pcc + (e * (pc + shifted_c))
+    if positions:
+        d = -float(window)
+        pt, ptt, ptc = prev[3:]
+        shifted_t = pt + (d * pv)
+        current[3] += shifted_t
+        current[4] += ptt + (d * (pt + shifted_t))
+        current[5] += ptc + (e * pt) + (d * shifted_c)
+    return tuple(term.reshape(-1)[: x.size] for term in sums)
+
+
+def rolling_std(values, window: int, min_periods: int | None = None, ddof: int = 1) -> np.ndarray:
+    """Sliding-window standard deviation from anchored running sums."""
+    x = _as_float_array(values)
+    min_periods = _resolve_min_periods(window, min_periods)
+    if x.size == 0:
+        return np.zeros(0)
+    n, sc, scc = _window_sums(x, window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        m2 = np.maximum(scc - (sc * sc / n), 0.0)
+        std = np.sqrt(m2 / (n - ddof))
+    return np.where((n >= min_periods) & (n > ddof), std, np.nan)
+
+
+def rolling_max(values, window: int, min_periods: int | None = None) -> np.ndarray:
+    """
+    Sliding-window maximum (van Herk/Gil-Werman): running maxima forward and
+    backward within blocks of `window`, so each window is max(suffix of its
+    first block, prefix of its last block).
+    """
+    x = _as_float_array(values)
+    min_periods = _resolve_min_periods(window, min_periods)
+    if x.size == 0:
+        return np.zeros(0)
+    filled = np.where(np.isnan(x), -np.inf, x)
+    blocks = _blocks(filled, window, -np.inf)
+    prefix = np.maximum.accumulate(blocks, axis=1).reshape(-1)[: x.size]
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1)
+
+    maxima = prefix.copy()
+    if x.size >= window:
+        maxima[window - 1 :] = np.maximum(suffix[: x.size - window + 1], prefix[window - 1 :])
+    return np.where(rolling_count(x, window) >= min_periods, maxima, np.nan)
+
+
+def rolling_min(values, window: int, min_periods: int | None = None) -> np.ndarray:
+    return -rolling_max(-_as_float_array(values), window, min_periods)
+
+
+def rolling_zscore(values, window: int, min_periods: int | None = None, ddof: int = 1) -> np.ndarray:
+    """(x - rolling mean) / rolling std over the trailing window, NaN where undefined."""
+    x = _as_float_array(values)
+    mean = rolling_mean(x, window, min_periods)
+    std = rolling_std(x, window, min_periods, ddof=ddof)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        zscore = (x - mean) / std
+    return np.where(np.isfinite(zscore), zscore, np.nan)
+
+
+def rolling_ols(values, window: int, min_periods: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Slope and slope t-statistic of an OLS fit of each trailing window against
+    its row positions. NaN rows are dropped from the fit but keep their
+    position, so gaps do not compress time.
+    """
+    y = _as_float_array(values)
+    min_periods = _resolve_min_periods(window, min_periods)
+    if y.size == 0:
+        return np.zeros(0), np.zeros(0)
+    n, sy, syy, st, stt, sty = _window_sums(y, window, positions=True)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sxx = stt - (st * st / n)
+        sxy = sty - (st * sy / n)
+        slope = sxy / sxx
+        sse = np.maximum((syy - (sy * sy / n)) - (slope * sxy), 0.0)
+        std_err = np.sqrt((sse / (n - 2)) / sxx)
+        tstat = slope / std_err
+
+    fitted = (n >= max(min_periods, 2)) & (sxx > 1e-12)
+    return np.where(fitted, slope, np.nan), np.where(fitted & (n > 2) & (std_err > 1e-12), tstat, np.nan)
+
+
+def rolling_trend_tscore(
+    log_prices,
+    window: int = 90,
+    min_periods: int = 20,
+    clip: float = 8.0,
+) -> np.ndarray:
+    """Clipped OLS t-score per row, 0.0 where it is undefined (as `_trend_tscore`)."""
+    _, tstat = rolling_ols(log_prices, window, min_periods)
+    return np.where(np.isnan(tstat), 0.0, np.clip(tstat, -clip, clip))
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer with a running sum and sum of squares.
+
+    Sums are rebuilt from the buffer once every `size` pushes, which keeps
+    float drift bounded while the amortized cost per push stays O(1).
+    """
+
+    def __init__(self, size: int, values: Iterable[float] = ()):
+        self.size = int(size)
+        self._buffer: list[float] = [0.0] * self.size
+        self._head = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._since_rebuild = 0
+        for value in values:
+            self.push(value)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        if self._count == self.size:
+            evicted = self._buffer[self._head]
+            self._sum -= evicted
+            self._sumsq -= evicted * evicted
+        else:
+            self._count += 1
+
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.size
+        self._sum += value
+        self._sumsq += value * value
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.size:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        values = self.values()
+        self._sum = math.fsum(values)
+        self._sumsq = math.fsum(value * value for value in values)
+        self._since_rebuild = 0
+
+    def values(self) -> list[float]:
+        """Oldest to newest."""
+        if self._count < self.size:
+            return self._buffer[: self._count]
+        return self._buffer[self._head :] + self._buffer[: self._head]
+
+    def ago(self, lag: int) -> float | None:
+        """Value pushed `lag` steps before the latest one (0 = latest)."""
+        if lag >= self._count:
+            return None
+        return self._buffer[(self._head - 1 - lag) % self.size]
+
+    def mean(self, min_periods: int = 1) -> float | None:
+        if self._count < max(min_periods, 1):
+            return None
+        return self._sum / self._count
+
+    def std(self, min_periods: int = 2, ddof: int = 1) -> float | None:
+        if self._count < max(min_periods, ddof + 1):
+            return None
+        mean = self._sum / self._count
+        variance = (self._sumsq - (self._count * mean * mean)) / (self._count - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+
+class RollingCovariance:
+    """
+    Paired ring buffer with running Σx, Σy, Σx², Σy² and Σxy.
+
+    Covariance and correlation of the last `size` (x, y) pairs cost O(1) per
+    push; sums are rebuilt periodically as in RollingWindow.
+    """
+
+    def __init__(self, size: int, pairs: Iterable[tuple[float, float]] = ()):
+        self.size = int(size)
+        self._buffer: list[tuple[float, float]] = [(0.0, 0.0)] * self.size
+        self._head = 0
+        self._count = 0
+        self._sx = self._sy = self._sxx = self._syy = self._sxy = 0.0
+        self._since_rebuild = 0
+        for x, y in pairs:
+            self.push(x, y)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, x: float, y: float) -> None:
+        x, y = float(x), float(y)
+        if self._count == self.size:
+            old_x, old_y = self._buffer[self._head]
+            self._sx -= old_x
+            self._sy -= old_y
+            self._sxx -= old_x * old_x
+            self._syy -= old_y * old_y
+            self._sxy -= old_x * old_y
+        else:
+            self._count += 1
+
+        self._buffer[self._head] = (x, y)
+        self._head = (self._head + 1) % self.size
+        self._sx += x
+        self._sy += y
+        self._sxx += x * x
+        self._syy += y * y
+        self._sxy += x * y
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.size:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        pairs = self.values()
+        self._sx = math.fsum(x for x, _ in pairs)
+        self._sy = math.fsum(y for _, y in pairs)
+        self._sxx = math.fsum(x * x for x, _ in pairs)
+        self._syy = math.fsum(y * y for _, y in pairs)
+        self._sxy = math.fsum(x * y for x, y in pairs)
+        self._since_rebuild = 0
+
+    def values(self) -> list[tuple[float, float]]:
+        """Oldest to newest."""
+        if self._count < self.size:
+            return self._buffer[: self._count]
+        return self._buffer[self._head :] + self._buffer[: self._head]
+
+    def _centered(self) -> tuple[float, float, float]:
+        n = self._count
+        return (
+            self._sxx - (self._sx * self._sx / n),
+            self._syy - (self._sy * self._sy / n),
+            self._sxy - (self._sx * self._sy / n),
+        )
+
+    def covariance(self, min_periods: int = 2, ddof: int = 1) -> float | None:
+        if self._count < max(min_periods, ddof + 1):
+            return None
+        return self._centered()[2] / (self._count - ddof)
+
+    def correlation(self, min_periods: int = 2) -> float | None:
+        if self._count < max(min_periods, 2):
+            return None
+        sxx, syy, sxy = self._centered()
+        denominator = math.sqrt(max(sxx, 0.0) * max(syy, 0.0))
+        if denominator <= 1e-300:
+            return None
+        return max(-1.0, min(1.0, sxy / denominator))
+
+
+class RollingMax:
+    """Sliding-window maximum over the last `size` pushes via a monotonic deque."""
+
+    _sign = 1.0
+
+    def __init__(self, size: int, values: Iterable[float] = ()):
+        self.size = int(size)
+        self._deque: deque[tuple[int, float]] = deque()
+        self._seq = 0
+        for value in values:
+            self.push(value)
+
+    def __len__(self) -> int:
+        return min(self._seq, self.size)
+
+    def push(self, value: float) -> None:
+        value = self._sign * float(value)
+        while self._deque and self._deque[-1][1] <= value:
+            self._deque.pop()
+        self._deque.append((self._seq, value))
+        self._seq += 1
+        while self._deque[0][0] <= self._seq - 1 - self.size:
+            self._deque.popleft()
+
+    def value(self, min_periods: int = 1) -> float | None:
+        if not self._deque or len(self) < min_periods:
+            return None
+        return self._sign * self._deque[0][1]
+
+    def max(self, min_periods: int = 1) -> float | None:
+        return self.value(min_periods)
+
+
+class RollingMin(RollingMax):
+    """Sliding-window minimum; a RollingMax over negated values."""
+
+    _sign = -1.0
+
+    def min(self, min_periods: int = 1) -> float | None:
+        return self.value(min_periods)
+
+
+class SlidingTrend:
+    """
+    OLS slope t-statistic of the last `size` values against 0..n-1.
+
+    Keeps Σy, Σy² and Σ(j·y) over a global index j; the window's own x is
+    j - start, so every sum updates in O(1) per push. Values are stored
+    relative to an anchor that is reset on each periodic rebuild.
+    """
+
+    def __init__(self, size: int, values: Iterable[float] = ()):
+        self.size = int(size)
+        self._window: deque[float] = deque()
+        self._anchor = 0.0
+        self._start = 0
+        self._sy = 0.0
+        self._syy = 0.0
+        self._sjy = 0.0
+        self._since_rebuild = 0
+        for value in values:
+            self.push(value)
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        if not self._window:
+            self._anchor = value
+
+        if len(self._window) == self.size:
+            evicted = self._window.popleft() - self._anchor
+            self._sy -= evicted
+            self._syy -= evicted * evicted
+            self._sjy -= self._start * evicted
+            self._start += 1
+
+        centered = value - self._anchor
+        position = self._start + len(self._window)
+        self._window.append(value)
+        self._sy += centered
+        self._syy += centered * centered
+        self._sjy += position * centered
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.size:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._anchor = self._window[0]
+        self._start = 0
+        centered = [value - self._anchor for value in self._window]
+        self._sy = math.fsum(centered)
+        self._syy = math.fsum(value * value for value in centered)
+        self._sjy = math.fsum(idx * value for idx, value in enumerate(centered))
+        self._since_rebuild = 0
+
+    def tscore(self, min_periods: int = 20, clip: float = 8.0) -> float:
+        n = len(self._window)
+        if n < min_periods:
+            return 0.0
+
+        sx = n * (n - 1) / 2.0
+        sxx_c = (n * (n * n - 1)) / 12.0
+        sxy_c = (self._sjy - (self._start * self._sy)) - (sx * self._sy / n)
+        syy_c = self._syy - (self._sy * self._sy / n)
+        if sxx_c <= 1e-12:
+            return 0.0
+
+        slope = sxy_c / sxx_c
+        sse = max(syy_c - (slope * sxy_c), 0.0)
+        mse = sse / max(1, n - 2)
+        std_err = math.sqrt(mse / sxx_c)
+        if std_err <= 1e-12:
+            return 0.0
+        return float(np.clip(slope / std_err, -clip, clip))
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.features.rolling import RollingMax, RollingWindow, SlidingTrend
+from src.utils.project_paths import STATE_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+HISTORICAL_CONTEXT_STATE_PATH = STATE_DIR / "historical_context.json"
+STATE_VERSION = 1
+# Bump when the definition of any context feature changes.
+CONTEXT_VERSION = 1
+
+ANNUALIZATION = math.sqrt(365.0)
+SMA_WINDOW = 365
+VOL_SHORT_WINDOW = 30
+VOL_LONG_WINDOW = 90
+MOMENTUM_LAG = 63
+PEAK_WINDOW = 180
+TREND_WINDOW = 90
+
+DEFAULT_CONTEXT = {
+    "mvrv_zscore": 0.0,
+    "realized_vol_30d": 0.65,
+    "realized_vol_90d": 0.70,
+    "momentum_63d": 0.0,
+    "drawdown_180d": 0.0,
+    "trend_tscore_90d": 0.0,
+}
+
+
+def _safe_last(series: pd.Series, default: float = 0.0) -> float:
+    if series is None or series.empty:
+        return float(default)
+    value = series.iloc[-1]
+    if pd.isna(value):
+        return float(default)
+    return float(value)
+
+
+def _trend_tscore(log_prices: np.ndarray) -> float:
+    if log_prices.size < 20:
+        return 0.0
+
+    x = np.arange(log_prices.size, dtype=float)
+    slope, intercept = np.polyfit(x, log_prices, 1)
+    fitted = (slope * x) + intercept
+    residuals = log_prices - fitted
+
+    dof = max(1, log_prices.size - 2)
+    mse = float(np.sum(residuals**2) / dof)
+    denom = float(np.sum((x - x.mean()) ** 2))
+    if denom <= 1e-12:
+        return 0.0
+
+    std_err = math.sqrt(mse / denom)
+    if std_err <= 1e-12:
+        return 0.0
+
+    t_score = slope / std_err
+    return float(np.clip(t_score, -8.0, 8.0))
+
+
+def _finite_or_default(context: dict) -> dict:
+    for key, value in list(context.items()):
+        if value is None or not math.isfinite(value):
+            context[key] = DEFAULT_CONTEXT[key]
+    return context
+
+
+def _context_columns(prices: pd.Series, window_days: int) -> pd.DataFrame:
+    df = pd.DataFrame({"price": prices.astype(float)})
+
+    # MVRV proxy and long-horizon valuation context.
+    df["sma_365"] = df["price"].rolling(window=SMA_WINDOW).mean()
+    df["mvrv_proxy"] = df["price"] / df["sma_365"]
+
+    # Calculate Z-Score (4-year window)
+    rolling_mean = df["mvrv_proxy"].rolling(window=window_days, min_periods=SMA_WINDOW).mean()
+    rolling_std = df["mvrv_proxy"].rolling(window=window_days, min_periods=SMA_WINDOW).std()
+    df["mvrv_zscore"] = (df["mvrv_proxy"] - rolling_mean) / rolling_std
+
+    # Volatility/momentum state features.
+    returns = df["price"].pct_change()
+    df["realized_vol_30d"] = returns.rolling(window=VOL_SHORT_WINDOW, min_periods=10).std() * ANNUALIZATION
+    df["realized_vol_90d"] = returns.rolling(window=VOL_LONG_WINDOW, min_periods=20).std() * ANNUALIZATION
+    df["momentum_63d"] = (df["price"] / df["price"].shift(MOMENTUM_LAG)) - 1.0
+    rolling_peak_180 = df["price"].rolling(window=PEAK_WINDOW, min_periods=30).max()
+    df["drawdown_180d"] = (df["price"] / rolling_peak_180) - 1.0
+    return df
+
+
+def compute_context_from_prices(prices: pd.Series, window_days: int = 1460) -> dict:
+    """Full pandas recomputation of the historical context from daily closes."""
+    df = _context_columns(prices, window_days)
+    log_prices_90d = np.log(df["price"].dropna().tail(TREND_WINDOW).to_numpy(dtype=float))
+
+    # We use the last available value of each column as the current context.
+    return _finite_or_default(
+        {
+            "mvrv_zscore": _safe_last(df["mvrv_zscore"], 0.0),
+            "realized_vol_30d": _safe_last(df["realized_vol_30d"], 0.65),
+            "realized_vol_90d": _safe_last(df["realized_vol_90d"], 0.70),
+            "momentum_63d": _safe_last(df["momentum_63d"], 0.0),
+            "drawdown_180d": _safe_last(df["drawdown_180d"], 0.0),
+            "trend_tscore_90d": _trend_tscore(log_prices_90d),
+        }
+    )
+
+
+class HistoricalContextState:
+    """
+    Persisted rolling state behind `fetch_historical_context`.
+
+    Each daily close updates SMA-365, the MVRV-proxy z-score window, 30/90d
+    realized vol, 63d momentum, the 180d peak and the 90d trend t-score in
+    O(1). Only the raw windows (closes and proxies) are written to disk; the
+    running sums are rebuilt from them on load.
+    """
+
+    def __init__(self, window_days: int = 1460):
+        self.window_days = int(window_days)
+        self.last_date: str | None = None
+        self._closes = RollingWindow(SMA_WINDOW)
+        self._proxies = RollingWindow(self.window_days)
+        self._returns_30 = RollingWindow(VOL_SHORT_WINDOW)
+        self._returns_90 = RollingWindow(VOL_LONG_WINDOW)
+        self._peak = RollingMax(PEAK_WINDOW)
+        self._trend = SlidingTrend(TREND_WINDOW)
+
+    def update(self, date_str: str, close: float) -> bool:
+        """Push the close for `date_str`; returns False when it is skipped."""
+        date_str = str(date_str)[:10]
+        close = float(close)
+        if self.last_date is not None and date_str <= self.last_date:
+            return False
+        if not math.isfinite(close) or close <= 0.0:
+            LOGGER.warning("Skipping invalid close %s for %s", close, date_str)
+            return False
+
+        previous = self._closes.ago(0)
+        self._closes.push(close)
+        if len(self._closes) == SMA_WINDOW:
+            self._proxies.push(close / self._closes.mean())
+        if previous is not None:
+            daily_return = (close / previous) - 1.0
+            self._returns_30.push(daily_return)
+            self._returns_90.push(daily_return)
+        self._peak.push(close)
+        self._trend.push(math.log(close))
+        self.last_date = date_str
+        return True
+
+    def extend(self, prices: pd.Series) -> int:
+        pushed = 0
+        for timestamp, close in prices.dropna().items():
+            pushed += int(self.update(pd.Timestamp(timestamp).strftime("%Y-%m-%d"), close))
+        return pushed
+
+    @classmethod
+    def from_prices(cls, prices: pd.Series, window_days: int = 1460) -> "HistoricalContextState":
+        state = cls(window_days=window_days)
+        state.extend(prices)
+        return state
+
+    def context(self) -> dict:
+        close = self._closes.ago(0)
+        if close is None:
+            return dict(DEFAULT_CONTEXT)
+
+        zscore = None
+        proxy = self._proxies.ago(0)
+        proxy_mean = self._proxies.mean(min_periods=SMA_WINDOW)
+        proxy_std = self._proxies.std(min_periods=SMA_WINDOW)
+        if proxy is not None and proxy_mean is not None and proxy_std:
+            zscore = (proxy - proxy_mean) / proxy_std
+
+        vol_30 = self._returns_30.std(min_periods=10)
+        vol_90 = self._returns_90.std(min_periods=20)
+        lagged = self._closes.ago(MOMENTUM_LAG)
+        peak = self._peak.max(min_periods=30)
+
+        return _finite_or_default(
+            {
+                "mvrv_zscore": zscore,
+                "realized_vol_30d": None if vol_30 is None else vol_30 * ANNUALIZATION,
+                "realized_vol_90d": None if vol_90 is None else vol_90 * ANNUALIZATION,
+                "momentum_63d": None if lagged is None else (close / lagged) - 1.0,
+                "drawdown_180d": None if peak is None else (close / peak) - 1.0,
+                "trend_tscore_90d": self._trend.tscore(),
+            }
+        )
+
+    def verify(self, prices: pd.Series, tolerance: float = 1e-8) -> dict[str, float]:
+        """
+        Compare the incremental context with a full recomputation over `prices`
+        (which must end at `last_date`). Returns the features whose absolute
+        difference exceeds `tolerance`.
+        """
+        expected = compute_context_from_prices(prices, window_days=self.window_days)
+        actual = self.context()
+        return {
+            key: abs(actual[key] - expected[key])
+            for key in expected
+            if abs(actual[key] - expected[key]) > tolerance * max(1.0, abs(expected[key]))
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "window_days": self.window_days,
+            "last_date": self.last_date,
+            "closes": self._closes.values(),
+            "proxies": self._proxies.values(),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "HistoricalContextState":
+        state = cls(window_days=int(payload["window_days"]))
+        closes = [float(value) for value in payload.get("closes", [])]
+        state._closes = RollingWindow(SMA_WINDOW, closes)
+        state._proxies = RollingWindow(state.window_days, payload.get("proxies", []))
+        returns = [(current / previous) - 1.0 for previous, current in zip(closes, closes[1:])]
+        state._returns_30 = RollingWindow(VOL_SHORT_WINDOW, returns[-VOL_SHORT_WINDOW:])
+        state._returns_90 = RollingWindow(VOL_LONG_WINDOW, returns[-VOL_LONG_WINDOW:])
+        state._peak = RollingMax(PEAK_WINDOW, closes[-PEAK_WINDOW:])
+        state._trend = SlidingTrend(TREND_WINDOW, (math.log(value) for value in closes[-TREND_WINDOW:]))
+        state.last_date = payload.get("last_date")
+        return state
+
+    def save(self, path: Path = HISTORICAL_CONTEXT_STATE_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = HISTORICAL_CONTEXT_STATE_PATH, window_days: int = 1460) -> "HistoricalContextState | None":
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable context state %s: %s", path, exc)
+            return None
+        if payload.get("version") != STATE_VERSION or int(payload.get("window_days", 0)) != int(window_days):
+            LOGGER.info("Context state %s does not match the requested layout; rebuilding.", path)
+            return None
+        return cls.from_dict(payload)
@@ -17,6 +17,8 @@ class BitcoinSeasonality:
         12: 5.0   # Dec: Moderate
     }
 
+    POSITIVE_STATUSES = ("BULLISH", "VERY BULLISH")
+
     def get_seasonality(self, date_str: str):
         """
         Returns the seasonality stats for the month of the given date.
@@ -24,17 +26,27 @@ class BitcoinSeasonality:
         dt = datetime.strptime(date_str, "%Y-%m-%d")
         month = dt.month
         avg_return = self.MONTHLY_AVG.get(month, 0.0)
-        
-        status = "NEUTRAL"
-        if avg_return > 10.0:
-            status = "VERY BULLISH"
-        elif avg_return > 3.0:
-            status = "BULLISH"
-        elif avg_return < -3.0:
-            status = "BEARISH"
-            
         return {
             "month": month,
             "avg_return_pct": avg_return,
-            "status": status
+            "status": self.status_for(avg_return)
         }
+
+    @staticmethod
+    def status_for(avg_return):
+        if avg_return > 10.0:
+            return "VERY BULLISH"
+        if avg_return > 3.0:
+            return "BULLISH"
+        if avg_return < -3.0:
+            return "BEARISH"
+        return "NEUTRAL"
+
+    @classmethod
+    def month_table(cls):
+        """
+        (statuses, is_positive) lists indexed by month number, for vectorized
+        lookups. Index 0 (unknown month) is NEUTRAL and not positive.
+        """
+        statuses = ["NEUTRAL"] + [cls.status_for(cls.MONTHLY_AVG.get(month, 0.0)) for month in range(1, 13)]
+        return statuses, [status in cls.POSITIVE_STATUSES for status in statuses]
@@ -61,7 +61,7 @@ def upsert_score_history(
     return csv_path
 
 
-def run_daily_paper_trading(processed_file_path: str | Path | None = None) -> dict:
+def run_daily_paper_trading(processed_file_path: str | Path | None = None, calibrator: str = "historical") -> dict:
     LOGGER.info("Starting daily paper trading routine.")
 
     processed_file_path = Path(processed_file_path) if processed_file_path else latest_processed_data_file()
@@ -77,7 +77,7 @@ def run_daily_paper_trading(processed_file_path: str | Path | None = None) -> di
     date_str = data["timestamp"][:10]
 
     # 4. Resolve live model from objective OOS gate output.
-    live_setup = build_live_components(min_trade_usd=20.0)
+    live_setup = build_live_components(min_trade_usd=20.0, calibrator=calibrator)
     scorer = live_setup["scorer"]
     pm = live_setup["manager"]
     LOGGER.info(
@@ -22,28 +22,93 @@ def run_download(target_date: date | datetime | str | None = None, strict: bool
     return download_all_data(output_path=output_path, strict=strict)
 
 
-def run_processing(raw_file: str | Path | None = None) -> dict:
+def run_processing(
+    raw_file: str | Path | None = None,
+    verify_context: bool = False,
+    use_cache: bool = True,
+    strict: bool = False,
+) -> dict:
+    from src.features.context_cache import ContextCache
     from src.strategy.process_data import process_daily_data
 
     target_file = Path(raw_file) if raw_file else latest_raw_data_file()
     if target_file is None:
         raise FileNotFoundError("No raw data file available to process.")
-    return process_daily_data(target_file)
+    cache = ContextCache() if use_cache else None
+    return process_daily_data(target_file, verify_context=verify_context, cache=cache, strict=strict)
 
 
-def run_paper(processed_file: str | Path | None = None) -> dict:
+def run_processing_range(
+    start_date: date | datetime | str,
+    end_date: date | datetime | str | None = None,
+    use_cache: bool = True,
+    strict: bool = False,
+) -> dict:
+    from src.features.context_cache import ContextCache
+    from src.strategy.process_data import process_range
+
+    start = normalize_date(start_date).isoformat()
+    end = normalize_date(end_date).isoformat()
+    return process_range(start, end, cache=ContextCache() if use_cache else None, strict=strict)
+
+
+def run_paper(processed_file: str | Path | None = None, calibrator: str = "historical") -> dict:
     from src.main_paper_trading import run_daily_paper_trading
 
     target_file = Path(processed_file) if processed_file else latest_processed_data_file()
     if target_file is None:
         raise FileNotFoundError("No processed data file available for paper trading.")
-    return run_daily_paper_trading(target_file)
+    return run_daily_paper_trading(target_file, calibrator=calibrator)
+
+
+def run_report_compaction(
+    keep_days: int = 90,
+    today: date | datetime | str | None = None,
+    dry_run: bool = False,
+) -> dict:
+    from src.execution.report_archive import RetentionPolicy, compact_reports
+
+    return compact_reports(RetentionPolicy(keep_days=keep_days), today=today, dry_run=dry_run)
+
+
+def run_feature_refresh(
+    only: list[str] | None = None,
+    adopt: bool = False,
+    dry_run: bool = False,
+    workers: int = 8,
+) -> dict:
+    from src.strategy.feature_refresh import refresh_features
+
+    return refresh_features(only=only or None, adopt=adopt, dry_run=dry_run, workers=workers)
+
+
+def run_stream(
+    url: str | None = None,
+    replay_file: str | Path | None = None,
+    max_messages: int | None = None,
+    delay: float = 0.0,
+) -> dict:
+    import asyncio
+
+    from src.data.stream import BINANCE_TRADE_STREAM, StreamIngestor, consume, load_replay_messages, replay
+
+    ingestor = StreamIngestor()
+    if replay_file:
+        asyncio.run(replay(load_replay_messages(Path(replay_file)), ingestor, delay=delay, max_messages=max_messages))
+    else:
+        asyncio.run(consume(url or BINANCE_TRADE_STREAM, ingestor, max_messages=max_messages))
+    ingestor.engine.flush()
+    return ingestor.stats()
 
 
-def run_full_pipeline(target_date: date | datetime | str | None = None, strict: bool = False) -> dict:
+def run_full_pipeline(
+    target_date: date | datetime | str | None = None,
+    strict: bool = False,
+    calibrator: str = "historical",
+) -> dict:
     download_result = run_download(target_date=target_date, strict=strict)
-    process_result = run_processing(download_result["output_path"])
-    paper_result = run_paper(process_result["output_path"])
+    process_result = run_processing(download_result["output_path"], strict=strict)
+    paper_result = run_paper(process_result["output_path"], calibrator=calibrator)
 
     return {
         "download": download_result,
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.features.pipeline import day_frame
+
+
+def as_feature_frame(features: pd.DataFrame | Mapping[str, Sequence] | Sequence[dict]) -> pd.DataFrame:
+    """
+    Columnar scorer input: an assembled feature frame, a mapping of flat
+    columns, or a list of nested day dicts.
+    """
+    if isinstance(features, pd.DataFrame):
+        return features
+    if isinstance(features, Mapping):
+        return pd.DataFrame(dict(features))
+    return day_frame(list(features))
+
+
+def float_column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    """Numeric column with missing or unparseable values as NaN."""
+    if name not in frame.columns:
+        return np.full(len(frame), np.nan)
+    return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def flag_column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    """Boolean column; a missing flag counts as False, like `flags.get(name)`."""
+    if name not in frame.columns:
+        return np.zeros(len(frame), dtype=bool)
+    column = frame[name]
+    if column.dtype == bool:
+        return column.to_numpy()
+    return column.astype("boolean").fillna(False).to_numpy(dtype=bool)
+
+
+def category_column(frame: pd.DataFrame, name: str, default: str) -> np.ndarray:
+    if name not in frame.columns:
+        return np.full(len(frame), default, dtype=object)
+    return frame[name].astype(object).where(frame[name].notna(), default).to_numpy(dtype=object)
+
+
+def round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    `np.round` that agrees element for element with Python's `round`, which
+    the scalar scorers use. np.round scales by 10**ndigits before rounding,
+    which can flip values sitting on a decimal tie (e.g. a blended 12.345);
+    those few are rounded by Python instead.
+    """
+    values = np.asarray(values, dtype=float)
+    scaled = values * (10.0**ndigits)
+    rounded = np.round(values, ndigits)
+    with np.errstate(invalid="ignore"):
+        near_tie = np.abs((scaled - np.floor(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(float(value), ndigits) for value in values[near_tie]]
+    return rounded
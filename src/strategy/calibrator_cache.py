@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Iterable
+
+from src.utils.project_paths import PROJECT_ROOT, STATE_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+CALIBRATOR_CACHE_DIR = STATE_DIR / "calibrator_cache"
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 32
+
+
+def files_fingerprint(files: Iterable[Path]) -> str:
+    """
+    Digest of a file list by name and content. Rewriting, adding or dropping
+    a processed file changes it; a fresh checkout (new modification times)
+    does not.
+    """
+    digest = hashlib.sha1()
+    for path in files:
+        content = path.read_bytes()
+        digest.update(f"{path.name}|{len(content)}|{hashlib.sha1(content).hexdigest()}\n".encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+
+def directory_key(directory: Path) -> str:
+    """`directory` relative to the project root when inside it, so keys match across checkouts."""
+    directory = Path(directory).resolve()
+    try:
+        return directory.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return str(directory)
+
+
+def params_key(**params) -> str:
+    payload = json.dumps({"cache_version": CACHE_VERSION, **params}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class CalibratorCache:
+    """
+    Fitted calibrator statistics on disk, one small JSON file per entry.
+
+    Entries are named `<params>-<fingerprint>.json`: the fit parameters and
+    code version, then the history fingerprint. Storing a fit drops every other
+    fingerprint for the same parameters, and the directory is capped at
+    `max_entries` files by modification time.
+    """
+
+    def __init__(self, directory: Path = CALIBRATOR_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.max_entries = max(int(max_entries), 1)
+
+    def _path(self, params: str, fingerprint: str) -> Path:
+        return self.directory / f"{params}-{fingerprint}.json"
+
+    def load(self, params: str, fingerprint: str) -> dict | None:
+        path = self._path(params, fingerprint)
+        try:
+            payload = json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable calibrator cache entry %s: %s", path, exc)
+            return None
+        if payload.get("version") != CACHE_VERSION:
+            return None
+        return payload
+
+    def save(self, params: str, fingerprint: str, payload: dict) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(params, fingerprint)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"version": CACHE_VERSION, **payload}), encoding="utf-8")
+        tmp_path.replace(path)
+        self._evict(params, keep=path)
+        return path
+
+    def _evict(self, params: str, keep: Path) -> None:
+        entries = [path for path in self.directory.glob("*.json") if path != keep]
+        superseded = [path for path in entries if path.name.startswith(f"{params}-")]
+        remaining = sorted(set(entries) - set(superseded), key=lambda path: path.stat().st_mtime_ns)
+        overflow = max(len(remaining) + 1 - self.max_entries, 0)
+        for path in superseded + remaining[:overflow]:
+            path.unlink(missing_ok=True)
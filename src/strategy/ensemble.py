@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.strategy.batch_inputs import as_feature_frame, round_like_python
+from src.strategy.legacy_score import LegacyQuantScorer
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator
+
+
+# A head is any object with `batch_values(inputs: EnsembleBatch)` and
+# `day_values(inputs: EnsembleDay)` returning (long_term, medium_term) scores,
+# arrays and floats respectively. Heads read the shared inputs they need;
+# those are computed on first use and reused by every other head. Heads that
+# read advanced z-scores list their features in `features`.
+
+
+class LegacyHead:
+    """LegacyQuantScorer, optionally with its own normalization ranges."""
+
+    def __init__(self, ranges: Mapping[str, tuple[float, float, bool]] | None = None):
+        self.ranges = {**LegacyQuantScorer.NORMALIZATION_RANGES, **(ranges or {})}
+        unknown = set(self.ranges) - set(LegacyQuantScorer.NORMALIZATION_RANGES)
+        if unknown:
+            raise ValueError(f"Unknown normalized features: {sorted(unknown)}")
+        for name, (min_val, max_val, _) in self.ranges.items():
+            if max_val <= min_val:
+                raise ValueError(f"Range of {name} must have min < max")
+
+    def batch_values(self, inputs: EnsembleBatch) -> tuple[np.ndarray, np.ndarray]:
+        scores = inputs.legacy._batch_model(inputs.legacy_columns, self.ranges)
+        return scores["long_term"], scores["medium_term"]
+
+    def day_values(self, inputs: EnsembleDay) -> tuple[float, float]:
+        legacy = inputs.legacy
+        return (
+            round(legacy._long_term_parts(inputs.day, self.ranges)[0] * 100, 2),
+            round(legacy._medium_term_parts(inputs.day, self.ranges)[0] * 100, 2),
+        )
+
+
+class AdvancedHead:
+    """AdvancedQuantScorer, optionally with its own block specs (same block names)."""
+
+    def __init__(
+        self,
+        long_term_blocks: Mapping[str, Sequence[tuple[str, float, float]]] | None = None,
+        medium_term_blocks: Mapping[str, Sequence[tuple[str, float, float]]] | None = None,
+    ):
+        self.long_term_blocks = dict(long_term_blocks or AdvancedQuantScorer.LONG_TERM_BLOCKS)
+        self.medium_term_blocks = dict(medium_term_blocks or AdvancedQuantScorer.MEDIUM_TERM_BLOCKS)
+        for blocks, default in (
+            (self.long_term_blocks, AdvancedQuantScorer.LONG_TERM_BLOCKS),
+            (self.medium_term_blocks, AdvancedQuantScorer.MEDIUM_TERM_BLOCKS),
+        ):
+            if set(blocks) != set(default):
+                raise ValueError(f"Blocks must be exactly {list(default)}")
+        self.features = sorted(
+            {
+                feature
+                for blocks in (self.long_term_blocks, self.medium_term_blocks)
+                for specs in blocks.values()
+                for feature, _, _ in specs
+            }
+        )
+        unknown = set(self.features) - set(HistoricalFeatureCalibrator.FEATURE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown features: {sorted(unknown)}")
+
+    def batch_values(self, inputs: EnsembleBatch) -> tuple[np.ndarray, np.ndarray]:
+        advanced = inputs.advanced
+        zscores, flags, cycle_prior_signal = inputs.advanced_inputs
+        blocks = {
+            name: advanced._aggregate_block_batch(zscores, specs)
+            for horizon in (self.long_term_blocks, self.medium_term_blocks)
+            for name, specs in horizon.items()
+        }
+        scores = advanced._batch_model(blocks, flags, cycle_prior_signal)
+        return scores["long_term"], scores["medium_term"]
+
+    def day_values(self, inputs: EnsembleDay) -> tuple[float, float]:
+        advanced = inputs.advanced
+        zscores = inputs.zscores
+        lt = advanced._long_term_state(
+            inputs.day,
+            {name: advanced._block_values(zscores, specs) for name, specs in self.long_term_blocks.items()},
+        )
+        mt = advanced._medium_term_state(
+            inputs.day,
+            lt,
+            {name: advanced._block_values(zscores, specs) for name, specs in self.medium_term_blocks.items()},
+        )
+        return round(lt["final"] * 100.0, 2), round(mt["final"] * 100.0, 2)
+
+
+class EnsembleBatch:
+    """Inputs shared by the heads for one batch, each computed on first use."""
+
+    def __init__(self, ensemble: ScoringEnsemble, frame: pd.DataFrame):
+        self.ensemble = ensemble
+        self.frame = frame
+
+    @property
+    def legacy(self) -> LegacyQuantScorer:
+        return self.ensemble.legacy
+
+    @property
+    def advanced(self) -> AdvancedQuantScorer:
+        return self.ensemble.advanced
+
+    @cached_property
+    def legacy_columns(self) -> dict[str, np.ndarray]:
+        return self.legacy._batch_inputs(self.frame)
+
+    @cached_property
+    def advanced_inputs(self) -> tuple[dict[str, tuple[np.ndarray, np.ndarray]], dict[str, np.ndarray], np.ndarray]:
+        return self.advanced._batch_inputs(self.frame, self.ensemble.advanced_features)
+
+
+class EnsembleDay:
+    """Inputs shared by the heads for one day dict."""
+
+    def __init__(self, ensemble: ScoringEnsemble, day: dict):
+        self.ensemble = ensemble
+        self.day = day
+
+    @property
+    def legacy(self) -> LegacyQuantScorer:
+        return self.ensemble.legacy
+
+    @property
+    def advanced(self) -> AdvancedQuantScorer:
+        return self.ensemble.advanced
+
+    @cached_property
+    def zscores(self) -> dict[str, tuple[float, float, float | None]]:
+        calibrator = self.advanced._calibrator
+        if self.day.get("timestamp"):
+            calibrator.as_of(self.day["timestamp"])
+        features = self.ensemble.advanced_features
+        return {feature: self.advanced._feature_zscore(self.day, feature) for feature in features}
+
+
+def _same_input(left, right) -> bool:
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(a is b for a, b in zip(left, right))
+    return left is right
+
+
+class ScoringEnsemble:
+    """
+    N scorer heads evaluated in one pass over shared features.
+
+    The feature frame, the legacy normalized columns and the advanced
+    z-scores, flags and cycle priors are computed once per batch (or day)
+    and shared by every head, so each extra head costs only its own block
+    aggregation and model. The ensemble score is the weighted mean of the
+    heads, rounded like the scorers. `weights` default to 1.0 per head; a
+    head left out of a given `weights` mapping is evaluated with weight 0,
+    e.g. a challenger tracked only through `head_scorer`.
+    """
+
+    def __init__(
+        self,
+        heads: Mapping[str, object] | None = None,
+        weights: Mapping[str, float] | None = None,
+        lookback_files: int = 900,
+        calibrator_max_date: str | None = None,
+        calibrator: HistoricalFeatureCalibrator | None = None,
+    ):
+        self.heads = dict(heads) if heads is not None else {"legacy": LegacyHead(), "advanced": AdvancedHead()}
+        if not self.heads:
+            raise ValueError("An ensemble needs at least one head")
+        raw_weights = {name: 1.0 for name in self.heads} if weights is None else dict(weights)
+        unknown = set(raw_weights) - set(self.heads)
+        if unknown:
+            raise ValueError(f"Weights for unknown heads: {sorted(unknown)}")
+        if any(weight < 0 for weight in raw_weights.values()) or sum(raw_weights.values()) <= 0:
+            raise ValueError("Head weights must be non-negative with a positive total")
+        total = sum(raw_weights.values())
+        self.weights = {name: raw_weights.get(name, 0.0) / total for name in self.heads}
+
+        self.lookback_files = lookback_files
+        self.calibrator_max_date = calibrator_max_date
+        self._calibrator = calibrator
+        self.legacy = LegacyQuantScorer()
+        self._advanced: AdvancedQuantScorer | None = None
+        self.advanced_features = sorted(
+            {feature for head in self.heads.values() for feature in getattr(head, "features", ())}
+        )
+        self._last_batch: tuple[object, dict] | None = None
+        self._last_day: tuple[object, dict] | None = None
+
+    @classmethod
+    def blend(cls, advanced_weight: float = 0.25, **kwargs) -> ScoringEnsemble:
+        """The legacy/advanced pair of `QuantScorer(mode="blend")`."""
+        advanced_weight = max(0.0, min(1.0, advanced_weight))
+        return cls(weights={"legacy": 1.0 - advanced_weight, "advanced": advanced_weight}, **kwargs)
+
+    @property
+    def advanced(self) -> AdvancedQuantScorer:
+        if self._advanced is None:
+            self._advanced = AdvancedQuantScorer(
+                lookback_files=self.lookback_files,
+                calibrator_max_date=self.calibrator_max_date,
+                calibrator=self._calibrator,
+            )
+        return self._advanced
+
+    def evaluate_batch(self, features: pd.DataFrame | Mapping[str, Sequence] | Sequence[dict]) -> dict:
+        """
+        Ensemble `long_term`/`medium_term` arrays plus `heads`, each head's own
+        arrays. The last batch is kept, so evaluating the same frame (or the
+        same day dicts) again is free.
+        """
+        if not isinstance(features, (pd.DataFrame, Mapping)):
+            features = list(features)
+        if self._last_batch is not None and _same_input(self._last_batch[0], features):
+            return self._last_batch[1]
+
+        inputs = EnsembleBatch(self, as_feature_frame(features))
+        heads = {}
+        for name, head in self.heads.items():
+            lt, mt = head.batch_values(inputs)
+            heads[name] = {"long_term": lt, "medium_term": mt}
+        result = {
+            "long_term": round_like_python(self._weighted({name: head["long_term"] for name, head in heads.items()}), 2),
+            "medium_term": round_like_python(self._weighted({name: head["medium_term"] for name, head in heads.items()}), 2),
+            "heads": heads,
+        }
+        self._last_batch = (features, result)
+        return result
+
+    def evaluate_day(self, day: dict) -> dict:
+        """Single-day `evaluate_batch`: floats, and (long_term, medium_term) per head."""
+        if self._last_day is not None and self._last_day[0] is day:
+            return self._last_day[1]
+
+        inputs = EnsembleDay(self, day)
+        heads = {name: head.day_values(inputs) for name, head in self.heads.items()}
+        result = {
+            "long_term": round(self._weighted({name: values[0] for name, values in heads.items()}), 2),
+            "medium_term": round(self._weighted({name: values[1] for name, values in heads.items()}), 2),
+            "heads": heads,
+        }
+        self._last_day = (day, result)
+        return result
+
+    def _weighted(self, values: dict):
+        # Summed in head order, so a legacy/advanced pair matches QuantScorer's blend exactly.
+        total = 0.0
+        for name, weight in self.weights.items():
+            total = total + (weight * values[name])
+        return total
+
+    def calculate_scores_batch(self, features, components: bool = False) -> dict:
+        if components:
+            raise ValueError("Ensemble scores have no components; use a head's scorer")
+        result = self.evaluate_batch(features)
+        return {"long_term": result["long_term"], "medium_term": result["medium_term"]}
+
+    def calculate_values(self, data: dict) -> tuple[float, float]:
+        result = self.evaluate_day(data)
+        return result["long_term"], result["medium_term"]
+
+    def head_scorer(self, name: str) -> HeadScorer:
+        if name not in self.heads:
+            raise ValueError(f"Unknown head: {name}")
+        return HeadScorer(self, name)
+
+
+class HeadScorer:
+    """
+    One head of an ensemble behind the scorer interface. Views of the same
+    ensemble share its evaluations, so models that differ only in their head
+    (or manager) score each batch once.
+    """
+
+    def __init__(self, ensemble: ScoringEnsemble, name: str):
+        self.ensemble = ensemble
+        self.name = name
+
+    def calculate_scores_batch(self, features, components: bool = False) -> dict:
+        if components:
+            raise ValueError("Head views return scores only; use the scorer itself for components")
+        head = self.ensemble.evaluate_batch(features)["heads"][self.name]
+        return {"long_term": head["long_term"], "medium_term": head["medium_term"]}
+
+    def calculate_values(self, data: dict) -> tuple[float, float]:
+        return self.ensemble.evaluate_day(data)["heads"][self.name]
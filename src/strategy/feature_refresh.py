@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from src.features.calendar import calendar_rows
+from src.features.graph import (
+    CALENDAR_SOURCE,
+    CALENDAR_VERSION,
+    FEATURE_MANIFEST_PATH,
+    PRICE_SOURCE,
+    RAW_SOURCE,
+    FeatureGraph,
+    FeatureManifest,
+    digest_bytes,
+    digest_prices,
+    plan_recompute,
+    source_of,
+)
+from src.features.pipeline import CONTEXT_FIELDS, raw_inputs
+from src.strategy.process_data import _write_processed, context_for_dates, history_closes
+from src.utils.project_paths import PROCESSED_DATA_DIR, RAW_DATA_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+
+
+def _read_bytes(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _stored_value(payload: dict, column: str) -> float:
+    node = payload
+    for part in column.split("."):
+        node = node.get(part) if isinstance(node, dict) else None
+    if node is None or isinstance(node, (dict, list, str)):
+        return np.nan
+    return float(node)
+
+
+def _plain(value):
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str):
+        return value
+    value = float(value)
+    return None if value != value else value
+
+
+def _assign(payload: dict, column: str, value) -> None:
+    if "." not in column:
+        payload[column] = value
+        return
+    section, name = column.split(".", 1)
+    # A snapshot without price data keeps `market_data: null`.
+    if isinstance(payload.get(section), dict):
+        payload[section][name] = value
+
+
+class FeatureStore:
+    """Processed snapshots plus their raw sources, loaded in parallel."""
+
+    def __init__(self, processed_dir: Path, raw_dir: Path, workers: int = DEFAULT_WORKERS):
+        self.processed_dir = Path(processed_dir)
+        self.raw_dir = Path(raw_dir)
+        self.workers = max(int(workers), 1)
+        self.paths = {
+            path.stem.replace("processed_data_", "", 1): path
+            for path in sorted(self.processed_dir.glob("processed_data_*.json"))
+        }
+        self.dates = sorted(self.paths)
+        raw_paths = [self.raw_dir / f"daily_data_{date_str}.json" for date_str in self.dates]
+        with ThreadPoolExecutor(self.workers) as pool:
+            self._processed = dict(zip(self.dates, pool.map(_read_bytes, self.paths.values())))
+            self._raw = dict(zip(self.dates, pool.map(_read_bytes, raw_paths)))
+        self._payloads: dict[str, dict] = {}
+
+    def raw_digests(self) -> dict[str, str]:
+        return {date_str: digest_bytes(raw) for date_str, raw in self._raw.items() if raw is not None}
+
+    def payload(self, date_str: str) -> dict:
+        if date_str not in self._payloads:
+            self._payloads[date_str] = json.loads(self._processed[date_str])
+        return self._payloads[date_str]
+
+    def stored_column(self, column: str, dates: list[str]) -> np.ndarray:
+        return np.array([_stored_value(self.payload(date_str), column) for date_str in dates], dtype=float)
+
+    def raw_frame(self, dates: list[str]) -> pd.DataFrame:
+        rows = [raw_inputs(json.loads(self._raw[date_str])) if self._raw[date_str] else {} for date_str in dates]
+        return pd.DataFrame(rows, index=pd.DatetimeIndex(dates))
+
+    def write(self, updates: dict[str, dict]) -> list[Path]:
+        def write_one(item: tuple[str, dict]) -> Path:
+            date_str, columns = item
+            payload = self.payload(date_str)
+            for column, value in columns.items():
+                _assign(payload, column, value)
+            return _write_processed(payload, self.paths[date_str])
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            return list(pool.map(write_one, updates.items()))
+
+
+def _source_frame(
+    store: FeatureStore,
+    columns: set[str],
+    dates: list[str],
+    prices: pd.Series | None,
+    window_days: int,
+) -> pd.DataFrame:
+    frame = pd.DataFrame(index=pd.DatetimeIndex(dates))
+    sources = {source_of(column) for column in columns}
+
+    if RAW_SOURCE in sources:
+        raw = store.raw_frame(dates)
+        for column in columns:
+            if source_of(column) == RAW_SOURCE:
+                name = column.split(".", 1)[1]
+                frame[column] = raw[name].to_numpy(dtype=float) if name in raw.columns else np.nan
+    if PRICE_SOURCE in sources:
+        context = context_for_dates(dates, prices, window_days=window_days)
+        for name in CONTEXT_FIELDS:
+            frame[f"{PRICE_SOURCE}.{name}"] = context[name].to_numpy()
+    if CALENDAR_SOURCE in sources:
+        calendar = calendar_rows(frame.index.values)
+        for column in columns:
+            if source_of(column) == CALENDAR_SOURCE:
+                frame[column] = calendar[column.split(".", 1)[1]].to_numpy()
+    return frame
+
+
+def refresh_features(
+    processed_dir: Path | None = None,
+    raw_dir: Path | None = None,
+    manifest_path: Path = FEATURE_MANIFEST_PATH,
+    graph: FeatureGraph | None = None,
+    only: Iterable[str] | None = None,
+    prices: pd.Series | None = None,
+    window_days: int = 1460,
+    workers: int = DEFAULT_WORKERS,
+    adopt: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Recomputes the stale columns of the processed history in place.
+
+    Staleness comes from the manifest (see `plan_recompute`); `only` forces
+    the named columns and their dependents instead. Columns that are not
+    stale are read back from the stored files, so the work scales with the
+    number of stale (column, date) pairs. `adopt` records the current store
+    as up to date without recomputing anything. Without `prices` the BTC
+    closes are downloaded, so revised closes are always detected. When no
+    closes are available the price-derived columns are left as stored and
+    the manifest is not saved, so they stay stale for the next run.
+    """
+    graph = graph or FeatureGraph()
+    store = FeatureStore(processed_dir or PROCESSED_DATA_DIR, raw_dir or RAW_DATA_DIR, workers=workers)
+    raw_digests = store.raw_digests()
+    manifest = FeatureManifest.load(manifest_path)
+
+    if prices is None and only is None and store.dates:
+        prices = history_closes(store.dates, window_days=window_days)
+        if prices.empty:
+            LOGGER.warning("No BTC closes available; price-derived columns are not checked for revisions")
+            prices = None
+
+    if only is not None:
+        unknown = set(only) - set(graph.nodes)
+        if unknown:
+            raise KeyError(f"unknown features: {', '.join(sorted(unknown))}")
+        plan = {name: set(store.dates) for name in graph.dependents(only)}
+    elif adopt:
+        plan = {}
+    else:
+        plan = plan_recompute(graph, manifest, store.dates, raw_digests, prices=prices)
+
+    skipped: list[str] = []
+    price_nodes = graph.source_dependents(PRICE_SOURCE)
+    if plan.keys() & price_nodes:
+        if prices is None and only is not None:
+            prices = history_closes(store.dates, window_days=window_days)
+        if prices is None or prices.empty:
+            skipped = [name for name in graph.order if name in plan and name in price_nodes]
+            LOGGER.warning("No BTC closes available; leaving %s stale", ", ".join(skipped))
+            plan = {name: plan_dates for name, plan_dates in plan.items() if name not in price_nodes}
+            prices = None
+
+    summary = {
+        "stale": {name: len(plan[name]) for name in graph.order if name in plan},
+        "skipped": skipped,
+        "dates": len(store.dates),
+        "written": 0,
+        "dry_run": dry_run,
+    }
+    if dry_run:
+        return summary
+
+    if plan:
+        dates = sorted(set().union(*plan.values()))
+        planned = [name for name in graph.order if name in plan]
+        inputs = {column for name in planned for column in graph.nodes[name].inputs}
+        frame = _source_frame(store, {column for column in inputs if source_of(column)}, dates, prices, window_days)
+        for column in inputs:
+            if source_of(column) is None and column not in plan:
+                frame[column] = store.stored_column(column, dates)
+
+        columns = {}
+        for name in planned:
+            values = graph.nodes[name].compute(frame)
+            if name in inputs:
+                frame[name] = values
+            columns[name] = values
+
+        positions = {date_str: idx for idx, date_str in enumerate(dates)}
+        updates: dict[str, dict] = {}
+        for name in planned:
+            for date_str in plan[name]:
+                updates.setdefault(date_str, {})[name] = _plain(columns[name][positions[date_str]])
+        summary["written"] = len(store.write(updates))
+        LOGGER.info("Recomputed %s columns across %s processed files", len(planned), summary["written"])
+
+    if skipped:
+        return summary
+    manifest = manifest or FeatureManifest()
+    signatures = graph.signatures()
+    if only is not None:
+        manifest.definitions.update({name: signatures[name] for name in plan})
+    else:
+        manifest.definitions = signatures
+        manifest.raw_digests.update(raw_digests)
+        manifest.calendar_version = CALENDAR_VERSION
+        if prices is not None and store.dates:
+            manifest.price_end = store.dates[-1]
+            manifest.price_digest = digest_prices(prices, manifest.price_end)
+    manifest.save(manifest_path)
+    return summary
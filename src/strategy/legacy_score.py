@@ -1,11 +1,41 @@
 import math
 
+import numpy as np
+
+from src.features.cycle import BitcoinCycle
+from src.strategy.batch_inputs import as_feature_frame, category_column, float_column, flag_column
+
 
 class LegacyQuantScorer:
     """
     Baseline scorer preserved for backtest comparisons.
     """
 
+    # Cycle score per BitcoinCycle phase code; the last entry is for unknown phases.
+    CYCLE_SCORES = np.array(
+        [
+            {
+                "Accumulation": 0.8,
+                "Pre-Halving Rally": 0.8,
+                "Post-Halving Expansion": 0.4,
+                "Bear Market / Distribution": -0.8,
+            }.get(phase, 0.0)
+            for phase in BitcoinCycle.PHASES
+        ]
+        + [0.0]
+    )
+
+    # Feature -> (min, max, invert) of its linear [-1, 1] normalization.
+    NORMALIZATION_RANGES = {
+        "mvrv_zscore": (-1.2, 2.5, True),
+        "mayer_multiple": (0.6, 2.4, True),
+        "rup": (0.0, 3.0, True),
+        "m2_yoy": (0.0, 10.0, False),
+        "interest_rate": (2.0, 5.0, True),
+        "fear_and_greed": (10, 90, True),
+        "price_vs_ema_pct": (-30, 100, True),
+    }
+
     def _normalize(self, value, min_val, max_val, invert=False):
         if value is None:
             return 0.0
@@ -19,19 +49,21 @@ class LegacyQuantScorer:
 
         return score
 
-    def _calc_long_term_quant(self, data: dict) -> dict:
+    def _long_term_parts(self, data: dict, ranges: dict | None = None) -> tuple[float, float, float, float]:
+        """(final, onchain, macro, cycle) before scaling and rounding, under `ranges` (default NORMALIZATION_RANGES)."""
+        ranges = ranges or self.NORMALIZATION_RANGES
         metrics = data.get("metrics", {})
         cycle = data.get("market_cycle_phase", "Unknown")
 
         z_score = metrics.get("mvrv_zscore", 0.0)
-        mvrv_score = self._normalize(z_score, -1.2, 2.5, invert=True)
-        mm_score = self._normalize(metrics.get("mayer_multiple"), 0.6, 2.4, invert=True)
-        rup_score = self._normalize(metrics.get("rup"), 0.0, 3.0, invert=True)
+        mvrv_score = self._normalize(z_score, *ranges["mvrv_zscore"])
+        mm_score = self._normalize(metrics.get("mayer_multiple"), *ranges["mayer_multiple"])
+        rup_score = self._normalize(metrics.get("rup"), *ranges["rup"])
 
         onchain_score = (mvrv_score * 0.4) + (mm_score * 0.3) + (rup_score * 0.3)
 
-        m2_score = self._normalize(metrics.get("m2_yoy"), 0.0, 10.0)
-        ir_score = self._normalize(metrics.get("interest_rate"), 2.0, 5.0, invert=True)
+        m2_score = self._normalize(metrics.get("m2_yoy"), *ranges["m2_yoy"])
+        ir_score = self._normalize(metrics.get("interest_rate"), *ranges["interest_rate"])
         macro_score = (m2_score * 0.6) + (ir_score * 0.4)
 
         cycle_score = 0.0
@@ -43,7 +75,10 @@ class LegacyQuantScorer:
             cycle_score = -0.8
 
         final_lt = (onchain_score * 0.45) + (cycle_score * 0.40) + (macro_score * 0.15)
+        return final_lt, onchain_score, macro_score, cycle_score
 
+    def _calc_long_term_quant(self, data: dict) -> dict:
+        final_lt, onchain_score, macro_score, cycle_score = self._long_term_parts(data)
         return {
             "score": round(final_lt * 100, 2),
             "components": {
@@ -53,21 +88,26 @@ class LegacyQuantScorer:
             },
         }
 
-    def _calc_medium_term_quant(self, data: dict) -> dict:
+    def _medium_term_parts(self, data: dict, ranges: dict | None = None) -> tuple[float, float, float, float]:
+        """(final, sentiment, extension, trend_dir) before scaling and rounding, under `ranges`."""
+        ranges = ranges or self.NORMALIZATION_RANGES
         metrics = data.get("metrics", {})
         market = data.get("market_data", {})
         flags = data.get("flags", {})
 
         fng = metrics.get("fear_and_greed")
-        fng_score = self._normalize(fng, 10, 90, invert=True)
+        fng_score = self._normalize(fng, *ranges["fear_and_greed"])
 
         ext_pct = market.get("price_vs_ema_pct")
-        trend_ext_score = self._normalize(ext_pct, -30, 100, invert=True)
+        trend_ext_score = self._normalize(ext_pct, *ranges["price_vs_ema_pct"])
         trend_dir = 1.0 if flags.get("is_bull_trend") else -1.0
         season_score = 1.0 if flags.get("is_positive_seasonality") else 0.0
 
         final_mt = (trend_dir * 0.60) + (fng_score * 0.20) + (trend_ext_score * 0.15) + (season_score * 0.05)
+        return final_mt, fng_score, trend_ext_score, trend_dir
 
+    def _calc_medium_term_quant(self, data: dict) -> dict:
+        final_mt, fng_score, trend_ext_score, trend_dir = self._medium_term_parts(data)
         return {
             "score": round(final_mt * 100, 2),
             "components": {
@@ -77,6 +117,88 @@ class LegacyQuantScorer:
             },
         }
 
+    def _normalize_batch(self, values, min_val, max_val, invert=False):
+        """
+        `_normalize` over an array; NaN (a missing value) scores 0.0. The
+        range and `invert` may be arrays broadcasting against `values`.
+        """
+        normalized = (np.clip(values, min_val, max_val) - min_val) / (max_val - min_val)
+        score = (normalized * 2) - 1
+        score = np.where(invert, -score, score)
+        return np.where(np.isnan(values), 0.0, score)
+
+    def _batch_inputs(self, features) -> dict[str, np.ndarray]:
+        """Normalized-feature columns, cycle scores and flag columns of a batch."""
+        frame = as_feature_frame(features)
+        columns = {name: float_column(frame, name) for name in self.NORMALIZATION_RANGES}
+        if "mvrv_zscore" not in frame.columns:
+            columns["mvrv_zscore"] = np.zeros(len(frame))
+
+        phase_codes = BitcoinCycle().phase_codes(category_column(frame, "market_cycle_phase", "Unknown"))
+        columns["cycle_score"] = self.CYCLE_SCORES[phase_codes]
+        columns["trend_dir"] = np.where(flag_column(frame, "is_bull_trend"), 1.0, -1.0)
+        columns["season_score"] = np.where(flag_column(frame, "is_positive_seasonality"), 1.0, 0.0)
+        return columns
+
+    def _batch_model(self, columns: dict[str, np.ndarray], ranges: dict, components: bool = False) -> dict:
+        """
+        Scores from `_batch_inputs` columns under `ranges` (shaped like
+        NORMALIZATION_RANGES). Array-valued ranges add leading axes, e.g. one
+        row per parameter set.
+        """
+        def normalized(name: str) -> np.ndarray:
+            return self._normalize_batch(columns[name], *ranges[name])
+
+        mvrv_score = normalized("mvrv_zscore")
+        mm_score = normalized("mayer_multiple")
+        rup_score = normalized("rup")
+        onchain_score = (mvrv_score * 0.4) + (mm_score * 0.3) + (rup_score * 0.3)
+
+        m2_score = normalized("m2_yoy")
+        ir_score = normalized("interest_rate")
+        macro_score = (m2_score * 0.6) + (ir_score * 0.4)
+
+        cycle_score = columns["cycle_score"]
+        final_lt = (onchain_score * 0.45) + (cycle_score * 0.40) + (macro_score * 0.15)
+
+        fng_score = normalized("fear_and_greed")
+        trend_ext_score = normalized("price_vs_ema_pct")
+        trend_dir = columns["trend_dir"]
+        season_score = columns["season_score"]
+
+        final_mt = (trend_dir * 0.60) + (fng_score * 0.20) + (trend_ext_score * 0.15) + (season_score * 0.05)
+
+        result = {
+            "long_term": np.round(final_lt * 100, 2),
+            "medium_term": np.round(final_mt * 100, 2),
+        }
+        if components:
+            result["components"] = {
+                "long_term": {
+                    "onchain": np.round(onchain_score, 2),
+                    "macro": np.round(macro_score, 2),
+                    "cycle": np.round(cycle_score, 2),
+                },
+                "medium_term": {
+                    "sentiment": np.round(fng_score, 2),
+                    "extension": np.round(trend_ext_score, 2),
+                    "trend_dir": np.round(trend_dir, 2),
+                },
+            }
+        return result
+
+    def calculate_scores_batch(self, features, components=False) -> dict:
+        """
+        Vectorized `calculate_scores` over a flat feature frame, a mapping of
+        columns or a list of day dicts (see AdvancedQuantScorer). A missing
+        `mvrv_zscore` column counts as 0.0, like a missing key per day.
+        """
+        return self._batch_model(self._batch_inputs(features), self.NORMALIZATION_RANGES, components=components)
+
+    def calculate_values(self, data: dict) -> tuple[float, float]:
+        """(long_term, medium_term) values of `calculate_scores` only."""
+        return round(self._long_term_parts(data)[0] * 100, 2), round(self._medium_term_parts(data)[0] * 100, 2)
+
     def calculate_scores(self, data: dict) -> dict:
         lt = self._calc_long_term_quant(data)
         mt = self._calc_medium_term_quant(data)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.strategy.legacy_score import LegacyQuantScorer
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator
+
+
+BlockParams = Mapping[str, Sequence[tuple[str, float, float]]]
+RangeParams = Mapping[str, tuple[float, float, bool]]
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def default_block_params() -> dict[str, list[tuple[str, float, float]]]:
+    """The scorer's own blocks, long and medium term, keyed by block name."""
+    return {**AdvancedQuantScorer.LONG_TERM_BLOCKS, **AdvancedQuantScorer.MEDIUM_TERM_BLOCKS}
+
+
+def perturbed_block_params(
+    count: int,
+    spread: float = 0.25,
+    seed: int | None = 0,
+    base: BlockParams | None = None,
+) -> list[dict[str, list[tuple[str, float, float]]]]:
+    """
+    Random variants of `base`: each weight is scaled by exp(N(0, spread)) and
+    every block rescaled to its original total weight. Directions are kept.
+    """
+    base = base or default_block_params()
+    rng = np.random.default_rng(seed)
+    variants = []
+    for _ in range(count):
+        variant = {}
+        for name, specs in base.items():
+            weights = np.array([weight for _, weight, _ in specs], dtype=float)
+            scaled = weights * np.exp(rng.normal(0.0, spread, weights.size))
+            scaled *= weights.sum() / scaled.sum()
+            variant[name] = [(feature, float(weight), direction) for (feature, _, direction), weight in zip(specs, scaled)]
+        variants.append(variant)
+    return variants
+
+
+@dataclass(frozen=True)
+class CompiledBlocks:
+    """
+    P block parameter sets as matrices over a shared feature axis F: per
+    block, `signed` holds weight·direction and `weights` the weights (P, F).
+    """
+
+    features: tuple[str, ...]
+    signed: dict[str, np.ndarray]
+    weights: dict[str, np.ndarray]
+
+    @property
+    def size(self) -> int:
+        return next(iter(self.weights.values())).shape[0]
+
+
+def compile_blocks(param_sets: Sequence[BlockParams]) -> CompiledBlocks:
+    """
+    Compiles block parameter sets (shaped like `default_block_params()`).
+    Directions must be ±1, which lets tanh(direction·z) factor into
+    direction·tanh(z) so that every block reduces to two matrix products.
+    """
+    if not param_sets:
+        raise ValueError("At least one parameter set is required")
+    block_names = tuple(default_block_params())
+    features = sorted({feature for params in param_sets for specs in params.values() for feature, _, _ in specs})
+    unknown = set(features) - set(HistoricalFeatureCalibrator.FEATURE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown features: {sorted(unknown)}")
+    column = {feature: idx for idx, feature in enumerate(features)}
+
+    signed = {name: np.zeros((len(param_sets), len(features))) for name in block_names}
+    weights = {name: np.zeros((len(param_sets), len(features))) for name in block_names}
+    for row, params in enumerate(param_sets):
+        if set(params) != set(block_names):
+            raise ValueError(f"Parameter set {row} must define exactly the blocks {list(block_names)}")
+        for name, specs in params.items():
+            for feature, weight, direction in specs:
+                if direction not in (-1.0, 1.0):
+                    raise ValueError(f"Direction of {name}.{feature} must be +1 or -1, got {direction}")
+                if weight < 0:
+                    raise ValueError(f"Weight of {name}.{feature} must be non-negative, got {weight}")
+                weights[name][row, column[feature]] += weight
+                signed[name][row, column[feature]] += weight * direction
+    return CompiledBlocks(features=tuple(features), signed=signed, weights=weights)
+
+
+def sweep_advanced(
+    scorer: AdvancedQuantScorer,
+    features: pd.DataFrame | Mapping[str, Sequence] | Sequence[dict],
+    param_sets: Sequence[BlockParams] | CompiledBlocks,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, np.ndarray]:
+    """
+    `calculate_scores_batch` for P block parameter sets at once: returns
+    (P, D) `long_term`/`medium_term` arrays. Z-scores, flags and priors are
+    computed once; each block is then (P, F) @ (F, D) for its signal and
+    reliability sums. Parameter sets are processed `chunk_size` at a time
+    to bound memory.
+    """
+    compiled = param_sets if isinstance(param_sets, CompiledBlocks) else compile_blocks(param_sets)
+    zscores, flags, cycle_prior_signal = scorer._batch_inputs(features, compiled.features)
+    reliability = np.vstack([zscores[feature][1] for feature in compiled.features])
+    signals = reliability * np.tanh(np.vstack([zscores[feature][0] for feature in compiled.features]) / 1.75)
+
+    days = reliability.shape[1]
+    result = {"long_term": np.empty((compiled.size, days)), "medium_term": np.empty((compiled.size, days))}
+    for start in range(0, compiled.size, max(int(chunk_size), 1)):
+        rows = slice(start, start + max(int(chunk_size), 1))
+        blocks = {}
+        for name, weights in compiled.weights.items():
+            weighted_signal_sum = compiled.signed[name][rows] @ signals
+            weighted_effective_sum = weights[rows] @ reliability
+            base_weight_sum = weights[rows].sum(axis=1, keepdims=True)
+
+            has_weight = weighted_effective_sum > 1e-9
+            score = np.where(has_weight, weighted_signal_sum / np.where(has_weight, weighted_effective_sum, 1.0), 0.0)
+            coverage = weighted_effective_sum / np.where(base_weight_sum > 0, base_weight_sum, 1.0)
+            blocks[name] = (np.clip(score, -1.0, 1.0), np.clip(coverage, 0.0, 1.0))
+
+        scores = scorer._batch_model(blocks, flags, cycle_prior_signal)
+        result["long_term"][rows] = scores["long_term"]
+        result["medium_term"][rows] = scores["medium_term"]
+    return result
+
+
+def perturbed_ranges(
+    count: int,
+    spread: float = 0.15,
+    seed: int | None = 0,
+    base: RangeParams | None = None,
+) -> list[dict[str, tuple[float, float, bool]]]:
+    """Random variants of `base`: both bounds move by N(0, spread) range widths (min stays below max)."""
+    base = base or LegacyQuantScorer.NORMALIZATION_RANGES
+    rng = np.random.default_rng(seed)
+    variants = []
+    for _ in range(count):
+        variant = {}
+        for name, (min_val, max_val, invert) in base.items():
+            width = max_val - min_val
+            low, high = sorted(np.array([min_val, max_val], dtype=float) + rng.normal(0.0, spread * width, 2))
+            variant[name] = (float(low), float(max(high, low + (0.05 * width))), invert)
+        variants.append(variant)
+    return variants
+
+
+def compile_ranges(range_sets: Sequence[RangeParams]) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    (P, 1) min, max and invert columns per normalized feature; a set that
+    omits a feature keeps the scorer's range for it.
+    """
+    if not range_sets:
+        raise ValueError("At least one parameter set is required")
+    compiled = {}
+    for name, default in LegacyQuantScorer.NORMALIZATION_RANGES.items():
+        rows = [ranges.get(name, default) for ranges in range_sets]
+        min_val = np.array([row[0] for row in rows], dtype=float)[:, None]
+        max_val = np.array([row[1] for row in rows], dtype=float)[:, None]
+        if np.any(max_val <= min_val):
+            raise ValueError(f"Range of {name} must have min < max")
+        compiled[name] = (min_val, max_val, np.array([bool(row[2]) for row in rows])[:, None])
+    return compiled
+
+
+def sweep_legacy(
+    scorer: LegacyQuantScorer,
+    features: pd.DataFrame | Mapping[str, Sequence] | Sequence[dict],
+    range_sets: Sequence[RangeParams],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, np.ndarray]:
+    """`calculate_scores_batch` for P normalization-range sets: (P, D) score arrays."""
+    compiled = compile_ranges(range_sets)
+    columns = scorer._batch_inputs(features)
+    size = len(range_sets)
+    days = len(columns["cycle_score"])
+    result = {"long_term": np.empty((size, days)), "medium_term": np.empty((size, days))}
+    for start in range(0, size, max(int(chunk_size), 1)):
+        rows = slice(start, start + max(int(chunk_size), 1))
+        ranges = {name: tuple(part[rows] for part in bounds) for name, bounds in compiled.items()}
+        scores = scorer._batch_model(columns, ranges)
+        result["long_term"][rows] = scores["long_term"]
+        result["medium_term"][rows] = scores["medium_term"]
+    return result
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+import logging
+import math
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from src.data.processed_reader import ProcessedPayloadReader
+from src.features.order_statistics import OrderStatisticWindow
+from src.strategy.score import FeatureStat, HistoricalFeatureCalibrator
+
+
+LOGGER = logging.getLogger(__name__)
+
+CYCLE_HORIZON_DAYS = 30
+CYCLE_MIN_SAMPLES = 25
+
+
+class PointInTimeCalibrator(HistoricalFeatureCalibrator):
+    """
+    Calibrator whose stats can be moved to any date without refitting.
+
+    The processed history (up to `max_file_date`) is read once. `as_of(date)`
+    makes the feature stats and cycle priors match a fresh
+    HistoricalFeatureCalibrator fitted on the files dated strictly before
+    `date` (the last `lookback_files` of them): each feature keeps its window
+    in an OrderStatisticWindow over precomputed ranks, so moving by a day costs
+    a few O(log n) updates, and the cycle forward-return moments come from
+    prefix sums. Given the row dates, the batch methods walk the distinct
+    dates in order and score every row with its own day's stats.
+    """
+
+    def __init__(
+        self,
+        lookback_files: int | None = 900,
+        min_samples: int = 80,
+        max_file_date: str | None = None,
+        processed_dir: Path | None = None,
+    ):
+        self.file_dates: list[str] = []
+        self.date: str | None = None
+        self._start = 0
+        self._end = 0
+        self._batch: tuple[tuple[str, ...], tuple] | None = None
+        super().__init__(
+            lookback_files=lookback_files,
+            min_samples=min_samples,
+            max_file_date=max_file_date,
+            processed_dir=processed_dir,
+            cache_dir=None,
+        )
+
+    def _fit_from_processed_history(self):
+        reader = ProcessedPayloadReader(directory=self.processed_dir, max_file_date=self.max_file_date)
+        fields = [
+            *self.FEATURE_FIELDS.values(),
+            "market_data.current_price",
+            "market_cycle_phase",
+        ]
+        dates, columns = reader.read_dated_columns(fields)
+        self.file_dates = [date or "" for date in dates]
+        size = len(self.file_dates)
+
+        # Per feature: the finite values in file order, and each file's slot
+        # among them (-1 when the file has no usable value).
+        self._windows: dict[str, OrderStatisticWindow] = {}
+        self._slots: dict[str, list[int]] = {}
+        for feature_name, field in self.FEATURE_FIELDS.items():
+            values = np.array([self._safe_float(value, default=math.nan) for value in columns[field]], dtype=float)
+            finite = np.isfinite(values)
+            slots = np.full(size, -1, dtype=np.int64)
+            slots[finite] = np.arange(int(finite.sum()))
+            self._windows[feature_name] = OrderStatisticWindow(values[finite])
+            self._slots[feature_name] = slots.tolist()
+        self._stats: dict[str, FeatureStat | None] = {name: None for name in self.FEATURE_FIELDS}
+
+        # Forward returns between priced files `horizon` priced files apart;
+        # a window holds the pairs whose both ends fall inside it.
+        prices = np.array(
+            [self._safe_float(value, default=math.nan) for value in columns["market_data.current_price"]],
+            dtype=float,
+        )
+        priced = np.flatnonzero(np.isfinite(prices) & (prices > 0))
+        self._priced = priced
+        cycles = np.array(
+            [str(cycle if cycle is not None else "Unknown") for cycle in columns["market_cycle_phase"]],
+            dtype=object,
+        )
+        forward = np.array([])
+        if priced.size > CYCLE_HORIZON_DAYS:
+            forward = (prices[priced[CYCLE_HORIZON_DAYS:]] / prices[priced[:-CYCLE_HORIZON_DAYS]]) - 1.0
+        pair_cycles = cycles[priced[: forward.size]]
+        self._cycle_sums: dict[str, np.ndarray] = {}
+        for cycle in sorted(set(pair_cycles)):
+            returns = np.where(pair_cycles == cycle, forward, 0.0)
+            member = (pair_cycles == cycle).astype(float)
+            sums = np.vstack([member, returns, returns * returns])
+            self._cycle_sums[cycle] = np.hstack([np.zeros((3, 1)), np.cumsum(sums, axis=1)])
+
+        self._start = self._end = 0
+        self.as_of(None)
+
+    def _bounds(self, date: str | None) -> tuple[int, int]:
+        end = len(self.file_dates) if date is None else bisect_left(self.file_dates, date)
+        start = 0 if self.lookback_files is None else max(0, end - self.lookback_files)
+        return start, end
+
+    def _shift(self, feature_name: str, start: int, end: int) -> bool:
+        """Moves one feature's window from [_start, _end) to [start, end); True if it changed."""
+        window = self._windows[feature_name]
+        slots = self._slots[feature_name]
+        changed = False
+        if start >= self._end or end <= self._start:
+            for index in range(self._start, self._end):
+                if slots[index] >= 0:
+                    window.remove(slots[index])
+                    changed = True
+            added = range(start, end)
+            removed: range = range(0)
+        else:
+            added = [*range(start, self._start), *range(self._end, end)]
+            removed = [*range(self._start, start), *range(end, self._end)]
+        for index in added:
+            if slots[index] >= 0:
+                window.insert(slots[index])
+                changed = True
+        for index in removed:
+            if slots[index] >= 0:
+                window.remove(slots[index])
+                changed = True
+        return changed
+
+    def _window_stat(self, feature_name: str) -> FeatureStat | None:
+        window = self._windows[feature_name]
+        if len(window) < self.min_samples:
+            return None
+        center = window.median()
+        scale = self._robust_scale(
+            window.median_abs_deviation(center),
+            lambda: window.percentile(0.75) - window.percentile(0.25),
+            window.std,
+        )
+        return FeatureStat(center=float(center), scale=scale, sample_size=len(window))
+
+    def _window_cycle_priors(self, start: int, end: int) -> dict[str, float]:
+        first = int(np.searchsorted(self._priced, start, side="left"))
+        last = int(np.searchsorted(self._priced, end, side="left"))
+        if last - first <= CYCLE_HORIZON_DAYS + 5:
+            return {}
+
+        pairs_end = last - CYCLE_HORIZON_DAYS
+        priors = {}
+        for cycle, sums in self._cycle_sums.items():
+            count, total, squares = sums[:, pairs_end] - sums[:, first]
+            count = int(round(count))
+            if count < CYCLE_MIN_SAMPLES:
+                continue
+            mean_ret = total / count
+            std_ret = math.sqrt(max(squares - (count * mean_ret * mean_ret), 0.0) / (count - 1))
+            if std_ret <= 1e-9:
+                continue
+            t_stat = mean_ret / (std_ret / math.sqrt(count))
+            priors[cycle] = max(-1.0, min(1.0, math.tanh(t_stat / 3.0)))
+        return priors
+
+    def as_of(self, date: str | None) -> None:
+        """Stats from the files dated before `date` (YYYY-MM-DD); None uses every file."""
+        date = None if date is None else str(date)[:10]
+        start, end = self._bounds(date)
+        for feature_name in self.FEATURE_FIELDS:
+            if self._shift(feature_name, start, end):
+                self._stats[feature_name] = self._window_stat(feature_name)
+        self._start, self._end = start, end
+        self.date = date
+
+        self.feature_stats = dict(self.DEFAULT_STATS)
+        self.feature_stats.update({name: stat for name, stat in self._stats.items() if stat is not None})
+        self.cycle_priors = self._window_cycle_priors(start, end)
+
+    def _batch_stats(self, dates: Sequence[str]) -> tuple[dict[str, tuple[np.ndarray, ...]], list[dict[str, float]]]:
+        """
+        Per-row (center, scale, sample_size) arrays for each feature and the
+        per-row cycle priors. Distinct dates are visited in sorted order and
+        the calibrator is left at the last one. The result is kept for the
+        next call with the same dates, since a batch asks once per feature.
+        """
+        key = tuple(str(date)[:10] for date in dates)
+        if self._batch is not None and self._batch[0] == key:
+            return self._batch[1]
+
+        unique = sorted(set(key))
+        position = {date: index for index, date in enumerate(unique)}
+        rows = np.array([position[date] for date in key], dtype=np.int64)
+
+        table = {name: np.empty((3, len(unique))) for name in self.FEATURE_FIELDS}
+        priors: list[dict[str, float]] = []
+        for index, date in enumerate(unique):
+            self.as_of(date)
+            for name in self.FEATURE_FIELDS:
+                stat = self.get_feature_stat(name)
+                table[name][:, index] = (stat.center, stat.scale, stat.sample_size)
+            priors.append(self.cycle_priors)
+
+        stats = {name: tuple(columns[:, rows]) for name, columns in table.items()}
+        result = (stats, [priors[row] for row in rows])
+        self._batch = (key, result)
+        return result
+
+    def robust_zscore_batch(self, feature_name: str, values: np.ndarray, dates: Sequence[str] | None = None):
+        if dates is None:
+            return super().robust_zscore_batch(feature_name, values)
+        center, scale, sample_size = self._batch_stats(dates)[0][feature_name]
+        return self._zscore_arrays(values, center, scale, sample_size)
+
+    def cycle_prior_batch(self, cycles: np.ndarray, dates: Sequence[str] | None = None) -> np.ndarray:
+        if dates is None:
+            return super().cycle_prior_batch(cycles)
+        priors = self._batch_stats(dates)[1]
+        return np.array(
+            [row_priors.get(cycle, self.CYCLE_PRIOR_FALLBACK.get(cycle, 0.0)) for cycle, row_priors in zip(cycles, priors)],
+            dtype=float,
+        )
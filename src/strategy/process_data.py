@@ -2,69 +2,129 @@ from __future__ import annotations
 
 import json
 import logging
-import math
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 import yfinance as yf
 
+from src.data.processed_reader import PROCESSED_SCHEMA_VERSION
 from src.features.cycle import BitcoinCycle
-from src.features.seasonality import BitcoinSeasonality
-from src.utils.project_paths import PROCESSED_DATA_DIR, latest_raw_data_file
+from src.features.context_cache import ContextCache, series_fingerprint
+from src.features.pipeline import (
+    CONTEXT_FIELDS,
+    FeatureSpec,
+    assemble_features,
+    context_asof,
+    feature_days,
+    price_features,
+    raw_input_frame,
+    raw_inputs,
+)
+from src.features.rolling_state import (
+    DEFAULT_CONTEXT,
+    HISTORICAL_CONTEXT_STATE_PATH,
+    HistoricalContextState,
+    compute_context_from_prices,
+)
+from src.utils.project_paths import PROCESSED_DATA_DIR, RAW_DATA_DIR, latest_raw_data_file
 
 
 LOGGER = logging.getLogger(__name__)
 
-# --- Helper Functions ---
-
-def _safe_last(series: pd.Series, default: float = 0.0) -> float:
-    if series is None or series.empty:
-        return float(default)
-    value = series.iloc[-1]
-    if pd.isna(value):
-        return float(default)
-    return float(value)
-
-
-def _trend_tscore(log_prices: np.ndarray) -> float:
-    if log_prices.size < 20:
-        return 0.0
+# Days of already-seen closes re-downloaded to detect revised history.
+REVISION_OVERLAP_DAYS = 3
 
-    x = np.arange(log_prices.size, dtype=float)
-    slope, intercept = np.polyfit(x, log_prices, 1)
-    fitted = (slope * x) + intercept
-    residuals = log_prices - fitted
+# Days of missing closes tolerated when the incremental download fails;
+# beyond this the full context is recomputed.
+MAX_STALE_CONTEXT_DAYS = 1
 
-    dof = max(1, log_prices.size - 2)
-    mse = float(np.sum(residuals**2) / dof)
-    denom = float(np.sum((x - x.mean()) ** 2))
-    if denom <= 1e-12:
-        return 0.0
-
-    std_err = math.sqrt(mse / denom)
-    if std_err <= 1e-12:
-        return 0.0
+# --- Helper Functions ---
 
-    t_score = slope / std_err
-    return float(np.clip(t_score, -8.0, 8.0))
+def _download_closes(start_date: str, end_date: str) -> pd.Series:
+    df = yf.download("BTC-USD", start=start_date, end=end_date, progress=False)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    if df.empty or "Close" not in df.columns:
+        return pd.Series(dtype=float)
+    return df["Close"].astype(float).dropna()
+
+
+def _verify_context_state(state: HistoricalContextState, window_days: int) -> None:
+    end_date = datetime.strptime(state.last_date, "%Y-%m-%d") + timedelta(days=1)
+    start_date = end_date - timedelta(days=window_days + 365)
+    prices = _download_closes(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+    mismatches = state.verify(prices)
+    if mismatches:
+        LOGGER.warning("Rolling context state drifted from full recomputation: %s", mismatches)
+    else:
+        LOGGER.info("Rolling context state matches full recomputation through %s", state.last_date)
 
 
-def fetch_historical_context(end_date_str, window_days=1460):
+def fetch_historical_context(
+    end_date_str,
+    window_days=1460,
+    state_path: Path | None = None,
+    verify: bool = False,
+    cache: ContextCache | None = None,
+    strict: bool = False,
+):
     """
-    Fetches historical BTC data and computes robust quantitative context features.
+    Robust quantitative context features from daily BTC closes before `end_date_str`.
+
+    The persisted rolling state is used when it is at or behind the
+    requested date and only the missing closes (plus, with a `cache`, a
+    short overlap to catch revisions) are downloaded. Dates older than the
+    state, a missing state or revised closes fall back to a full download,
+    which (re)seeds the state; with a `cache` that computation is memoized
+    under the fingerprint of the downloaded closes. If the missing closes cannot be
+    fetched, the state is used only when at most MAX_STALE_CONTEXT_DAYS
+    behind, and never with `strict=True`, which raises instead.
+    `verify=True` re-downloads the full window and logs any drift between
+    the incremental and full computations.
     """
-    default_context = {
-        "mvrv_zscore": 0.0,
-        "realized_vol_30d": 0.65,
-        "realized_vol_90d": 0.70,
-        "momentum_63d": 0.0,
-        "drawdown_180d": 0.0,
-        "trend_tscore_90d": 0.0,
-    }
-
+    state_path = state_path or HISTORICAL_CONTEXT_STATE_PATH
     end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+    last_needed = (end_date - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    state = HistoricalContextState.load(state_path, window_days=window_days)
+    revised = False
+    stale = False
+    if state is not None and state.last_date is not None and state.last_date <= last_needed:
+        if state.last_date < last_needed:
+            overlap = REVISION_OVERLAP_DAYS if cache is not None else 0
+            start_date = (datetime.strptime(state.last_date, "%Y-%m-%d") + timedelta(days=1 - overlap)).strftime("%Y-%m-%d")
+            try:
+                closes = _download_closes(start_date, end_date_str)
+            except Exception as e:
+                LOGGER.warning("Unable to fetch closes since %s: %s", start_date, e)
+            else:
+                revised = cache is not None and cache.observe(closes) is not None
+                if not revised and state.extend(closes):
+                    state.save(state_path)
+        missing_days = (datetime.strptime(last_needed, "%Y-%m-%d") - datetime.strptime(state.last_date, "%Y-%m-%d")).days
+        if not revised and missing_days > 0:
+            if strict:
+                raise RuntimeError(
+                    f"Historical context for {end_date_str} needs closes through {last_needed}; "
+                    f"rolling state ends {state.last_date}"
+                )
+            stale = missing_days > MAX_STALE_CONTEXT_DAYS
+            if stale:
+                LOGGER.warning(
+                    "Rolling state ends %s, %s days before %s; recomputing the full context",
+                    state.last_date,
+                    missing_days,
+                    last_needed,
+                )
+            else:
+                LOGGER.warning("Using rolling state as of %s for %s", state.last_date, end_date_str)
+        if not (revised or stale):
+            LOGGER.info("Historical context from rolling state as of %s", state.last_date)
+            if verify:
+                _verify_context_state(state, window_days)
+            return state.context()
+
     start_date = end_date - timedelta(days=window_days + 365)  # Buffer for MA calculation
     
     LOGGER.info(
@@ -74,52 +134,30 @@ def fetch_historical_context(end_date_str, window_days=1460):
     )
     
     try:
-        df = yf.download("BTC-USD", start=start_date.strftime('%Y-%m-%d'), end=end_date_str, progress=False)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        
-        df = df.rename(columns={"Close": "price"})
-        
-        # MVRV proxy and long-horizon valuation context.
-        df["sma_365"] = df["price"].rolling(window=365).mean()
-        df["mvrv_proxy"] = df["price"] / df["sma_365"]
-        
-        # Calculate Z-Score (4-year window)
-        # We use the last available value as the current Z-Score
-        rolling_mean = df["mvrv_proxy"].rolling(window=window_days, min_periods=365).mean()
-        rolling_std = df["mvrv_proxy"].rolling(window=window_days, min_periods=365).std()
-        
-        df["mvrv_zscore"] = (df["mvrv_proxy"] - rolling_mean) / rolling_std
-
-        # Volatility/momentum state features.
-        returns = df["price"].pct_change()
-        df["realized_vol_30d"] = returns.rolling(window=30, min_periods=10).std() * math.sqrt(365.0)
-        df["realized_vol_90d"] = returns.rolling(window=90, min_periods=20).std() * math.sqrt(365.0)
-        df["momentum_63d"] = (df["price"] / df["price"].shift(63)) - 1.0
-        rolling_peak_180 = df["price"].rolling(window=180, min_periods=30).max()
-        df["drawdown_180d"] = (df["price"] / rolling_peak_180) - 1.0
-
-        log_prices_90d = np.log(df["price"].dropna().tail(90).to_numpy(dtype=float))
-        trend_tscore_90d = _trend_tscore(log_prices_90d)
-
-        context = {
-            "mvrv_zscore": _safe_last(df["mvrv_zscore"], 0.0),
-            "realized_vol_30d": _safe_last(df["realized_vol_30d"], 0.65),
-            "realized_vol_90d": _safe_last(df["realized_vol_90d"], 0.70),
-            "momentum_63d": _safe_last(df["momentum_63d"], 0.0),
-            "drawdown_180d": _safe_last(df["drawdown_180d"], 0.0),
-            "trend_tscore_90d": trend_tscore_90d,
-        }
-
-        for key, value in list(context.items()):
-            if not math.isfinite(value):
-                context[key] = default_context[key]
-
+        prices = _download_closes(start_date.strftime('%Y-%m-%d'), end_date_str)
+        if strict and prices.empty:
+            raise RuntimeError(f"No BTC closes returned for the historical context of {end_date_str}")
+        if (state is None or revised or stale) and not prices.empty:
+            HistoricalContextState.from_prices(prices, window_days=window_days).save(state_path)
+        if cache is None or prices.empty:
+            return compute_context_from_prices(prices, window_days=window_days)
+
+        cache.observe(prices)
+        fingerprint = series_fingerprint(prices, end_date_str, window_days)
+        context = cache.get(end_date_str, window_days, fingerprint)
+        if context is None:
+            context = compute_context_from_prices(prices, window_days=window_days)
+            cache.put(end_date_str, window_days, fingerprint, context)
+        else:
+            LOGGER.info("Historical context for %s from cache", end_date_str)
+        cache.save()
         return context
 
     except Exception as e:
+        if strict:
+            raise
         LOGGER.warning("Error fetching historical context: %s", e)
-        return default_context
+        return dict(DEFAULT_CONTEXT)
 
 # --- Logic Functions ---
 
@@ -127,168 +165,62 @@ def check_cycle_phase(date_str):
     cycle = BitcoinCycle()
     return cycle.get_phase(date_str)
 
-def check_seasonality(date_str):
-    seasonality = BitcoinSeasonality()
-    stats = seasonality.get_seasonality(date_str)
-    return stats["status"] in ["BULLISH", "VERY BULLISH"]
+# --- Main Processing ---
+
+def _processed_payload(raw_data: dict, raw_file_path: Path, day: dict) -> dict:
+    price_data = raw_data["metrics"].get("btc_price_ema_365")
+    market_data = None
+    if isinstance(price_data, dict):
+        market_data = {name: value for name, value in day["market_data"].items() if name != "open_price"}
 
-def check_correlations(data):
-    """
-    Returns True if BTC is highly correlated with Risk Assets (SPX) > 0.5
-    or acting as Safe Haven (Gold) > 0.5.
-    """
-    corr_data = data["metrics"].get("macro_correlations")
-    if not corr_data: 
-        return {"is_high_corr_spx": False, "is_high_corr_gold": False}
-    
     return {
-        "is_high_corr_spx": corr_data["corr_spx_90d"] > 0.5,
-        "is_high_corr_gold": corr_data["corr_gold_90d"] > 0.5
+        "schema_version": PROCESSED_SCHEMA_VERSION,
+        "timestamp": raw_data["timestamp"],
+        "raw_source": str(raw_file_path),
+        "market_data": market_data,
+        "metrics": day["metrics"],
+        "flags": day["flags"],
+        "market_cycle_phase": day["market_cycle_phase"],
     }
 
-def is_accumulation_zone(data):
-    # Logic: RUP < 0.2 AND MVRV < 1.2 AND SOPR < 1
-    mvrv = data["metrics"].get("mvrv")
-    rup = data["metrics"].get("rup")
-    sopr = data["metrics"].get("sopr")
-    
-    if mvrv is None or rup is None or sopr is None:
-        return None
-    
-    is_acc = (rup < 0.2) and (mvrv < 1.2) and (sopr < 1.0)
-    return is_acc
-
-def is_overheated(data):
-    # Logic: (Mayer Multiple > 2.5 AND SOPR > 1) OR (RUP > 2.5)
-    mm = data["metrics"].get("mayer_multiple")
-    sopr = data["metrics"].get("sopr")
-    rup = data["metrics"].get("rup")
-    
-    if rup is not None and rup > 2.5:
-        return True
-        
-    if mm is not None and sopr is not None:
-        if mm > 2.5 and sopr > 1.0:
-            return True
-            
-    return False
-
-def is_fear_extreme(data):
-    fng = data["metrics"].get("fear_and_greed")
-    if not fng: return None
-    return fng["value"] < 20
-
-def is_greed_extreme(data):
-    fng = data["metrics"].get("fear_and_greed")
-    if not fng: return None
-    return fng["value"] > 70
-
-def check_liquidity(data):
-    """
-    Returns True if Liquidity is favorable (Good), False otherwise.
-    """
-    ir_data = data["metrics"].get("interest_rate")
-    m2_data = data["metrics"].get("m2_supply")
-    
-    if not ir_data or not m2_data:
-        return False
-        
-    ir_val = ir_data["current_rate"]
-    m2_yoy = m2_data["m2_year_pct"]
-    
-    # 1. M2 Booming (> 5% YoY) -> Good
-    if m2_yoy > 5.0:
-        return True
-        
-    # 2. Low Rates (< 2%) -> Good
-    if ir_val < 2.0:
-        return True
-        
-    return False
 
-def check_inflation_flags(data):
+def build_processed_batch(snapshots: list[tuple[Path, dict]], contexts: pd.DataFrame) -> list[dict]:
     """
-    Returns boolean flags for inflation.
+    Processed payloads for many raw snapshots in one pass of the feature
+    pipeline. `contexts` holds one historical-context row per snapshot, in order.
     """
-    inf_data = data["metrics"].get("inflation")
-    if not inf_data: 
-        return {"is_inflation_high": False, "is_inflation_falling": False}
-    
-    cpi_yoy = inf_data["yoy_inflation_pct"]
-    trend = inf_data.get("inflation_trend", 0.0)
-    
-    return {
-        "is_inflation_high": cpi_yoy > 3.0,
-        "is_inflation_falling": trend < 0
-    }
+    if not snapshots:
+        return []
+    index = pd.DatetimeIndex([raw_data["timestamp"][:10] for _, raw_data in snapshots])
+    base = pd.DataFrame(contexts.to_numpy(dtype=float), index=index, columns=list(CONTEXT_FIELDS))
+    inputs = raw_input_frame([raw_inputs(raw_data) for _, raw_data in snapshots], index)
+    days = feature_days(assemble_features(base, inputs))
+    return [
+        _processed_payload(raw_data, raw_file_path, day)
+        for (raw_file_path, raw_data), day in zip(snapshots, days)
+    ]
 
-def check_trend(data):
-    """
-    Returns True if Price > EMA 365 (Long Term Bull Trend).
-    """
-    price_data = data["metrics"].get("btc_price_ema_365")
-    if not price_data or isinstance(price_data, float): return False # Handle legacy float format if needed
-    
-    # Support both old float format and new dict format for backward compatibility
-    if isinstance(price_data, dict):
-        return price_data["current_price"] > price_data["ema_365"]
-    return False
 
-def check_derivatives_risk(data):
-    """
-    Returns True if Derivatives show High Risk (Cascading Liquidation Risk).
-    Logic: High Funding Rate (> 0.01%) AND High Open Interest (Contextual check needed, but simplified here).
-    For now, we check if Funding is very positive (Over-leveraged Longs).
-    """
-    deriv_data = data["metrics"].get("derivatives")
-    if not deriv_data: return False
-    
-    funding = deriv_data.get("funding_rate")
-    if funding is None: return False
-    
-    # Funding > 0.01% (Standard baseline) is normal bullish.
-    # Funding > 0.03% starts getting overheated.
-    return funding > 0.03
+def build_processed_data(raw_data: dict, raw_file_path: Path, historical_context: dict) -> dict:
+    """Processed payload for one raw snapshot given its historical context."""
+    contexts = pd.DataFrame([{name: historical_context[name] for name in CONTEXT_FIELDS}])
+    return build_processed_batch([(raw_file_path, raw_data)], contexts)[0]
 
-def check_volatility_opportunity(data):
-    """
-    Returns True if there is a sharp drop in a Bull Trend (Buy the Dip).
-    Logic: Daily Drop < -5% AND Price > EMA 365.
-    """
-    price_data = data["metrics"].get("btc_price_ema_365")
-    if not price_data or not isinstance(price_data, dict): return False
-    
-    is_bullish = price_data["current_price"] > price_data["ema_365"]
-    is_sharp_drop = price_data["daily_change_pct"] < -5.0
-    
-    return is_bullish and is_sharp_drop
 
-def get_market_context(data):
-    """
-    Extracts raw market data and calculates extension from EMA.
-    """
-    price_data = data["metrics"].get("btc_price_ema_365")
-    if not price_data or not isinstance(price_data, dict):
-        return None
-        
-    current_price = price_data["current_price"]
-    ema = price_data["ema_365"]
-    
-    # Calculate extension from EMA (How stretched is the move?)
-    extension_pct = ((current_price - ema) / ema) * 100
-    
-    return {
-        "current_price": current_price,
-        "daily_change_pct": price_data["daily_change_pct"],
-        "weekly_change_pct": price_data.get("weekly_change_pct", 0.0),
-        "monthly_change_pct": price_data.get("monthly_change_pct", 0.0),
-        "ema_365": ema,
-        "price_vs_ema_pct": extension_pct # > 100% is usually top territory, < -30% is bottom
-    }
+def _write_processed(processed: dict, output_path: Path) -> Path:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as f:
+        json.dump(processed, f, indent=4)
+    return output_path
 
-# --- Main Processing ---
 
-def process_daily_data(raw_file_path: str | Path, output_path: Path | None = None) -> dict:
+def process_daily_data(
+    raw_file_path: str | Path,
+    output_path: Path | None = None,
+    verify_context: bool = False,
+    cache: ContextCache | None = None,
+    strict: bool = False,
+) -> dict:
     raw_file_path = Path(raw_file_path)
     LOGGER.info("Processing %s", raw_file_path)
 
@@ -298,7 +230,7 @@ def process_daily_data(raw_file_path: str | Path, output_path: Path | None = Non
     # 0. Fetch Historical Context for Z-Score
     # We need the date from the timestamp
     date_str = raw_data["timestamp"][:10]
-    historical_context = fetch_historical_context(date_str)
+    historical_context = fetch_historical_context(date_str, verify=verify_context, cache=cache, strict=strict)
     LOGGER.info(
         "Historical context -> z=%.2f rv30=%.2f mom63=%.2f dd180=%.2f",
         historical_context["mvrv_zscore"],
@@ -307,74 +239,135 @@ def process_daily_data(raw_file_path: str | Path, output_path: Path | None = Non
         historical_context["drawdown_180d"],
     )
 
-    processed = {
-        "timestamp": raw_data["timestamp"],
-        "raw_source": str(raw_file_path),
-        "market_data": get_market_context(raw_data),
-        "metrics": {
-            "mvrv": raw_data["metrics"].get("mvrv"),
-            "mvrv_zscore": historical_context["mvrv_zscore"],
-            "sopr": raw_data["metrics"].get("sopr"),
-            "rup": raw_data["metrics"].get("rup"),
-            "mayer_multiple": raw_data["metrics"].get("mayer_multiple"),
-            "fear_and_greed": raw_data["metrics"].get("fear_and_greed", {}).get("value"),
-            "interest_rate": raw_data["metrics"].get("interest_rate", {}).get("current_rate"),
-            "m2_yoy": raw_data["metrics"].get("m2_supply", {}).get("m2_year_pct"),
-            "inflation_yoy": raw_data["metrics"].get("inflation", {}).get("yoy_inflation_pct"),
-            "funding_rate": raw_data["metrics"].get("derivatives", {}).get("funding_rate"),
-            "realized_vol_30d": historical_context["realized_vol_30d"],
-            "realized_vol_90d": historical_context["realized_vol_90d"],
-            "momentum_63d": historical_context["momentum_63d"],
-            "drawdown_180d": historical_context["drawdown_180d"],
-            "trend_tscore_90d": historical_context["trend_tscore_90d"],
-        },
-        "flags": {}
-    }
-    
-    # 1. Cycle Analysis
-    # We keep the phase name as it's not a boolean, but useful context
-    processed["market_cycle_phase"] = check_cycle_phase(raw_data["timestamp"][:10])["phase"]
-    
-    # 2. On-Chain States (Booleans)
-    processed["flags"]["is_accumulation"] = is_accumulation_zone(raw_data)
-    processed["flags"]["is_overheated"] = is_overheated(raw_data)
-    
-    # 3. Sentiment (Booleans)
-    processed["flags"]["is_fear_extreme"] = is_fear_extreme(raw_data)
-    processed["flags"]["is_greed_extreme"] = is_greed_extreme(raw_data)
-    
-    # 4. Macro (Booleans)
-    processed["flags"]["is_liquidity_good"] = check_liquidity(raw_data)
-    
-    inf_flags = check_inflation_flags(raw_data)
-    processed["flags"]["is_inflation_high"] = inf_flags["is_inflation_high"]
-    processed["flags"]["is_inflation_falling"] = inf_flags["is_inflation_falling"]
-    
-    # 5. Advanced Market Structure (Booleans)
-    processed["flags"]["is_bull_trend"] = check_trend(raw_data)
-    processed["flags"]["is_derivatives_risk"] = check_derivatives_risk(raw_data)
-    processed["flags"]["is_volatility_opportunity"] = check_volatility_opportunity(raw_data)
-    
-    # 6. New Metrics (Seasonality & Correlations)
-    processed["flags"]["is_positive_seasonality"] = check_seasonality(raw_data["timestamp"][:10])
-    
-    corr_flags = check_correlations(raw_data)
-    processed["flags"]["is_high_corr_spx"] = corr_flags["is_high_corr_spx"]
-    processed["flags"]["is_high_corr_gold"] = corr_flags["is_high_corr_gold"]
-    
-    # Save to processed folder
-    output_path = output_path or PROCESSED_DATA_DIR / f"processed_data_{date_str}.json"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    processed = build_processed_data(raw_data, raw_file_path, historical_context)
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(processed, f, indent=4)
-        
+    # Save to processed folder
+    output_path = _write_processed(
+        processed,
+        output_path or PROCESSED_DATA_DIR / f"processed_data_{date_str}.json",
+    )
     LOGGER.info("Processed data saved to %s", output_path)
     return {
         "data": processed,
         "output_path": output_path,
     }
 
+
+def history_closes(dates: list[str], window_days: int = 1460) -> pd.Series:
+    """BTC closes covering the historical context of every date in `dates`."""
+    history_start = datetime.strptime(min(dates), "%Y-%m-%d") - timedelta(days=window_days + 365)
+    LOGGER.info("Fetching historical context from %s to %s", history_start.strftime("%Y-%m-%d"), max(dates))
+    try:
+        return _download_closes(history_start.strftime("%Y-%m-%d"), max(dates))
+    except Exception as e:
+        LOGGER.warning("Error fetching historical context: %s", e)
+        return pd.Series(dtype=float)
+
+
+def context_for_dates(
+    dates: list[str],
+    prices: pd.Series,
+    window_days: int = 1460,
+) -> pd.DataFrame:
+    """
+    Historical context for many dates from one price history.
+
+    Each date sees only the closes strictly before it, like
+    `fetch_historical_context`.
+    """
+    return context_asof(price_features(prices, FeatureSpec(zscore_window=window_days)), dates)
+
+
+def _contexts(dates: list[str], prices: pd.Series, window_days: int, cache: ContextCache | None) -> pd.DataFrame:
+    """
+    `context_for_dates`, reusing the cached contexts whose closes (by
+    `series_fingerprint`) are unchanged.
+    """
+    if cache is None or prices.empty:
+        return context_for_dates(dates, prices, window_days=window_days)
+
+    cache.observe(prices)
+    fingerprints = [series_fingerprint(prices, date_str, window_days) for date_str in dates]
+    rows = [cache.get(date_str, window_days, fingerprint) for date_str, fingerprint in zip(dates, fingerprints)]
+    missing = [idx for idx, row in enumerate(rows) if row is None]
+    if missing:
+        computed = context_for_dates([dates[idx] for idx in missing], prices, window_days=window_days)
+        for idx, context in zip(missing, computed.to_dict(orient="records")):
+            cache.put(dates[idx], window_days, fingerprints[idx], context)
+            rows[idx] = context
+    cache.save()
+    LOGGER.info("Historical context for %s of %s dates from cache", len(dates) - len(missing), len(dates))
+    return pd.DataFrame(rows, index=pd.DatetimeIndex(dates), columns=list(CONTEXT_FIELDS))
+
+
+def process_range(
+    start_date: str,
+    end_date: str,
+    raw_dir: Path | None = None,
+    output_dir: Path | None = None,
+    window_days: int = 1460,
+    prices: pd.Series | None = None,
+    cache: ContextCache | None = None,
+    strict: bool = False,
+) -> dict:
+    """
+    Reprocesses every raw snapshot dated within [start_date, end_date].
+
+    Raw files are read once, the BTC closes for the whole range come from a
+    single download (or `prices`), and the historical context and flags for all
+    dates are computed as vectorized columns before the outputs are written.
+    Contexts in `cache` built from the same closes are reused.
+
+    Processed files are never overwritten with default contexts: without any
+    closes this raises RuntimeError, and dates with no close before them are
+    skipped (or raise when `strict`).
+    """
+    raw_dir = Path(raw_dir) if raw_dir else RAW_DATA_DIR
+    output_dir = Path(output_dir) if output_dir else PROCESSED_DATA_DIR
+
+    raw_files = []
+    for raw_file_path in sorted(raw_dir.glob("daily_data_*.json"), key=lambda file_path: file_path.name):
+        file_date = raw_file_path.stem.replace("daily_data_", "", 1)
+        if start_date <= file_date <= end_date:
+            raw_files.append(raw_file_path)
+
+    snapshots = []
+    for raw_file_path in raw_files:
+        with raw_file_path.open("r", encoding="utf-8") as f:
+            raw_data = json.load(f)
+        snapshots.append((raw_file_path, raw_data, raw_data["timestamp"][:10]))
+
+    if not snapshots:
+        LOGGER.warning("No raw files between %s and %s", start_date, end_date)
+        return {"dates": [], "output_paths": []}
+
+    dates = [date_str for _, _, date_str in snapshots]
+    if prices is None:
+        prices = history_closes(dates, window_days=window_days)
+    if prices.empty:
+        raise RuntimeError(f"No BTC closes for {start_date} to {end_date}; processed files left unchanged.")
+
+    first_close = prices.index.min().strftime("%Y-%m-%d")
+    uncovered = [date_str for date_str in dates if date_str <= first_close]
+    if uncovered:
+        if strict:
+            raise RuntimeError(f"No BTC closes before {', '.join(uncovered)}; processed files left unchanged.")
+        LOGGER.warning("Skipping %s dates with no BTC close before them: %s", len(uncovered), ", ".join(uncovered))
+        snapshots = [snapshot for snapshot in snapshots if snapshot[2] > first_close]
+        dates = [date_str for _, _, date_str in snapshots]
+        if not snapshots:
+            return {"dates": [], "output_paths": []}
+    contexts = _contexts(dates, prices, window_days, cache)
+    processed = build_processed_batch([(raw_file_path, raw_data) for raw_file_path, raw_data, _ in snapshots], contexts)
+
+    output_paths = [
+        _write_processed(payload, output_dir / f"processed_data_{date_str}.json")
+        for payload, date_str in zip(processed, dates)
+    ]
+
+    LOGGER.info("Processed %s raw files between %s and %s", len(output_paths), start_date, end_date)
+    return {"dates": dates, "output_paths": output_paths}
+
 if __name__ == "__main__":
     raw_path = latest_raw_data_file()
 
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-import json
+from dataclasses import asdict, dataclass
 import math
+from pathlib import Path
+from typing import Mapping, Sequence
 
 import numpy as np
-
+import pandas as pd
+
+from src.data.processed_reader import ProcessedPayloadReader
+from src.strategy.batch_inputs import as_feature_frame, category_column, float_column, flag_column, round_like_python
+from src.strategy.calibrator_cache import (
+    CALIBRATOR_CACHE_DIR,
+    CalibratorCache,
+    directory_key,
+    files_fingerprint,
+    params_key,
+)
 from src.strategy.legacy_score import LegacyQuantScorer
-from src.utils.project_paths import PROCESSED_DATA_DIR
 
 
 @dataclass(frozen=True)
@@ -45,12 +55,25 @@ class HistoricalFeatureCalibrator:
         "trend_tscore_90d": FeatureStat(0.0, 1.80, 0),
     }
 
-    def __init__(self, lookback_files: int = 900, min_samples: int = 80, max_file_date: str | None = None):
+    # Bump when the fitting code changes so cached fits are recomputed.
+    FIT_VERSION = 1
+
+    def __init__(
+        self,
+        lookback_files: int = 900,
+        min_samples: int = 80,
+        max_file_date: str | None = None,
+        processed_dir: Path | None = None,
+        cache_dir: Path | None = CALIBRATOR_CACHE_DIR,
+    ):
         self.lookback_files = lookback_files
         self.min_samples = min_samples
         self.max_file_date = max_file_date
+        self.processed_dir = processed_dir
+        self.cache_dir = cache_dir
         self.feature_stats: dict[str, FeatureStat] = dict(self.DEFAULT_STATS)
         self.cycle_priors: dict[str, float] = {}
+        self.loaded_from_cache = False
         self._fit_from_processed_history()
 
     def _safe_float(self, value, default=0.0):
@@ -61,86 +84,108 @@ class HistoricalFeatureCalibrator:
         except (TypeError, ValueError):
             return float(default)
 
-    def _extract_date_from_filename(self, file_path) -> str | None:
-        name = file_path.stem  # processed_data_YYYY-MM-DD
-        if not name.startswith("processed_data_"):
-            return None
-        raw_date = name.replace("processed_data_", "", 1)
-        if len(raw_date) != 10:
-            return None
-        return raw_date
+    FEATURE_FIELDS = {
+        "mvrv_zscore": "metrics.mvrv_zscore",
+        "mayer_multiple": "metrics.mayer_multiple",
+        "rup": "metrics.rup",
+        "sopr": "metrics.sopr",
+        "fear_and_greed": "metrics.fear_and_greed",
+        "interest_rate": "metrics.interest_rate",
+        "m2_yoy": "metrics.m2_yoy",
+        "inflation_yoy": "metrics.inflation_yoy",
+        "funding_rate": "metrics.funding_rate",
+        "price_vs_ema_pct": "market_data.price_vs_ema_pct",
+        "weekly_change_pct": "market_data.weekly_change_pct",
+        "monthly_change_pct": "market_data.monthly_change_pct",
+        "realized_vol_30d": "metrics.realized_vol_30d",
+        "realized_vol_90d": "metrics.realized_vol_90d",
+        "momentum_63d": "metrics.momentum_63d",
+        "drawdown_180d": "metrics.drawdown_180d",
+        "trend_tscore_90d": "metrics.trend_tscore_90d",
+    }
 
     def _fit_from_processed_history(self):
-        files = sorted(PROCESSED_DATA_DIR.glob("processed_data_*.json"))
-        if self.max_file_date:
-            filtered_files = []
-            for file_path in files:
-                file_date = self._extract_date_from_filename(file_path)
-                if file_date is None:
-                    continue
-                if file_date <= self.max_file_date:
-                    filtered_files.append(file_path)
-            files = filtered_files
-
-        files = files[-self.lookback_files :]
+        reader = ProcessedPayloadReader(
+            directory=self.processed_dir,
+            max_file_date=self.max_file_date,
+            lookback_files=self.lookback_files,
+        )
+        files = reader.files()
         if not files:
             return
 
-        feature_values: dict[str, list[float]] = {key: [] for key in self.DEFAULT_STATS}
-        cycle_records: list[dict] = []
-
-        for file_path in files:
-            try:
-                payload = json.loads(file_path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
-                continue
-
-            market = payload.get("market_data", {})
-            metrics = payload.get("metrics", {})
-            cycle = payload.get("market_cycle_phase", "Unknown")
-            timestamp = payload.get("timestamp", "")
-
-            row = {
-                "mvrv_zscore": metrics.get("mvrv_zscore"),
-                "mayer_multiple": metrics.get("mayer_multiple"),
-                "rup": metrics.get("rup"),
-                "sopr": metrics.get("sopr"),
-                "fear_and_greed": metrics.get("fear_and_greed"),
-                "interest_rate": metrics.get("interest_rate"),
-                "m2_yoy": metrics.get("m2_yoy"),
-                "inflation_yoy": metrics.get("inflation_yoy"),
-                "funding_rate": metrics.get("funding_rate"),
-                "price_vs_ema_pct": market.get("price_vs_ema_pct"),
-                "weekly_change_pct": market.get("weekly_change_pct"),
-                "monthly_change_pct": market.get("monthly_change_pct"),
-                "realized_vol_30d": metrics.get("realized_vol_30d"),
-                "realized_vol_90d": metrics.get("realized_vol_90d"),
-                "momentum_63d": metrics.get("momentum_63d"),
-                "drawdown_180d": metrics.get("drawdown_180d"),
-                "trend_tscore_90d": metrics.get("trend_tscore_90d"),
-            }
+        cache = None
+        if self.cache_dir is not None:
+            cache = CalibratorCache(self.cache_dir)
+            params = params_key(
+                directory=directory_key(reader.directory),
+                lookback_files=self.lookback_files,
+                min_samples=self.min_samples,
+                max_file_date=self.max_file_date,
+                fit_version=self.FIT_VERSION,
+            )
+            fingerprint = files_fingerprint(files)
+            cached = cache.load(params, fingerprint)
+            if cached is not None:
+                self.feature_stats.update(
+                    {name: FeatureStat(**stat) for name, stat in cached["feature_stats"].items()}
+                )
+                self.cycle_priors = dict(cached["cycle_priors"])
+                self.loaded_from_cache = True
+                return
+
+        fitted = self._fit_columns(reader)
+        if cache is not None:
+            cache.save(
+                params,
+                fingerprint,
+                {
+                    "feature_stats": {name: asdict(stat) for name, stat in fitted.items()},
+                    "cycle_priors": self.cycle_priors,
+                },
+            )
 
-            for feature_name, raw_value in row.items():
+    def _fit_columns(self, reader: ProcessedPayloadReader) -> dict[str, FeatureStat]:
+        """Fits feature stats and cycle priors; returns the stats that replaced defaults."""
+        fitted: dict[str, FeatureStat] = {}
+        fields = [
+            *self.FEATURE_FIELDS.values(),
+            "market_data.current_price",
+            "market_cycle_phase",
+            "timestamp",
+        ]
+        columns = reader.read_columns(fields)
+
+        for feature_name, field in self.FEATURE_FIELDS.items():
+            values = []
+            for raw_value in columns[field]:
                 value = self._safe_float(raw_value, default=float("nan"))
                 if math.isfinite(value):
-                    feature_values[feature_name].append(value)
+                    values.append(value)
+
+            stat = self._build_robust_stat(values)
+            if stat is not None:
+                self.feature_stats[feature_name] = stat
+                fitted[feature_name] = stat
 
-            price = self._safe_float(market.get("current_price"), default=float("nan"))
+        cycle_records: list[dict] = []
+        for raw_price, cycle, timestamp in zip(
+            columns["market_data.current_price"],
+            columns["market_cycle_phase"],
+            columns["timestamp"],
+        ):
+            price = self._safe_float(raw_price, default=float("nan"))
             if math.isfinite(price) and price > 0:
                 cycle_records.append(
                     {
-                        "timestamp": str(timestamp),
-                        "cycle": str(cycle),
+                        "timestamp": str(timestamp if timestamp is not None else ""),
+                        "cycle": str(cycle if cycle is not None else "Unknown"),
                         "price": float(price),
                     }
                 )
 
-        for feature_name, values in feature_values.items():
-            stat = self._build_robust_stat(values)
-            if stat is not None:
-                self.feature_stats[feature_name] = stat
-
         self.cycle_priors = self._build_cycle_priors(cycle_records)
+        return fitted
 
     def _build_robust_stat(self, values: list[float]) -> FeatureStat | None:
         if len(values) < self.min_samples:
@@ -154,16 +199,23 @@ class HistoricalFeatureCalibrator:
         center = float(np.median(arr))
         mad = float(np.median(np.abs(arr - center)))
 
-        if mad > 1e-9:
-            scale = 1.4826 * mad
-        else:
+        def iqr() -> float:
             q75, q25 = np.percentile(arr, [75, 25])
-            iqr = float(q75 - q25)
-            scale = iqr / 1.349 if iqr > 1e-9 else float(np.std(arr, ddof=1))
+            return float(q75 - q25)
 
-        scale = max(float(scale), 1e-3)
+        scale = self._robust_scale(mad, iqr, lambda: float(np.std(arr, ddof=1)))
         return FeatureStat(center=center, scale=scale, sample_size=int(arr.size))
 
+    @staticmethod
+    def _robust_scale(mad: float, iqr, std) -> float:
+        """1.4826·MAD, falling back to IQR/1.349 and then the std (both lazy callables)."""
+        if mad > 1e-9:
+            scale = 1.4826 * mad
+        else:
+            spread = iqr()
+            scale = spread / 1.349 if spread > 1e-9 else std()
+        return max(float(scale), 1e-3)
+
     def _build_cycle_priors(self, cycle_records: list[dict], horizon_days: int = 30) -> dict[str, float]:
         if len(cycle_records) <= horizon_days + 5:
             return {}
@@ -203,6 +255,9 @@ class HistoricalFeatureCalibrator:
     def get_feature_stat(self, feature_name: str) -> FeatureStat:
         return self.feature_stats.get(feature_name, self.DEFAULT_STATS[feature_name])
 
+    def as_of(self, date: str | None) -> None:
+        """Moves the stats to `date` (YYYY-MM-DD); a one-shot fit ignores it."""
+
     def robust_zscore(self, feature_name: str, value: float) -> tuple[float, float]:
         stat = self.get_feature_stat(feature_name)
         if not math.isfinite(value):
@@ -216,17 +271,50 @@ class HistoricalFeatureCalibrator:
         reliability = max(0.05, min(1.0, 0.15 + (0.85 * sample_reliability * tail_penalty)))
         return z, reliability
 
+    def robust_zscore_batch(
+        self,
+        feature_name: str,
+        values: np.ndarray,
+        dates: Sequence[str] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        `robust_zscore` over an array; non-finite values get z = 0 and
+        reliability 0. `dates` (one per value) only matters to calibrators
+        whose stats depend on the date.
+        """
+        stat = self.get_feature_stat(feature_name)
+        return self._zscore_arrays(values, stat.center, stat.scale, stat.sample_size)
+
+    @staticmethod
+    def _zscore_arrays(values, center, scale, sample_size) -> tuple[np.ndarray, np.ndarray]:
+        """Stats may be scalars or per-value arrays."""
+        values = np.asarray(values, dtype=float)
+        finite = np.isfinite(values)
+
+        z = np.clip((np.where(finite, values, center) - center) / scale, -5.0, 5.0)
+        sample_reliability = np.minimum(1.0, sample_size / 240.0)
+        tail_penalty = 1.0 / (1.0 + np.maximum(0.0, np.abs(z) - 2.5))
+        reliability = np.clip(0.15 + (0.85 * sample_reliability * tail_penalty), 0.05, 1.0)
+        return np.where(finite, z, 0.0), np.where(finite, reliability, 0.0)
+
+    CYCLE_PRIOR_FALLBACK = {
+        "Accumulation": 0.45,
+        "Pre-Halving Rally": 0.50,
+        "Post-Halving Expansion": 0.15,
+        "Bear Market / Distribution": -0.50,
+    }
+
     def cycle_prior(self, cycle_name: str) -> float:
         if cycle_name in self.cycle_priors:
             return self.cycle_priors[cycle_name]
+        return self.CYCLE_PRIOR_FALLBACK.get(cycle_name, 0.0)
 
-        fallback = {
-            "Accumulation": 0.45,
-            "Pre-Halving Rally": 0.50,
-            "Post-Halving Expansion": 0.15,
-            "Bear Market / Distribution": -0.50,
-        }
-        return fallback.get(cycle_name, 0.0)
+    def cycle_prior_batch(self, cycles: np.ndarray, dates: Sequence[str] | None = None) -> np.ndarray:
+        """`cycle_prior` per row; `dates` as in `robust_zscore_batch`."""
+        priors = np.zeros(len(cycles))
+        for cycle in pd.unique(cycles):
+            priors[cycles == cycle] = self.cycle_prior(cycle)
+        return priors
 
 
 class AdvancedQuantScorer:
@@ -241,11 +329,73 @@ class AdvancedQuantScorer:
     - Explicit uncertainty penalty to reduce exposure under conflicting evidence.
     """
 
-    def __init__(self, lookback_files: int = 900, calibrator_max_date: str | None = None):
-        self._calibrator = HistoricalFeatureCalibrator(
+    # Block -> [(feature, weight, direction)].
+    LONG_TERM_BLOCKS = {
+        "valuation": [
+            ("mvrv_zscore", 0.35, -1.0),
+            ("mayer_multiple", 0.25, -1.0),
+            ("rup", 0.20, -1.0),
+            ("sopr", 0.20, -1.0),
+        ],
+        "macro": [
+            ("m2_yoy", 0.35, +1.0),
+            ("interest_rate", 0.30, -1.0),
+            ("inflation_yoy", 0.20, -1.0),
+            ("funding_rate", 0.15, -1.0),
+        ],
+        "trend": [
+            ("price_vs_ema_pct", 0.30, -1.0),
+            ("trend_tscore_90d", 0.30, +1.0),
+            ("momentum_63d", 0.20, +1.0),
+            ("drawdown_180d", 0.20, -1.0),
+        ],
+        "volatility": [
+            ("realized_vol_30d", 0.60, -1.0),
+            ("realized_vol_90d", 0.40, -1.0),
+        ],
+    }
+    MEDIUM_TERM_BLOCKS = {
+        "momentum": [
+            ("weekly_change_pct", 0.35, +1.0),
+            ("monthly_change_pct", 0.40, +1.0),
+            ("trend_tscore_90d", 0.25, +1.0),
+        ],
+        "reversion": [
+            ("price_vs_ema_pct", 0.40, -1.0),
+            ("fear_and_greed", 0.35, -1.0),
+            ("drawdown_180d", 0.25, -1.0),
+        ],
+        "risk": [
+            ("funding_rate", 0.30, -1.0),
+            ("realized_vol_30d", 0.45, -1.0),
+            ("realized_vol_90d", 0.25, -1.0),
+        ],
+    }
+
+    # Flags read by the batch path.
+    BATCH_FLAGS = (
+        "is_bull_trend",
+        "is_positive_seasonality",
+        "is_derivatives_risk",
+        "is_overheated",
+        "is_accumulation",
+        "is_volatility_opportunity",
+        "is_high_corr_spx",
+        "is_liquidity_good",
+        "is_inflation_high",
+    )
+
+    def __init__(
+        self,
+        lookback_files: int = 900,
+        calibrator_max_date: str | None = None,
+        calibrator: HistoricalFeatureCalibrator | None = None,
+    ):
+        self._calibrator = calibrator or HistoricalFeatureCalibrator(
             lookback_files=lookback_files,
             max_file_date=calibrator_max_date,
         )
+        self._features = self._feature_names()
 
     def _safe_float(self, value, default=0.0):
         try:
@@ -276,25 +426,23 @@ class AdvancedQuantScorer:
             return market.get(feature_name)
         return metrics.get(feature_name)
 
-    def _feature_signal(self, data: dict, feature_name: str, direction: float) -> dict:
+    def _feature_zscore(self, data: dict, feature_name: str) -> tuple[float, float, float | None]:
+        """(z, reliability, value); a missing value has z = reliability = 0."""
         value = self._safe_float(self._extract_feature(data, feature_name), default=float("nan"))
         if not math.isfinite(value):
-            return {
-                "signal": 0.0,
-                "z": 0.0,
-                "reliability": 0.0,
-                "value": None,
-            }
-
+            return 0.0, 0.0, None
         z, reliability = self._calibrator.robust_zscore(feature_name, value)
-        signed_z = direction * z
-        signal = math.tanh(signed_z / 1.75)
+        return float(z), float(reliability), float(value)
+
+    def _feature_signal(self, data: dict, feature_name: str, direction: float) -> dict:
+        z, reliability, value = self._feature_zscore(data, feature_name)
+        signal = math.tanh((direction * z) / 1.75) if value is not None else 0.0
 
         return {
             "signal": self._clip(signal),
-            "z": float(z),
-            "reliability": float(reliability),
-            "value": float(value),
+            "z": z,
+            "reliability": reliability,
+            "value": value,
         }
 
     def _aggregate_block(self, data: dict, specs: list[tuple[str, float, float]]) -> dict:
@@ -327,63 +475,46 @@ class AdvancedQuantScorer:
             "components": components,
         }
 
+    def _block_values(
+        self,
+        zscores: dict[str, tuple[float, float, float | None]],
+        specs: list[tuple[str, float, float]],
+    ) -> tuple[float, float]:
+        """`_aggregate_block` score and coverage from precomputed feature z-scores."""
+        weighted_signal_sum = 0.0
+        weighted_effective_sum = 0.0
+        base_weight_sum = 0.0
+
+        for feature_name, weight, direction in specs:
+            z, reliability, value = zscores[feature_name]
+            signal = self._clip(math.tanh((direction * z) / 1.75)) if value is not None else 0.0
+            effective_weight = weight * reliability
+
+            weighted_signal_sum += effective_weight * signal
+            weighted_effective_sum += effective_weight
+            base_weight_sum += weight
+
+        score = weighted_signal_sum / weighted_effective_sum if weighted_effective_sum > 1e-9 else 0.0
+        coverage = weighted_effective_sum / base_weight_sum if base_weight_sum > 1e-9 else 0.0
+        return self._clip(score), self._clip(coverage, 0.0, 1.0)
+
     def _entropy_uncertainty(self, probability: float) -> float:
         p = self._clip(probability, 1e-6, 1.0 - 1e-6)
         entropy = -((p * math.log(p)) + ((1.0 - p) * math.log(1.0 - p))) / math.log(2.0)
         return self._clip(entropy, 0.0, 1.0)
 
     def _long_term_blocks(self, data: dict) -> dict:
-        valuation = self._aggregate_block(
-            data,
-            [
-                ("mvrv_zscore", 0.35, -1.0),
-                ("mayer_multiple", 0.25, -1.0),
-                ("rup", 0.20, -1.0),
-                ("sopr", 0.20, -1.0),
-            ],
-        )
-        macro = self._aggregate_block(
-            data,
-            [
-                ("m2_yoy", 0.35, +1.0),
-                ("interest_rate", 0.30, -1.0),
-                ("inflation_yoy", 0.20, -1.0),
-                ("funding_rate", 0.15, -1.0),
-            ],
-        )
-        trend = self._aggregate_block(
-            data,
-            [
-                ("price_vs_ema_pct", 0.30, -1.0),
-                ("trend_tscore_90d", 0.30, +1.0),
-                ("momentum_63d", 0.20, +1.0),
-                ("drawdown_180d", 0.20, -1.0),
-            ],
-        )
-        volatility = self._aggregate_block(
-            data,
-            [
-                ("realized_vol_30d", 0.60, -1.0),
-                ("realized_vol_90d", 0.40, -1.0),
-            ],
-        )
-
-        return {
-            "valuation": valuation,
-            "macro": macro,
-            "trend": trend,
-            "volatility": volatility,
-        }
+        return {name: self._aggregate_block(data, specs) for name, specs in self.LONG_TERM_BLOCKS.items()}
 
-    def _calc_long_term_quant(self, data: dict) -> tuple[dict, dict]:
+    def _long_term_state(self, data: dict, blocks: dict[str, tuple[float, float]]) -> dict[str, float]:
+        """Long-term model from the block (score, coverage) pairs; `final` is in [-1, 1]."""
         flags = data.get("flags", {})
         cycle = data.get("market_cycle_phase", "Unknown")
 
-        blocks = self._long_term_blocks(data)
-        valuation = blocks["valuation"]["score"]
-        macro = blocks["macro"]["score"]
-        trend = blocks["trend"]["score"]
-        volatility = blocks["volatility"]["score"]
+        valuation = blocks["valuation"][0]
+        macro = blocks["macro"][0]
+        trend = blocks["trend"][0]
+        volatility = blocks["volatility"][0]
 
         trend_bias = 0.18 if flags.get("is_bull_trend") else -0.18
         season_bias = 0.08 if flags.get("is_positive_seasonality") else -0.05
@@ -409,18 +540,19 @@ class AdvancedQuantScorer:
         bull_probability = self._sigmoid(regime_linear)
         regime_signal = (2.0 * bull_probability) - 1.0
 
-        coverages = np.asarray(
-            [
-                blocks["valuation"]["coverage"],
-                blocks["macro"]["coverage"],
-                blocks["trend"]["coverage"],
-            ],
-            dtype=float,
-        )
-        coverage = float(np.mean(coverages)) if coverages.size else 0.0
+        # Sequential sums, as numpy's mean/std reduce arrays this short.
+        coverage = (blocks["valuation"][1] + blocks["macro"][1] + blocks["trend"][1]) / 3
 
-        signal_vector = np.asarray([valuation, macro, trend, regime_signal], dtype=float)
-        disagreement = float(np.std(signal_vector))
+        signal_mean = (valuation + macro + trend + regime_signal) / 4
+        disagreement = math.sqrt(
+            (
+                ((valuation - signal_mean) * (valuation - signal_mean))
+                + ((macro - signal_mean) * (macro - signal_mean))
+                + ((trend - signal_mean) * (trend - signal_mean))
+                + ((regime_signal - signal_mean) * (regime_signal - signal_mean))
+            )
+            / 4
+        )
         entropy = self._entropy_uncertainty(bull_probability)
         uncertainty = self._clip((0.45 * entropy) + (0.35 * disagreement) + (0.20 * (1.0 - coverage)), 0.0, 1.0)
 
@@ -428,63 +560,59 @@ class AdvancedQuantScorer:
         raw_edge = (0.45 * valuation) + (0.30 * macro) + (0.25 * regime_signal)
         risk_adjusted_edge = raw_edge - (0.35 * uncertainty) - (0.20 * volatility_pressure)
 
-        final_lt = self._clip(math.tanh(1.55 * risk_adjusted_edge))
-
-        details = {
+        return {
+            "final": self._clip(math.tanh(1.55 * risk_adjusted_edge)),
+            "valuation": valuation,
+            "macro": macro,
+            "trend": trend,
             "regime_signal": regime_signal,
+            "bull_probability": bull_probability,
             "uncertainty": uncertainty,
             "coverage": coverage,
             "volatility_pressure": volatility_pressure,
+            "cycle_prior_signal": cycle_prior_signal,
+        }
+
+    def _calc_long_term_quant(self, data: dict) -> tuple[dict, dict]:
+        blocks = self._long_term_blocks(data)
+        state = self._long_term_state(data, {name: (block["score"], block["coverage"]) for name, block in blocks.items()})
+
+        details = {
+            "regime_signal": state["regime_signal"],
+            "uncertainty": state["uncertainty"],
+            "coverage": state["coverage"],
+            "volatility_pressure": state["volatility_pressure"],
             "blocks": blocks,
         }
 
         result = {
-            "score": round(final_lt * 100.0, 2),
+            "score": round(state["final"] * 100.0, 2),
             "components": {
-                "valuation": round(valuation, 3),
-                "macro": round(macro, 3),
-                "trend": round(trend, 3),
-                "regime": round(regime_signal, 3),
-                "bull_probability": round(bull_probability, 3),
-                "uncertainty": round(uncertainty, 3),
-                "coverage": round(coverage, 3),
-                "volatility_pressure": round(volatility_pressure, 3),
-                "cycle_prior_signal": round(cycle_prior_signal, 3),
+                "valuation": round(state["valuation"], 3),
+                "macro": round(state["macro"], 3),
+                "trend": round(state["trend"], 3),
+                "regime": round(state["regime_signal"], 3),
+                "bull_probability": round(state["bull_probability"], 3),
+                "uncertainty": round(state["uncertainty"], 3),
+                "coverage": round(state["coverage"], 3),
+                "volatility_pressure": round(state["volatility_pressure"], 3),
+                "cycle_prior_signal": round(state["cycle_prior_signal"], 3),
             },
         }
         return result, details
 
-    def _calc_medium_term_quant(self, data: dict, lt_details: dict) -> dict:
+    def _medium_term_state(
+        self,
+        data: dict,
+        lt_details: dict,
+        blocks: dict[str, tuple[float, float]],
+    ) -> dict[str, float]:
+        """Medium-term model from the block (score, coverage) pairs; `final` is in [-1, 1]."""
         flags = data.get("flags", {})
 
-        momentum_block = self._aggregate_block(
-            data,
-            [
-                ("weekly_change_pct", 0.35, +1.0),
-                ("monthly_change_pct", 0.40, +1.0),
-                ("trend_tscore_90d", 0.25, +1.0),
-            ],
-        )
-        reversion_block = self._aggregate_block(
-            data,
-            [
-                ("price_vs_ema_pct", 0.40, -1.0),
-                ("fear_and_greed", 0.35, -1.0),
-                ("drawdown_180d", 0.25, -1.0),
-            ],
-        )
-        risk_block = self._aggregate_block(
-            data,
-            [
-                ("funding_rate", 0.30, -1.0),
-                ("realized_vol_30d", 0.45, -1.0),
-                ("realized_vol_90d", 0.25, -1.0),
-            ],
-        )
-
-        momentum = momentum_block["score"]
-        reversion = reversion_block["score"]
-        risk = risk_block["score"]
+        momentum = blocks["momentum"][0]
+        reversion = blocks["reversion"][0]
+        risk = blocks["risk"][0]
 
         trend_bias = 0.18 if flags.get("is_bull_trend") else -0.18
         regime_signal = self._clip(self._safe_float(lt_details.get("regime_signal"), 0.0))
@@ -504,35 +632,74 @@ class AdvancedQuantScorer:
         if flags.get("is_volatility_opportunity") and regime_signal > 0:
             base_mt += 0.10
 
-        coverages = np.asarray(
-            [
-                momentum_block["coverage"],
-                reversion_block["coverage"],
-                risk_block["coverage"],
-            ],
-            dtype=float,
-        )
-        coverage = float(np.mean(coverages)) if coverages.size else 0.0
+        coverage = (blocks["momentum"][1] + blocks["reversion"][1] + blocks["risk"][1]) / 3
         disagreement = abs(momentum - reversion)
         confidence = self._clip(
             (0.50 * coverage) + (0.30 * (1.0 - (disagreement / 2.0))) + (0.20 * (1.0 - uncertainty_lt)),
             0.12,
             1.0,
         )
-        final_mt = self._clip(base_mt * (0.60 + (0.50 * confidence)))
 
         return {
-            "score": round(final_mt * 100.0, 2),
+            "final": self._clip(base_mt * (0.60 + (0.50 * confidence))),
+            "momentum": momentum,
+            "reversion": reversion,
+            "risk": risk,
+            "regime_alignment": regime_alignment,
+            "confidence": confidence,
+            "coverage": coverage,
+        }
+
+    def _calc_medium_term_quant(self, data: dict, lt_details: dict) -> dict:
+        blocks = {name: self._aggregate_block(data, specs) for name, specs in self.MEDIUM_TERM_BLOCKS.items()}
+        state = self._medium_term_state(
+            data,
+            lt_details,
+            {name: (block["score"], block["coverage"]) for name, block in blocks.items()},
+        )
+
+        return {
+            "score": round(state["final"] * 100.0, 2),
             "components": {
-                "momentum": round(momentum, 3),
-                "reversion": round(reversion, 3),
-                "risk": round(risk, 3),
-                "regime_alignment": round(regime_alignment, 3),
-                "confidence": round(confidence, 3),
-                "coverage": round(coverage, 3),
+                "momentum": round(state["momentum"], 3),
+                "reversion": round(state["reversion"], 3),
+                "risk": round(state["risk"], 3),
+                "regime_alignment": round(state["regime_alignment"], 3),
+                "confidence": round(state["confidence"], 3),
+                "coverage": round(state["coverage"], 3),
             },
         }
 
+    def _feature_names(self) -> list[str]:
+        names = {
+            feature_name
+            for blocks in (self.LONG_TERM_BLOCKS, self.MEDIUM_TERM_BLOCKS)
+            for specs in blocks.values()
+            for feature_name, _, _ in specs
+        }
+        return sorted(names)
+
+    def calculate_values(self, data: dict) -> tuple[float, float]:
+        """
+        (long_term, medium_term) values of `calculate_scores`, without the
+        components, descriptions and metadata. Each feature is normalized
+        once even when several blocks use it.
+        """
+        if data.get("timestamp"):
+            self._calibrator.as_of(data["timestamp"])
+        zscores = {feature_name: self._feature_zscore(data, feature_name) for feature_name in self._features}
+
+        lt = self._long_term_state(
+            data,
+            {name: self._block_values(zscores, specs) for name, specs in self.LONG_TERM_BLOCKS.items()},
+        )
+        mt = self._medium_term_state(
+            data,
+            lt,
+            {name: self._block_values(zscores, specs) for name, specs in self.MEDIUM_TERM_BLOCKS.items()},
+        )
+        return round(lt["final"] * 100.0, 2), round(mt["final"] * 100.0, 2)
+
     def _describe_score(self, score):
         if score >= 80:
             return "Extreme Bullish (Max Opportunity)"
@@ -548,7 +715,161 @@ class AdvancedQuantScorer:
             return "Bearish (Unfavorable)"
         return "Extreme Bearish (Max Risk)"
 
+    # --- Batch scoring ---
+
+    def _aggregate_block_batch(
+        self,
+        zscores: dict[str, tuple[np.ndarray, np.ndarray]],
+        specs: list[tuple[str, float, float]],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        weighted_signal_sum = 0.0
+        weighted_effective_sum = 0.0
+        base_weight_sum = 0.0
+
+        for feature_name, weight, direction in specs:
+            z, reliability = zscores[feature_name]
+            signal = np.clip(np.tanh((direction * z) / 1.75), -1.0, 1.0)
+            effective_weight = weight * reliability
+
+            weighted_signal_sum = weighted_signal_sum + (effective_weight * signal)
+            weighted_effective_sum = weighted_effective_sum + effective_weight
+            base_weight_sum += weight
+
+        has_weight = weighted_effective_sum > 1e-9
+        score = np.where(has_weight, weighted_signal_sum / np.where(has_weight, weighted_effective_sum, 1.0), 0.0)
+        coverage = weighted_effective_sum / base_weight_sum
+        return np.clip(score, -1.0, 1.0), np.clip(coverage, 0.0, 1.0)
+
+    def calculate_scores_batch(
+        self,
+        features: pd.DataFrame | Mapping[str, Sequence] | Sequence[dict],
+        components: bool = False,
+    ) -> dict:
+        """
+        Vectorized `calculate_scores` over many days.
+
+        `features` is a flat feature frame (as built by `assemble_features`),
+        a mapping of such columns, or a list of day dicts. Returns
+        `long_term`/`medium_term` score arrays and, with `components=True`,
+        the component arrays of both horizons, rounded like the scalar path.
+        A DatetimeIndex (day dicts with timestamps get one) dates the rows
+        for point-in-time calibrators.
+        """
+        zscores, flags, cycle_prior_signal = self._batch_inputs(features, self._features)
+        blocks = {
+            name: self._aggregate_block_batch(zscores, specs)
+            for horizon in (self.LONG_TERM_BLOCKS, self.MEDIUM_TERM_BLOCKS)
+            for name, specs in horizon.items()
+        }
+        return self._batch_model(blocks, flags, cycle_prior_signal, components=components)
+
+    def _batch_inputs(
+        self,
+        features: pd.DataFrame | Mapping[str, Sequence] | Sequence[dict],
+        feature_names: Sequence[str],
+    ) -> tuple[dict[str, tuple[np.ndarray, np.ndarray]], dict[str, np.ndarray], np.ndarray]:
+        """Per-feature (z, reliability), the flag columns and the cycle prior signal of a batch."""
+        frame = as_feature_frame(features)
+        dates = frame.index.strftime("%Y-%m-%d") if isinstance(frame.index, pd.DatetimeIndex) else None
+        zscores = {
+            feature_name: self._calibrator.robust_zscore_batch(feature_name, float_column(frame, feature_name), dates)
+            for feature_name in feature_names
+        }
+        flags = {name: flag_column(frame, name) for name in self.BATCH_FLAGS}
+        cycles = category_column(frame, "market_cycle_phase", "Unknown")
+        return zscores, flags, self._calibrator.cycle_prior_batch(cycles, dates)
+
+    def _batch_model(
+        self,
+        blocks: dict[str, tuple[np.ndarray, np.ndarray]],
+        flags: dict[str, np.ndarray],
+        cycle_prior_signal: np.ndarray,
+        components: bool = False,
+    ) -> dict:
+        """
+        Scores from the block (score, coverage) arrays. Blocks may carry
+        leading axes (e.g. parameter sets) in front of the day axis; the
+        per-day inputs broadcast against them.
+        """
+        # Long term
+        valuation, macro, trend, volatility = (blocks[name][0] for name in ("valuation", "macro", "trend", "volatility"))
+
+        trend_bias = np.where(flags["is_bull_trend"], 0.18, -0.18)
+        season_bias = np.where(flags["is_positive_seasonality"], 0.08, -0.05)
+
+        prior_logit = (0.90 * cycle_prior_signal) + (0.70 * trend_bias) + (0.40 * season_bias)
+        likelihood_logit = (1.25 * valuation) + (1.10 * macro) + (0.80 * trend)
+        likelihood_logit = np.where(flags["is_derivatives_risk"], likelihood_logit - 0.35, likelihood_logit)
+        likelihood_logit = np.where(flags["is_overheated"], likelihood_logit - 0.55, likelihood_logit)
+        likelihood_logit = np.where(flags["is_accumulation"], likelihood_logit + 0.35, likelihood_logit)
+        likelihood_logit = np.where(flags["is_volatility_opportunity"], likelihood_logit + 0.15, likelihood_logit)
+        illiquid = ~flags["is_liquidity_good"]
+        likelihood_logit = np.where(flags["is_high_corr_spx"] & illiquid, likelihood_logit - 0.20, likelihood_logit)
+        likelihood_logit = np.where(flags["is_inflation_high"] & illiquid, likelihood_logit - 0.25, likelihood_logit)
+
+        regime_linear = prior_logit + likelihood_logit
+        bull_probability = 1.0 / (1.0 + np.exp(-np.clip(regime_linear, -60.0, 60.0)))
+        regime_signal = (2.0 * bull_probability) - 1.0
+
+        coverage_lt = np.mean([blocks["valuation"][1], blocks["macro"][1], blocks["trend"][1]], axis=0)
+        disagreement_lt = np.std([valuation, macro, trend, regime_signal], axis=0)
+        p = np.clip(bull_probability, 1e-6, 1.0 - 1e-6)
+        entropy = np.clip(-((p * np.log(p)) + ((1.0 - p) * np.log(1.0 - p))) / math.log(2.0), 0.0, 1.0)
+        uncertainty = np.clip((0.45 * entropy) + (0.35 * disagreement_lt) + (0.20 * (1.0 - coverage_lt)), 0.0, 1.0)
+
+        volatility_pressure = np.maximum(0.0, -volatility)
+        raw_edge = (0.45 * valuation) + (0.30 * macro) + (0.25 * regime_signal)
+        risk_adjusted_edge = raw_edge - (0.35 * uncertainty) - (0.20 * volatility_pressure)
+        final_lt = np.clip(np.tanh(1.55 * risk_adjusted_edge), -1.0, 1.0)
+
+        # Medium term
+        momentum, reversion, risk = (blocks[name][0] for name in ("momentum", "reversion", "risk"))
+
+        regime_alignment = (0.65 * regime_signal) + (0.35 * trend_bias)
+        base_mt = (0.50 * momentum) + (0.30 * reversion) + (0.20 * risk) + (0.25 * regime_alignment)
+        base_mt = np.where(flags["is_derivatives_risk"], base_mt - 0.18, base_mt)
+        base_mt = np.where(flags["is_volatility_opportunity"] & (regime_signal > 0), base_mt + 0.10, base_mt)
+
+        coverage_mt = np.mean([blocks[name][1] for name in self.MEDIUM_TERM_BLOCKS], axis=0)
+        disagreement_mt = np.abs(momentum - reversion)
+        confidence = np.clip(
+            (0.50 * coverage_mt) + (0.30 * (1.0 - (disagreement_mt / 2.0))) + (0.20 * (1.0 - uncertainty)),
+            0.12,
+            1.0,
+        )
+        final_mt = np.clip(base_mt * (0.60 + (0.50 * confidence)), -1.0, 1.0)
+
+        result = {
+            "long_term": np.round(final_lt * 100.0, 2),
+            "medium_term": np.round(final_mt * 100.0, 2),
+        }
+        if components:
+            result["components"] = {
+                "long_term": {
+                    "valuation": np.round(valuation, 3),
+                    "macro": np.round(macro, 3),
+                    "trend": np.round(trend, 3),
+                    "regime": np.round(regime_signal, 3),
+                    "bull_probability": np.round(bull_probability, 3),
+                    "uncertainty": np.round(uncertainty, 3),
+                    "coverage": np.round(coverage_lt, 3),
+                    "volatility_pressure": np.round(volatility_pressure, 3),
+                    "cycle_prior_signal": np.round(cycle_prior_signal, 3),
+                },
+                "medium_term": {
+                    "momentum": np.round(momentum, 3),
+                    "reversion": np.round(reversion, 3),
+                    "risk": np.round(risk, 3),
+                    "regime_alignment": np.round(regime_alignment, 3),
+                    "confidence": np.round(confidence, 3),
+                    "coverage": np.round(coverage_mt, 3),
+                },
+            }
+        return result
+
     def calculate_scores(self, data: dict) -> dict:
+        if data.get("timestamp"):
+            self._calibrator.as_of(data["timestamp"])
         lt, lt_details = self._calc_long_term_quant(data)
         mt = self._calc_medium_term_quant(data, lt_details)
 
@@ -601,11 +922,13 @@ class QuantScorer:
         advanced_weight: float = 0.25,
         lookback_files: int = 900,
         calibrator_max_date: str | None = None,
+        calibrator: HistoricalFeatureCalibrator | None = None,
     ):
         self.mode = mode
         self.advanced_weight = max(0.0, min(1.0, advanced_weight))
         self.lookback_files = lookback_files
         self.calibrator_max_date = calibrator_max_date
+        self._calibrator = calibrator
         self._legacy = LegacyQuantScorer()
         self._advanced: AdvancedQuantScorer | None = None
 
@@ -614,6 +937,7 @@ class QuantScorer:
             self._advanced = AdvancedQuantScorer(
                 lookback_files=self.lookback_files,
                 calibrator_max_date=self.calibrator_max_date,
+                calibrator=self._calibrator,
             )
         return self._advanced
 
@@ -641,3 +965,46 @@ class QuantScorer:
             return legacy_result
 
         raise ValueError(f"Unsupported scorer mode: {self.mode}")
+
+    def calculate_values(self, data: dict) -> tuple[float, float]:
+        """(long_term, medium_term) values of `calculate_scores`, without components or metadata."""
+        if self.mode == "legacy":
+            return self._legacy.calculate_values(data)
+        if self.mode in {"advanced", "quant"}:
+            return self._get_advanced().calculate_values(data)
+        if self.mode == "blend":
+            legacy_lt, legacy_mt = self._legacy.calculate_values(data)
+            advanced_lt, advanced_mt = self._get_advanced().calculate_values(data)
+
+            lw = 1.0 - self.advanced_weight
+            aw = self.advanced_weight
+            return round((lw * legacy_lt) + (aw * advanced_lt), 2), round((lw * legacy_mt) + (aw * advanced_mt), 2)
+
+        raise ValueError(f"Unsupported scorer mode: {self.mode}")
+
+    def calculate_scores_batch(
+        self,
+        features: pd.DataFrame | Mapping[str, Sequence] | Sequence[dict],
+        components: bool = False,
+    ) -> dict:
+        """
+        Vectorized `calculate_scores` for every mode. In blend mode the score
+        arrays are blended and the components are the legacy ones, as in the
+        scalar path.
+        """
+        if self.mode == "legacy":
+            return self._legacy.calculate_scores_batch(features, components=components)
+        if self.mode in {"advanced", "quant"}:
+            return self._get_advanced().calculate_scores_batch(features, components=components)
+        if self.mode == "blend":
+            frame = as_feature_frame(features)
+            legacy_result = self._legacy.calculate_scores_batch(frame, components=components)
+            advanced_result = self._get_advanced().calculate_scores_batch(frame)
+
+            lw = 1.0 - self.advanced_weight
+            aw = self.advanced_weight
+            for horizon in ("long_term", "medium_term"):
+                legacy_result[horizon] = round_like_python((lw * legacy_result[horizon]) + (aw * advanced_result[horizon]), 2)
+            return legacy_result
+
+        raise ValueError(f"Unsupported scorer mode: {self.mode}")
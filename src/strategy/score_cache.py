@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import inspect
+import json
+from pathlib import Path
+from typing import Hashable, Sequence
+
+import numpy as np
+
+
+DEFAULT_MAX_ENTRIES = 200_000
+DAY_KEYS = ("identity", "content")
+
+_PLAIN_TYPES = (str, int, float, bool, type(None), Path)
+
+
+def _config(obj) -> dict:
+    params = {}
+    for name in inspect.signature(type(obj).__init__).parameters:
+        if name in {"self", "args", "kwargs"}:
+            continue
+        for attribute in (name, f"_{name}"):
+            if hasattr(obj, attribute):
+                value = getattr(obj, attribute)
+                if isinstance(value, _PLAIN_TYPES):
+                    params[name] = value
+                else:
+                    params[name] = _config(value) if hasattr(value, "__dict__") else repr(value)
+                break
+    return {"class": f"{type(obj).__module__}.{type(obj).__qualname__}", "params": params}
+
+
+def scorer_fingerprint(scorer) -> str:
+    """
+    Digest of a scorer's class and the constructor arguments it keeps (as
+    `name` or `_name`), recursing into nested objects such as the calibrator.
+    Two scorers built the same way share a fingerprint.
+    """
+    payload = json.dumps(_config(scorer), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def day_fingerprint(day: dict) -> str:
+    return hashlib.sha1(json.dumps(day, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    In-memory LRU of per-day scorer outputs, shared by CachedScorer wrappers.
+
+    Entries may carry an anchor object (the day dict for identity keys); a
+    lookup only hits when it passes that same object, so a recycled `id()`
+    can never return another day's score.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(int(max_entries), 1)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[object, object]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, anchor: object = None):
+        """Cached value or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not anchor:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value, anchor: object = None) -> None:
+        self._entries[key] = (anchor, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class CachedScorer:
+    """
+    Scorer wrapper that memoizes per-day outputs in a shared ScoreCache.
+
+    Keys are (scorer fingerprint, output kind, day key). With
+    `day_key="identity"` a day is the same dict object (what backtests pass
+    around after loading once); `"content"` hashes the payload instead. Full
+    `calculate_scores` results are returned as cached, so treat them as
+    read-only. Batch calls on day dicts only score the missing days; frames
+    and component requests go straight to the wrapped scorer.
+    """
+
+    def __init__(
+        self,
+        scorer,
+        cache: ScoreCache | None = None,
+        fingerprint: str | None = None,
+        day_key: str = "identity",
+    ):
+        if day_key not in DAY_KEYS:
+            raise ValueError(f"Unsupported day key: {day_key}")
+        self.scorer = scorer
+        self.cache = cache if cache is not None else ScoreCache()
+        self.fingerprint = fingerprint or scorer_fingerprint(scorer)
+        self.day_key = day_key
+
+    def _key(self, kind: str, day: dict) -> tuple[tuple, object]:
+        if self.day_key == "identity":
+            return (self.fingerprint, kind, id(day)), day
+        return (self.fingerprint, kind, day_fingerprint(day)), None
+
+    def _cached(self, kind: str, day: dict, compute):
+        key, anchor = self._key(kind, day)
+        value = self.cache.get(key, anchor)
+        if value is None:
+            value = compute(day)
+            self.cache.put(key, value, anchor)
+        return value
+
+    def calculate_scores(self, data: dict) -> dict:
+        return self._cached("scores", data, self.scorer.calculate_scores)
+
+    def calculate_values(self, data: dict) -> tuple[float, float]:
+        return self._cached("values", data, self.scorer.calculate_values)
+
+    def calculate_scores_batch(self, features, components: bool = False) -> dict:
+        if components or not isinstance(features, Sequence) or isinstance(features, str):
+            return self.scorer.calculate_scores_batch(features, components=components)
+
+        days = list(features)
+        keys = [self._key("batch", day) for day in days]
+        values = [self.cache.get(key, anchor) for key, anchor in keys]
+        missing = [idx for idx, value in enumerate(values) if value is None]
+        if missing:
+            batch = self.scorer.calculate_scores_batch([days[idx] for idx in missing])
+            for position, idx in enumerate(missing):
+                values[idx] = (float(batch["long_term"][position]), float(batch["medium_term"][position]))
+                key, anchor = keys[idx]
+                self.cache.put(key, values[idx], anchor)
+
+        return {
+            "long_term": np.array([value[0] for value in values], dtype=float),
+            "medium_term": np.array([value[1] for value in values], dtype=float),
+        }
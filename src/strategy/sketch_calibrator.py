@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+from pathlib import Path
+
+from src.data.processed_reader import ProcessedPayloadReader
+from src.features.quantile_sketch import DEFAULT_K, KLLSketch
+from src.strategy.calibrator_cache import directory_key, files_fingerprint
+from src.strategy.score import FeatureStat, HistoricalFeatureCalibrator
+from src.utils.project_paths import STATE_DIR
+
+
+LOGGER = logging.getLogger(__name__)
+
+SKETCH_STATE_PATH = STATE_DIR / "calibrator_sketches.json"
+STATE_VERSION = 2
+CYCLE_HORIZON_DAYS = 30
+
+
+class RunningMoments:
+    """Count, mean and sum of squared deviations; mergeable (Chan et al.)."""
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + (delta * delta * self.count * other.count / total)
+        self.mean += delta * other.count / total
+        self.count = total
+        return self
+
+    def std(self, ddof: int = 1) -> float:
+        if self.count <= ddof:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.count - ddof))
+
+    def to_list(self) -> list[float]:
+        return [self.count, self.mean, self.m2]
+
+
+class CalibrationSketches:
+    """
+    Streaming summary of the processed history for the calibrator.
+
+    One KLL sketch and running moments per feature, plus running moments of
+    the 30-day forward return per cycle phase. Days are absorbed in file
+    order; `pending` holds the last 30 priced days awaiting their forward
+    price. Merging shards combines sketches and moments exactly, except for
+    the forward returns that would straddle the shard boundary.
+
+    `directory` (relative to the project root when inside it) and
+    `files_fingerprint` (file names and contents) record which processed files
+    were absorbed, so a persisted state is only extended from the same,
+    unchanged history, on any checkout.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, horizon_days: int = CYCLE_HORIZON_DAYS):
+        self.k = int(k)
+        self.horizon_days = int(horizon_days)
+        self.sketches = {name: KLLSketch(self.k) for name in HistoricalFeatureCalibrator.FEATURE_FIELDS}
+        self.moments = {name: RunningMoments() for name in HistoricalFeatureCalibrator.FEATURE_FIELDS}
+        self.cycle_returns: dict[str, RunningMoments] = {}
+        self.pending: list[list] = []
+        self.last_date: str | None = None
+        self.directory: str | None = None
+        self.files_fingerprint: str | None = None
+
+    @staticmethod
+    def fields() -> list[str]:
+        return [
+            *HistoricalFeatureCalibrator.FEATURE_FIELDS.values(),
+            "market_data.current_price",
+            "market_cycle_phase",
+            "timestamp",
+        ]
+
+    @staticmethod
+    def _finite(value) -> float:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return math.nan
+        return value if math.isfinite(value) else math.nan
+
+    def absorb(self, row: dict) -> None:
+        """One processed day, as a mapping of `fields()` to raw values."""
+        for name, field in HistoricalFeatureCalibrator.FEATURE_FIELDS.items():
+            value = self._finite(row.get(field))
+            if value == value:
+                self.sketches[name].update(value)
+                self.moments[name].update(value)
+
+        price = self._finite(row.get("market_data.current_price"))
+        if price == price and price > 0:
+            cycle = row.get("market_cycle_phase")
+            self.pending.append([str(cycle if cycle is not None else "Unknown"), price])
+            if len(self.pending) > self.horizon_days:
+                start_cycle, start_price = self.pending.pop(0)
+                forward_return = (price / start_price) - 1.0
+                if math.isfinite(forward_return):
+                    self.cycle_returns.setdefault(start_cycle, RunningMoments()).update(forward_return)
+
+        timestamp = str(row.get("timestamp") or "")[:10]
+        if timestamp and (self.last_date is None or timestamp > self.last_date):
+            self.last_date = timestamp
+
+    def absorb_columns(self, columns: dict[str, list]) -> int:
+        fields = list(columns)
+        rows = zip(*(columns[field] for field in fields))
+        absorbed = 0
+        for values in rows:
+            self.absorb(dict(zip(fields, values)))
+            absorbed += 1
+        return absorbed
+
+    def merge(self, other: "CalibrationSketches") -> "CalibrationSketches":
+        for name in self.sketches:
+            self.sketches[name].merge(other.sketches[name])
+            self.moments[name].merge(other.moments[name])
+        for cycle, moments in other.cycle_returns.items():
+            self.cycle_returns.setdefault(cycle, RunningMoments()).merge(moments)
+        if other.last_date is not None and (self.last_date is None or other.last_date > self.last_date):
+            self.last_date = other.last_date
+            self.pending = [list(record) for record in other.pending]
+        return self
+
+    def feature_stat(self, name: str, min_samples: int) -> FeatureStat | None:
+        sketch = self.sketches[name]
+        if sketch.count < min_samples:
+            return None
+        center = sketch.quantile(0.5)
+        scale = HistoricalFeatureCalibrator._robust_scale(
+            sketch.median_abs_deviation(center),
+            lambda: sketch.quantile(0.75) - sketch.quantile(0.25),
+            lambda: self.moments[name].std(),
+        )
+        return FeatureStat(center=float(center), scale=scale, sample_size=int(sketch.count))
+
+    def cycle_priors(self, min_samples: int = 25) -> dict[str, float]:
+        priors = {}
+        for cycle, moments in self.cycle_returns.items():
+            std_ret = moments.std()
+            if moments.count < min_samples or not std_ret > 1e-9:
+                continue
+            t_stat = moments.mean / (std_ret / math.sqrt(moments.count))
+            priors[cycle] = max(-1.0, min(1.0, math.tanh(t_stat / 3.0)))
+        return priors
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "k": self.k,
+            "horizon_days": self.horizon_days,
+            "last_date": self.last_date,
+            "directory": self.directory,
+            "files_fingerprint": self.files_fingerprint,
+            "sketches": {name: sketch.to_dict() for name, sketch in self.sketches.items()},
+            "moments": {name: moments.to_list() for name, moments in self.moments.items()},
+            "cycle_returns": {cycle: moments.to_list() for cycle, moments in self.cycle_returns.items()},
+            "pending": self.pending,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "CalibrationSketches":
+        state = cls(k=payload["k"], horizon_days=payload["horizon_days"])
+        state.last_date = payload.get("last_date")
+        state.directory = payload.get("directory")
+        state.files_fingerprint = payload.get("files_fingerprint")
+        for name, sketch in payload.get("sketches", {}).items():
+            if name in state.sketches:
+                state.sketches[name] = KLLSketch.from_dict(sketch)
+        for name, moments in payload.get("moments", {}).items():
+            if name in state.moments:
+                state.moments[name] = RunningMoments(*moments)
+        state.cycle_returns = {cycle: RunningMoments(*moments) for cycle, moments in payload.get("cycle_returns", {}).items()}
+        state.pending = [list(record) for record in payload.get("pending", [])]
+        return state
+
+    def save(self, path: Path = SKETCH_STATE_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = SKETCH_STATE_PATH, k: int = DEFAULT_K) -> "CalibrationSketches | None":
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable calibrator sketches %s: %s", path, exc)
+            return None
+        if payload.get("version") != STATE_VERSION or payload.get("k") != k:
+            return None
+        return cls.from_dict(payload)
+
+
+class SketchFeatureCalibrator(HistoricalFeatureCalibrator):
+    """
+    Calibrator backed by CalibrationSketches instead of raw value arrays.
+
+    Without `max_file_date` the sketches persist at `state_path` and each
+    construction only absorbs processed files newer than the last absorbed
+    day. A persisted state built from another directory, or whose absorbed
+    files have since been rewritten, added or removed, is rebuilt from
+    scratch. The sketches cover the whole absorbed history (there is no
+    `lookback_files` window). With `max_file_date` (backtests) the sketches
+    are built in memory up to that date and not persisted.
+    """
+
+    def __init__(
+        self,
+        min_samples: int = 80,
+        max_file_date: str | None = None,
+        processed_dir: Path | None = None,
+        state_path: Path | None = SKETCH_STATE_PATH,
+        k: int = DEFAULT_K,
+    ):
+        self.state_path = state_path if max_file_date is None else None
+        self.k = k
+        self.sketches: CalibrationSketches | None = None
+        self.absorbed_files = 0
+        super().__init__(
+            lookback_files=None,
+            min_samples=min_samples,
+            max_file_date=max_file_date,
+            processed_dir=processed_dir,
+            cache_dir=None,
+        )
+
+    def _persisted_state(self, directory: Path) -> tuple[CalibrationSketches, list[Path]] | None:
+        """The saved state and the files it absorbed, if it still matches `directory`."""
+        state = CalibrationSketches.load(self.state_path, k=self.k)
+        if state is None or state.last_date is None:
+            return None
+        if state.directory != directory_key(directory):
+            LOGGER.info("Calibrator sketches at %s belong to %s; rebuilding", self.state_path, state.directory)
+            return None
+        absorbed = ProcessedPayloadReader(directory=directory, max_file_date=state.last_date).files()
+        if files_fingerprint(absorbed) != state.files_fingerprint:
+            LOGGER.info("Processed files changed since they were sketched; rebuilding %s", self.state_path)
+            return None
+        return state, absorbed
+
+    def _fit_from_processed_history(self):
+        directory = ProcessedPayloadReader(directory=self.processed_dir).directory.resolve()
+        persisted = self._persisted_state(directory) if self.state_path is not None else None
+        state, absorbed = persisted or (CalibrationSketches(k=self.k), [])
+
+        reader = ProcessedPayloadReader(
+            directory=directory,
+            max_file_date=self.max_file_date,
+            after_file_date=state.last_date,
+        )
+        files = reader.files()
+        if files:
+            self.absorbed_files = state.absorb_columns(reader.read_columns(CalibrationSketches.fields()))
+        if self.state_path is not None and state.last_date is not None and (files or persisted is None):
+            state.directory = directory_key(directory)
+            state.files_fingerprint = files_fingerprint([*absorbed, *files])
+            state.save(self.state_path)
+        self.apply(state)
+
+    def apply(self, state: CalibrationSketches) -> None:
+        """Replaces the fitted stats and priors with those of `state`."""
+        self.sketches = state
+        self.feature_stats = dict(self.DEFAULT_STATS)
+        for name in self.FEATURE_FIELDS:
+            stat = state.feature_stat(name, self.min_samples)
+            if stat is not None:
+                self.feature_stats[name] = stat
+        self.cycle_priors = state.cycle_priors()
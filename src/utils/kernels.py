@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+import numpy as np
+
+try:
+    import numba
+    from numba.core.errors import NumbaError
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+    NumbaError = None
+    NUMBA_AVAILABLE = False
+
+KERNEL_BACKEND = "numba" if NUMBA_AVAILABLE else "python"
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Optional compiled kernels for the sequential hot loops. Kernels are plain
+# Python over NumPy arrays and scalars; with Numba installed they are compiled
+# with `njit`, otherwise they run as written (or through a vectorized NumPy
+# fallback when one is given). Both must produce identical results. Setting
+# NUMBA_DISABLE_JIT=1 forces the Python path without uninstalling Numba.
+
+
+def jit(func: Callable) -> Callable:
+    """Compiles a helper that kernels call; identity without Numba."""
+    if NUMBA_AVAILABLE:
+        return numba.njit(cache=True)(func)
+    return func
+
+
+class Kernel:
+    """
+    Entry point for a loop with an optional compiled version. Calls go to the
+    Numba build when available; if compiling fails the kernel logs a warning
+    and permanently switches to `python` (the fallback, or the loop itself).
+    """
+
+    def __init__(self, loop: Callable, fallback: Callable | None = None):
+        self.__name__ = loop.__name__
+        self.__doc__ = loop.__doc__
+        self.loop = loop
+        self.python = fallback or loop
+        self.compiled = numba.njit(cache=True)(loop) if NUMBA_AVAILABLE else None
+
+    @property
+    def backend(self) -> str:
+        return "numba" if self.compiled is not None else "python"
+
+    def __call__(self, *args):
+        if self.compiled is not None:
+            try:
+                return self.compiled(*args)
+            except NumbaError as exc:
+                LOGGER.warning("Compiling %s failed, using the Python fallback: %s", self.__name__, exc)
+                self.compiled = None
+        return self.python(*args)
+
+
+def kernel(fallback: Callable | None = None) -> Callable[[Callable], Kernel]:
+    """Decorator form of Kernel: `@kernel()` or `@kernel(fallback=numpy_version)`."""
+
+    def wrap(loop: Callable) -> Kernel:
+        return Kernel(loop, fallback)
+
+    return wrap
+
+
+def transition_cdf(matrix) -> np.ndarray:
+    """
+    Row-wise cumulative transition probabilities, normalized exactly like
+    `Generator.choice(p=row)` so that sampling against them reproduces it.
+    """
+    probabilities = np.asarray(matrix, dtype=float)
+    if probabilities.ndim != 2 or probabilities.shape[0] != probabilities.shape[1]:
+        raise ValueError("Transition matrix must be square")
+    if np.any(probabilities < 0):
+        raise ValueError("Transition probabilities must be non-negative")
+    if np.any(np.abs(probabilities.sum(axis=1) - 1.0) > np.sqrt(np.finfo(np.float64).eps)):
+        raise ValueError("Transition matrix rows must sum to 1")
+    cdf = np.cumsum(probabilities, axis=1)
+    return cdf / cdf[:, -1:]
+
+
+def _markov_chain_step_numpy(cdf: np.ndarray, states: np.ndarray, uniforms: np.ndarray) -> np.ndarray:
+    return (cdf[states] <= uniforms[:, None]).sum(axis=1)
+
+
+@kernel(fallback=_markov_chain_step_numpy)
+def markov_chain_step(cdf: np.ndarray, states: np.ndarray, uniforms: np.ndarray) -> np.ndarray:
+    """
+    Next state of each chain: the first column of its row of `cdf` above its
+    uniform draw, i.e. `rng.choice(n, p=matrix[state])` given the draw.
+    """
+    out = np.empty(states.shape[0], dtype=np.int64)
+    for idx in range(states.shape[0]):
+        row = states[idx]
+        state = 0
+        while state < cdf.shape[1] and cdf[row, state] <= uniforms[idx]:
+            state += 1
+        out[idx] = state
+    return out
@@ -11,6 +11,8 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 SIGNALS_DIR = DATA_DIR / "signals"
 ACCOUNTING_DIR = DATA_DIR / "accounting"
+MACRO_DATA_DIR = DATA_DIR / "macro"
+STATE_DIR = DATA_DIR / "state"
 REPORTS_DIR = PROJECT_ROOT / "reports" / "daily"
 LATEST_REPORT_PATH = PROJECT_ROOT / "latest_report.md"
 README_PATH = PROJECT_ROOT / "README.md"
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.kernels import KERNEL_BACKEND
+from tests.backtest.benchmark_scoring import best_of
+from tests.backtest.compare_models import PortfolioSimulator
+from tests.backtest.stochastic_calculus_validation import model_specs, simulate_regime_jump_diffusion
+
+
+REGIME_PARAMS = {
+    "mu_regimes": [-0.85, 0.35, 1.25],
+    "sigma_regimes": [0.95, 0.55, 0.75],
+    "jump_lambda": 12.0,
+    "jump_mu": -0.02,
+    "jump_sigma": 0.06,
+    "transition_matrix": [[0.96, 0.03, 0.01], [0.02, 0.95, 0.03], [0.01, 0.04, 0.95]],
+}
+
+
+def path_inputs(prices: np.ndarray, seed: int) -> tuple[list[dict], list[dict]]:
+    """
+    Day dicts for one simulated path plus AR(1) long/medium-term scores in
+    [-100, 100]. Scoring is batched elsewhere, so only the state machine is timed.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2021-01-01", periods=len(prices), freq="D")
+    opens = np.concatenate([[prices[0]], prices[:-1]]) * np.exp(rng.normal(0.0, 0.005, len(prices)))
+    days = [
+        {"timestamp": f"{day:%Y-%m-%d} 00:00:00", "market_data": {"current_price": float(close), "open_price": float(open_)}}
+        for day, close, open_ in zip(index, prices, opens)
+    ]
+
+    long_term = np.zeros(len(prices))
+    medium_term = np.zeros(len(prices))
+    for idx in range(1, len(prices)):
+        long_term[idx] = (0.97 * long_term[idx - 1]) + rng.normal(0.0, 12.0)
+        medium_term[idx] = (0.80 * medium_term[idx - 1]) + rng.normal(0.0, 25.0)
+    scores = [
+        {"long_term": {"value": round(float(lt), 2)}, "medium_term": {"value": round(float(mt), 2)}}
+        for lt, mt in zip(np.clip(long_term, -100.0, 100.0), np.clip(medium_term, -100.0, 100.0))
+    ]
+    return days, scores
+
+
+def run_benchmark(years: int = 5, paths: int = 220, repeats: int = 3, seed: int = 123) -> pd.DataFrame:
+    """Reference loops vs kernels for the regime simulation and the per-model portfolio runs."""
+    horizon = int(round(365 * years))
+    managers = [manager for _, _, manager in model_specs()]
+
+    # Compile (or load the Numba cache) outside the timings.
+    simulate_regime_jump_diffusion(REGIME_PARAMS, 30_000.0, 4, 10, seed)
+    warmup_days, warmup_scores = path_inputs(np.full(10, 30_000.0), seed)
+    for manager in managers:
+        PortfolioSimulator().simulate(manager, warmup_days, warmup_scores)
+
+    rows = []
+    regime_timings = {}
+    for use_kernels in (False, True):
+        regime_timings[use_kernels] = best_of(
+            lambda: simulate_regime_jump_diffusion(REGIME_PARAMS, 30_000.0, paths, horizon, seed, use_kernels=use_kernels),
+            repeats,
+        )
+    rows.append({"stage": "regime_paths", "reference_s": regime_timings[False], "kernel_s": regime_timings[True]})
+
+    prices, _ = simulate_regime_jump_diffusion(REGIME_PARAMS, 30_000.0, paths, horizon, seed)
+    inputs = [path_inputs(prices[path], seed + path) for path in range(paths)]
+    portfolio_timings = {}
+    for use_kernels in (False, True):
+        simulator = PortfolioSimulator(use_kernels=use_kernels)
+        portfolio_timings[use_kernels] = best_of(
+            lambda: [simulator.simulate(manager, days, scores) for days, scores in inputs for manager in managers],
+            repeats,
+        )
+    rows.append(
+        {"stage": "portfolio_runs", "reference_s": portfolio_timings[False], "kernel_s": portfolio_timings[True]}
+    )
+
+    results = pd.DataFrame(rows)
+    results["speedup"] = results["reference_s"] / results["kernel_s"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compiled-kernel vs reference timings for the sequential backtest loops")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--paths", type=int, default=220)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run_benchmark(years=args.years, paths=args.paths, repeats=args.repeats)
+    print(
+        f"{args.years} years x {len(model_specs())} models x {args.paths} paths, "
+        f"backend={KERNEL_BACKEND}, best of {args.repeats} (seconds)"
+    )
+    print(results.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
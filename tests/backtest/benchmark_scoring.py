@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.features.pipeline import feature_days
+from src.strategy.ensemble import AdvancedHead, LegacyHead, ScoringEnsemble
+from src.strategy.parameter_sweep import perturbed_block_params
+from src.strategy.score import AdvancedQuantScorer, QuantScorer
+from tests.test_score_batch import _feature_frame
+
+
+def synthetic_days(periods: int, seed: int = 7) -> list[dict]:
+    """Day dicts with the production feature schema from the unit tests' random history."""
+    return feature_days(_feature_frame(periods=periods, seed=seed))
+
+
+def best_of(runner, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        runner()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_benchmark(periods: int = 2_000, repeats: int = 5) -> pd.DataFrame:
+    """Per-day cost of the simulator hot loop: full score dicts vs values only vs one batch call."""
+    days = synthetic_days(periods)
+    rows = []
+    for mode in ("legacy", "advanced", "blend"):
+        scorer = QuantScorer(mode=mode)
+        scorer.calculate_values(days[0])  # fits the calibrator outside the timings
+
+        full = best_of(lambda: [scorer.calculate_scores(day)["scores"] for day in days], repeats)
+        values = best_of(lambda: [scorer.calculate_values(day) for day in days], repeats)
+        batch = best_of(lambda: scorer.calculate_scores_batch(days), repeats)
+        rows.append(
+            {
+                "mode": mode,
+                "calculate_scores_us": full / periods * 1e6,
+                "calculate_values_us": values / periods * 1e6,
+                "batch_us": batch / periods * 1e6,
+                "values_speedup": full / values,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def run_ensemble_benchmark(periods: int = 2_000, variants: int = 4, repeats: int = 5) -> pd.DataFrame:
+    """
+    Batch cost of legacy + advanced (+ perturbed advanced variants) scored
+    one head at a time vs as heads of one ScoringEnsemble.
+    """
+    days = synthetic_days(periods)
+    variant_heads = {
+        f"advanced_variant_{idx}": AdvancedHead(
+            {name: params[name] for name in AdvancedQuantScorer.LONG_TERM_BLOCKS},
+            {name: params[name] for name in AdvancedQuantScorer.MEDIUM_TERM_BLOCKS},
+        )
+        for idx, params in enumerate(perturbed_block_params(variants, seed=1))
+    }
+    rows = []
+    for extra in (0, variants):
+        heads = {"legacy": LegacyHead(), "advanced": AdvancedHead(), **dict(list(variant_heads.items())[:extra])}
+        separate_scorers = [ScoringEnsemble({name: head}) for name, head in heads.items()]
+        ensemble = ScoringEnsemble(heads)
+        for scorer in (*separate_scorers, ensemble):
+            scorer.evaluate_batch(days[:5])  # fits the calibrators outside the timings
+
+        def evaluate(scorers):
+            for scorer in scorers:
+                scorer._last_batch = None  # time the evaluation, not the memo
+                scorer.evaluate_batch(days)
+
+        separate = best_of(lambda: evaluate(separate_scorers), repeats)
+        shared = best_of(lambda: evaluate([ensemble]), repeats)
+        rows.append({"heads": len(heads), "separate_ms": separate * 1e3, "ensemble_ms": shared * 1e3})
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call scorer timings for the backtest hot loop")
+    parser.add_argument("--periods", type=int, default=2_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_benchmark(periods=args.periods, repeats=args.repeats)
+    print(f"{args.periods} days, best of {args.repeats} (microseconds per day)")
+    print(results.to_string(index=False, float_format=lambda value: f"{value:.1f}"))
+
+    ensemble = run_ensemble_benchmark(periods=args.periods, repeats=args.repeats)
+    print(f"\nEnsemble heads vs separate scorers, {args.periods} days (milliseconds per batch)")
+    print(ensemble.to_string(index=False, float_format=lambda value: f"{value:.1f}"))
+
+
+if __name__ == "__main__":
+    main()
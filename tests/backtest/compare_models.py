@@ -6,6 +6,7 @@ from pathlib import Path
 import sys
 
 import math
+import numpy as np
 import pandas as pd
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -14,6 +15,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
 from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
+from src.execution.portfolio_kernels import manager_kernel_spec, simulate_portfolio
 from src.execution.portfolio_manager import PortfolioManager
 from src.strategy.legacy_score import LegacyQuantScorer
 from src.strategy.score import AdvancedQuantScorer, QuantScorer
@@ -54,10 +56,28 @@ class SimulationResult:
     final_equity: float
 
 
+def daily_scores(scorer, daily_data) -> list[dict]:
+    """
+    Per-day `scores` for the portfolio managers, from one batch call (or the
+    values-only scalar path) when the scorer supports it. Those entries carry
+    the values only.
+    """
+    if hasattr(scorer, "calculate_scores_batch"):
+        batch = scorer.calculate_scores_batch(daily_data)
+        values = zip(batch["long_term"], batch["medium_term"])
+    elif hasattr(scorer, "calculate_values"):
+        values = (scorer.calculate_values(day) for day in daily_data)
+    else:
+        return [scorer.calculate_scores(day)["scores"] for day in daily_data]
+
+    return [{"long_term": {"value": float(lt)}, "medium_term": {"value": float(mt)}} for lt, mt in values]
+
+
 class PortfolioSimulator:
-    def __init__(self, trading_cost_bps=TRADING_COST_BPS, annual_debt_rate=ANNUAL_DEBT_RATE):
+    def __init__(self, trading_cost_bps=TRADING_COST_BPS, annual_debt_rate=ANNUAL_DEBT_RATE, use_kernels=True):
         self.trading_cost_bps = trading_cost_bps
         self.annual_debt_rate = annual_debt_rate
+        self.use_kernels = use_kernels
 
     def _execute_order(self, side, amount_usd, price, cash, btc, debt):
         fee_rate = self.trading_cost_bps / 10_000.0
@@ -95,6 +115,53 @@ class PortfolioSimulator:
         return cash, btc, debt, traded_notional
 
     def run(self, model_name, scorer, manager, daily_data):
+        scores_by_day = daily_scores(scorer, daily_data)
+        equities, leverages, daily_returns, trades, turnover = self.simulate(manager, daily_data, scores_by_day)
+        return self._compute_metrics(model_name, equities, daily_returns, leverages, trades, turnover)
+
+    def simulate(self, manager, daily_data, scores_by_day):
+        """
+        Daily (equities, leverages, returns) plus trade count and turnover.
+        Runs the `simulate_portfolio` kernel when the manager has an array
+        version (`manager_kernel_spec`), else the reference loop below; both
+        give identical results.
+        """
+        spec = manager_kernel_spec(manager) if self.use_kernels else None
+        if spec is None:
+            return self._simulate_reference(manager, daily_data, scores_by_day)
+
+        kind, params = spec
+        days = len(daily_data)
+        closes = np.array([float(day["market_data"]["current_price"]) for day in daily_data], dtype=float)
+        opens = np.array(
+            [float(day["market_data"].get("open_price", close)) for day, close in zip(daily_data, closes)],
+            dtype=float,
+        )
+        day_numbers = np.array([day["timestamp"][:10] for day in daily_data], dtype="datetime64[D]").astype(np.int64)
+        long_term = np.array([scores["long_term"]["value"] for scores in scores_by_day], dtype=float)
+        medium_term = np.array([scores["medium_term"]["value"] for scores in scores_by_day], dtype=float)
+
+        equities = np.empty(days)
+        leverages = np.empty(days)
+        daily_returns = np.empty(days)
+        trades, turnover = simulate_portfolio(
+            opens,
+            closes,
+            day_numbers,
+            long_term,
+            medium_term,
+            kind,
+            params,
+            self.trading_cost_bps / 10_000.0,
+            1.0 + (self.annual_debt_rate / 365.0),
+            INITIAL_CAPITAL,
+            equities,
+            leverages,
+            daily_returns,
+        )
+        return equities.tolist(), leverages.tolist(), daily_returns.tolist(), int(trades), float(turnover)
+
+    def _simulate_reference(self, manager, daily_data, scores_by_day):
         cash = INITIAL_CAPITAL
         btc = 0.0
         debt = 0.0
@@ -136,7 +203,7 @@ class PortfolioSimulator:
             has_next_day = idx < (len(daily_data) - 1)
             if has_next_day:
                 next_date_str = daily_data[idx + 1]["timestamp"][:10]
-                scores = scorer.calculate_scores(day)["scores"]
+                scores = scores_by_day[idx]
                 pending_order = manager.calculate_order(
                     scores=scores,
                     current_cash=cash,
@@ -158,7 +225,7 @@ class PortfolioSimulator:
             leverages.append(leverage)
             daily_returns.append(daily_ret)
 
-        return self._compute_metrics(model_name, equities, daily_returns, leverages, trades, turnover)
+        return equities, leverages, daily_returns, trades, turnover
 
     def _compute_metrics(self, model_name, equities, daily_returns, leverages, trades, turnover):
         equity_series = pd.Series(equities)
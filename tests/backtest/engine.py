@@ -22,9 +22,7 @@ class BacktestEngine:
             date = day_data["timestamp"]
             
             # 1. Get Strategy Signal
-            analysis = self.scorer.calculate_scores(day_data)
-            lt_score = analysis["scores"]["long_term"]["value"]
-            mt_score = analysis["scores"]["medium_term"]["value"]
+            lt_score, mt_score = self.scorer.calculate_values(day_data)
             
             recommendation = self._decide_action(lt_score, mt_score)
             
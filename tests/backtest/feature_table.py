@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+import json
+import math
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+
+MATRIX_FILE = "columns.npy"
+SCHEMA_FILE = "schema.json"
+
+KIND_FLOAT = "float"
+KIND_BOOL = "bool"
+KIND_CATEGORY = "category"
+KIND_TIMESTAMP = "timestamp"
+
+
+def _flatten(day: Mapping, prefix: tuple[str, ...] = ()) -> Iterator[tuple[tuple[str, ...], object]]:
+    for key, value in day.items():
+        path = (*prefix, str(key))
+        if isinstance(value, Mapping):
+            yield from _flatten(value, path)
+        else:
+            yield path, value
+
+
+def _kind_for(path: tuple[str, ...], value) -> str:
+    if path == ("timestamp",):
+        return KIND_TIMESTAMP
+    if isinstance(value, (bool, np.bool_)):
+        return KIND_BOOL
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return KIND_FLOAT
+    return KIND_CATEGORY
+
+
+def _timestamp_to_seconds(value: str) -> float:
+    # Naive timestamps are UTC; offset-aware ones are converted to it.
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc).timestamp()
+    return parsed.astimezone(timezone.utc).timestamp()
+
+
+def _seconds_to_timestamp(value: float) -> str:
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class FeatureTable:
+    """
+    Column-major float64 matrix of a backtest dataset, memory-mapped from disk.
+
+    `write` flattens the nested day dicts (`market_data.current_price`,
+    `flags.is_bull_trend`, ...) into one `.npy` file plus a JSON schema. Worker
+    processes call `open` on the same directory and share the pages through the
+    OS cache instead of unpickling thousands of dicts. Pickling a table only
+    sends its directory.
+    """
+
+    def __init__(self, directory: Path, matrix: np.ndarray, schema: dict):
+        self.directory = Path(directory)
+        self.matrix = matrix
+        self.columns: list[str] = schema["columns"]
+        self.kinds: dict[str, str] = schema["kinds"]
+        self.categories: dict[str, list[str]] = schema["categories"]
+        self._position = {name: idx for idx, name in enumerate(self.columns)}
+        self._tree = self._build_tree()
+
+    def _build_tree(self) -> dict:
+        tree: dict = {}
+        for name in self.columns:
+            parts = name.split(".")
+            node = tree
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = name
+        return tree
+
+    @classmethod
+    def write(cls, days: Iterable[Mapping], directory: str | Path) -> "FeatureTable":
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        rows = [dict(_flatten(day)) for day in days]
+        kinds: dict[tuple[str, ...], str | None] = {}
+        for row in rows:
+            for path, value in row.items():
+                if kinds.get(path) is None:
+                    kinds[path] = None if value is None else _kind_for(path, value)
+        # Columns that are None on every day stay in the schema as all-NaN floats.
+        kinds = {path: kind or KIND_FLOAT for path, kind in kinds.items()}
+
+        paths = list(kinds)
+        categories: dict[str, list[str]] = {}
+        codes: dict[tuple[str, ...], dict[str, int]] = {}
+        for path in paths:
+            if kinds[path] == KIND_CATEGORY:
+                labels = sorted({str(row[path]) for row in rows if row.get(path) is not None})
+                categories[".".join(path)] = labels
+                codes[path] = {label: idx for idx, label in enumerate(labels)}
+
+        matrix = np.full((len(paths), len(rows)), np.nan, dtype=float)
+        for col, path in enumerate(paths):
+            kind = kinds[path]
+            for idx, row in enumerate(rows):
+                value = row.get(path)
+                if value is None:
+                    continue
+                if kind == KIND_TIMESTAMP:
+                    matrix[col, idx] = _timestamp_to_seconds(value)
+                elif kind == KIND_CATEGORY:
+                    matrix[col, idx] = codes[path][str(value)]
+                else:
+                    matrix[col, idx] = float(value)
+
+        schema = {
+            "rows": len(rows),
+            "columns": [".".join(path) for path in paths],
+            "kinds": {".".join(path): kinds[path] for path in paths},
+            "categories": categories,
+        }
+        np.save(directory / MATRIX_FILE, matrix)
+        (directory / SCHEMA_FILE).write_text(json.dumps(schema, indent=2), encoding="utf-8")
+        return cls.open(directory)
+
+    @classmethod
+    def open(cls, directory: str | Path) -> "FeatureTable":
+        directory = Path(directory)
+        schema = json.loads((directory / SCHEMA_FILE).read_text(encoding="utf-8"))
+        matrix = np.load(directory / MATRIX_FILE, mmap_mode="r")
+        return cls(directory, matrix, schema)
+
+    def __reduce__(self):
+        return (FeatureTable.open, (str(self.directory),))
+
+    def __len__(self) -> int:
+        return int(self.matrix.shape[1])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [DayView(self, row) for row in range(len(self))[index]]
+        row = int(index)
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(index)
+        return DayView(self, row)
+
+    def __iter__(self) -> Iterator["DayView"]:
+        for row in range(len(self)):
+            yield DayView(self, row)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one feature column (no copy)."""
+        return self.matrix[self._position[name]]
+
+    def value(self, name: str, row: int):
+        raw = float(self.matrix[self._position[name], row])
+        if math.isnan(raw):
+            return None
+
+        kind = self.kinds[name]
+        if kind == KIND_BOOL:
+            return raw != 0.0
+        if kind == KIND_CATEGORY:
+            return self.categories[name][int(raw)]
+        if kind == KIND_TIMESTAMP:
+            return _seconds_to_timestamp(raw)
+        return raw
+
+
+class DayView(Mapping):
+    """
+    Read-only dict-like row over a FeatureTable.
+
+    Keeps `day["market_data"]["current_price"]` and `day.get("flags", {})`
+    working for scorers, managers and the simulator. Values that were missing
+    when the table was written read back as None.
+    """
+
+    __slots__ = ("_table", "_row", "_node")
+
+    def __init__(self, table: FeatureTable, row: int, node: dict | None = None):
+        self._table = table
+        self._row = row
+        self._node = table._tree if node is None else node
+
+    def __getitem__(self, key):
+        child = self._node[key]
+        if isinstance(child, dict):
+            return DayView(self._table, self._row, child)
+        return self._table.value(child, self._row)
+
+    def __iter__(self):
+        return iter(self._node)
+
+    def __len__(self) -> int:
+        return len(self._node)
+
+    def to_dict(self) -> dict:
+        return {
+            key: value.to_dict() if isinstance(value, DayView) else value
+            for key, value in self.items()
+        }
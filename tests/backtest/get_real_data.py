@@ -1,20 +1,72 @@
 import pandas as pd
 from fredapi import Fred
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.macro_store import DEFAULT_MACRO_COLUMNS, MacroVintageStore
+
 load_dotenv()
 
 class RealDataFetcher:
-    def __init__(self):
+    def __init__(self, store: MacroVintageStore | None = None):
         self.fred_key = os.getenv("FRED_API_KEY")
         self.fred = Fred(api_key=self.fred_key) if self.fred_key else None
+        self.store = store or MacroVintageStore()
+
+    def refresh_vintages(self, series_ids=None):
+        """
+        Pulls only the vintages released since the last stored knowledge date.
+        """
+        if not self.fred:
+            return 0
+
+        series_ids = series_ids or sorted({spec.series_id for spec in DEFAULT_MACRO_COLUMNS.values()})
+        added = 0
+        for series_id in series_ids:
+            latest = self.store.latest_knowledge_date(series_id)
+            realtime_start = latest.strftime("%Y-%m-%d") if latest is not None else None
+            releases = self.fred.get_series_all_releases(series_id, realtime_start=realtime_start)
+            vintages = releases.rename(columns={"date": "observation_date", "realtime_start": "knowledge_date"})
+            added += self.store.upsert(series_id, self.store.unseen_vintages(series_id, vintages))
+
+        if added:
+            self.store.save()
+        return added
+
+    def fetch_point_in_time_macro(self, start_date, end_date):
+        """
+        Daily macro columns using only the vintages public on each day.
+        """
+        try:
+            self.refresh_vintages()
+        except Exception as e:
+            print(f"⚠️ FRED vintage refresh failed, using local store: {e}")
 
-    def fetch_macro_data(self, start_date, end_date):
+        if not self.store.series_ids():
+            return None
+
+        dates = pd.date_range(start=start_date, end=end_date, freq="D")
+        return self.store.as_of(dates)
+
+    def fetch_macro_data(self, start_date, end_date, point_in_time=True):
         """
         Fetches 10Y Yield (DGS10) and M2 Money Supply (M2SL) from FRED.
+
+        By default values come from the local vintage store, so each day only
+        sees revisions that were published by then.
         """
+        if point_in_time:
+            macro_df = self.fetch_point_in_time_macro(start_date, end_date)
+            if macro_df is not None:
+                return macro_df
+
         if not self.fred:
             print("⚠️ FRED_API_KEY not found. Using neutral macro data.")
             return None
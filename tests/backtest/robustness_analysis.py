@@ -14,6 +14,7 @@ from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
 from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
 from src.execution.portfolio_manager import PortfolioManager
 from src.strategy.score import AdvancedQuantScorer, QuantScorer
+from src.strategy.score_cache import CachedScorer, ScoreCache
 from tests.backtest.compare_models import PortfolioSimulator, buy_and_hold_metrics
 from tests.backtest.data_loader import BacktestDataLoader
 
@@ -53,8 +54,8 @@ def filter_period(daily_data: list[dict], start: str, end: str) -> list[dict]:
     return [row for row in daily_data if in_range(row["timestamp"][:10], start, end)]
 
 
-def model_specs() -> list[tuple[str, object, object]]:
-    return [
+def model_specs(score_cache: ScoreCache | None = None) -> list[tuple[str, object, object]]:
+    specs = [
         (
             "production_legacy_cooldown1",
             QuantScorer(mode="legacy"),
@@ -76,6 +77,9 @@ def model_specs() -> list[tuple[str, object, object]]:
             AdvancedPortfolioManager(min_trade_usd=20.0, cooldown_days=1),
         ),
     ]
+    if score_cache is None:
+        return specs
+    return [(name, CachedScorer(scorer, score_cache), manager) for name, scorer, manager in specs]
 
 
 def run_period_simulations(
@@ -87,6 +91,7 @@ def run_period_simulations(
     window_end: str,
     trading_cost_bps: float,
     annual_debt_rate: float,
+    score_cache: ScoreCache | None = None,
 ) -> list[dict]:
     simulator = PortfolioSimulator(
         trading_cost_bps=trading_cost_bps,
@@ -114,7 +119,7 @@ def run_period_simulations(
         }
     )
 
-    for model_name, scorer, manager in model_specs():
+    for model_name, scorer, manager in model_specs(score_cache):
         result = simulator.run(model_name, scorer, manager, daily_data)
         rows.append(
             {
@@ -221,6 +226,8 @@ def run_robustness_analysis() -> None:
         raise RuntimeError("Robustness dataset is empty.")
 
     rows = []
+    # Shared by every cost scenario and transition window of this run.
+    score_cache = ScoreCache()
 
     first_date = daily_data[0]["timestamp"][:10]
     last_date = daily_data[-1]["timestamp"][:10]
@@ -235,6 +242,7 @@ def run_robustness_analysis() -> None:
                 window_end=last_date,
                 trading_cost_bps=cost_bps,
                 annual_debt_rate=debt_rate,
+                score_cache=score_cache,
             )
         )
 
@@ -258,6 +266,7 @@ def run_robustness_analysis() -> None:
                     window_end=window_end,
                     trading_cost_bps=cost_bps,
                     annual_debt_rate=TRANSITION_DEBT_RATE,
+                    score_cache=score_cache,
                 )
             )
 
@@ -271,6 +280,7 @@ def run_robustness_analysis() -> None:
 
     print("Robustness analysis completed.")
     print(df[["analysis_type", "scenario", "model", "total_return_pct", "sharpe"]].head(20))
+    print(f"Score cache: {score_cache.stats()}")
 
 
 if __name__ == "__main__":
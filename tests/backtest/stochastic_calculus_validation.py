@@ -18,10 +18,10 @@ if str(PROJECT_ROOT) not in sys.path:
 from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
 from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
 from src.execution.portfolio_manager import PortfolioManager
-from src.features.cycle import BitcoinCycle
-from src.features.seasonality import BitcoinSeasonality
+from src.data.processed_reader import ProcessedPayloadReader
+from src.features.pipeline import FeatureSpec, assemble_features, feature_days, price_features
 from src.strategy.score import AdvancedQuantScorer, QuantScorer
-from src.utils.project_paths import PROCESSED_DATA_DIR
+from src.utils.kernels import markov_chain_step, transition_cdf
 from tests.backtest.compare_models import PortfolioSimulator, buy_and_hold_metrics
 from tests.backtest.data_loader import BacktestDataLoader
 
@@ -116,20 +116,23 @@ def _holm_adjustment(named_pvalues: list[tuple[str, float]]) -> dict[str, float]
     return adjusted
 
 
-def _load_processed_daily_data() -> list[dict]:
-    rows: list[dict] = []
-    for file_path in sorted(PROCESSED_DATA_DIR.glob("processed_data_*.json")):
-        try:
-            payload = json.loads(file_path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            continue
+PROCESSED_FIELDS = (
+    "timestamp",
+    "market_data.current_price",
+    "metrics.interest_rate",
+    "metrics.m2_yoy",
+    "metrics.inflation_yoy",
+)
 
-        price = payload.get("market_data", {}).get("current_price")
-        if price is None:
-            continue
-        rows.append(payload)
 
-    rows.sort(key=lambda row: row.get("timestamp", ""))
+def _load_processed_daily_data() -> list[dict]:
+    # Calibration only needs prices and the macro baseline, so skip decoding the rest.
+    rows = [
+        row
+        for row in ProcessedPayloadReader().read_projected(PROCESSED_FIELDS)
+        if row["market_data"]["current_price"] is not None
+    ]
+    rows.sort(key=lambda row: row.get("timestamp") or "")
     return rows
 
 
@@ -268,7 +271,13 @@ def simulate_regime_jump_diffusion(
     seed: int,
     drift_scale: float = 1.0,
     vol_scale: float = 1.0,
+    use_kernels: bool = True,
 ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Regime-switching jump diffusion. With `use_kernels` the Markov chain
+    draws one uniform per path and steps through `markov_chain_step`, which
+    consumes the generator exactly like the per-path `rng.choice` reference.
+    """
     rng = np.random.default_rng(seed)
 
     mu_regimes = np.array(params["mu_regimes"], dtype=float) * float(drift_scale)
@@ -280,6 +289,7 @@ def simulate_regime_jump_diffusion(
     jump_sigma = float(params["jump_sigma"]) * max(0.5, float(vol_scale))
 
     transition = np.array(params["transition_matrix"], dtype=float)
+    transition_cumulative = transition_cdf(transition)
 
     prices = np.zeros((n_paths, horizon_days + 1), dtype=float)
     regimes = np.zeros((n_paths, horizon_days + 1), dtype=int)
@@ -288,11 +298,13 @@ def simulate_regime_jump_diffusion(
 
     for t in range(horizon_days):
         z = rng.standard_normal(n_paths)
-        next_regimes = np.zeros(n_paths, dtype=int)
-
-        for i in range(n_paths):
-            p = int(regimes[i, t])
-            next_regimes[i] = int(rng.choice(3, p=transition[p]))
+        if use_kernels:
+            next_regimes = markov_chain_step(transition_cumulative, regimes[:, t], rng.random(n_paths))
+        else:
+            next_regimes = np.zeros(n_paths, dtype=int)
+            for i in range(n_paths):
+                p = int(regimes[i, t])
+                next_regimes[i] = int(rng.choice(3, p=transition[p]))
 
         regimes[:, t + 1] = next_regimes
 
@@ -382,8 +394,7 @@ def simulate_heston_jump_diffusion(
     return prices, variances
 
 
-def _phase_for_date(cycle: BitcoinCycle, date_value: datetime) -> str:
-    return cycle.get_phase(date_value.strftime("%Y-%m-%d"))["phase"]
+SYNTHETIC_FEATURE_SPEC = FeatureSpec(zscore_window=180, zscore_min_periods=20, sma_min_periods=20, warmup_fill=True)
 
 
 def build_synthetic_daily_data(
@@ -391,99 +402,40 @@ def build_synthetic_daily_data(
     start_date: datetime,
     macro_baseline: dict,
 ) -> list[dict]:
-    cycle = BitcoinCycle()
-    seasonality = BitcoinSeasonality()
-
-    dates = [start_date + timedelta(days=i) for i in range(len(price_path))]
-    df = pd.DataFrame({"price": price_path}, index=pd.to_datetime(dates))
-
-    df["daily_change_pct"] = df["price"].pct_change().fillna(0.0) * 100.0
-    df["weekly_change_pct"] = df["price"].pct_change(7).fillna(0.0) * 100.0
-    df["monthly_change_pct"] = df["price"].pct_change(30).fillna(0.0) * 100.0
+    index = pd.date_range(pd.Timestamp(start_date).normalize(), periods=len(price_path), freq="D")
+    df = price_features(pd.Series(price_path, index=index, dtype=float), SYNTHETIC_FEATURE_SPEC)
 
-    df["ema_365"] = df["price"].ewm(span=365, adjust=False, min_periods=1).mean()
-    df["sma_200"] = df["price"].rolling(window=200, min_periods=20).mean().bfill().ffill()
-    df["sma_365"] = df["price"].rolling(window=365, min_periods=20).mean().bfill().ffill()
+    daily_return = df["daily_change_pct"] / 100.0
+    rv_30 = df["realized_vol_30d"] / math.sqrt(TRADING_DAYS)
 
-    df["price_vs_ema_pct"] = ((df["price"] - df["ema_365"]) / df["ema_365"]) * 100.0
-    df["mvrv_proxy"] = df["price"] / df["sma_365"]
-    df["mayer_multiple"] = df["price"] / df["sma_200"]
-
-    rolling_mean = df["mvrv_proxy"].rolling(window=180, min_periods=20).mean().bfill().ffill()
-    rolling_std = df["mvrv_proxy"].rolling(window=180, min_periods=20).std().bfill().ffill()
-    rolling_std = rolling_std.replace(0.0, np.nan).bfill().ffill().fillna(1.0)
-    df["mvrv_zscore"] = ((df["mvrv_proxy"] - rolling_mean) / rolling_std).clip(-4.0, 4.0)
-
-    daily_return = df["price"].pct_change().fillna(0.0)
-    rv_30 = daily_return.rolling(window=30, min_periods=5).std().bfill().ffill().fillna(0.02)
-
-    df["rup"] = (0.80 + (1.35 * (df["mvrv_proxy"] - 1.0))).clip(0.0, 3.0)
-    df["sopr"] = (1.0 + (2.1 * daily_return)).clip(0.85, 1.20)
+    inputs = pd.DataFrame(index=index)
+    inputs["mvrv"] = df["mvrv_proxy"]
+    inputs["mayer_multiple"] = df["mayer_proxy"]
+    inputs["mvrv_zscore"] = df["mvrv_zscore"].clip(-4.0, 4.0)
+    inputs["rup"] = (0.80 + (1.35 * (df["mvrv_proxy"] - 1.0))).clip(0.0, 3.0)
+    inputs["sopr"] = (1.0 + (2.1 * daily_return)).clip(0.85, 1.20)
 
     fng = 50.0 + (0.72 * df["weekly_change_pct"]) + (0.38 * df["monthly_change_pct"]) - (260.0 * rv_30)
-    df["fear_and_greed"] = fng.clip(5.0, 95.0)
+    inputs["fear_and_greed"] = fng.clip(5.0, 95.0)
 
     base_interest = _safe_float(macro_baseline.get("interest_rate"), 3.5)
     base_m2 = _safe_float(macro_baseline.get("m2_yoy"), 5.0)
     base_infl = _safe_float(macro_baseline.get("inflation_yoy"), 3.0)
 
-    df["interest_rate"] = (base_interest + (1.8 * rv_30)).clip(0.5, 10.0)
-    df["m2_yoy"] = (base_m2 - (5.5 * rv_30)).clip(-8.0, 15.0)
-    df["inflation_yoy"] = (base_infl + (2.3 * rv_30)).clip(0.0, 12.0)
-    df["funding_rate"] = (0.0045 + (0.0006 * df["weekly_change_pct"]) - (0.03 * rv_30)).clip(-0.05, 0.08)
+    inputs["interest_rate"] = (base_interest + (1.8 * rv_30)).clip(0.5, 10.0)
+    inputs["m2_yoy"] = (base_m2 - (5.5 * rv_30)).clip(-8.0, 15.0)
+    inputs["inflation_yoy"] = (base_infl + (2.3 * rv_30)).clip(0.0, 12.0)
+    inputs["funding_rate"] = (0.0045 + (0.0006 * df["weekly_change_pct"]) - (0.03 * rv_30)).clip(-0.05, 0.08)
+    inputs["inflation_trend"] = inputs["inflation_yoy"].diff(30).fillna(0.0)
 
-    rows: list[dict] = []
-    for date_idx, row in df.iterrows():
-        date_str = date_idx.strftime("%Y-%m-%d")
-        seasonality_status = seasonality.get_seasonality(date_str)["status"]
-
-        is_bull = bool(row["price"] > row["ema_365"])
-        is_derivatives_risk = bool(row["funding_rate"] > 0.03)
-        is_high_vol = bool(abs(row["daily_change_pct"]) > 4.0)
+    # Simulated 90d correlations: risk-on coupling with SPX in high-vol drawdowns,
+    # gold-like behaviour in high-vol rallies with weak liquidity.
+    is_bull = df["current_price"] > df["ema_365"]
+    is_high_vol = df["daily_change_pct"].abs() > 4.0
+    inputs["corr_spx_90d"] = np.where(~is_bull & is_high_vol, 0.8, 0.2)
+    inputs["corr_gold_90d"] = np.where(is_bull & is_high_vol & (inputs["m2_yoy"] < 1.0), 0.8, 0.2)
 
-        rows.append(
-            {
-                "timestamp": f"{date_str}T00:00:00",
-                "market_cycle_phase": _phase_for_date(cycle, date_idx.to_pydatetime()),
-                "market_data": {
-                    "current_price": float(row["price"]),
-                    "daily_change_pct": float(row["daily_change_pct"]),
-                    "weekly_change_pct": float(row["weekly_change_pct"]),
-                    "monthly_change_pct": float(row["monthly_change_pct"]),
-                    "ema_365": float(row["ema_365"]),
-                    "price_vs_ema_pct": float(row["price_vs_ema_pct"]),
-                },
-                "metrics": {
-                    "mvrv": float(row["mvrv_proxy"]),
-                    "mvrv_zscore": float(row["mvrv_zscore"]),
-                    "sopr": float(row["sopr"]),
-                    "rup": float(row["rup"]),
-                    "mayer_multiple": float(row["mayer_multiple"]),
-                    "fear_and_greed": float(row["fear_and_greed"]),
-                    "interest_rate": float(row["interest_rate"]),
-                    "m2_yoy": float(row["m2_yoy"]),
-                    "inflation_yoy": float(row["inflation_yoy"]),
-                    "funding_rate": float(row["funding_rate"]),
-                },
-                "flags": {
-                    "is_accumulation": bool((row["rup"] < 0.60) and (row["mvrv_proxy"] < 1.2) and (row["sopr"] < 1.0)),
-                    "is_overheated": bool((row["mayer_multiple"] > 2.30) or (row["mvrv_zscore"] > 2.0)),
-                    "is_fear_extreme": bool(row["fear_and_greed"] < 15.0),
-                    "is_greed_extreme": bool(row["fear_and_greed"] > 80.0),
-                    "is_liquidity_good": bool((row["m2_yoy"] > 5.0) or (row["interest_rate"] < 2.0)),
-                    "is_inflation_high": bool(row["inflation_yoy"] > 3.0),
-                    "is_inflation_falling": bool(row["daily_change_pct"] < 0.0),
-                    "is_bull_trend": is_bull,
-                    "is_derivatives_risk": is_derivatives_risk,
-                    "is_volatility_opportunity": bool((row["daily_change_pct"] < -5.0) and is_bull),
-                    "is_positive_seasonality": seasonality_status in {"BULLISH", "VERY BULLISH"},
-                    "is_high_corr_spx": bool((not is_bull) and is_high_vol),
-                    "is_high_corr_gold": bool(is_bull and is_high_vol and (row["m2_yoy"] < 1.0)),
-                },
-            }
-        )
-
-    return rows
+    return feature_days(assemble_features(df, inputs))
 
 
 def model_specs() -> list[tuple[str, object, object]]:
@@ -14,6 +14,7 @@ from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
 from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
 from src.execution.portfolio_manager import PortfolioManager
 from src.strategy.score import AdvancedQuantScorer, QuantScorer
+from src.strategy.score_cache import CachedScorer, ScoreCache
 from tests.backtest.compare_models import PortfolioSimulator, buy_and_hold_metrics
 from tests.backtest.data_loader import BacktestDataLoader
 
@@ -67,6 +68,8 @@ def run_subperiod_analysis() -> None:
             ConfidencePortfolioManager(min_trade_usd=20.0, cooldown_days=1),
         ),
     ]
+    score_cache = ScoreCache()
+    model_specs = [(name, CachedScorer(scorer, score_cache), manager) for name, scorer, manager in model_specs]
 
     rows = []
 
@@ -151,6 +154,7 @@ def run_subperiod_analysis() -> None:
 
     print("Subperiod analysis completed.")
     print(df)
+    print(f"Score cache: {score_cache.stats()}")
 
 
 if __name__ == "__main__":
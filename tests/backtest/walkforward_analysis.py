@@ -17,8 +17,10 @@ if str(PROJECT_ROOT) not in sys.path:
 from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
 from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
 from src.execution.portfolio_manager import PortfolioManager
-from src.strategy.score import AdvancedQuantScorer, QuantScorer
-from tests.backtest.compare_models import INITIAL_CAPITAL, PortfolioSimulator, buy_and_hold_metrics
+from src.strategy.ensemble import AdvancedHead, LegacyHead, ScoringEnsemble
+from src.strategy.point_in_time_calibrator import PointInTimeCalibrator
+from src.strategy.score_cache import CachedScorer, ScoreCache
+from tests.backtest.compare_models import INITIAL_CAPITAL, PortfolioSimulator, buy_and_hold_metrics, daily_scores
 from tests.backtest.data_loader import BacktestDataLoader
 
 
@@ -83,14 +85,13 @@ def simulate_daily_returns(daily_data: list[dict], scorer, manager) -> list[floa
     prev_equity = INITIAL_CAPITAL
 
     returns = []
-    for day in daily_data:
+    for day, scores in zip(daily_data, daily_scores(scorer, daily_data)):
         price = float(day["market_data"]["current_price"])
         date_str = day["timestamp"][:10]
 
         if debt > 0:
             debt *= 1.0 + (simulator.annual_debt_rate / 365.0)
 
-        scores = scorer.calculate_scores(day)["scores"]
         order = manager.calculate_order(
             scores=scores,
             current_cash=cash,
@@ -613,6 +614,7 @@ def run_walkforward_analysis(
     bootstrap_samples: int = BOOTSTRAP_SAMPLES,
     bootstrap_method: str = DEFAULT_BOOTSTRAP_METHOD,
     block_length: int = DEFAULT_BLOCK_LENGTH,
+    point_in_time: bool = False,
 ) -> None:
     loader = BacktestDataLoader(start_date=START_DATE)
     loader.fetch_data()
@@ -629,28 +631,38 @@ def run_walkforward_analysis(
         raise RuntimeError("Not enough data to build walk-forward folds.")
 
     simulator = PortfolioSimulator()
+    # Every gate candidate reads one head of a shared ensemble: features are
+    # extracted once per batch and a new scorer variant costs only its head.
+    # With `point_in_time` the advanced head scores each day with stats fitted
+    # on the processed files dated before it, so test folds never calibrate
+    # on their own (or later) days.
+    calibrator = PointInTimeCalibrator() if point_in_time else None
+    ensemble = ScoringEnsemble({"legacy": LegacyHead(), "advanced": AdvancedHead()}, calibrator=calibrator)
     model_specs = [
         (
             "production_legacy_cooldown1",
-            QuantScorer(mode="legacy"),
+            ensemble.head_scorer("legacy"),
             PortfolioManager(min_trade_usd=20.0, cooldown_days=1),
         ),
         (
             "legacy_cooldown3_baseline",
-            QuantScorer(mode="legacy"),
+            ensemble.head_scorer("legacy"),
             PortfolioManager(min_trade_usd=20.0, cooldown_days=3),
         ),
         (
             "advanced_adaptive_research",
-            AdvancedQuantScorer(),
+            ensemble.head_scorer("advanced"),
             AdvancedPortfolioManager(min_trade_usd=20.0, cooldown_days=1),
         ),
         (
             "legacy_confidence_research",
-            QuantScorer(mode="legacy"),
+            ensemble.head_scorer("legacy"),
             ConfidencePortfolioManager(min_trade_usd=20.0, cooldown_days=1),
         ),
     ]
+    # Identical scorer configurations score each day once across models and folds.
+    score_cache = ScoreCache()
+    model_specs = [(name, CachedScorer(scorer, score_cache), manager) for name, scorer, manager in model_specs]
 
     oos_returns = {
         "production_legacy_cooldown1": [],
@@ -790,6 +802,7 @@ def run_walkforward_analysis(
     print("Walk-forward analysis completed.")
     print(f"Selected fold step: {selected_fold_step} days | Folds: {len(folds)}")
     print(f"Production gate selected model: {gate_payload['selected_model']}")
+    print(f"Score cache: {score_cache.stats()}")
     print(summary_df)
 
 
@@ -803,6 +816,11 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_BOOTSTRAP_METHOD,
     )
     parser.add_argument("--block-length", type=int, default=DEFAULT_BLOCK_LENGTH)
+    parser.add_argument(
+        "--point-in-time",
+        action="store_true",
+        help="Calibrate the advanced model on the history before each scored day.",
+    )
     return parser.parse_args()
 
 
@@ -813,4 +831,5 @@ if __name__ == "__main__":
         bootstrap_samples=args.bootstrap_samples,
         bootstrap_method=args.bootstrap_method,
         block_length=args.block_length,
+        point_in_time=args.point_in_time,
     )
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from src.data.processed_reader import ProcessedPayloadReader
+from src.strategy.calibrator_cache import directory_key
+from src.strategy.score import HistoricalFeatureCalibrator
+from src.utils.project_paths import PROCESSED_DATA_DIR
+
+
+def _write_history(directory: Path, days: int = 150, seed: int = 2) -> None:
+    rng = np.random.default_rng(seed)
+    prices = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, days)))
+    for idx in range(days):
+        date_str = f"2024-{1 + idx // 28:02d}-{1 + idx % 28:02d}"
+        payload = {
+            "timestamp": f"{date_str}T00:00:00",
+            "market_cycle_phase": "Accumulation" if idx % 3 else "Pre-Halving Rally",
+            "market_data": {"current_price": float(prices[idx]), "price_vs_ema_pct": float(rng.normal(10.0, 20.0))},
+            "metrics": {"mvrv_zscore": float(rng.normal(0.5, 1.0)), "sopr": float(rng.normal(1.0, 0.05))},
+        }
+        (directory / f"processed_data_{date_str}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+
+class TestCalibratorCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.processed_dir, self.cache_dir = root / "processed", root / "cache"
+        self.processed_dir.mkdir()
+        _write_history(self.processed_dir)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _calibrator(self, **kwargs) -> HistoricalFeatureCalibrator:
+        return HistoricalFeatureCalibrator(processed_dir=self.processed_dir, cache_dir=self.cache_dir, **kwargs)
+
+    def test_cached_fit_matches_fresh_fit_without_reading_history(self):
+        fresh = self._calibrator()
+        self.assertFalse(fresh.loaded_from_cache)
+
+        with mock.patch.object(ProcessedPayloadReader, "read_columns", side_effect=AssertionError("history read")):
+            started = time.perf_counter()
+            cached = self._calibrator()
+            elapsed = time.perf_counter() - started
+
+        self.assertTrue(cached.loaded_from_cache)
+        self.assertEqual(cached.feature_stats, fresh.feature_stats)
+        self.assertEqual(cached.cycle_priors, fresh.cycle_priors)
+        self.assertNotEqual(cached.feature_stats["sopr"], HistoricalFeatureCalibrator.DEFAULT_STATS["sopr"])
+        self.assertLess(elapsed, 0.05)
+
+    def test_parameters_key_separate_entries(self):
+        self._calibrator()
+        other = self._calibrator(lookback_files=100)
+        self.assertFalse(other.loaded_from_cache)
+        self.assertEqual(len(list(self.cache_dir.glob("*.json"))), 2)
+
+        with mock.patch.object(HistoricalFeatureCalibrator, "FIT_VERSION", 2):
+            self.assertFalse(self._calibrator().loaded_from_cache)
+
+    def test_changed_history_refits_and_evicts_the_stale_entry(self):
+        self._calibrator()
+        before = list(self.cache_dir.glob("*.json"))
+
+        newest = sorted(self.processed_dir.glob("processed_data_*.json"))[-1]
+        payload = json.loads(newest.read_text(encoding="utf-8"))
+        payload["metrics"]["sopr"] = 5.0
+        newest.write_text(json.dumps(payload), encoding="utf-8")
+
+        refit = self._calibrator()
+        after = list(self.cache_dir.glob("*.json"))
+
+        self.assertFalse(refit.loaded_from_cache)
+        self.assertEqual(len(after), 1)
+        self.assertNotEqual(after, before)
+        self.assertTrue(self._calibrator().loaded_from_cache)
+
+    def test_fresh_checkout_reuses_the_entry(self):
+        self._calibrator()
+        for path in self.processed_dir.glob("processed_data_*.json"):
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertTrue(self._calibrator().loaded_from_cache)
+        self.assertEqual(directory_key(PROCESSED_DATA_DIR), "data/processed")
+
+
+if __name__ == "__main__":
+    unittest.main()
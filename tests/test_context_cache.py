@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.features.context_cache import ContextCache, series_fingerprint
+from src.features.rolling_state import DEFAULT_CONTEXT, compute_context_from_prices
+from src.strategy import process_data
+
+
+def _context(value: float) -> dict:
+    return {name: value for name in DEFAULT_CONTEXT}
+
+
+class TestContextCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        rng = np.random.default_rng(5)
+        index = pd.date_range(end="2024-06-30", periods=2_000, freq="D")
+        self.prices = pd.Series(30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, size=index.size))), index=index)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _download(self, start_date: str, end_date: str) -> pd.Series:
+        index = pd.DatetimeIndex(self.prices.index)
+        return self.prices[(index >= start_date) & (index < end_date)]
+
+    def test_full_download_contexts_are_keyed_by_their_closes(self):
+        cache = ContextCache(self.root / "cache")
+        state_path = self.root / "state.json"
+        compute = mock.Mock(wraps=process_data.compute_context_from_prices)
+
+        with mock.patch.object(process_data, "_download_closes", side_effect=self._download), mock.patch.object(
+            process_data, "compute_context_from_prices", compute
+        ):
+            process_data.fetch_historical_context("2024-06-30", state_path=state_path, cache=cache)
+            # Older than the rolling state: full download, then memoized.
+            first = process_data.fetch_historical_context("2024-03-01", state_path=state_path, cache=cache)
+            second = process_data.fetch_historical_context(
+                "2024-03-01", state_path=state_path, cache=ContextCache(self.root / "cache")
+            )
+            self.assertEqual(compute.call_count, 2)
+            self.assertEqual(second, first)
+
+            # A revision far outside the remembered tail still misses.
+            self.prices.loc["2023-09-01"] *= 1.05
+            process_data.fetch_historical_context("2024-03-01", state_path=state_path, cache=cache)
+            self.assertEqual(compute.call_count, 3)
+
+        cached = cache.get("2024-03-01", 1460, series_fingerprint(self.prices, "2024-03-01", 1460))
+        expected = compute_context_from_prices(self.prices[self.prices.index < "2024-03-01"])
+        for name in DEFAULT_CONTEXT:
+            self.assertAlmostEqual(cached[name], expected[name], places=8)
+
+    def test_range_contexts_reuse_only_unchanged_dates(self):
+        cache = ContextCache(self.root / "cache")
+        dates = ["2024-05-01", "2024-06-01", "2024-06-29"]
+        expected = process_data.context_for_dates(dates, self.prices)
+        pd.testing.assert_frame_equal(process_data._contexts(dates, self.prices, 1460, cache), expected)
+
+        revised = self.prices.copy()
+        revised.loc["2024-05-15"] *= 1.05
+        with mock.patch.object(process_data, "context_for_dates", wraps=process_data.context_for_dates) as compute:
+            pd.testing.assert_frame_equal(process_data._contexts(dates, self.prices, 1460, cache), expected)
+            self.assertEqual(compute.call_count, 0)
+            process_data._contexts(dates, revised, 1460, cache)
+        self.assertEqual(compute.call_args.args[0], ["2024-06-01", "2024-06-29"])
+
+    def test_lru_eviction_bounds_entries(self):
+        cache = ContextCache(self.root / "cache", max_entries=3)
+        for day in range(1, 5):
+            cache.put(f"2024-01-0{day}", 1460, f"fp{day}", _context(float(day)))
+        cache.get("2024-01-02", 1460, "fp2")
+        cache.put("2024-01-05", 1460, "fp5", _context(5.0))
+
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(len(list((self.root / "cache" / "objects").iterdir())), 3)
+        self.assertIsNone(cache.get("2024-01-03", 1460, "fp3"))
+        self.assertEqual(cache.get("2024-01-02", 1460, "fp2")["mvrv_zscore"], 2.0)
+
+    def test_fingerprint_mismatch_misses(self):
+        cache = ContextCache(self.root / "cache")
+        fingerprint = series_fingerprint(self.prices, "2024-06-30", 1460)
+        cache.put("2024-06-30", 1460, fingerprint, _context(1.0))
+
+        self.assertIsNotNone(cache.get("2024-06-30", 1460, fingerprint))
+        revised = self.prices.copy()
+        revised.iloc[-10] *= 1.01
+        self.assertIsNone(cache.get("2024-06-30", 1460, series_fingerprint(revised, "2024-06-30", 1460)))
+        self.assertIsNone(cache.get("2024-06-30", 365, fingerprint))
+
+    def test_revised_tail_invalidates_later_contexts(self):
+        cache = ContextCache(self.root / "cache")
+        for date_str in ("2024-06-25", "2024-06-28", "2024-06-30"):
+            cache.put(date_str, 1460, "fp", _context(1.0))
+        cache.observe(self.prices)
+
+        revised = self.prices.copy()
+        revised.loc["2024-06-27"] *= 1.02
+        self.assertEqual(cache.observe(revised), "2024-06-27")
+        self.assertIsNotNone(cache.get("2024-06-25", 1460, "fp"))
+        self.assertIsNone(cache.get("2024-06-28", 1460, "fp"))
+        self.assertIsNone(cache.get("2024-06-30", 1460, "fp"))
+        self.assertIsNone(cache.observe(revised))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.calendar import calendar_rows, calendar_table
+from src.features.cycle import BitcoinCycle
+from src.features.flags import compute_flags
+from src.features.seasonality import BitcoinSeasonality
+
+
+class TestCycleCalendar(unittest.TestCase):
+    def test_get_phases_matches_get_phase(self):
+        cycle = BitcoinCycle()
+        dates = pd.date_range("2010-01-01", "2040-12-31", freq="3D")
+        boundaries = []
+        for halving in cycle.HALVINGS:
+            for offset in (-541, -540, -366, -365, -271, -270, -1, 0, 1, 540, 541):
+                boundaries.append(pd.Timestamp(halving) + pd.Timedelta(days=offset))
+        dates = dates.append(pd.DatetimeIndex(boundaries))
+
+        phases = cycle.get_phases(dates.values)
+        names = cycle.phase_names(phases["phase_code"])
+
+        for idx, date_value in enumerate(dates):
+            expected = cycle.get_phase(date_value.strftime("%Y-%m-%d"))
+            self.assertEqual(names[idx], expected["phase"], date_value)
+            self.assertEqual(phases["days_since_halving"][idx], expected["days_since_halving"], date_value)
+            self.assertEqual(phases["days_until_halving"][idx], expected["days_until_halving"], date_value)
+
+    def test_calendar_rows_include_seasonality(self):
+        rows = calendar_rows(np.array(["2024-05-22", "2025-09-30", "2025-11-22"], dtype="datetime64[D]"))
+        seasonality = BitcoinSeasonality()
+
+        self.assertIs(calendar_table(), calendar_table())
+        self.assertEqual(rows["phase"].tolist(), ["Post-Halving Expansion", "Post-Halving Expansion", "Bear Market / Distribution"])
+        self.assertEqual(rows["seasonality_status"].tolist(), [seasonality.get_seasonality(d)["status"] for d in ("2024-05-22", "2025-09-30", "2025-11-22")])
+        self.assertEqual(rows["is_positive_seasonality"].tolist(), [True, False, True])
+
+
+    def test_dates_outside_the_table_fall_back_to_get_phase(self):
+        cycle = BitcoinCycle()
+        seasonality = BitcoinSeasonality()
+        dates = ["2009-06-15", "2024-05-22", "2041-03-01"]
+        rows = calendar_rows(np.array(dates, dtype="datetime64[D]"))
+
+        self.assertEqual(rows.index.strftime("%Y-%m-%d").tolist(), dates)
+        self.assertEqual(rows["phase"].tolist(), [cycle.get_phase(d)["phase"] for d in dates])
+        self.assertEqual(rows["days_since_halving"].tolist(), [cycle.get_phase(d)["days_since_halving"] for d in dates])
+        self.assertEqual(rows["seasonality_status"].tolist(), [seasonality.get_seasonality(d)["status"] for d in dates])
+
+    def test_seasonality_flag_matches_calendar(self):
+        year = calendar_table().loc["2024-01-01":"2024-12-31"]
+        flags = compute_flags(pd.DataFrame(index=year.index))
+        np.testing.assert_array_equal(flags["is_positive_seasonality"], year["is_positive_seasonality"])
+
+
+if __name__ == "__main__":
+    unittest.main()
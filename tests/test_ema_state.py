@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from src.data.get_data import EMA
+from src.data.get_data.EMA import PriceEMAState, ema_from_prices, get_ema
+
+
+def _chart(days: int, end: datetime, seed: int = 3) -> list[tuple[str, float]]:
+    rng = np.random.default_rng(seed)
+    prices = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, days + 2)))
+    dates = [(end - timedelta(days=days - idx)).strftime("%Y-%m-%d") for idx in range(days + 1)]
+    return list(zip(dates + [dates[-1]], prices.tolist()))
+
+
+class TestPriceEMAState(unittest.TestCase):
+    def test_incremental_updates_match_full_recomputation(self):
+        points = _chart(500, datetime(2025, 6, 1))
+        closes, current_price = points[:-1], points[-1][1]
+        state = PriceEMAState.from_closes(closes[:400], seeded_on="2025-02-20")
+        for date_str, close in closes[400:]:
+            state.update(date_str, close)
+
+        window = points[-(EMA.BUFFER_DAYS + 1):]
+        self.assertEqual(state.snapshot(current_price), ema_from_prices([price for _, price in window]))
+        self.assertEqual(len(state.closes), EMA.BUFFER_DAYS)
+        self.assertFalse(state.update(closes[-2][0], 1.0))
+
+    def test_get_ema_seeds_then_downloads_only_new_closes(self):
+        today = datetime.now(timezone.utc)
+        history = _chart(400, today)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = Path(tmp_dir) / "ema.json"
+
+            seed_chart = history[-(EMA.EMA_SPAN + 2):-2] + [history[-1]]
+            with mock.patch.object(EMA, "_fetch_chart", return_value=seed_chart) as fetch:
+                get_ema(state_path=state_path)
+            self.assertEqual(fetch.call_args.args, (EMA.EMA_SPAN,))
+
+            self.assertEqual(PriceEMAState.load(state_path).last_date, history[-3][0])
+
+            with mock.patch.object(EMA, "_fetch_chart", return_value=history[-3:]) as fetch:
+                snapshot = get_ema(state_path=state_path)
+            self.assertEqual(fetch.call_args.args, (1,))
+
+            # The chart the full path would have downloaded today.
+            window = history[-(EMA.EMA_SPAN + 1):]
+            self.assertEqual(snapshot, ema_from_prices([price for _, price in window]))
+
+    def test_reseed_reports_deviation_from_the_windowed_chart(self):
+        today = datetime.now(timezone.utc)
+        history = _chart(420, today)
+        stale = PriceEMAState.from_closes(history[:-60], seeded_on="2000-01-01")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = stale.save(Path(tmp_dir) / "ema.json")
+            window = history[-(EMA.EMA_SPAN + 1):]
+
+            with mock.patch.object(EMA, "_fetch_chart", return_value=window):
+                snapshot = get_ema(state_path=state_path)
+
+            state = PriceEMAState.load(state_path)
+            self.assertEqual(snapshot, ema_from_prices([price for _, price in window]))
+            self.assertAlmostEqual(state.reseed_deviation_pct, 0.0, places=9)
+            self.assertFalse(state.needs_reseed(today.strftime("%Y-%m-%d")))
+
+    def test_failed_download_keeps_the_state(self):
+        today = datetime.now(timezone.utc)
+        history = _chart(400, today)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = PriceEMAState.from_closes(
+                history[-30:-2], seeded_on=today.strftime("%Y-%m-%d")
+            ).save(Path(tmp_dir) / "ema.json")
+            saved = state_path.read_text(encoding="utf-8")
+
+            response = mock.Mock(**{"json.return_value": {"status": {"error_code": 429}}})
+            with mock.patch.object(EMA.requests, "get", return_value=response):
+                with self.assertRaises(ValueError):
+                    get_ema(state_path=state_path)
+            self.assertEqual(state_path.read_text(encoding="utf-8"), saved)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.features.pipeline import feature_days
+from src.strategy.batch_inputs import round_like_python
+from src.strategy.ensemble import AdvancedHead, LegacyHead, ScoringEnsemble
+from src.strategy.legacy_score import LegacyQuantScorer
+from src.strategy.parameter_sweep import perturbed_block_params, perturbed_ranges
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator, QuantScorer
+from src.strategy.score_cache import CachedScorer
+from tests.test_score_batch import _feature_frame
+
+
+def _advanced_variant(seed: int) -> AdvancedHead:
+    params = perturbed_block_params(1, spread=0.5, seed=seed)[0]
+    return AdvancedHead(
+        {name: params[name] for name in AdvancedQuantScorer.LONG_TERM_BLOCKS},
+        {name: params[name] for name in AdvancedQuantScorer.MEDIUM_TERM_BLOCKS},
+    )
+
+
+class TestScoringEnsemble(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.frame = _feature_frame(periods=400, seed=8)
+        cls.days = feature_days(cls.frame)
+        cls.calibrator = HistoricalFeatureCalibrator(cache_dir=None)
+
+    def test_blend_matches_quant_scorer(self):
+        ensemble = ScoringEnsemble.blend(advanced_weight=0.25, calibrator=self.calibrator)
+        scorer = QuantScorer(mode="blend", advanced_weight=0.25, calibrator=self.calibrator)
+
+        batch = ensemble.calculate_scores_batch(self.days)
+        expected = scorer.calculate_scores_batch(self.days)
+        np.testing.assert_array_equal(batch["long_term"], expected["long_term"])
+        np.testing.assert_array_equal(batch["medium_term"], expected["medium_term"])
+        for day in self.days[::25]:
+            self.assertEqual(ensemble.calculate_values(day), scorer.calculate_values(day))
+
+    def test_blend_batch_reproduces_scalar_values_exactly(self):
+        days = feature_days(_feature_frame(periods=3000, seed=1))
+        ensemble = ScoringEnsemble.blend(advanced_weight=0.25, calibrator=self.calibrator)
+        batch = ensemble.calculate_scores_batch(days)
+        values = [ensemble.calculate_values(day) for day in days]
+        self.assertEqual(batch["long_term"].tolist(), [long_term for long_term, _ in values])
+        self.assertEqual(batch["medium_term"].tolist(), [medium_term for _, medium_term in values])
+
+    def test_variant_heads_match_their_scorers(self):
+        advanced = _advanced_variant(seed=5)
+        ranges = perturbed_ranges(1, seed=3)[0]
+        ensemble = ScoringEnsemble({"advanced": advanced, "legacy": LegacyHead(ranges)}, calibrator=self.calibrator)
+        heads = ensemble.evaluate_batch(self.frame)["heads"]
+
+        with mock.patch.object(AdvancedQuantScorer, "LONG_TERM_BLOCKS", advanced.long_term_blocks), mock.patch.object(
+            AdvancedQuantScorer, "MEDIUM_TERM_BLOCKS", advanced.medium_term_blocks
+        ):
+            scorer = AdvancedQuantScorer(calibrator=self.calibrator)
+            expected = scorer.calculate_scores_batch(self.frame)
+            for idx in range(0, len(self.days), 40):
+                day_values = ensemble.evaluate_day(self.days[idx])["heads"]["advanced"]
+                self.assertEqual(day_values, scorer.calculate_values(self.days[idx]))
+        np.testing.assert_array_equal(heads["advanced"]["long_term"], expected["long_term"])
+        np.testing.assert_array_equal(heads["advanced"]["medium_term"], expected["medium_term"])
+
+        patched = {**LegacyQuantScorer.NORMALIZATION_RANGES, **ranges}
+        with mock.patch.object(LegacyQuantScorer, "NORMALIZATION_RANGES", patched):
+            legacy = LegacyQuantScorer()
+            np.testing.assert_array_equal(
+                heads["legacy"]["medium_term"], legacy.calculate_scores_batch(self.frame)["medium_term"]
+            )
+            day = self.days[3]
+            self.assertEqual(ensemble.head_scorer("legacy").calculate_values(day), legacy.calculate_values(day))
+
+    def test_shared_inputs_are_extracted_once_for_all_heads(self):
+        heads = {"legacy": LegacyHead(), "advanced": AdvancedHead(), "variant": _advanced_variant(seed=1)}
+        ensemble = ScoringEnsemble(heads, weights={"legacy": 0.6, "advanced": 0.4}, calibrator=self.calibrator)
+        views = [CachedScorer(ensemble.head_scorer(name)) for name in heads]
+
+        with mock.patch.object(
+            AdvancedQuantScorer, "_batch_inputs", autospec=True, side_effect=AdvancedQuantScorer._batch_inputs
+        ) as advanced_inputs, mock.patch.object(
+            LegacyQuantScorer, "_batch_inputs", autospec=True, side_effect=LegacyQuantScorer._batch_inputs
+        ) as legacy_inputs:
+            outputs = [view.calculate_scores_batch(self.days) for view in views]
+        self.assertEqual((advanced_inputs.call_count, legacy_inputs.call_count), (1, 1))
+
+        blended = ensemble.calculate_scores_batch(self.days)["long_term"]
+        expected = round_like_python((0.6 * outputs[0]["long_term"]) + (0.4 * outputs[1]["long_term"]), 2)
+        np.testing.assert_array_equal(blended, expected)
+        self.assertEqual(ensemble.weights["variant"], 0.0)
+
+    def test_invalid_configurations_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ScoringEnsemble({})
+        with self.assertRaises(ValueError):
+            ScoringEnsemble(weights={"legacy": 1.0, "momentum": 1.0})
+        with self.assertRaises(ValueError):
+            ScoringEnsemble(weights={"legacy": -1.0, "advanced": 2.0})
+        with self.assertRaises(ValueError):
+            LegacyHead({"rup": (3.0, 0.0, True)})
+        with self.assertRaises(ValueError):
+            AdvancedHead({"valuation": [("mvrv_zscore", 1.0, -1.0)]})
+        with self.assertRaises(ValueError):
+            ScoringEnsemble().head_scorer("momentum")
+        with self.assertRaises(ValueError):
+            ScoringEnsemble().calculate_scores_batch(self.frame, components=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.pipeline import (
+    CONTEXT_FIELDS,
+    METRIC_FIELDS,
+    build_feature_frame,
+    context_asof,
+    feature_days,
+    price_features,
+    raw_input_frame,
+    raw_inputs,
+)
+from src.features.rolling_state import DEFAULT_CONTEXT, compute_context_from_prices
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator, QuantScorer
+
+
+def _prices(periods: int = 900, seed: int = 7) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    closes = 20_000.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.03, periods)))
+    return pd.Series(closes, index=pd.date_range("2019-01-01", periods=periods, freq="D"))
+
+
+class TestFeaturePipeline(unittest.TestCase):
+    def test_price_context_matches_reference_recomputation(self):
+        prices = _prices()
+        frame = price_features(prices)
+
+        for end in (50, 400, 899):
+            expected = compute_context_from_prices(prices.iloc[: end + 1])
+            for name in CONTEXT_FIELDS:
+                self.assertAlmostEqual(frame[name].iloc[end], expected[name], places=8, msg=f"{name}@{end}")
+
+    def test_context_asof_uses_the_previous_close(self):
+        prices = _prices(periods=120)
+        frame = price_features(prices)
+        context = context_asof(frame, ["2018-12-31", "2019-01-01", "2019-03-01", "2030-01-01"])
+
+        self.assertEqual(context.iloc[0].to_dict(), DEFAULT_CONTEXT)
+        self.assertEqual(context.iloc[1].to_dict(), DEFAULT_CONTEXT)
+        self.assertEqual(context.iloc[2].tolist(), frame.loc["2019-02-28", list(CONTEXT_FIELDS)].tolist())
+        self.assertEqual(context.iloc[3].tolist(), frame[list(CONTEXT_FIELDS)].iloc[-1].tolist())
+
+    def test_feature_days_feed_the_scorers(self):
+        prices = _prices()
+        inputs = pd.DataFrame({"mvrv": 1.1, "fear_and_greed": 45.0, "sopr": 1.0}, index=prices.index)
+        days = feature_days(build_feature_frame(prices, inputs).iloc[400:])
+
+        day = days[-1]
+        self.assertEqual(day["timestamp"], "2021-06-18T00:00:00")
+        self.assertEqual(tuple(day["metrics"]), METRIC_FIELDS)
+        self.assertIsNone(day["metrics"]["rup"])
+        self.assertIsNone(day["flags"]["is_accumulation"])
+        self.assertEqual(day["flags"]["is_bull_trend"], day["market_data"]["current_price"] > day["market_data"]["ema_365"])
+        for scorer in (QuantScorer(mode="legacy"), AdvancedQuantScorer(calibrator=HistoricalFeatureCalibrator(cache_dir=None))):
+            self.assertIn("scores", scorer.calculate_scores(day))
+
+    def test_integer_raw_inputs_stay_integers(self):
+        prices = _prices(periods=30)
+        raws = [
+            {"timestamp": "2019-01-29T00:00:00", "metrics": {"fear_and_greed": {"value": 11}, "mvrv": 2.0}},
+            {"timestamp": "2019-01-30T00:00:00", "metrics": {"fear_and_greed": None, "mvrv": 1.5}},
+        ]
+        inputs = raw_input_frame([raw_inputs(raw) for raw in raws], prices.index[-2:])
+        days = feature_days(build_feature_frame(prices, inputs).iloc[-2:])
+
+        self.assertIs(type(days[0]["metrics"]["fear_and_greed"]), int)
+        self.assertIsNone(days[1]["metrics"]["fear_and_greed"])
+        self.assertIs(type(days[0]["metrics"]["mvrv"]), float)
+        self.assertTrue(days[0]["flags"]["is_fear_extreme"])
+
+
+if __name__ == "__main__":
+    unittest.main()
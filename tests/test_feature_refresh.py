@@ -0,0 +1,146 @@
+import json
+import shutil
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.features.graph import FeatureGraph, FeatureManifest, default_nodes
+from src.strategy import feature_refresh
+from src.strategy.feature_refresh import refresh_features
+from src.strategy.process_data import process_range
+from src.utils.project_paths import RAW_DATA_DIR
+
+
+class TestFeatureRefresh(unittest.TestCase):
+    def setUp(self):
+        raw_files = sorted(RAW_DATA_DIR.glob("daily_data_*.json"))[-6:]
+        if len(raw_files) < 6:
+            self.skipTest("raw fixtures not available")
+
+        self.dates = [path.stem.replace("daily_data_", "") for path in raw_files]
+        rng = np.random.default_rng(11)
+        index = pd.date_range(end=self.dates[-1], periods=2_000, freq="D")
+        self.prices = pd.Series(30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, size=index.size))), index=index)
+
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.raw_dir, self.processed_dir = root / "raw", root / "processed"
+        self.manifest_path = root / "manifest.json"
+        self.raw_dir.mkdir()
+        for path in raw_files:
+            shutil.copy(path, self.raw_dir / path.name)
+        process_range(self.dates[0], self.dates[-1], raw_dir=self.raw_dir, output_dir=self.processed_dir, prices=self.prices)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _refresh(self, **kwargs) -> dict:
+        return refresh_features(
+            processed_dir=self.processed_dir,
+            raw_dir=self.raw_dir,
+            manifest_path=self.manifest_path,
+            workers=4,
+            **{"prices": self.prices, **kwargs},
+        )
+
+    def _payloads(self) -> dict[str, dict]:
+        return {
+            date_str: json.loads((self.processed_dir / f"processed_data_{date_str}.json").read_text(encoding="utf-8"))
+            for date_str in self.dates
+        }
+
+    def test_full_recompute_reproduces_processing(self):
+        expected = self._payloads()
+        summary = self._refresh()
+
+        self.assertEqual(summary["written"], len(self.dates))
+        self.assertEqual(self._payloads(), expected)
+        self.assertEqual(self._refresh(dry_run=True)["stale"], {})
+
+    def test_definition_change_recomputes_only_dependent_columns(self):
+        self._refresh(adopt=True)
+        before = self._payloads()
+
+        def doubled(frame):
+            return frame["raw.fear_and_greed"].to_numpy(dtype=float) * 2.0
+
+        nodes = [
+            replace(node, version=2, compute=doubled) if node.name == "metrics.fear_and_greed" else node
+            for node in default_nodes()
+        ]
+        summary = self._refresh(graph=FeatureGraph(nodes))
+
+        self.assertEqual(
+            set(summary["stale"]),
+            {"metrics.fear_and_greed", "flags.is_fear_extreme", "flags.is_greed_extreme"},
+        )
+        for date_str, payload in self._payloads().items():
+            old = before[date_str]
+            if old["metrics"]["fear_and_greed"] is not None:
+                self.assertEqual(payload["metrics"]["fear_and_greed"], old["metrics"]["fear_and_greed"] * 2.0)
+                self.assertEqual(payload["flags"]["is_greed_extreme"], payload["metrics"]["fear_and_greed"] > 70.0)
+            payload["metrics"].pop("fear_and_greed"), old["metrics"].pop("fear_and_greed")
+            for name in ("is_fear_extreme", "is_greed_extreme"):
+                payload["flags"].pop(name), old["flags"].pop(name)
+            self.assertEqual(payload, old)
+
+    def test_changed_raw_snapshot_stales_only_its_date(self):
+        self._refresh(adopt=True)
+        target = self.dates[2]
+        raw_path = self.raw_dir / f"daily_data_{target}.json"
+        raw = json.loads(raw_path.read_text(encoding="utf-8"))
+        raw["metrics"]["mvrv"] = 0.5
+        raw_path.write_text(json.dumps(raw), encoding="utf-8")
+
+        summary = self._refresh()
+
+        self.assertEqual(set(summary["stale"].values()), {1})
+        self.assertNotIn("metrics.mvrv_zscore", summary["stale"])
+        self.assertEqual(summary["written"], 1)
+        self.assertEqual(self._payloads()[target]["metrics"]["mvrv"], 0.5)
+        self.assertEqual(FeatureManifest.load(self.manifest_path).definitions, FeatureGraph().signatures())
+
+    def test_revised_closes_are_detected_without_passing_prices(self):
+        self._refresh(adopt=True)
+        revised = self.prices.copy()
+        revised.iloc[-30] *= 1.05
+
+        with mock.patch.object(feature_refresh, "history_closes", return_value=revised) as download:
+            summary = self._refresh(prices=None, dry_run=True)
+        download.assert_called_once()
+        self.assertIn("metrics.mvrv_zscore", summary["stale"])
+        self.assertNotIn("metrics.mvrv", summary["stale"])
+
+        with mock.patch.object(feature_refresh, "history_closes", return_value=self.prices):
+            self.assertEqual(self._refresh(prices=None, dry_run=True)["stale"], {})
+
+    def test_missing_closes_leave_price_columns_and_manifest_alone(self):
+        before = self._payloads()
+        for payload in before.values():
+            payload["metrics"]["fear_and_greed"] = 1.0
+        for date_str, payload in before.items():
+            (self.processed_dir / f"processed_data_{date_str}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+        empty = pd.Series(dtype=float)
+        with mock.patch.object(feature_refresh, "history_closes", return_value=empty):
+            summary = self._refresh(prices=None)
+            self.assertIn("metrics.mvrv_zscore", summary["skipped"])
+            self.assertNotIn("metrics.mvrv_zscore", summary["stale"])
+            with self.assertLogs(feature_refresh.LOGGER, "WARNING"):
+                self._refresh(prices=None, only=["metrics.realized_vol_30d"])
+
+        after = self._payloads()
+        self.assertFalse(self.manifest_path.exists())
+        for date_str, payload in after.items():
+            self.assertNotEqual(payload["metrics"]["fear_and_greed"], 1.0)
+            for name in ("mvrv_zscore", "realized_vol_30d", "drawdown_180d"):
+                self.assertEqual(payload["metrics"][name], before[date_str]["metrics"][name], msg=name)
+
+
+if __name__ == "__main__":
+    unittest.main()
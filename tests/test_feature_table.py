@@ -0,0 +1,81 @@
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.strategy.legacy_score import LegacyQuantScorer
+from tests.backtest.feature_table import FeatureTable
+
+
+class TestFeatureTable(unittest.TestCase):
+    def _days(self) -> list[dict]:
+        days = []
+        for idx in range(5):
+            days.append(
+                {
+                    "timestamp": f"2024-01-0{idx + 1}T00:00:00",
+                    "market_cycle_phase": "Accumulation" if idx < 3 else "Post-Halving Expansion",
+                    "metrics": {
+                        "mvrv_zscore": 0.5 - (0.2 * idx),
+                        "mayer_multiple": np.float64(1.1 + (0.05 * idx)),
+                        "rup": None if idx == 2 else 0.8,
+                        "hash_ribbon": None,
+                        "inflation": {"yoy_inflation_pct": 2.0},
+                    },
+                    "market_data": {
+                        "current_price": 40_000.0 + (500.0 * idx),
+                        "open_price": 39_900.0 + (500.0 * idx),
+                        "price_vs_ema_pct": 12.0 - idx,
+                    },
+                    "flags": {
+                        "is_bull_trend": np.bool_(idx % 2 == 0),
+                        "is_positive_seasonality": True,
+                    },
+                }
+            )
+        return days
+
+    def test_row_views_match_source_days(self):
+        days = self._days()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            table = FeatureTable.write(days, tmp_dir)
+            scorer = LegacyQuantScorer()
+
+            self.assertEqual(len(table), len(days))
+            self.assertEqual(table[-1]["timestamp"], "2024-01-05T00:00:00")
+            self.assertEqual(table[2]["market_cycle_phase"], "Accumulation")
+            self.assertIsNone(table[2]["metrics"]["rup"])
+            self.assertIsNone(table[4]["metrics"]["hash_ribbon"])
+            self.assertEqual(table[1]["metrics"]["inflation"]["yoy_inflation_pct"], 2.0)
+            self.assertIs(table[1]["flags"]["is_bull_trend"], False)
+            self.assertEqual(table[0]["market_data"].get("open_price", 0.0), 39_900.0)
+
+            for day, view in zip(days, table):
+                self.assertEqual(scorer.calculate_scores(day)["scores"], scorer.calculate_scores(view)["scores"])
+
+    def test_offset_timestamps_are_converted_to_utc(self):
+        days = self._days()[:2]
+        days[0]["timestamp"] = "2024-01-01T03:00:00+03:00"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            table = FeatureTable.write(days, tmp_dir)
+            self.assertEqual(table[0]["timestamp"], "2024-01-01T00:00:00")
+            self.assertEqual(table[1]["timestamp"], "2024-01-02T00:00:00")
+
+    def test_columns_are_memory_mapped_and_pickle_by_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            table = FeatureTable.write(self._days(), tmp_dir)
+            prices = table.column("market_data.current_price")
+
+            self.assertIsInstance(table.matrix, np.memmap)
+            self.assertFalse(prices.flags.writeable)
+            np.testing.assert_allclose(prices, [40_000.0, 40_500.0, 41_000.0, 41_500.0, 42_000.0])
+
+            payload = pickle.dumps(table)
+            self.assertLess(len(payload), 512)
+            restored = pickle.loads(payload)
+            self.assertEqual(restored[3].to_dict()["market_data"]["current_price"], 41_500.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
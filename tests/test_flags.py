@@ -0,0 +1,62 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.flags import FLAG_NAMES, compute_flags, flag_records, flags_for_raw, raw_flag_inputs
+from src.utils.project_paths import PROCESSED_DATA_DIR, RAW_DATA_DIR
+
+
+class TestFlagEngine(unittest.TestCase):
+    def test_row_adapter_reproduces_processed_history(self):
+        pairs = []
+        for raw_path in sorted(RAW_DATA_DIR.glob("daily_data_*.json")):
+            processed_path = PROCESSED_DATA_DIR / raw_path.name.replace("daily_data_", "processed_data_")
+            if processed_path.exists():
+                pairs.append((raw_path, processed_path))
+        if not pairs:
+            self.skipTest("raw/processed fixtures not available")
+
+        raws = [json.loads(raw_path.read_text(encoding="utf-8")) for raw_path, _ in pairs]
+        bulk = flag_records(compute_flags(pd.DataFrame([raw_flag_inputs(raw) for raw in raws])))
+        for raw, row_flags, (_, processed_path) in zip(raws, bulk, pairs):
+            expected = json.loads(processed_path.read_text(encoding="utf-8"))["flags"]
+            self.assertEqual(flags_for_raw(raw), expected, processed_path.name)
+            self.assertEqual(row_flags, expected, processed_path.name)
+
+    def test_missing_inputs_follow_production_rules(self):
+        frame = pd.DataFrame(
+            {
+                "mvrv": [1.0, np.nan],
+                "rup": [0.1, 0.1],
+                "sopr": [0.9, 0.9],
+                "fear_and_greed": [np.nan, 10.0],
+                "interest_rate": [1.5, 1.5],
+                "m2_yoy": [np.nan, 2.0],
+                "inflation_yoy": [np.nan, 4.0],
+                "current_price": [110.0, 110.0],
+                "ema_365": [100.0, np.nan],
+                "daily_change_pct": [-6.0, -6.0],
+            },
+            index=pd.to_datetime(["2026-10-01", "2026-09-01"]),
+        )
+
+        rows = flag_records(compute_flags(frame))
+
+        self.assertEqual(list(rows[0]), list(FLAG_NAMES))
+        self.assertTrue(rows[0]["is_accumulation"])
+        self.assertIsNone(rows[1]["is_accumulation"])
+        self.assertIsNone(rows[0]["is_fear_extreme"])
+        self.assertTrue(rows[1]["is_fear_extreme"])
+        self.assertFalse(rows[0]["is_liquidity_good"])
+        self.assertTrue(rows[1]["is_liquidity_good"])
+        self.assertFalse(rows[0]["is_inflation_falling"])
+        self.assertTrue(rows[1]["is_inflation_high"])
+        self.assertTrue(rows[0]["is_volatility_opportunity"])
+        self.assertFalse(rows[1]["is_bull_trend"])
+        self.assertEqual([row["is_positive_seasonality"] for row in rows], [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
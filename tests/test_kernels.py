@@ -0,0 +1,124 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.execution.advanced_portfolio_manager import AdvancedPortfolioManager
+from src.execution.confidence_portfolio_manager import ConfidencePortfolioManager
+from src.execution.portfolio_kernels import manager_kernel_spec, simulate_portfolio
+from src.execution.portfolio_manager import PortfolioManager
+from src.utils import kernels
+from src.utils.kernels import markov_chain_step, transition_cdf
+from tests.backtest.compare_models import PortfolioSimulator
+from tests.backtest.stochastic_calculus_validation import simulate_regime_jump_diffusion
+
+
+TRANSITION = [[0.90, 0.07, 0.03], [0.05, 0.90, 0.05], [0.0, 0.12, 0.88]]
+
+
+def _days_and_scores(periods: int, seed: int) -> tuple[list[dict], list[dict]]:
+    rng = np.random.default_rng(seed)
+    closes = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.04, periods)))
+    opens = closes * np.exp(rng.normal(0.0, 0.01, periods))
+    index = pd.date_range("2020-01-01", periods=periods, freq="D")
+    days = [
+        {"timestamp": f"{day:%Y-%m-%d} 00:00:00", "market_data": {"current_price": float(close), "open_price": float(open_)}}
+        for day, close, open_ in zip(index, closes, opens)
+    ]
+    long_term = np.clip(np.cumsum(rng.normal(0.0, 12.0, periods)) * 0.5, -100, 100)
+    medium_term = np.clip(rng.normal(0.0, 45.0, periods), -100, 100)
+    # Integer scores (as in the manager tests) alongside rounded floats.
+    values = [
+        (int(lt), int(mt)) if idx % 3 == 0 else (round(lt, 2), round(mt, 2))
+        for idx, (lt, mt) in enumerate(zip(long_term, medium_term))
+    ]
+    scores = [{"long_term": {"value": lt}, "medium_term": {"value": mt}} for lt, mt in values]
+    return days, scores
+
+
+class TestMarkovChainStep(unittest.TestCase):
+    def test_matches_generator_choice(self):
+        cdf = transition_cdf(TRANSITION)
+        states = np.random.default_rng(1).integers(0, 3, 4_000)
+        reference_rng, kernel_rng = np.random.default_rng(5), np.random.default_rng(5)
+        expected = np.array([reference_rng.choice(3, p=TRANSITION[state]) for state in states])
+
+        uniforms = kernel_rng.random(states.size)
+        np.testing.assert_array_equal(markov_chain_step(cdf, states, uniforms), expected)
+        np.testing.assert_array_equal(markov_chain_step.loop(cdf, states, uniforms), expected)
+        np.testing.assert_array_equal(markov_chain_step.python(cdf, states, uniforms), expected)
+        self.assertEqual(reference_rng.random(), kernel_rng.random())
+
+    def test_regime_simulation_matches_reference(self):
+        params = {
+            "mu_regimes": [-0.8, 0.3, 1.2],
+            "sigma_regimes": [0.9, 0.55, 0.7],
+            "jump_lambda": 12.0,
+            "jump_mu": -0.02,
+            "jump_sigma": 0.06,
+            "transition_matrix": TRANSITION,
+        }
+        reference = simulate_regime_jump_diffusion(params, 30_000.0, 40, 90, seed=9, use_kernels=False)
+        result = simulate_regime_jump_diffusion(params, 30_000.0, 40, 90, seed=9)
+        np.testing.assert_array_equal(result[0], reference[0])
+        np.testing.assert_array_equal(result[1], reference[1])
+
+    def test_invalid_transition_matrices_are_rejected(self):
+        with self.assertRaises(ValueError):
+            transition_cdf([[0.5, 0.5]])
+        with self.assertRaises(ValueError):
+            transition_cdf([[1.2, -0.2], [0.5, 0.5]])
+        with self.assertRaises(ValueError):
+            transition_cdf([[0.6, 0.6], [0.5, 0.5]])
+
+
+class TestPortfolioKernel(unittest.TestCase):
+    MANAGERS = [
+        PortfolioManager(min_trade_usd=20.0, cooldown_days=1),
+        PortfolioManager(min_trade_usd=20.0, cooldown_days=3),
+        ConfidencePortfolioManager(min_trade_usd=20.0, cooldown_days=1),
+        ConfidencePortfolioManager(min_trade_usd=10.0, cooldown_days=5, max_leverage=1.5),
+        AdvancedPortfolioManager(min_trade_usd=20.0, cooldown_days=1),
+        AdvancedPortfolioManager(min_trade_usd=20.0, cooldown_days=4, max_leverage=2.0),
+    ]
+
+    def test_kernel_matches_reference_simulation(self):
+        for seed in range(3):
+            days, scores = _days_and_scores(500, seed)
+            for manager in self.MANAGERS:
+                for simulator in (PortfolioSimulator(), PortfolioSimulator(trading_cost_bps=40.0, annual_debt_rate=0.2)):
+                    with self.subTest(seed=seed, manager=type(manager).__name__):
+                        simulator.use_kernels = False
+                        expected = simulator.simulate(manager, days, scores)
+                        simulator.use_kernels = True
+                        self.assertEqual(simulator.simulate(manager, days, scores), expected)
+                        self.assertGreater(expected[3], 0)
+
+    def test_python_loop_matches_dispatch(self):
+        days, scores = _days_and_scores(200, 4)
+        simulator = PortfolioSimulator()
+        expected = simulator.simulate(self.MANAGERS[2], days, scores)
+        with mock.patch.object(simulate_portfolio, "compiled", None):
+            self.assertEqual(simulator.simulate(self.MANAGERS[2], days, scores), expected)
+
+    def test_subclassed_managers_use_the_reference_loop(self):
+        class Patient(PortfolioManager):
+            def calculate_order(self, *args, **kwargs):
+                return None
+
+        self.assertIsNone(manager_kernel_spec(Patient()))
+        days, scores = _days_and_scores(50, 1)
+        self.assertEqual(PortfolioSimulator().simulate(Patient(), days, scores)[3], 0)
+
+    @unittest.skipUnless(kernels.NUMBA_AVAILABLE, "numba is not installed")
+    def test_compile_failure_falls_back_to_python(self):
+        kernel = kernels.Kernel(lambda values: sum(values))
+        with mock.patch.object(kernel, "compiled", mock.Mock(side_effect=kernels.NumbaError("no typing"))):
+            with self.assertLogs(kernels.LOGGER, level="WARNING"):
+                self.assertEqual(kernel([1, 2]), 3)
+            self.assertEqual(kernel.backend, "python")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.get_data import correlations
+from src.data.get_data.correlations import CorrelationState, correlations_from_closes, get_macro_correlations
+from src.features.rolling import RollingCovariance
+
+
+def _closes(days: int, end: str, seed: int = 9) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(end=end, periods=days, freq="D")
+    shocks = rng.normal(0.0, 0.02, size=(days, 3))
+    shocks[:, 1] += 0.4 * shocks[:, 0]
+    frame = pd.DataFrame(100.0 * np.exp(np.cumsum(shocks, axis=0)), index=index, columns=["BTC", "SPX", "GOLD"])
+    # Weekends only trade BTC; joint sessions drop them.
+    frame.loc[frame.index.dayofweek >= 5, ["SPX", "GOLD"]] = np.nan
+    return frame.dropna()
+
+
+class TestRollingCovariance(unittest.TestCase):
+    def test_matches_pandas_rolling_moments(self):
+        rng = np.random.default_rng(4)
+        x = rng.normal(0.0, 0.03, size=1_000)
+        y = 0.3 * x + rng.normal(0.0, 0.01, size=x.size)
+        expected_corr = pd.Series(x).rolling(90).corr(pd.Series(y)).to_numpy()
+        expected_cov = pd.Series(x).rolling(90).cov(pd.Series(y)).to_numpy()
+
+        window = RollingCovariance(90)
+        for idx in range(x.size):
+            window.push(x[idx], y[idx])
+            if idx < 89:
+                self.assertIsNone(window.correlation(min_periods=90))
+                continue
+            self.assertAlmostEqual(window.correlation(min_periods=90), expected_corr[idx], places=10)
+            self.assertAlmostEqual(window.covariance(), expected_cov[idx], places=14)
+
+
+class TestCorrelationState(unittest.TestCase):
+    def test_incremental_state_matches_full_recomputation(self):
+        closes = _closes(700, "2025-06-30")
+        state = CorrelationState()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = Path(tmp_dir) / "corr.json"
+            for position in range(len(closes)):
+                state.extend(closes.iloc[position : position + 1])
+                if position % 50 == 0:
+                    state = CorrelationState.load(state.save(state_path))
+
+                expected = correlations_from_closes(closes.iloc[: position + 1])
+                actual = state.correlations()
+                if expected is None:
+                    self.assertIsNone(actual)
+                    continue
+                for name, value in expected.items():
+                    self.assertAlmostEqual(actual[name], value, places=10, msg=name)
+
+        self.assertFalse(state.update(state.last_date, closes.iloc[-1]))
+
+    def test_get_macro_correlations_downloads_only_new_sessions(self):
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        closes = _closes(500, (pd.Timestamp(today) - timedelta(days=1)).strftime("%Y-%m-%d"))
+
+        def download(start_date, end_date):
+            return closes[(closes.index >= start_date) & (closes.index < end_date)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = Path(tmp_dir) / "corr.json"
+            with mock.patch.object(correlations, "_download_closes", side_effect=lambda s, e: download(s, e).iloc[:-3]):
+                get_macro_correlations(state_path=state_path)
+            seeded_until = CorrelationState.load(state_path).last_date
+            self.assertEqual(seeded_until, closes.index[-4].strftime("%Y-%m-%d"))
+
+            with mock.patch.object(correlations, "_download_closes", side_effect=download) as fetch:
+                result = get_macro_correlations(state_path=state_path)
+            start_date = fetch.call_args.args[0]
+            self.assertGreater(start_date, seeded_until)
+
+        expected = correlations_from_closes(download((pd.Timestamp(today) - timedelta(days=365)).strftime("%Y-%m-%d"), today))
+        for name, value in expected.items():
+            self.assertAlmostEqual(result[name], value, places=10, msg=name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import math
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data.macro_store import MacroColumn, MacroVintageStore
+
+
+class TestMacroVintageStore(unittest.TestCase):
+    def _store(self, tmp_dir: str) -> MacroVintageStore:
+        store = MacroVintageStore(store_path=Path(tmp_dir) / "vintages.csv")
+        store.upsert(
+            "M2SL",
+            pd.DataFrame(
+                {
+                    "observation_date": ["2024-01-01", "2024-01-01", "2024-02-01", "2024-03-01"],
+                    "knowledge_date": ["2024-02-10", "2024-03-10", "2024-03-10", "2024-04-10"],
+                    "value": [100.0, 101.0, 102.0, 103.0],
+                }
+            ),
+        )
+        return store
+
+    def test_revisions_are_not_visible_before_release(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = self._store(tmp_dir)
+            values = store.as_of_series(
+                "M2SL",
+                ["2024-01-15", "2024-02-15", "2024-03-15", "2024-03-15"],
+                knowledge_dates=["2024-01-15", "2024-02-15", "2024-03-15", "2024-05-01"],
+            )
+
+            self.assertTrue(math.isnan(values[0]))
+            self.assertEqual(values[1], 100.0)
+            self.assertEqual(values[2], 102.0)
+            self.assertEqual(values[3], 103.0)
+
+    def test_vectorized_lookup_matches_row_by_row_scan(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = self._store(tmp_dir)
+            dates = pd.date_range("2023-12-01", "2024-05-01", freq="D")
+            batch = store.as_of_series("M2SL", dates)
+
+            frame = store._frame
+            for idx, day in enumerate(dates):
+                known = frame[(frame["knowledge_date"] <= day) & (frame["observation_date"] <= day)]
+                if known.empty:
+                    self.assertTrue(math.isnan(batch[idx]))
+                    continue
+                latest_obs = known["observation_date"].max()
+                expected = known[known["observation_date"] == latest_obs].sort_values("knowledge_date")["value"].iloc[-1]
+                self.assertEqual(batch[idx], expected)
+
+    def test_yoy_uses_the_same_vintage_and_roundtrips_to_disk(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = self._store(tmp_dir)
+            store.save()
+
+            reloaded = MacroVintageStore(store_path=store.store_path)
+            frame = reloaded.as_of(
+                ["2024-03-15"],
+                columns={"m2_change": MacroColumn("M2SL", yoy_periods=1)},
+            )
+
+            self.assertAlmostEqual(frame["m2_change"].iloc[0], ((102.0 / 101.0) - 1.0) * 100.0)
+            self.assertEqual(reloaded.latest_knowledge_date("M2SL"), pd.Timestamp("2024-04-10"))
+            self.assertTrue(np.isnan(reloaded.as_of_series("DGS10", ["2024-03-15"])[0]))
+
+    def test_refresh_without_new_vintages_adds_nothing(self):
+        from tests.backtest.get_real_data import RealDataFetcher
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = self._store(tmp_dir)
+            # ALFRED answers with every observation still valid at realtime_start.
+            releases = pd.DataFrame(
+                {
+                    "date": ["2024-01-01", "2024-02-01", "2024-03-01"],
+                    "realtime_start": ["2024-04-10", "2024-04-10", "2024-04-10"],
+                    "value": [101.0, 102.0, 103.0],
+                }
+            )
+            fetcher = RealDataFetcher(store=store)
+            fetcher.fred = mock.Mock()
+            fetcher.fred.get_series_all_releases.return_value = releases
+
+            with mock.patch.object(store, "save") as save:
+                self.assertEqual(fetcher.refresh_vintages(["M2SL"]), 0)
+            self.assertEqual(len(store._frame), 4)
+            save.assert_not_called()
+
+            releases.loc[1, ["realtime_start", "value"]] = ["2024-05-10", 102.5]
+            with mock.patch.object(store, "save"):
+                self.assertEqual(fetcher.refresh_vintages(["M2SL"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
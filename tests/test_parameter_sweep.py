@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.strategy.legacy_score import LegacyQuantScorer
+from src.strategy.parameter_sweep import (
+    compile_blocks,
+    default_block_params,
+    perturbed_block_params,
+    perturbed_ranges,
+    sweep_advanced,
+    sweep_legacy,
+)
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator
+from tests.test_score_batch import _feature_frame
+
+
+class TestAdvancedSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scorer = AdvancedQuantScorer(calibrator=HistoricalFeatureCalibrator(cache_dir=None))
+        cls.frame = _feature_frame(periods=600, seed=11)
+
+    def test_each_row_matches_the_scorer_with_those_blocks(self):
+        param_sets = [default_block_params(), *perturbed_block_params(4, spread=0.5, seed=3)]
+        sweep = sweep_advanced(self.scorer, self.frame, param_sets, chunk_size=2)
+        self.assertEqual(sweep["long_term"].shape, (5, len(self.frame)))
+
+        for row, params in enumerate(param_sets):
+            long_term = {name: params[name] for name in AdvancedQuantScorer.LONG_TERM_BLOCKS}
+            medium_term = {name: params[name] for name in AdvancedQuantScorer.MEDIUM_TERM_BLOCKS}
+            with mock.patch.object(AdvancedQuantScorer, "LONG_TERM_BLOCKS", long_term), mock.patch.object(
+                AdvancedQuantScorer, "MEDIUM_TERM_BLOCKS", medium_term
+            ):
+                expected = self.scorer.calculate_scores_batch(self.frame)
+            # Matrix products sum in a different order, which can move a rounded score by one cent.
+            for horizon in ("long_term", "medium_term"):
+                np.testing.assert_allclose(sweep[horizon][row], expected[horizon], atol=0.0100001)
+                self.assertGreater(np.mean(sweep[horizon][row] == expected[horizon]), 0.99)
+
+    def test_invalid_parameter_sets_are_rejected(self):
+        params = default_block_params()
+        with self.assertRaises(ValueError):
+            compile_blocks([{**params, "valuation": [("mvrv_zscore", 1.0, 0.5)]}])
+        with self.assertRaises(ValueError):
+            compile_blocks([{**params, "valuation": [("not_a_feature", 1.0, 1.0)]}])
+        with self.assertRaises(ValueError):
+            compile_blocks([{name: specs for name, specs in params.items() if name != "risk"}])
+
+
+class TestLegacySweep(unittest.TestCase):
+    def test_each_row_matches_the_scorer_with_those_ranges(self):
+        scorer = LegacyQuantScorer()
+        days = _feature_frame(periods=400, seed=4)
+        range_sets = [LegacyQuantScorer.NORMALIZATION_RANGES, *perturbed_ranges(3, seed=2), {"rup": (0.5, 2.0, False)}]
+        sweep = sweep_legacy(scorer, days, range_sets, chunk_size=3)
+
+        for row, ranges in enumerate(range_sets):
+            patched = {**LegacyQuantScorer.NORMALIZATION_RANGES, **ranges}
+            with mock.patch.object(LegacyQuantScorer, "NORMALIZATION_RANGES", patched):
+                expected = scorer.calculate_scores_batch(days)
+            np.testing.assert_array_equal(sweep["long_term"][row], expected["long_term"])
+            np.testing.assert_array_equal(sweep["medium_term"][row], expected["medium_term"])
+
+
+if __name__ == "__main__":
+    unittest.main()
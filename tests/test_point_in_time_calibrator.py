@@ -0,0 +1,130 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.features.order_statistics import OrderStatisticWindow
+from src.strategy.ensemble import ScoringEnsemble
+from src.strategy.point_in_time_calibrator import PointInTimeCalibrator
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator
+
+
+def _write_history(directory: Path, days: int, seed: int = 5) -> list[str]:
+    rng = np.random.default_rng(seed)
+    draws = rng.normal(size=(days, 3))
+    prices = 30_000.0 * np.exp(np.cumsum(0.03 * draws[:, 0]))
+    dates = []
+    for idx in range(days):
+        day = str(np.datetime64("2021-01-01") + idx)
+        metrics = {"mvrv_zscore": float(draws[idx, 2]), "sopr": round(float(1.0 + 0.05 * draws[idx, 1]), 2)}
+        if idx % 7 == 3:
+            metrics["mvrv_zscore"] = None
+        payload = {
+            "timestamp": f"{day}T00:00:00",
+            "market_cycle_phase": ("Accumulation", "Pre-Halving Rally", "Post-Halving Expansion")[(idx // 40) % 3],
+            "market_data": {"current_price": float(prices[idx]), "price_vs_ema_pct": float(10.0 + 20.0 * draws[idx, 1])},
+            "metrics": metrics,
+            "flags": {"is_bull_trend": bool(draws[idx, 0] > 0)},
+        }
+        (directory / f"processed_data_{day}.json").write_text(json.dumps(payload), encoding="utf-8")
+        dates.append(day)
+    return dates
+
+
+class TestOrderStatisticWindow(unittest.TestCase):
+    def test_matches_numpy_under_inserts_and_removals(self):
+        rng = np.random.default_rng(0)
+        values = np.round(rng.normal(size=400), 1)  # plenty of ties
+        window = OrderStatisticWindow(values)
+        for end in range(1, values.size + 1):
+            window.insert(end - 1)
+            if end > 150:
+                window.remove(end - 151)
+            if end % 17:
+                continue
+            current = values[max(0, end - 150) : end]
+            center = float(np.median(current))
+            self.assertEqual(window.median(), center)
+            self.assertEqual(window.median_abs_deviation(center), float(np.median(np.abs(current - center))))
+            self.assertAlmostEqual(window.percentile(0.25), float(np.percentile(current, 25)), places=12)
+            if current.size > 1:
+                self.assertAlmostEqual(window.std(), float(np.std(current, ddof=1)), places=9)
+
+
+class TestPointInTimeCalibrator(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.processed_dir = Path(self._tmp.name)
+        self.dates = _write_history(self.processed_dir, 420)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _assert_matches_refit(self, calibrator, date, lookback_files):
+        cutoff = str(np.datetime64(date) - 1)
+        exact = HistoricalFeatureCalibrator(
+            lookback_files=lookback_files,
+            max_file_date=cutoff,
+            processed_dir=self.processed_dir,
+            cache_dir=None,
+        )
+        for name in HistoricalFeatureCalibrator.FEATURE_FIELDS:
+            expected, actual = exact.get_feature_stat(name), calibrator.get_feature_stat(name)
+            self.assertEqual(actual.sample_size, expected.sample_size, (date, name))
+            self.assertEqual(actual.center, expected.center, (date, name))
+            self.assertAlmostEqual(actual.scale, expected.scale, places=12, msg=(date, name))
+        self.assertEqual(set(calibrator.cycle_priors), set(exact.cycle_priors))
+        for cycle, prior in exact.cycle_priors.items():
+            self.assertAlmostEqual(calibrator.cycle_priors[cycle], prior, places=9)
+
+    def test_as_of_matches_a_refit_on_the_prior_days(self):
+        for lookback_files in (None, 200):
+            calibrator = PointInTimeCalibrator(lookback_files=lookback_files, processed_dir=self.processed_dir)
+            # Forward, backward and past-the-end moves.
+            for date in ("2021-02-10", "2021-06-30", "2021-04-01", "2021-09-01", "2022-03-01", "2021-01-01"):
+                calibrator.as_of(date)
+                self._assert_matches_refit(calibrator, date, lookback_files)
+
+    def test_batch_scores_use_each_days_stats(self):
+        days = [json.loads((self.processed_dir / f"processed_data_{date}.json").read_text()) for date in self.dates[150::10]]
+        scorer = AdvancedQuantScorer(calibrator=PointInTimeCalibrator(lookback_files=200, processed_dir=self.processed_dir))
+
+        batch = scorer.calculate_scores_batch(days[::-1])
+        scalar = [scorer.calculate_scores(day)["scores"] for day in days[::-1]]
+        np.testing.assert_array_equal(batch["long_term"], [scores["long_term"]["value"] for scores in scalar])
+        np.testing.assert_array_equal(batch["medium_term"], [scores["medium_term"]["value"] for scores in scalar])
+
+        # Undated rows use the stats the calibrator currently holds (all files at construction).
+        undated = {"mvrv_zscore": [day["metrics"]["mvrv_zscore"] for day in days]}
+        fresh = AdvancedQuantScorer(calibrator=PointInTimeCalibrator(lookback_files=200, processed_dir=self.processed_dir))
+        fitted = AdvancedQuantScorer(
+            calibrator=HistoricalFeatureCalibrator(lookback_files=200, processed_dir=self.processed_dir, cache_dir=None)
+        )
+        np.testing.assert_allclose(
+            fresh.calculate_scores_batch(undated)["long_term"],
+            fitted.calculate_scores_batch(undated)["long_term"],
+            atol=0.011,
+        )
+
+    def test_ensemble_heads_score_point_in_time(self):
+        days = [json.loads((self.processed_dir / f"processed_data_{date}.json").read_text()) for date in self.dates[150::10]]
+        ensemble = ScoringEnsemble(calibrator=PointInTimeCalibrator(lookback_files=200, processed_dir=self.processed_dir))
+        scorer = AdvancedQuantScorer(calibrator=PointInTimeCalibrator(lookback_files=200, processed_dir=self.processed_dir))
+
+        heads = ensemble.evaluate_batch(days)["heads"]
+        expected = [scorer.calculate_values(day) for day in days]
+        self.assertEqual(heads["advanced"]["long_term"].tolist(), [long_term for long_term, _ in expected])
+        for day in days[::4]:
+            self.assertEqual(ensemble.evaluate_day(day)["heads"]["advanced"], scorer.calculate_values(day))
+
+    def test_one_shot_calibrator_ignores_as_of(self):
+        calibrator = HistoricalFeatureCalibrator(lookback_files=200, processed_dir=self.processed_dir, cache_dir=None)
+        stats, priors = dict(calibrator.feature_stats), dict(calibrator.cycle_priors)
+        calibrator.as_of("2021-02-01")
+        self.assertEqual((calibrator.feature_stats, calibrator.cycle_priors), (stats, priors))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.features.rolling_state import compute_context_from_prices
+from src.strategy import process_data
+from src.strategy.process_data import build_processed_data, process_range
+from src.utils.project_paths import RAW_DATA_DIR
+
+
+class TestProcessRange(unittest.TestCase):
+    def test_range_matches_per_file_processing(self):
+        raw_files = sorted(RAW_DATA_DIR.glob("daily_data_*.json"))[:4]
+        if len(raw_files) < 4:
+            self.skipTest("raw fixtures not available")
+
+        dates = [path.stem.replace("daily_data_", "") for path in raw_files]
+        rng = np.random.default_rng(3)
+        index = pd.date_range(end=dates[-1], periods=2_000, freq="D")
+        prices = pd.Series(30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, size=index.size))), index=index)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_dir = Path(tmp_dir) / "raw"
+            output_dir = Path(tmp_dir) / "processed"
+            raw_dir.mkdir()
+            for path in raw_files:
+                shutil.copy(path, raw_dir / path.name)
+
+            result = process_range(dates[1], dates[-1], raw_dir=raw_dir, output_dir=output_dir, prices=prices)
+
+            self.assertEqual(result["dates"], dates[1:])
+            self.assertEqual(sorted(path.name for path in output_dir.iterdir()), [f"processed_data_{d}.json" for d in dates[1:]])
+
+            for raw_path, date_str in zip(raw_files[1:], dates[1:]):
+                raw_data = json.loads(raw_path.read_text(encoding="utf-8"))
+                context = compute_context_from_prices(prices[prices.index < date_str])
+                expected = build_processed_data(raw_data, raw_dir / raw_path.name, context)
+                written = json.loads((output_dir / f"processed_data_{date_str}.json").read_text(encoding="utf-8"))
+
+                self.assertEqual(written["flags"], expected["flags"])
+                self.assertEqual(written["market_cycle_phase"], expected["market_cycle_phase"])
+                for key, value in expected["metrics"].items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(written["metrics"][key], value, places=8, msg=key)
+                    else:
+                        self.assertEqual(written["metrics"][key], value, msg=key)
+
+    def _raw_dir(self, tmp_dir: str, count: int) -> tuple[Path, list[str]]:
+        raw_files = sorted(RAW_DATA_DIR.glob("daily_data_*.json"))[:count]
+        if len(raw_files) < count:
+            self.skipTest("raw fixtures not available")
+        raw_dir = Path(tmp_dir) / "raw"
+        raw_dir.mkdir()
+        for path in raw_files:
+            shutil.copy(path, raw_dir / path.name)
+        return raw_dir, [path.stem.replace("daily_data_", "") for path in raw_files]
+
+    def test_failed_download_leaves_processed_files_alone(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_dir, dates = self._raw_dir(tmp_dir, 2)
+            output_dir = Path(tmp_dir) / "processed"
+            output_dir.mkdir()
+            existing = output_dir / f"processed_data_{dates[0]}.json"
+            existing.write_text('{"metrics": {"mvrv_zscore": 1.7}}', encoding="utf-8")
+
+            with mock.patch.object(process_data, "_download_closes", side_effect=OSError("offline")):
+                with self.assertRaises(RuntimeError):
+                    process_range(dates[0], dates[-1], raw_dir=raw_dir, output_dir=output_dir)
+            self.assertEqual(existing.read_text(encoding="utf-8"), '{"metrics": {"mvrv_zscore": 1.7}}')
+            self.assertEqual([path.name for path in output_dir.iterdir()], [existing.name])
+
+    def test_dates_without_earlier_closes_are_not_written(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_dir, dates = self._raw_dir(tmp_dir, 3)
+            output_dir = Path(tmp_dir) / "processed"
+            index = pd.date_range(start=dates[1], end=dates[-1], freq="D")
+            prices = pd.Series(30_000.0, index=index)
+
+            with self.assertRaises(RuntimeError):
+                process_range(dates[0], dates[-1], raw_dir=raw_dir, output_dir=output_dir, prices=prices, strict=True)
+            self.assertFalse(output_dir.exists())
+
+            result = process_range(dates[0], dates[-1], raw_dir=raw_dir, output_dir=output_dir, prices=prices)
+            self.assertEqual(result["dates"], [date_str for date_str in dates if date_str > dates[1]])
+            self.assertEqual(len(list(output_dir.iterdir())), len(result["dates"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
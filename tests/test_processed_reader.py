@@ -0,0 +1,68 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.data.processed_reader import (
+    LEGACY_SCHEMA_VERSION,
+    PROCESSED_SCHEMA_VERSION,
+    ProcessedPayloadReader,
+)
+
+
+class TestProcessedPayloadReader(unittest.TestCase):
+    def _write(self, directory: Path, date_str: str, payload) -> None:
+        path = directory / f"processed_data_{date_str}.json"
+        path.write_text(payload if isinstance(payload, str) else json.dumps(payload), encoding="utf-8")
+
+    def _payload(self, date_str: str, price: float, **extra) -> dict:
+        return {
+            "timestamp": f"{date_str}T00:00:00",
+            "market_data": {"current_price": price, "price_vs_ema_pct": 5.0},
+            "metrics": {"mvrv_zscore": 0.4, "funding_rate": None},
+            "flags": {"is_bull_trend": True},
+            "market_cycle_phase": "Accumulation",
+            **extra,
+        }
+
+    def test_projection_filters_and_aligns_columns(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = Path(tmp_dir)
+            self._write(directory, "2026-01-01", self._payload("2026-01-01", 100.0))
+            self._write(directory, "2026-01-02", "{not json")
+            self._write(directory, "2026-01-03", self._payload("2026-01-03", 102.0, market_data=None))
+            self._write(directory, "2026-01-04", self._payload("2026-01-04", 104.0))
+
+            reader = ProcessedPayloadReader(directory=directory, max_file_date="2026-01-03")
+            columns = reader.read_columns(["timestamp", "market_data.current_price", "metrics.funding_rate"])
+
+            self.assertEqual(columns["timestamp"], ["2026-01-01T00:00:00", "2026-01-03T00:00:00"])
+            self.assertEqual(columns["market_data.current_price"], [100.0, None])
+            self.assertEqual(columns["metrics.funding_rate"], [None, None])
+
+    def test_projected_rows_keep_payload_shape_and_lazy_sections(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = Path(tmp_dir)
+            self._write(directory, "2026-01-01", self._payload("2026-01-01", 100.0))
+            self._write(
+                directory,
+                "2026-01-02",
+                self._payload("2026-01-02", 101.0, schema_version=PROCESSED_SCHEMA_VERSION),
+            )
+
+            reader = ProcessedPayloadReader(directory=directory, lookback_files=1)
+            rows = reader.read_projected(["timestamp", "market_data.current_price"])
+            self.assertEqual(rows, [{"timestamp": "2026-01-02T00:00:00", "market_data": {"current_price": 101.0}}])
+
+            payload = next(ProcessedPayloadReader(directory=directory).iter_payloads())
+            self.assertIsNone(payload._decoded)
+            self.assertTrue(payload.flags["is_bull_trend"])
+            self.assertEqual(payload.schema_version, LEGACY_SCHEMA_VERSION)
+            self.assertEqual(
+                ProcessedPayloadReader(directory=directory).schema_versions(),
+                {LEGACY_SCHEMA_VERSION: 1, PROCESSED_SCHEMA_VERSION: 1},
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,10 @@ import json
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from src.execution.production_gate import DEFAULT_MODEL, build_live_components, resolve_live_model
+from src.strategy import sketch_calibrator
 
 
 class TestProductionGate(unittest.TestCase):
@@ -39,6 +41,21 @@ class TestProductionGate(unittest.TestCase):
             self.assertTrue(hasattr(components["manager"], "calculate_order"))
             self.assertTrue(hasattr(components["scorer"], "calculate_scores"))
 
+    def test_sketch_calibrator_is_opt_in(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            gate_file = Path(tmp_dir) / "missing_gate.json"
+            sketches = object()
+            with mock.patch.object(sketch_calibrator, "SketchFeatureCalibrator", return_value=sketches) as sketch:
+                default = build_live_components(gate_file=gate_file)
+                sketch.assert_not_called()
+                components = build_live_components(gate_file=gate_file, calibrator="sketch")
+
+            sketch.assert_called_once_with()
+            self.assertIsNone(default["scorer"]._calibrator)
+            self.assertIs(components["scorer"]._calibrator, sketches)
+            with self.assertRaises(ValueError):
+                build_live_components(gate_file=gate_file, calibrator="exact")
+
 
 if __name__ == "__main__":
     unittest.main()
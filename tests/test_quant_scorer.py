@@ -1,7 +1,7 @@
 import copy
 import unittest
 
-from src.strategy.score import QuantScorer
+from src.strategy.score import HistoricalFeatureCalibrator, QuantScorer
 
 
 class TestQuantScorer(unittest.TestCase):
@@ -51,7 +51,7 @@ class TestQuantScorer(unittest.TestCase):
         }
 
     def test_quant_mode_output_contract(self):
-        scorer = QuantScorer(mode="quant")
+        scorer = QuantScorer(mode="quant", calibrator=HistoricalFeatureCalibrator(cache_dir=None))
         result = scorer.calculate_scores(self._base_snapshot())
 
         self.assertIn("scores", result)
@@ -71,7 +71,7 @@ class TestQuantScorer(unittest.TestCase):
         self.assertIn("coverage", lt_components)
 
     def test_valuation_discount_improves_long_term_score(self):
-        scorer = QuantScorer(mode="quant")
+        scorer = QuantScorer(mode="quant", calibrator=HistoricalFeatureCalibrator(cache_dir=None))
 
         cheap = self._base_snapshot()
         expensive = copy.deepcopy(cheap)
@@ -93,7 +93,7 @@ class TestQuantScorer(unittest.TestCase):
         self.assertGreater(cheap_lt, expensive_lt)
 
     def test_conflicting_signals_raise_uncertainty(self):
-        scorer = QuantScorer(mode="quant")
+        scorer = QuantScorer(mode="quant", calibrator=HistoricalFeatureCalibrator(cache_dir=None))
 
         coherent = self._base_snapshot()
         conflicting = copy.deepcopy(coherent)
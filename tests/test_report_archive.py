@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.execution.report_archive import (
+    RetentionPolicy,
+    compact_reports,
+    load_report_history,
+    parse_report_markdown,
+    rollup_path,
+)
+
+
+REPORT_TEMPLATE = """# Daily Report {date}
+
+- **Total Equity**: ${equity}
+- **ROI (Total)**: +1.25%
+- **Alpha vs BTC**: -0.40%
+- 💵 **Cash**: $400.00
+- 🟠 **Bitcoin**: $600.00 (`0.00650000 BTC`)
+- 🔴 **Debt**: $0.00
+"""
+
+
+class TestReportArchive(unittest.TestCase):
+    def _write_report(self, directory: Path, date_str: str, equity: str = "1,000.00") -> Path:
+        path = directory / f"report_{date_str}.md"
+        path.write_text(REPORT_TEMPLATE.format(date=date_str, equity=equity), encoding="utf-8")
+        return path
+
+    def test_parse_report_markdown_extracts_metrics(self):
+        row = parse_report_markdown(REPORT_TEMPLATE.format(date="2026-01-01", equity="1,234.56"), "2026-01-01")
+
+        self.assertEqual(row["date"], "2026-01-01")
+        self.assertEqual(row["equity"], 1234.56)
+        self.assertEqual(row["roi"], 1.25)
+        self.assertEqual(row["alpha"], -0.40)
+        self.assertEqual(row["btc_amount"], 0.0065)
+        self.assertEqual(row["debt"], 0.0)
+
+    def test_compaction_rolls_old_reports_into_monthly_tables(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            reports_dir = Path(tmp_dir)
+            for date_str in ("2026-01-30", "2026-01-31", "2026-02-01", "2026-02-10", "2026-02-11"):
+                self._write_report(reports_dir, date_str)
+            before = load_report_history(reports_dir)
+
+            preview = compact_reports(RetentionPolicy(keep_days=2), today="2026-02-11", reports_dir=reports_dir, dry_run=True)
+            self.assertEqual(preview["compacted_reports"], 3)
+            self.assertEqual(len(list(reports_dir.glob("report_*.md"))), 5)
+
+            result = compact_reports(RetentionPolicy(keep_days=2), today="2026-02-11", reports_dir=reports_dir)
+
+            self.assertEqual(result["cutoff"], "2026-02-10")
+            self.assertEqual(result["months"], ["2026-01", "2026-02"])
+            self.assertTrue(rollup_path("2026-01", reports_dir).exists())
+            self.assertEqual(
+                sorted(path.name for path in reports_dir.glob("report_*.md")),
+                ["report_2026-02-10.md", "report_2026-02-11.md"],
+            )
+            self.assertEqual(load_report_history(reports_dir), before)
+
+    def test_loose_report_overrides_rollup_row(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            reports_dir = Path(tmp_dir)
+            self._write_report(reports_dir, "2026-01-01")
+            compact_reports(RetentionPolicy(keep_days=1), today="2026-03-01", reports_dir=reports_dir)
+            self._write_report(reports_dir, "2026-01-01", equity="2,000.00")
+
+            history = load_report_history(reports_dir)
+
+            self.assertEqual(len(history), 1)
+            self.assertEqual(history[0]["equity"], 2000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.rolling import (
+    RollingMin,
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_ols,
+    rolling_std,
+    rolling_trend_tscore,
+    rolling_zscore,
+)
+from src.features.rolling_state import _trend_tscore
+
+
+def _series(size: int = 1_500, seed: int = 11, nan_every: int | None = None) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = 10.0 + np.cumsum(rng.normal(0.001, 0.03, size=size))
+    if nan_every:
+        values[::nan_every] = np.nan
+        values[200:240] = np.nan
+    return values
+
+
+class TestRollingKernels(unittest.TestCase):
+    def assertArrayClose(self, actual, expected, rtol=1e-9, atol=1e-10):
+        np.testing.assert_allclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+
+    def test_moments_match_pandas_with_gaps(self):
+        for nan_every in (None, 7):
+            values = _series(nan_every=nan_every)
+            rolling = pd.Series(values).rolling(window=90, min_periods=20)
+
+            self.assertArrayClose(rolling_mean(values, 90, 20), rolling.mean().to_numpy())
+            self.assertArrayClose(rolling_std(values, 90, 20), rolling.std().to_numpy())
+            self.assertArrayClose(rolling_std(values, 90, 20, ddof=0), rolling.std(ddof=0).to_numpy())
+            self.assertArrayClose(rolling_max(values, 90, 20), rolling.max().to_numpy())
+            self.assertArrayClose(rolling_min(values, 90, 20), rolling.min().to_numpy())
+            self.assertArrayClose(
+                rolling_zscore(values, 90, 20),
+                ((pd.Series(values) - rolling.mean()) / rolling.std()).to_numpy(),
+                rtol=1e-7,
+            )
+
+    def test_default_min_periods_is_window(self):
+        values = _series(size=50)
+        expected = pd.Series(values).rolling(window=30).mean().to_numpy()
+
+        self.assertArrayClose(rolling_mean(values, 30), expected)
+        self.assertTrue(np.isnan(rolling_std(values, 30)[28]))
+
+    def test_sliding_ols_matches_polyfit(self):
+        values = _series(size=600)
+        slope, tstat = rolling_ols(values, 90, 20)
+        scores = rolling_trend_tscore(values)
+
+        for end in (0, 18, 19, 20, 89, 90, 91, 333, 599):
+            window = values[max(end - 89, 0) : end + 1]
+            self.assertAlmostEqual(scores[end], _trend_tscore(window), places=8)
+            if window.size >= 20:
+                self.assertAlmostEqual(slope[end], np.polyfit(np.arange(window.size), window, 1)[0], places=10)
+            else:
+                self.assertTrue(np.isnan(tstat[end]))
+
+    def test_sliding_ols_drops_nan_rows_but_keeps_positions(self):
+        values = _series(size=300, nan_every=9)
+        slope, _ = rolling_ols(values, 60, 20)
+
+        for end in (120, 280, 299):
+            x = np.arange(end - 59, end + 1)
+            y = values[x]
+            mask = ~np.isnan(y)
+            self.assertAlmostEqual(slope[end], np.polyfit(x[mask], y[mask], 1)[0], places=10)
+
+    def test_batch_kernels_keep_pace_with_pandas(self):
+        values = _series(size=200_000, nan_every=7)
+        series = pd.Series(values)
+
+        def best_of(runner, repeats=5):
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                runner()
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        pandas_std = best_of(lambda: series.rolling(90, 20).std())
+        pandas_max = best_of(lambda: series.rolling(180, 30).max())
+        self.assertLess(best_of(lambda: rolling_std(values, 90, 20)), 6.0 * pandas_std + 0.005)
+        self.assertLess(best_of(lambda: rolling_max(values, 180, 30)), 4.0 * pandas_max + 0.005)
+        self.assertLess(best_of(lambda: rolling_trend_tscore(values)), 12.0 * pandas_std + 0.01)
+
+    def test_streaming_min_matches_batch(self):
+        values = _series(size=400)
+        tracker = RollingMin(50)
+        expected = rolling_min(values, 50, 1)
+        for value, target in zip(values, expected):
+            tracker.push(value)
+            self.assertEqual(tracker.min(), target)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.features.rolling import RollingMax
+from src.features.rolling_state import HistoricalContextState, compute_context_from_prices
+from src.strategy import process_data
+
+
+def _prices(days: int, seed: int = 7) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0008, 0.035, size=days)
+    index = pd.date_range("2019-01-01", periods=days, freq="D")
+    return pd.Series(20_000.0 * np.exp(np.cumsum(returns)), index=index)
+
+
+class TestHistoricalContextState(unittest.TestCase):
+    def assertContextClose(self, actual: dict, expected: dict):
+        self.assertEqual(set(actual), set(expected))
+        for key in expected:
+            self.assertAlmostEqual(actual[key], expected[key], places=8, msg=key)
+
+    def test_incremental_updates_match_full_recomputation(self):
+        prices = _prices(2_400)
+        state = HistoricalContextState.from_prices(prices.iloc[:1_900])
+
+        for cutoff in (1_900, 2_150, 2_400):
+            state.extend(prices.iloc[:cutoff])
+            self.assertContextClose(state.context(), compute_context_from_prices(prices.iloc[:cutoff]))
+            self.assertEqual(state.verify(prices.iloc[:cutoff]), {})
+
+    def test_short_history_uses_pandas_min_periods(self):
+        prices = _prices(40)
+        state = HistoricalContextState.from_prices(prices)
+
+        self.assertContextClose(state.context(), compute_context_from_prices(prices))
+        self.assertEqual(state.context()["mvrv_zscore"], 0.0)
+
+    def test_rolling_max_matches_pandas(self):
+        values = _prices(500).to_numpy()
+        rolling = RollingMax(180)
+        expected = pd.Series(values).rolling(180, min_periods=1).max().to_numpy()
+        for value, target in zip(values, expected):
+            rolling.push(value)
+            self.assertEqual(rolling.max(), target)
+
+    def test_state_round_trip_and_incremental_fetch(self):
+        prices = _prices(2_000)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = Path(tmp_dir) / "state.json"
+            HistoricalContextState.from_prices(prices.iloc[:-1]).save(state_path)
+
+            with mock.patch.object(process_data, "_download_closes", return_value=prices.iloc[-1:]) as download:
+                context = process_data.fetch_historical_context(
+                    (prices.index[-1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+                    state_path=state_path,
+                )
+
+            download.assert_called_once()
+            self.assertEqual(download.call_args.args[0], prices.index[-1].strftime("%Y-%m-%d"))
+            self.assertContextClose(context, compute_context_from_prices(prices))
+
+            restored = HistoricalContextState.load(state_path)
+            self.assertEqual(restored.last_date, prices.index[-1].strftime("%Y-%m-%d"))
+            self.assertContextClose(restored.context(), context)
+
+    def test_failed_incremental_fetch_uses_only_a_fresh_state(self):
+        prices = _prices(2_000)
+        next_day = (prices.index[-1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = Path(tmp_dir) / "state.json"
+            HistoricalContextState.from_prices(prices.iloc[:-1]).save(state_path)
+            with mock.patch.object(process_data, "_download_closes", side_effect=OSError("offline")):
+                with self.assertLogs(process_data.LOGGER, level="WARNING"):
+                    context = process_data.fetch_historical_context(next_day, state_path=state_path)
+                self.assertContextClose(context, compute_context_from_prices(prices.iloc[:-1]))
+                with self.assertRaises(RuntimeError):
+                    process_data.fetch_historical_context(next_day, state_path=state_path, strict=True)
+
+            HistoricalContextState.from_prices(prices.iloc[:-3]).save(state_path)
+            with mock.patch.object(
+                process_data, "_download_closes", side_effect=[OSError("offline"), prices]
+            ) as download:
+                context = process_data.fetch_historical_context(next_day, state_path=state_path)
+            self.assertEqual(download.call_count, 2)
+            self.assertContextClose(context, compute_context_from_prices(prices))
+            self.assertEqual(HistoricalContextState.load(state_path).last_date, prices.index[-1].strftime("%Y-%m-%d"))
+
+
+if __name__ == "__main__":
+    unittest.main()
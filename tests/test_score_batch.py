@@ -0,0 +1,135 @@
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features.pipeline import METRIC_FIELDS, build_feature_frame, feature_days
+from src.strategy.legacy_score import LegacyQuantScorer
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator, QuantScorer
+
+
+def _feature_frame(periods: int = 1_500, seed: int = 21) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2019-01-01", periods=periods, freq="D")
+    prices = pd.Series(20_000.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.03, periods))), index=index)
+    inputs = pd.DataFrame(
+        {
+            "mvrv": rng.uniform(0.6, 3.5, periods),
+            "sopr": rng.normal(1.0, 0.05, periods),
+            "rup": rng.uniform(0.0, 3.0, periods),
+            "fear_and_greed": rng.uniform(5.0, 95.0, periods),
+            "interest_rate": rng.uniform(0.0, 6.0, periods),
+            "m2_yoy": rng.normal(5.0, 4.0, periods),
+            "inflation_yoy": rng.normal(3.0, 1.5, periods),
+            "funding_rate": rng.normal(0.01, 0.02, periods),
+        },
+        index=index,
+    )
+    # Gaps exercise the missing-feature path (zero signal and reliability).
+    for offset, name in enumerate(inputs.columns):
+        inputs.iloc[offset::9, inputs.columns.get_loc(name)] = np.nan
+    return build_feature_frame(prices, inputs)
+
+
+class TestAdvancedScoresBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scorer = AdvancedQuantScorer(calibrator=HistoricalFeatureCalibrator(cache_dir=None))
+        cls.frame = _feature_frame()
+        cls.days = feature_days(cls.frame)
+
+    def test_batch_matches_scalar_scores_and_components(self):
+        batch = self.scorer.calculate_scores_batch(self.frame, components=True)
+
+        for idx, day in enumerate(self.days):
+            scores = self.scorer.calculate_scores(day)["scores"]
+            for horizon in ("long_term", "medium_term"):
+                self.assertAlmostEqual(batch[horizon][idx], scores[horizon]["value"], delta=0.0100001, msg=f"{horizon}@{idx}")
+                for name, value in scores[horizon]["components"].items():
+                    self.assertAlmostEqual(
+                        batch["components"][horizon][name][idx], value, delta=0.0010001, msg=f"{horizon}.{name}@{idx}"
+                    )
+
+    def test_day_dicts_and_column_mappings_are_accepted(self):
+        expected = self.scorer.calculate_scores_batch(self.frame)
+        from_days = self.scorer.calculate_scores_batch(self.days)
+        columns = {name: self.frame[name].to_numpy() for name in (*METRIC_FIELDS, "price_vs_ema_pct", "weekly_change_pct")}
+        from_columns = self.scorer.calculate_scores_batch(columns)
+
+        np.testing.assert_allclose(from_days["long_term"], expected["long_term"], atol=1e-9)
+        np.testing.assert_allclose(from_days["medium_term"], expected["medium_term"], atol=1e-9)
+        self.assertEqual(from_columns["long_term"].shape, (len(self.frame),))
+
+    def test_mixed_timestamp_formats_are_accepted(self):
+        # data/processed mixes midnight and microsecond timestamps.
+        days = [dict(day) for day in self.days[:40]]
+        for day in days[1::2]:
+            day["timestamp"] = day["timestamp"][:10] + "T14:05:09.123456"
+        expected = self.scorer.calculate_scores_batch(self.days[:40])
+
+        for scorer in (self.scorer, LegacyQuantScorer()):
+            batch = scorer.calculate_scores_batch(days)
+            self.assertEqual(batch["long_term"].tolist(), [scorer.calculate_values(day)[0] for day in days])
+        np.testing.assert_array_equal(self.scorer.calculate_scores_batch(days)["long_term"], expected["long_term"])
+
+    def test_batch_is_fast_on_a_multi_year_history(self):
+        started = time.perf_counter()
+        self.scorer.calculate_scores_batch(self.frame, components=True)
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+
+class TestLegacyScoresBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.calibrator = HistoricalFeatureCalibrator(cache_dir=None)
+
+    def setUp(self):
+        self.frame = _feature_frame(periods=800, seed=5)
+        self.days = feature_days(self.frame)
+        self.days[3]["market_cycle_phase"] = "Unknown"
+        self.days[4]["flags"]["is_bull_trend"] = None
+        self.days[5]["metrics"].update({"mvrv_zscore": None, "mayer_multiple": None})
+
+    def _assert_parity(self, scorer, components: bool = True):
+        batch = scorer.calculate_scores_batch(self.days, components=components)
+        for idx, day in enumerate(self.days):
+            scores = scorer.calculate_scores(day)["scores"]
+            for horizon in ("long_term", "medium_term"):
+                self.assertAlmostEqual(batch[horizon][idx], scores[horizon]["value"], delta=1e-9, msg=f"{horizon}@{idx}")
+                if components:
+                    for name, value in scores[horizon]["components"].items():
+                        self.assertAlmostEqual(batch["components"][horizon][name][idx], value, delta=1e-9, msg=name)
+
+    def test_legacy_batch_matches_scalar_path(self):
+        self._assert_parity(LegacyQuantScorer())
+
+    def test_facade_modes_expose_batch_scoring(self):
+        self._assert_parity(QuantScorer(mode="legacy"))
+        self._assert_parity(QuantScorer(mode="blend", advanced_weight=0.4, calibrator=self.calibrator), components=False)
+
+        batch = LegacyQuantScorer().calculate_scores_batch(self.frame)
+        self.assertEqual(batch["long_term"].shape, (len(self.frame),))
+        self.assertEqual(LegacyQuantScorer.CYCLE_SCORES.size, 5)
+
+    def test_calculate_values_matches_full_scores(self):
+        for scorer in (LegacyQuantScorer(), AdvancedQuantScorer(calibrator=self.calibrator), QuantScorer(mode="blend", advanced_weight=0.4, calibrator=self.calibrator)):
+            for day in self.days:
+                scores = scorer.calculate_scores(day)["scores"]
+                self.assertEqual(
+                    scorer.calculate_values(day),
+                    (scores["long_term"]["value"], scores["medium_term"]["value"]),
+                )
+
+    def test_blend_batch_rounds_exactly_like_scalar_path(self):
+        days = feature_days(_feature_frame(periods=3000, seed=1))
+        for weight in (0.25, 0.4):
+            scorer = QuantScorer(mode="blend", advanced_weight=weight, calibrator=self.calibrator)
+            batch = scorer.calculate_scores_batch(days)
+            values = [scorer.calculate_values(day) for day in days]
+            self.assertEqual(batch["long_term"].tolist(), [long_term for long_term, _ in values])
+            self.assertEqual(batch["medium_term"].tolist(), [medium_term for _, medium_term in values])
+
+
+if __name__ == "__main__":
+    unittest.main()
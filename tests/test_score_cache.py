@@ -0,0 +1,87 @@
+import copy
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.features.pipeline import feature_days
+from src.strategy.legacy_score import LegacyQuantScorer
+from src.strategy.score import AdvancedQuantScorer, HistoricalFeatureCalibrator, QuantScorer
+from src.strategy.score_cache import CachedScorer, ScoreCache, scorer_fingerprint
+from tests.test_score_batch import _feature_frame
+
+
+class TestScoreCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.days = feature_days(_feature_frame(periods=120, seed=3))
+
+    def test_identical_configs_share_scores_across_wrappers(self):
+        cache = ScoreCache()
+        first = CachedScorer(QuantScorer(mode="legacy"), cache)
+        second = CachedScorer(QuantScorer(mode="legacy"), cache)
+        other = CachedScorer(QuantScorer(mode="blend", advanced_weight=0.0, calibrator=HistoricalFeatureCalibrator(cache_dir=None)), cache)
+        self.assertEqual(first.fingerprint, second.fingerprint)
+        self.assertNotEqual(first.fingerprint, other.fingerprint)
+
+        expected = QuantScorer(mode="legacy").calculate_scores_batch(self.days)
+        with mock.patch.object(
+            LegacyQuantScorer, "calculate_scores_batch", autospec=True, side_effect=LegacyQuantScorer.calculate_scores_batch
+        ) as batch:
+            np.testing.assert_array_equal(first.calculate_scores_batch(self.days)["long_term"], expected["long_term"])
+            np.testing.assert_array_equal(second.calculate_scores_batch(self.days)["medium_term"], expected["medium_term"])
+            second.calculate_scores_batch(self.days[40:80])
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(cache.stats()["hits"], len(self.days) + 40)
+        self.assertEqual(cache.stats()["misses"], len(self.days))
+
+    def test_partial_batches_only_score_missing_days(self):
+        scorer = CachedScorer(QuantScorer(mode="legacy"))
+        scorer.calculate_scores_batch(self.days[:50])
+        with mock.patch.object(
+            LegacyQuantScorer, "calculate_scores_batch", autospec=True, side_effect=LegacyQuantScorer.calculate_scores_batch
+        ) as batch:
+            result = scorer.calculate_scores_batch(self.days)
+        self.assertEqual(len(batch.call_args.args[1]), len(self.days) - 50)
+        np.testing.assert_array_equal(
+            result["long_term"], QuantScorer(mode="legacy").calculate_scores_batch(self.days)["long_term"]
+        )
+
+    def test_day_keys_and_scalar_paths(self):
+        identity = CachedScorer(LegacyQuantScorer())
+        content = CachedScorer(LegacyQuantScorer(), day_key="content")
+        day = self.days[7]
+        clone = copy.deepcopy(day)
+
+        self.assertEqual(identity.calculate_values(day), LegacyQuantScorer().calculate_values(day))
+        identity.calculate_values(clone)
+        self.assertEqual(identity.cache.hits, 0)  # equal content, different object
+
+        content.calculate_scores(day)
+        self.assertIs(content.calculate_scores(clone), content.calculate_scores(day))
+        self.assertEqual(content.cache.hit_rate, 2 / 3)
+
+        with self.assertRaises(ValueError):
+            CachedScorer(LegacyQuantScorer(), day_key="timestamp")
+
+    def test_cache_is_bounded(self):
+        cache = ScoreCache(max_entries=10)
+        scorer = CachedScorer(LegacyQuantScorer(), cache)
+        for day in self.days[:25]:
+            scorer.calculate_values(day)
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(cache.evictions, 15)
+        scorer.calculate_values(self.days[24])
+        scorer.calculate_values(self.days[0])
+        self.assertEqual((cache.hits, cache.misses), (1, 26))
+
+    def test_fingerprint_follows_the_calibrator_config(self):
+        def scorer(**params):
+            return AdvancedQuantScorer(calibrator=HistoricalFeatureCalibrator(cache_dir=None, **params))
+
+        self.assertEqual(scorer_fingerprint(scorer()), scorer_fingerprint(scorer()))
+        self.assertNotEqual(scorer_fingerprint(scorer()), scorer_fingerprint(scorer(lookback_files=300)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from src.data.processed_reader import ProcessedPayloadReader
+from src.features.quantile_sketch import KLLSketch
+from src.strategy.score import HistoricalFeatureCalibrator
+from src.strategy.sketch_calibrator import CalibrationSketches, SketchFeatureCalibrator
+
+
+def _rank_errors(sketch: KLLSketch, values: np.ndarray, quantiles) -> list[float]:
+    # Distance from q to the rank interval of the returned value (ties span one).
+    ordered = np.sort(values)
+    errors = []
+    for q in quantiles:
+        value = sketch.quantile(q)
+        low = np.searchsorted(ordered, value, side="left") / ordered.size
+        high = np.searchsorted(ordered, value, side="right") / ordered.size
+        errors.append(max(low - q, q - high, 0.0))
+    return errors
+
+
+def _write_history(directory: Path, start: int, stop: int, seed: int = 8) -> None:
+    rng = np.random.default_rng(seed)
+    draws = rng.normal(size=(stop, 3))
+    prices = 30_000.0 * np.exp(np.cumsum(0.03 * draws[:, 0]))
+    for idx in range(start, stop):
+        day = np.datetime64("2021-01-01") + idx
+        payload = {
+            "timestamp": f"{day}T00:00:00",
+            "market_cycle_phase": ("Accumulation", "Pre-Halving Rally", "Post-Halving Expansion")[(idx // 40) % 3],
+            "market_data": {"current_price": float(prices[idx]), "price_vs_ema_pct": float(10.0 + 20.0 * draws[idx, 1])},
+            "metrics": {"mvrv_zscore": float(draws[idx, 2]), "sopr": float(1.0 + 0.05 * draws[idx, 1])},
+        }
+        (directory / f"processed_data_{day}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+
+class TestKLLSketch(unittest.TestCase):
+    QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+    def test_rank_error_within_documented_bound(self):
+        rng = np.random.default_rng(0)
+        for values in (rng.normal(size=30_000), rng.lognormal(size=30_000), rng.integers(0, 50, 30_000).astype(float)):
+            for seed in range(3):
+                sketch = KLLSketch(k=200, seed=seed)
+                sketch.extend(values)
+                self.assertLessEqual(max(_rank_errors(sketch, values, self.QUANTILES)), sketch.rank_error)
+                self.assertLess(len(sketch.to_dict()["levels"]), 12)
+                self.assertEqual(sketch.quantile(0.0), values.min())
+                self.assertEqual(sketch.quantile(1.0), values.max())
+
+    def test_merged_shards_keep_the_bound(self):
+        rng = np.random.default_rng(1)
+        shards = [rng.normal(loc, 1.0, 10_000) for loc in (-1.0, 0.0, 3.0)]
+        merged = KLLSketch(seed=0)
+        for idx, shard in enumerate(shards):
+            sketch = KLLSketch(seed=idx + 1)
+            sketch.extend(shard)
+            merged.merge(KLLSketch.from_dict(json.loads(json.dumps(sketch.to_dict()))))
+
+        values = np.concatenate(shards)
+        self.assertEqual(len(merged), values.size)
+        self.assertLessEqual(max(_rank_errors(merged, values, self.QUANTILES)), merged.rank_error)
+
+        center = float(np.median(values))
+        mad = float(np.median(np.abs(values - center)))
+        self.assertAlmostEqual(merged.median_abs_deviation(center) / mad, 1.0, delta=0.02)
+
+    def test_small_streams_are_exact(self):
+        values = np.random.default_rng(2).normal(size=151)
+        sketch = KLLSketch()
+        sketch.extend(values)
+        self.assertEqual(sketch.quantile(0.5), float(np.median(values)))
+
+
+class TestSketchFeatureCalibrator(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.processed_dir, self.state_path = root / "processed", root / "sketches.json"
+        self.processed_dir.mkdir()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_stats_and_priors_track_the_exact_fit(self):
+        _write_history(self.processed_dir, 0, 400)
+        exact = HistoricalFeatureCalibrator(processed_dir=self.processed_dir, cache_dir=None)
+        sketched = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+
+        for name in ("mvrv_zscore", "sopr", "price_vs_ema_pct"):
+            expected, actual = exact.get_feature_stat(name), sketched.get_feature_stat(name)
+            self.assertEqual(actual.sample_size, expected.sample_size)
+            self.assertAlmostEqual(actual.center, expected.center, delta=0.05 * expected.scale)
+            self.assertAlmostEqual(actual.scale / expected.scale, 1.0, delta=0.05)
+        self.assertEqual(set(sketched.cycle_priors), set(exact.cycle_priors))
+        for cycle, prior in exact.cycle_priors.items():
+            self.assertAlmostEqual(sketched.cycle_priors[cycle], prior, places=9)
+
+    def test_new_days_are_absorbed_without_rereading_history(self):
+        _write_history(self.processed_dir, 0, 300)
+        SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+        _write_history(self.processed_dir, 300, 302)
+
+        files_read = []
+        original = ProcessedPayloadReader.read_columns
+
+        def read_columns(reader, fields):
+            files_read.extend(reader.files())
+            return original(reader, fields)
+
+        with mock.patch.object(ProcessedPayloadReader, "read_columns", read_columns):
+            updated = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+
+        self.assertEqual(len(files_read), 2)
+        self.assertEqual(updated.get_feature_stat("sopr").sample_size, 302)
+        one_shot = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=None)
+        self.assertEqual(updated.cycle_priors, one_shot.cycle_priors)
+        self.assertEqual(updated.feature_stats, one_shot.feature_stats)
+
+    def test_state_from_another_directory_is_not_extended(self):
+        _write_history(self.processed_dir, 0, 300)
+        SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+        other_dir = self.processed_dir.parent / "other"
+        other_dir.mkdir()
+        _write_history(other_dir, 0, 120, seed=3)
+
+        other = SketchFeatureCalibrator(processed_dir=other_dir, state_path=self.state_path)
+        self.assertEqual(other.get_feature_stat("sopr").sample_size, 120)
+        self.assertEqual(other.feature_stats, SketchFeatureCalibrator(processed_dir=other_dir, state_path=None).feature_stats)
+
+    def test_rewritten_files_are_reabsorbed(self):
+        _write_history(self.processed_dir, 0, 300)
+        SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+        _write_history(self.processed_dir, 0, 300, seed=9)
+
+        updated = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+        self.assertEqual(updated.absorbed_files, 300)
+        self.assertEqual(updated.get_feature_stat("sopr").sample_size, 300)
+        one_shot = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=None)
+        self.assertEqual(updated.feature_stats, one_shot.feature_stats)
+        self.assertEqual(updated.cycle_priors, one_shot.cycle_priors)
+
+    def test_fresh_checkout_extends_the_committed_state(self):
+        _write_history(self.processed_dir, 0, 300)
+        SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+        for path in self.processed_dir.glob("processed_data_*.json"):
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        _write_history(self.processed_dir, 300, 301)
+
+        updated = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=self.state_path)
+        self.assertEqual(updated.absorbed_files, 1)
+        self.assertEqual(updated.get_feature_stat("sopr").sample_size, 301)
+
+    def test_sharded_histories_merge(self):
+        _write_history(self.processed_dir, 0, 400)
+        earlier = SketchFeatureCalibrator(processed_dir=self.processed_dir, max_file_date="2021-07-19").sketches
+        later = CalibrationSketches()
+        later.absorb_columns(
+            ProcessedPayloadReader(self.processed_dir, after_file_date="2021-07-19").read_columns(CalibrationSketches.fields())
+        )
+        merged = earlier.merge(later)
+
+        full = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=None)
+        calibrator = SketchFeatureCalibrator(processed_dir=self.processed_dir, state_path=None, max_file_date="2000-01-01")
+        calibrator.apply(merged)
+        for name in ("mvrv_zscore", "sopr"):
+            self.assertEqual(calibrator.get_feature_stat(name).sample_size, 400)
+            self.assertAlmostEqual(calibrator.get_feature_stat(name).center, full.get_feature_stat(name).center, delta=0.05)
+        self.assertEqual(merged.last_date, "2022-02-04")
+
+
+if __name__ == "__main__":
+    unittest.main()
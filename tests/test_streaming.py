@@ -0,0 +1,108 @@
+import asyncio
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data import stream
+from src.data.stream import StreamIngestor, parse_message
+from src.features.candles import CandleRing, DEFAULT_WINDOWS, LiveFeatureEngine
+
+
+def _trades(minutes: int, seed: int = 5) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    prices = 60_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, minutes * 3)))
+    start = 1_700_000_000 - (1_700_000_000 % 86_400)
+    return [
+        {"ts": start + (idx * 20) + 1, "price": float(price), "qty": 0.01}
+        for idx, price in enumerate(prices)
+    ]
+
+
+class TestStreaming(unittest.TestCase):
+    def test_ring_is_bounded_and_ordered(self):
+        ring = CandleRing(3)
+        for idx in range(5):
+            ring.append([idx, 1.0, 2.0, 0.5, float(idx), 10.0])
+
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.array()[:, 0].tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual(ring.last(0)[4], 4.0)
+        self.assertIsNone(ring.last(3))
+        self.assertEqual(ring.nbytes, 3 * 6 * 8)
+
+    def test_trades_roll_into_candles_with_incremental_features(self):
+        trades = _trades(minutes=3 * 24 * 60)
+        engine = LiveFeatureEngine()
+        for trade in trades:
+            engine.on_trade(trade["ts"], trade["price"], trade["qty"])
+        engine.flush()
+
+        frame = pd.DataFrame(trades)
+        frame.index = pd.to_datetime(frame["ts"], unit="s")
+        hourly = frame["price"].resample("1h").ohlc()
+        bars = engine.rings["1h"].to_frame()
+        np.testing.assert_allclose(bars[["open", "high", "low", "close"]].to_numpy(), hourly.to_numpy())
+        np.testing.assert_allclose(bars["volume"].to_numpy(), 0.01 * 180)
+        self.assertEqual(len(engine.rings["1m"]), engine.rings["1m"].capacity)
+
+        windows = DEFAULT_WINDOWS["1h"]
+        closes = hourly["close"]
+        latest = engine.latest["1h"]
+        returns = closes.pct_change()
+        self.assertAlmostEqual(latest["ema"], closes.ewm(span=windows.ema_span, adjust=False).mean().iloc[-1], places=6)
+        self.assertAlmostEqual(
+            latest["realized_vol"],
+            returns.rolling(windows.vol_window).std().iloc[-1] * np.sqrt(windows.bars_per_year),
+            places=9,
+        )
+        self.assertAlmostEqual(latest["drawdown"], closes.iloc[-1] / closes.tail(windows.peak_window).max() - 1.0, places=12)
+        self.assertAlmostEqual(latest["momentum"], closes.iloc[-1] / closes.iloc[-1 - windows.momentum_lag] - 1.0, places=12)
+
+    def test_parse_message_formats(self):
+        self.assertEqual(
+            parse_message('{"e": "trade", "T": 1700000000500, "p": "100.5", "q": "0.2"}'),
+            (1_700_000_000.5, 100.5, 100.5, 100.5, 100.5, 0.2, False),
+        )
+        kline = {"e": "kline", "k": {"t": 1_700_000_000_000, "o": "1", "h": "3", "l": "0.5", "c": "2", "v": "7"}}
+        self.assertEqual(parse_message(kline), (1_700_000_000.0, 1.0, 3.0, 0.5, 2.0, 7.0, True))
+        self.assertIsNone(parse_message({"result": None, "id": 1}))
+
+    def test_repeated_kline_updates_replace_the_open_bar(self):
+        start_ms = 1_700_006_400_000  # a day boundary
+
+        def kline(minute: int, close: float, volume: float) -> dict:
+            bar = {"t": start_ms + (minute * 60_000), "o": "100", "h": str(max(close, 100.0)), "l": "99"}
+            return {"e": "kline", "k": {**bar, "c": str(close), "v": str(volume)}}
+
+        ingestor = StreamIngestor(LiveFeatureEngine(timeframes=("1m", "1h")))
+        updates = [(0, 101.0, 1.0), (0, 102.0, 2.0), (0, 101.5, 3.0), (1, 103.0, 4.0), (1, 104.0, 5.0)]
+        for minute, close, volume in updates:
+            ingestor.handle(kline(minute, close, volume))
+        ingestor.engine.flush()
+
+        minutes = ingestor.engine.rings["1m"].to_frame()
+        self.assertEqual(minutes["volume"].tolist(), [3.0, 5.0])
+        self.assertEqual(minutes["close"].tolist(), [101.5, 104.0])
+        self.assertEqual(minutes["high"].tolist(), [102.0, 104.0])
+        hour = ingestor.engine.rings["1h"].last(0)
+        self.assertEqual((hour[1], hour[2], hour[3], hour[4], hour[5]), (100.0, 104.0, 99.0, 104.0, 8.0))
+
+    @unittest.skipIf(stream.websockets is None, "websockets is not installed")
+    def test_replay_server_feeds_the_ingestor(self):
+        messages = [json.dumps(trade) for trade in _trades(minutes=180)] + ['{"ping": 1}']
+        ingestor = asyncio.run(stream.replay(messages, StreamIngestor()))
+
+        stats = ingestor.stats()
+        self.assertEqual(stats["count"], len(messages) - 1)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(stats["bars"]["1h"], 2)
+        self.assertGreater(stats["p99_us"], 0.0)
+
+        limited = asyncio.run(stream.replay(messages, StreamIngestor(), max_messages=10))
+        self.assertEqual(limited.stats()["count"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,12 +2,12 @@ from flask import Flask, jsonify, send_from_directory
 from flask_cors import CORS
 import pandas as pd
 import json
-import re
 from datetime import datetime, timedelta
 from functools import lru_cache
 from pathlib import Path
 import yfinance as yf
 
+from src.execution.report_archive import load_report_history
 from src.utils.project_paths import ACCOUNTING_DIR, PROCESSED_DATA_DIR, REPORTS_DIR, SIGNALS_DIR
 
 app = Flask(__name__, static_folder='static')
@@ -20,46 +20,8 @@ PROJECT_ROOT = Path(__file__).parent.parent
 PAPER_TRADING_START = "2025-11-23"
 
 def parse_daily_reports():
-    """Parse all daily reports to build historical data"""
-    reports = []
-    
-    for report_file in sorted(REPORTS_DIR.glob('report_*.md')):
-        try:
-            with open(report_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract date from filename
-            date_match = re.search(r'report_(\d{4}-\d{2}-\d{2})\.md', report_file.name)
-            if not date_match:
-                continue
-            date = date_match.group(1)
-            
-            # Extract metrics using regex
-            equity_match = re.search(r'\*\*Total Equity\*\*.*?\$([0-9,]+\.\d{2})', content)
-            roi_match = re.search(r'\*\*ROI \(Total\)\*\*.*?([+-]?\d+\.\d{2})%', content)
-            alpha_match = re.search(r'\*\*Alpha.*?\*\*.*?([+-]?\d+\.\d{2})%', content)
-            cash_match = re.search(r'💵 \*\*Cash\*\*.*?\$([0-9,]+\.\d{2})', content)
-            btc_value_match = re.search(r'🟠 \*\*Bitcoin\*\*.*?\$([0-9,]+\.\d{2})', content)
-            btc_amount_match = re.search(r'`([0-9.]+) BTC`', content)
-            debt_match = re.search(r'🔴 \*\*Debt\*\*.*?\$([0-9,]+\.\d{2})', content)
-            
-            report = {
-                'date': date,
-                'equity': float(equity_match.group(1).replace(',', '')) if equity_match else 0,
-                'roi': float(roi_match.group(1)) if roi_match else 0,
-                'alpha': float(alpha_match.group(1)) if alpha_match else 0,
-                'cash': float(cash_match.group(1).replace(',', '')) if cash_match else 0,
-                'btc_value': float(btc_value_match.group(1).replace(',', '')) if btc_value_match else 0,
-                'btc_amount': float(btc_amount_match.group(1)) if btc_amount_match else 0,
-                'debt': float(debt_match.group(1).replace(',', '')) if debt_match else 0
-            }
-            
-            reports.append(report)
-        except Exception as e:
-            print(f"Error parsing {report_file}: {e}")
-            continue
-    
-    return reports
+    """Load report history from monthly rollups plus the loose daily reports"""
+    return load_report_history(REPORTS_DIR)
 
 
 @lru_cache(maxsize=8)